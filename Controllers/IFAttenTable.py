@@ -0,0 +1,116 @@
+import atexit
+import logging
+import threading
+import time
+import yaml
+from datetime import datetime
+from pydantic import BaseModel
+from typing import Optional
+
+class IFAttenPoint(BaseModel):
+    freqLO: float               # GHz
+    freqIF: float               # GHz
+    input: str                  # InputSelect name: pol and sideband
+    targetLevel: float          # dBm
+    atten: int                  # dB
+    timeStamp: Optional[datetime] = None
+
+class IFAttenTableData(BaseModel):
+    points: list[IFAttenPoint] = []
+
+class IFAttenTable():
+    """Persisted table of IF attenuation settings which reached the target level
+
+    Keyed by LO frequency, IF frequency, IF input (pol and sideband) and target level.
+    lookup() returns the attenuation of the nearest recorded point, adjusted for any
+    difference in target level, if it is close enough in LO and IF.
+    """
+    IFATTENTABLE_FILE = "Settings/IFAttenTable.yaml"
+    FREQ_RESOLUTION = 0.01      # GHz.  Points closer than this are the same frequency
+    LO_WINDOW = 2.0             # GHz.  Only use points within this of the requested LO
+    IF_WINDOW = 1.0             # GHz.  Only use points within this of the requested IF
+    SAVE_INTERVAL = 30          # seconds.  The table can be large so don't rewrite it at every IF step
+
+    def __init__(self, fileName: str = None):
+        self.logger = logging.getLogger("ALMAFE-CTS-Control")
+        self.fileName = fileName if fileName else self.IFATTENTABLE_FILE
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.lastSave = 0
+        self.loadTable()
+        atexit.register(self.flush)
+
+    def loadTable(self) -> None:
+        try:
+            with open(self.fileName, "r") as f:
+                d = yaml.safe_load(f)
+                self.data = IFAttenTableData.model_validate(d)
+        except Exception as e:
+            self.data = IFAttenTableData()
+
+    def flush(self) -> None:
+        """Save the table if there are unsaved changes"""
+        with self.lock:
+            if self.dirty:
+                self.saveTable()
+
+    def saveTable(self) -> None:
+        # call with self.lock held
+        self.dirty = False
+        self.lastSave = time.time()
+        try:
+            with open(self.fileName, "w") as f:
+                yaml.dump(self.data.model_dump(), f)
+        except Exception as e:
+            self.logger.error(f"IFAttenTable.saveTable: {e}")
+
+    def record(self, freqLO: float, freqIF: float, input: str, targetLevel: float, atten: int) -> None:
+        """Record an attenuation which reached the target level, replacing any for the same LO, IF and input"""
+        point = IFAttenPoint(
+            freqLO = freqLO,
+            freqIF = freqIF,
+            input = input,
+            targetLevel = targetLevel,
+            atten = atten,
+            timeStamp = datetime.now()
+        )
+        with self.lock:
+            self.data.points = [p for p in self.data.points if not self._samePoint(p, point)]
+            self.data.points.append(point)
+            self.dirty = True
+            if time.time() - self.lastSave > self.SAVE_INTERVAL:
+                self.saveTable()
+
+    def lookup(self, freqLO: float, freqIF: float, input: str, targetLevel: float) -> int | None:
+        """Starting attenuation for the given LO, IF, input and target level
+
+        :return attenuation dB or None if there are no recorded points near enough
+        """
+        best = None
+        bestDistance = None
+        with self.lock:
+            for p in self.data.points:
+                if p.input != input:
+                    continue
+                dLO = abs(p.freqLO - freqLO)
+                dIF = abs(p.freqIF - freqIF)
+                if dLO > self.LO_WINDOW or dIF > self.IF_WINDOW:
+                    continue
+                # normalized distance, preferring points at the same LO:
+                distance = dLO / self.LO_WINDOW + dIF / self.IF_WINDOW
+                if bestDistance is None or distance < bestDistance:
+                    best, bestDistance = p, distance
+        if best is None:
+            return None
+        # a lower target level needs that much more attenuation:
+        return int(round(best.atten + best.targetLevel - targetLevel))
+
+    def clear(self) -> None:
+        with self.lock:
+            self.data.points = []
+            self.saveTable()
+
+    def _samePoint(self, a: IFAttenPoint, b: IFAttenPoint) -> bool:
+        return a.input == b.input \
+            and abs(a.freqLO - b.freqLO) < self.FREQ_RESOLUTION \
+            and abs(a.freqIF - b.freqIF) < self.FREQ_RESOLUTION
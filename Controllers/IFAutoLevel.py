@@ -5,6 +5,7 @@ import yaml
 from math import floor
 from pydantic import BaseModel
 from Controllers.IFSystem.Interface import IFSystem_Interface, InputSelect
+from Controllers.IFAttenTable import IFAttenTable
 from Controllers.PowerDetect.Interface import PowerDetect_Interface, DetectMode
 from INSTR.Chopper.Interface import Chopper_Interface
 from simple_pid import PID
@@ -18,6 +19,8 @@ class IFAutoLevelSettings(BaseModel):
     max_iter: int = 15
     tolerance: float = 0.75   # dB
     sleep: float = 0.25
+    predictive: bool = True     # try computing the attenuation from one reading before falling back on PID
+    atten_slope: float = 1.0    # dB change in detected power per dB of attenuation
 
 class IFAutoLevel():
     SETTINGS_FILE = "Settings/Settings_IFAutoLevel.yaml"
@@ -30,6 +33,7 @@ class IFAutoLevel():
         self.ifSystem = ifSystem
         self.powerDetect = powerDetect
         self.chopper = chopper
+        self.attenTable = IFAttenTable()
         self.loadSettings()
 
     def loadSettings(self):
@@ -47,9 +51,16 @@ class IFAutoLevel():
 
     def autoLevel(self, 
             targetLevel: float, 
-            inputSelect: InputSelect = InputSelect.POL0_USB
+            inputSelect: InputSelect = InputSelect.POL0_USB,
+            freqLO: float = None
         ) -> tuple[bool, str]:
-        
+        """Set the IF attenuation to give targetLevel with the chopper on the hot load
+
+        First tries the predictive method: start from the attenuation learned for this LO, IF and input,
+        measure, compute the attenuation needed, and verify with a second measurement.
+        Falls back on the PID loop if that misses.
+        :param freqLO: if given, look up and record the learned attenuation for this LO frequency
+        """
         if self.powerDetect.detect_mode == DetectMode.SPEC_AN:
             # nothing to do in this mode
             return True, ""
@@ -60,21 +71,72 @@ class IFAutoLevel():
         self.chopper.gotoHot()
 
         self.loadSettings()
+        freqIF = self.ifSystem.frequency
+
+        if self.settings.predictive:
+            learned = None
+            if freqLO is not None:
+                learned = self.attenTable.lookup(freqLO, freqIF, inputSelect.name, targetLevel)
+            if learned is not None:
+                self.ifSystem.attenuation = self._limit(learned)
+                time.sleep(self.settings.sleep)
+            success, msg = self._predictiveLevel(targetLevel)
+            if success:
+                if freqLO is not None:
+                    self.attenTable.record(freqLO, freqIF, inputSelect.name, targetLevel, self.ifSystem.attenuation)
+                self.logger.info(msg)
+                return True, ""
+            self.logger.info(msg)
+
+        success, msg = self._pidLevel(targetLevel)
+        if success:
+            if freqLO is not None:
+                self.attenTable.record(freqLO, freqIF, inputSelect.name, targetLevel, self.ifSystem.attenuation)
+            self.logger.info(msg)
+            return True, ""
+        else:
+            self.logger.error(msg)
+            return False, msg
+
+    def _limit(self, atten: float) -> int:
+        return int(min(max(round(atten), self.settings.min_atten), self.settings.max_atten))
+
+    def _inTolerance(self, amp: float, targetLevel: float) -> bool:
+        return targetLevel - self.settings.tolerance <= amp <= targetLevel + self.settings.tolerance
+
+    def _predictiveLevel(self, targetLevel: float) -> tuple[bool, str]:
+        # detected power in dBm falls by atten_slope dB per dB of attenuation:
+        atten = self.ifSystem.attenuation
+        amp = self.powerDetect.read(averaging = 10)
+        if amp is None:
+            return False, "IF autoLevel predictive: powerDetect.read error"
+        if self._inTolerance(amp, targetLevel):
+            return True, f"IF autoLevel SUCCESS: first read amp={amp:.1f} dBm, atten={atten} dB"
+        nextAtten = self._limit(atten + (amp - targetLevel) / self.settings.atten_slope)
+        if nextAtten == atten:
+            return False, f"IF autoLevel predictive: can't adjust from atten={atten} dB, amp={amp:.1f} dBm"
+        self.ifSystem.attenuation = nextAtten
+        time.sleep(self.settings.sleep)
+        amp = self.powerDetect.read(averaging = 10)
+        if amp is None:
+            return False, "IF autoLevel predictive: powerDetect.read error"
+        if self._inTolerance(amp, targetLevel):
+            return True, f"IF autoLevel SUCCESS: predicted amp={amp:.1f} dBm, atten={nextAtten} dB"
+        return False, f"IF autoLevel predictive: missed amp={amp:.1f} dBm, atten={nextAtten} dB.  Trying PID."
+
+    def _pidLevel(self, targetLevel: float) -> tuple[bool, str]:
         output = self.ifSystem.attenuation
         pid = PID(-self.settings.Kp, -self.settings.Ki, -self.settings.Kd, starting_output = output)
         pid.setpoint = targetLevel
         pid.output_limits = (self.settings.min_atten, self.settings.max_atten)
         pid.sample_time = self.settings.sleep - 0.1
 
-        done = error = False
-        msg = ""
-
         amp = self.powerDetect.read(averaging = 10)
         if not amp:
-            error = True
+            return False, "IF autoLevel: powerDetect.read error"
 
         iter = 0
-        while not done and not error: 
+        while True: 
             self.logger.info(f"IF autoLevel: iter={iter}, amp={amp:.1f} dBm, atten={int(round(output))} dB")
             output = pid(amp)
             self.ifSystem.attenuation = int(round(output))
@@ -82,16 +144,7 @@ class IFAutoLevel():
             amp = self.powerDetect.read(averaging = 10)
             
             iter += 1
-            if targetLevel - self.settings.tolerance <= amp <= targetLevel + self.settings.tolerance:
-                done = True
-                msg = f"IF autoLevel SUCCESS: iter={iter}, amp={amp:.1f} dBm, atten={int(round(output))} dB"
+            if self._inTolerance(amp, targetLevel):
+                return True, f"IF autoLevel SUCCESS: iter={iter}, amp={amp:.1f} dBm, atten={int(round(output))} dB"
             elif iter > self.settings.max_iter:
-                error = True
-                msg = f"IF autoLevel FAIL: iter={iter}, amp={amp:.1f} dBm, atten={int(round(output))} dB"
-
-        if error:
-            self.logger.error(msg)
-            return error, msg
-        elif msg:
-            self.logger.info(msg)
-            return True, ""
+                return False, f"IF autoLevel FAIL: iter={iter}, amp={amp:.1f} dBm, atten={int(round(output))} dB"
@@ -8,6 +8,7 @@ class AutoLOStatus(BaseModel):
     is_active: bool = False
     last_output: float = None
     last_measured: float = None
+    polarization: int = None    # pol being leveled.  None if leveling both at once
 
 class LOControl_Interface(ABC):
 
@@ -0,0 +1,144 @@
+import logging
+import threading
+import yaml
+from datetime import datetime
+from pydantic import BaseModel
+from typing import Optional
+
+class LockHint(BaseModel):
+    freqLO: float               # GHz
+    refAmplitude: float         # dBm reference synth amplitude which last locked
+    lockSB: int                 # LODevice.LOCK_BELOW_REF or LOCK_ABOVE_REF
+    courseTune: int             # YTO course tune which last locked
+    locks: int = 0              # successful setFrequency calls
+    failures: int = 0           # setFrequency calls which didn't lock
+    attempts: int = 0           # total lockPLL calls over all setFrequency calls
+    lastAttempts: int = 0       # lockPLL calls in the most recent setFrequency
+    timeStamp: Optional[datetime] = None
+
+class LockStats(BaseModel):
+    serialNum: str
+    freqLO: float
+    locks: int
+    failures: int
+    meanAttempts: float
+    lastAttempts: int
+    timeStamp: Optional[datetime] = None
+
+class LockHintCacheData(BaseModel):
+    # keyed by LO serial number:
+    hints: dict[str, list[LockHint]] = {}
+
+class LockHintCache():
+    """Persisted lock parameters which last succeeded for each LO and frequency
+
+    setFrequency applies the hint on the first lock attempt, so a frequency which needed
+    a higher reference amplitude or the other lock sideband locks first time on the next run.
+    Also keeps counts of lock attempts per frequency.
+    """
+    LOCKHINTCACHE_FILE = "Settings/LockHintCache.yaml"
+    FREQ_RESOLUTION = 0.001     # GHz.  Frequencies closer than this are the same
+
+    def __init__(self, fileName: str = None):
+        self.logger = logging.getLogger("ALMAFE-CTS-Control")
+        self.fileName = fileName if fileName else self.LOCKHINTCACHE_FILE
+        self.lock = threading.Lock()
+        self.loadCache()
+
+    def loadCache(self) -> None:
+        try:
+            with open(self.fileName, "r") as f:
+                d = yaml.safe_load(f)
+                self.data = LockHintCacheData.model_validate(d)
+        except Exception as e:
+            self.data = LockHintCacheData()
+
+    def saveCache(self) -> None:
+        # call with self.lock held
+        try:
+            with open(self.fileName, "w") as f:
+                yaml.dump(self.data.model_dump(), f)
+        except Exception as e:
+            self.logger.error(f"LockHintCache.saveCache: {e}")
+
+    def lookup(self, serialNum: str, freqLO: float) -> LockHint | None:
+        """The hint for the given LO and frequency, or None if it has never locked there"""
+        with self.lock:
+            hint = self._find(serialNum, freqLO)
+            return hint.model_copy() if hint and hint.locks else None
+
+    def recordLock(self,
+            serialNum: str,
+            freqLO: float,
+            refAmplitude: float,
+            lockSB: int,
+            courseTune: int,
+            attempts: int
+        ) -> None:
+        """Record the parameters of a successful lock"""
+        with self.lock:
+            hint = self._findOrAdd(serialNum, freqLO)
+            hint.refAmplitude = refAmplitude
+            hint.lockSB = lockSB
+            hint.courseTune = courseTune
+            hint.locks += 1
+            self._count(hint, attempts)
+            self.saveCache()
+
+    def recordFailure(self, serialNum: str, freqLO: float, attempts: int) -> None:
+        """Record that setFrequency didn't lock.  The last good hint, if any, is kept"""
+        with self.lock:
+            hint = self._findOrAdd(serialNum, freqLO)
+            hint.failures += 1
+            self._count(hint, attempts)
+            self.saveCache()
+
+    def getStats(self, serialNum: str = None) -> list[LockStats]:
+        """Lock attempt statistics per frequency for one LO, or all of them"""
+        stats = []
+        with self.lock:
+            for key, hints in self.data.hints.items():
+                if serialNum is not None and key != serialNum:
+                    continue
+                for hint in hints:
+                    calls = hint.locks + hint.failures
+                    stats.append(LockStats(
+                        serialNum = key,
+                        freqLO = hint.freqLO,
+                        locks = hint.locks,
+                        failures = hint.failures,
+                        meanAttempts = hint.attempts / calls if calls else 0,
+                        lastAttempts = hint.lastAttempts,
+                        timeStamp = hint.timeStamp
+                    ))
+        return stats
+
+    def clear(self, serialNum: str = None) -> None:
+        """Forget the hints for one LO, or all of them"""
+        with self.lock:
+            if serialNum is None:
+                self.data.hints = {}
+            else:
+                self.data.hints.pop(serialNum, None)
+            self.saveCache()
+
+    def _find(self, serialNum: str, freqLO: float) -> LockHint | None:
+        for hint in self.data.hints.get(serialNum, []):
+            if abs(hint.freqLO - freqLO) < self.FREQ_RESOLUTION:
+                return hint
+        return None
+
+    def _findOrAdd(self, serialNum: str, freqLO: float) -> LockHint:
+        hint = self._find(serialNum, freqLO)
+        if hint is None:
+            # refAmplitude, lockSB and courseTune are not valid until locks > 0:
+            hint = LockHint(freqLO = freqLO, refAmplitude = 0, lockSB = 0, courseTune = 0)
+            hints = self.data.hints.setdefault(serialNum, [])
+            hints.append(hint)
+            hints.sort(key = lambda h: h.freqLO)
+        return hint
+
+    def _count(self, hint: LockHint, attempts: int) -> None:
+        hint.attempts += attempts
+        hint.lastAttempts = attempts
+        hint.timeStamp = datetime.now()
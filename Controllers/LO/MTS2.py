@@ -40,7 +40,8 @@ class LOControl(LOControl_Interface, SetFrequency_Mixin):
             self.loDevice, 
             self.refSynth, 
             LODevice.COLD_MULTIPLIERS[self.loDevice.band],
-            LODevice.WARM_MULTIPLIERS[self.loDevice.band]
+            LODevice.WARM_MULTIPLIERS[self.loDevice.band],
+            nodeAddr = nodeAddr
         )
         self.loDevice.setYTOLimits(ytoLowGHz, ytoHighGHz)
         self.polarization = polarization
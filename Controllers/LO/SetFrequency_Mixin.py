@@ -1,6 +1,7 @@
 from AMB.LODevice import LODevice
 from INSTR.SignalGenerator.Interface import SignalGenInterface
 from Controllers.schemas.LO import LOSettings
+from .LockHintCache import LockHintCache, LockStats
 
 class SetFrequency_Mixin():
     """ Shared implementation of set LO frequency is common to MTS1 and MTS2"""
@@ -9,33 +10,57 @@ class SetFrequency_Mixin():
             loDevice: LODevice,
             refSynth: SignalGenInterface,
             coldMultiplier: int,
-            warmMultiplier: int
+            warmMultiplier: int,
+            nodeAddr: int = 0,
+            serialNum: str = None
     ):
+        """
+        :param nodeAddr: AMB node address of the LO, for the LockHintCache key
+        :param serialNum: identifies the LO in the LockHintCache.  If not given, use the band and node address
+        """
         self.loDevice = loDevice
         self.refSynth = refSynth
         self.coldMultiplier = coldMultiplier
         self.warmMultiplier = warmMultiplier
+        self.lockHintKey = serialNum if serialNum else f"band{loDevice.band}:{nodeAddr:x}"
+        self.lockHints = LockHintCache()
+
+    def getLockStats(self) -> list[LockStats]:
+        return self.lockHints.getStats(self.lockHintKey)
 
     def setFrequency(self, 
             freqGHz: float,
             settings: LOSettings = None
         ) -> tuple[bool, str]:        
+        # start from the parameters which last locked at this frequency:
+        hint = None
+        if settings.lockLO and settings.useLockHints:
+            hint = self.lockHints.lookup(self.lockHintKey, freqGHz)
+        lockSB = settings.lockSBSelect
+        refAmplitude = settings.refAmplitude
+        if hint and settings.setReference:
+            # the sideband is only ours to choose when we also set the reference:
+            lockSB = hint.lockSB
+            refAmplitude = hint.refAmplitude
+            if settings.refAmplitudeMax is not None:
+                refAmplitude = min(refAmplitude, settings.refAmplitudeMax)
+
         if settings.setReference:
-            sign = 1 if settings.lockSBSelect == LODevice.LOCK_BELOW_REF else -1            
+            sign = 1 if lockSB == LODevice.LOCK_BELOW_REF else -1            
             if not self.refSynth.setFrequency((freqGHz / self.coldMultiplier + (settings.floogOffset * sign)) / self.warmMultiplier):
                 return False, "error setting synthesizer frequency"
-            if not self.refSynth.setAmplitude(settings.refAmplitude):
+            if not self.refSynth.setAmplitude(refAmplitude):
                 return False, "error setting synthesizer amplitude"
             if not self.refSynth.setRFOutput(True):
                 return False, "error enabling synthesizer output"
         self.loDevice.selectLoopBW(settings.loopBWSelect)
-        self.loDevice.selectLockSideband(settings.lockSBSelect)
+        self.loDevice.selectLockSideband(lockSB)
         
         # not locking LO:
         if not settings.lockLO:
             wcaFreq, ytoFreq, ytoCourse = self.loDevice.setFrequency(freqGHz)
             if wcaFreq == 0:
-                error = "frequency out of range"
+                return False, "frequency out of range"
             else:
                 self.loDevice.setNullLoopIntegrator(True)
                 return True, "tuned but not locked"
@@ -43,17 +68,27 @@ class SetFrequency_Mixin():
         # locking LO, loop increasing refAmplitude up to max:
         done = False
         error = False
-        refAmplitude = settings.refAmplitude        
+        attempts = 0
+        if hint:
+            # the lock search starts from the course tune which last locked:
+            wcaFreq, ytoFreq, ytoCourse = self.loDevice.setFrequency(freqGHz)
+            if wcaFreq != 0:
+                self.loDevice.setYTOCourseTune(hint.courseTune)
         while not done and not error:
-            wcaFreq, ytoFreq, ytoCourse = self.loDevice.lockPLL(freqGHz)
+            attempts += 1
+            if hint and attempts == 1:
+                wcaFreq, ytoFreq, ytoCourse = self.loDevice.lockPLL()
+            else:
+                wcaFreq, ytoFreq, ytoCourse = self.loDevice.lockPLL(freqGHz)
             if wcaFreq == 0:
                 # lock failed
                 if settings.setReference and settings.refAmplitudeMax is not None and refAmplitude < settings.refAmplitudeMax:
                     # Increase reference amplitude if configured:
                     refAmplitude += 1
-                    if not self.refSynth.setAmplitude(settings.refAmplitude):
+                    if not self.refSynth.setAmplitude(refAmplitude):
                         error = "error setting synthesizer amplitude"
                 else:
+                    self.lockHints.recordFailure(self.lockHintKey, freqGHz, attempts)
                     # set the zero integrator and warn:
                     wcaFreq, ytoFreq, ytoCourse = self.loDevice.setFrequency(freqGHz)
                     if wcaFreq == 0:
@@ -63,6 +98,7 @@ class SetFrequency_Mixin():
                         return True, "tuned but not locked"
             else:
                 self.loDevice.clearUnlockDetect()
+                self.lockHints.recordLock(self.lockHintKey, freqGHz, refAmplitude, lockSB, ytoCourse, attempts)
                 done = True
         if error:
             return False, error
@@ -47,6 +47,15 @@ class BinaryProbabilityDistribution():
         y_int = y_lower - slope * x_lower
         return y_int + slope * 0.5
 
+    def focus(self, lower: float, upper: float, weight: float) -> None:
+        # multiply the PDF between lower and upper by weight relative to outside:
+        if self.limits[0] < lower < self.limits[-1]:
+            self.split_at(lower, 1, weight)
+        else:
+            lower = self.limits[0]
+        if lower < upper < self.limits[-1]:
+            self.split_at(upper, 1, 1 / weight)
+
 
 class PBAController():
     """Probablistic Bisection Algorithm"""
@@ -64,13 +73,25 @@ class PBAController():
         self.max_iter = max_iter
         self.reset()
 
-    def reset(self):
+    FOCUS_WEIGHT = 10   # prior weight of the window around a warm-start output
+
+    def reset(self, initial: float = None, spread: float = None):
+        """Reset to start a new search
+
+        :param initial: optional warm-start output.  If not given, start in the middle of output_limits
+        :param spread: if given with initial, concentrate the prior within initial +/- spread
+        """
         self.p = 0.65
         self.q = 1 - self.p
         self.pdf = BinaryProbabilityDistribution(self.output_limits[0], self.output_limits[1])
         self.error = float_info.max
         self.best_error = self.error
-        self.output = (self.output_limits[0] + self.output_limits[1]) / 2
+        if initial is None:
+            self.output = (self.output_limits[0] + self.output_limits[1]) / 2
+        else:
+            self.output = min(max(initial, self.output_limits[0]), self.output_limits[1])
+            if spread:
+                self.pdf.focus(self.output - spread, self.output + spread, self.FOCUS_WEIGHT)
         self.best_output = self.output
         self.output = self.best_output
         self.last_errors = []
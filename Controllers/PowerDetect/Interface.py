@@ -47,4 +47,9 @@ class PowerDetect_Interface(ABC):
     @abstractmethod
     def zero(self) -> None:
         pass
+
+    @property
+    def sweep_time(self) -> float | None:
+        """Sweep time [s] for detectors which read a swept trace.  None for the others"""
+        return None
     
\ No newline at end of file
@@ -61,6 +61,11 @@ class PDSpecAn(PowerDetect_Interface):
         self._last_read = self.spectrumAnalyzer.read(delay = delay, **kwargs)
         return self._last_read
 
+    @property
+    def sweep_time(self) -> float:
+        """Sweep time [s] of the spectrum analyzer as currently configured"""
+        return self.spectrumAnalyzer.readSweepTime()
+
     @property
     def last_read(self) -> float | tuple[list[float], list[float]]:
         return self._last_read
@@ -3,6 +3,7 @@ import logging
 import yaml
 from pydantic import BaseModel
 from Controllers.RFSource.Interface import RFSource_Interface
+from Controllers.RFSource.RFOutputTable import rfOutputTable
 from Controllers.IFSystem.Interface import IFSystem_Interface
 from Controllers.PowerDetect.Interface import PowerDetect_Interface
 from Controllers.PBAController import PBAController
@@ -13,9 +14,12 @@ class RFAutoLevelSettings(BaseModel):
     max_iter: int = 15
     tolerance: float = 0.5   # dB
     sleep: float = 0.2
+    warmStart: bool = True          # seed the search from the RFOutputTable
+    warmStartSpread: float = 5      # % PA output around the warm-start value to search first
 
 class RFAutoLevel():
     SETTINGS_FILE = "Settings/Settings_RFAutoLevel.yaml"
+    RFOUTPUTTABLE_FILE = "Settings/RFOutputTable_RFAutoLevel.yaml"
 
     def __init__(self,
             ifSystem: IFSystem_Interface,
@@ -25,6 +29,7 @@ class RFAutoLevel():
         self.ifSystem = ifSystem
         self.powerDetect = powerDetect
         self.rfSrcDevice = rfSrcDevice
+        self.outputTable = rfOutputTable(self.RFOUTPUTTABLE_FILE)
         self.loadSettings()
         self.controller = PBAController(
             tolerance = self.settings.tolerance,
@@ -49,14 +54,28 @@ class RFAutoLevel():
     def autoLevel(self, 
             freqIF: float, 
             targetLevel: float,
-            powerDetect: PowerDetect_Interface = None
+            powerDetect: PowerDetect_Interface = None,
+            freqRF: float = None
         ) -> tuple[bool, str]:
+        """Set the RF source PA output to give targetLevel at the IF
 
+        :param freqRF: if given, start from the PA output learned for this RF, IF and target level
+            and record the result
+        """
         if not powerDetect:
             powerDetect = self.powerDetect
 
         self.loadSettings()
-        self.controller.reset()
+        # one RF source PA per RFAutoLevel so the table is keyed by configuration only:
+        configId = self.rfSrcDevice.getConfig()
+        initial = None
+        if self.settings.warmStart and freqRF is not None:
+            initial = self.outputTable.lookup(configId, 0, freqRF, targetLevel, freqIF)
+        if initial is not None:
+            self.logger.info(f"RF autoLevel: warm start setValue={initial:.2f}% at RF={freqRF} GHz")
+            self.controller.reset(initial, self.settings.warmStartSpread)
+        else:
+            self.controller.reset()
         self.controller.setpoint = targetLevel        
         self.ifSystem.frequency = freqIF
         
@@ -72,11 +91,15 @@ class RFAutoLevel():
             msg = "RF autolevel: powerDetect.read error before loop"
         
         while not done and not error: 
-            self.logger.info(f"RF autoLevel: iter={self.controller.iter} setValue={self.controller.output:.2f}% amp={amp:.1f} dBm")
+            # the output which gave amp:
+            applied = self.controller.output
+            self.logger.info(f"RF autoLevel: iter={self.controller.iter} setValue={applied:.2f}% amp={amp:.1f} dBm")
             setValue = self.controller.process(amp)
             if self.controller.done and not self.controller.fail:
-                msg = f"RF autoLevel: success amp={amp:.1f} dBm"
+                msg = f"RF autoLevel: success amp={amp:.1f} dBm iter={self.controller.iter}"
                 done = True
+                if freqRF is not None:
+                    self.outputTable.record(configId, 0, freqRF, targetLevel, applied, freqIF, self.controller.iter)
             elif self.controller.fail:
                 msg = f"RF autoLevel: fail iter={self.controller.iter} max_iter={self.settings.max_iter} setValue={self.controller.output:.2f}%"
                 error = True
@@ -90,7 +113,7 @@ class RFAutoLevel():
             
         if error:
             self.logger.error(msg)
-            return error, msg
+            return False, msg
         elif msg:
             self.logger.info(msg)
             return True, ""
@@ -62,7 +62,7 @@ class RFSource(RFSource_Interface, LODevice):
         self.setPABias(1, gateVoltage = self.config.VGp1)
 
     def getConfig(self) -> int:
-        return self.configId
+        return self.config.key if self.config is not None else 0
 
     def connected(self) -> bool:
         return super().connected()
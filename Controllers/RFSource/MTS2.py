@@ -6,6 +6,7 @@ from pydantic import BaseModel
 from simple_pid import PID
 from app_Common.CTSDB import CTSDB
 from .Interface import RFSource_Interface, AutoRFStatus
+from .RFOutputTable import rfOutputTable
 from Controllers.PowerDetect.Interface import PowerDetect_Interface
 from Controllers.schemas.DeviceInfo import DeviceInfo
 from Controllers.schemas.LO import LOSettings
@@ -22,6 +23,7 @@ class PIDSettings(BaseModel):
     maxIter: int = 15
     tolerance: float = 0.75 # dB
     iterSleep: float = 0.2
+    warmStart: bool = True  # start from the RFOutputTable rather than the last output
 
 class SidebandSourceSettings(BaseModel):
     wcaConfig: WCA = WCA()
@@ -31,6 +33,7 @@ class SidebandSourceSettings(BaseModel):
 class SidebandSource(RFSource_Interface):
 
     RFSRC_SETTINGS = "Settings/Settings_SidebandSource.yaml"
+    RFOUTPUTTABLE_FILE = "Settings/RFOutputTable_SidebandSource.yaml"
 
     def __init__(self,
             conn: AMBConnectionItf,
@@ -48,6 +51,7 @@ class SidebandSource(RFSource_Interface):
             last_output = 15
         )
         self.pid = None
+        self.outputTable = rfOutputTable(self.RFOUTPUTTABLE_FILE)
         self.coldMultiplier = LODevice.COLD_MULTIPLIERS[self.loDevice.band]
         self.warmMultiplier = LODevice.WARM_MULTIPLIERS[self.loDevice.band]        
         self.loadSettings()
@@ -163,6 +167,12 @@ class SidebandSource(RFSource_Interface):
 
         self.loadSettings()
         self.autoRFStatus.is_active = True
+        freqRF = self.pll['loFreqGHz']
+        if self.config.autoRFSettings.warmStart and not reinitialize and freqRF:
+            initial = self.outputTable.lookup(self.getConfig(), self.polarization, freqRF, targetSBPower)
+            if initial is not None:
+                self.logger.info(f"SidebandSource.autoRFPower: warm start {initial:.2f} % at {freqRF} GHz")
+                self.autoRFStatus.last_output = initial
         self.setOutputPower(self.autoRFStatus.last_output)
         time.sleep(self.config.autoRFSettings.iterSleep)
         
@@ -203,6 +213,8 @@ class SidebandSource(RFSource_Interface):
                 self.autoRFStatus.last_measured = powerDetect.read()
                 if abs(self.autoRFStatus.last_measured - targetSBPower) < tolerance:
                     success = True
+                    if freqRF:
+                        self.outputTable.record(self.getConfig(), self.polarization, freqRF, targetSBPower, control, iterations = iter)
                 msg = f"SidebandSource.autoRFPower: iter:{iter} control:{control:.2f} %, powerLevel:{self.autoRFStatus.last_measured} dBm"
                 self.logger.info(msg)
 
@@ -0,0 +1,150 @@
+import logging
+import os
+import threading
+import yaml
+from datetime import datetime
+from pydantic import BaseModel
+from typing import Optional
+
+class RFOutputPoint(BaseModel):
+    freqRF: float               # GHz
+    freqIF: float = 0           # GHz.  0 if the source is leveled without reference to an IF
+    targetLevel: float          # dBm
+    paOutput: float             # %
+    iterations: int = 0         # controller iterations it took to converge
+    timeStamp: Optional[datetime] = None
+
+class RFOutputTableData(BaseModel):
+    # keyed by "configId/pol" of the RF source:
+    points: dict[str, list[RFOutputPoint]] = {}
+
+class RFOutputTable():
+    """Persisted table of RF source PA output settings which reached the target level
+
+    Keyed by source configuration and pol, then RF frequency, IF frequency and target level.
+    lookup() interpolates in RF frequency between the recorded points nearest the requested
+    IF frequency and target level.
+    """
+    RFOUTPUTTABLE_FILE = "Settings/RFOutputTable.yaml"
+    FREQ_RESOLUTION = 0.01      # GHz.  Points closer than this are the same frequency
+    RF_WINDOW = 2.0             # GHz.  Only use points within this of the requested RF
+    IF_WINDOW = 1.0             # GHz.  Only use points within this of the requested IF
+    LEVEL_WINDOW = 2.0          # dB.  Only use points with target level within this of the requested
+
+    def __init__(self, fileName: str = None):
+        self.logger = logging.getLogger("ALMAFE-CTS-Control")
+        self.fileName = fileName if fileName else self.RFOUTPUTTABLE_FILE
+        self.lock = threading.Lock()
+        self.loadTable()
+
+    def loadTable(self) -> None:
+        try:
+            with open(self.fileName, "r") as f:
+                d = yaml.safe_load(f)
+                self.data = RFOutputTableData.model_validate(d)
+        except Exception as e:
+            self.data = RFOutputTableData()
+
+    def saveTable(self) -> None:
+        try:
+            with open(self.fileName, "w") as f:
+                yaml.dump(self.data.model_dump(), f)
+        except Exception as e:
+            self.logger.error(f"RFOutputTable.saveTable: {e}")
+
+    def record(self,
+            configId: int,
+            pol: int,
+            freqRF: float,
+            targetLevel: float,
+            paOutput: float,
+            freqIF: float = 0,
+            iterations: int = 0
+        ) -> None:
+        """Record a PA output which reached the target level, replacing any for the same RF, IF and target level"""
+        point = RFOutputPoint(
+            freqRF = freqRF,
+            freqIF = freqIF,
+            targetLevel = targetLevel,
+            paOutput = paOutput,
+            iterations = iterations,
+            timeStamp = datetime.now()
+        )
+        with self.lock:
+            points = self.data.points.setdefault(self._key(configId, pol), [])
+            points[:] = [p for p in points if not self._samePoint(p, point)]
+            points.append(point)
+            points.sort(key = lambda p: p.freqRF)
+            self.saveTable()
+
+    def lookup(self,
+            configId: int,
+            pol: int,
+            freqRF: float,
+            targetLevel: float,
+            freqIF: float = 0
+        ) -> float | None:
+        """Starting PA output for the given RF frequency, target level and IF frequency
+
+        :return PA output % or None if there are no recorded points near enough
+        """
+        with self.lock:
+            points = self.data.points.get(self._key(configId, pol), [])
+            # for each recorded RF frequency, the point nearest the requested IF and target level:
+            nearest = {}
+            for p in points:
+                dIF = abs(p.freqIF - freqIF)
+                dLevel = abs(p.targetLevel - targetLevel)
+                if dIF > self.IF_WINDOW or dLevel > self.LEVEL_WINDOW:
+                    continue
+                distance = dIF / self.IF_WINDOW + dLevel / self.LEVEL_WINDOW
+                freq = round(p.freqRF / self.FREQ_RESOLUTION)
+                if freq not in nearest or distance < nearest[freq][0]:
+                    nearest[freq] = (distance, p)
+        candidates = sorted((p for _, p in nearest.values()), key = lambda p: p.freqRF)
+        below = [p for p in candidates if freqRF - self.RF_WINDOW <= p.freqRF <= freqRF + self.FREQ_RESOLUTION / 2]
+        above = [p for p in candidates if freqRF - self.FREQ_RESOLUTION / 2 <= p.freqRF <= freqRF + self.RF_WINDOW]
+        if below and above:
+            lo, hi = below[-1], above[0]
+            if hi.freqRF - lo.freqRF < self.FREQ_RESOLUTION:
+                return lo.paOutput
+            return lo.paOutput + (hi.paOutput - lo.paOutput) * (freqRF - lo.freqRF) / (hi.freqRF - lo.freqRF)
+        elif below:
+            return below[-1].paOutput
+        elif above:
+            return above[0].paOutput
+        return None
+
+    def clear(self, configId: int = None) -> None:
+        """Forget the recorded points for a configuration, or all of them"""
+        with self.lock:
+            if configId is None:
+                self.data.points = {}
+            else:
+                prefix = f"{configId}/"
+                self.data.points = {k: v for k, v in self.data.points.items() if not k.startswith(prefix)}
+            self.saveTable()
+
+    def _key(self, configId: int, pol: int) -> str:
+        return f"{configId}/{pol}"
+
+    def _samePoint(self, a: RFOutputPoint, b: RFOutputPoint) -> bool:
+        return abs(a.freqRF - b.freqRF) < self.FREQ_RESOLUTION \
+            and abs(a.freqIF - b.freqIF) < self.FREQ_RESOLUTION \
+            and abs(a.targetLevel - b.targetLevel) < 0.05
+
+def rfOutputTable(fileName: str = None) -> RFOutputTable:
+    '''
+    test and if necessary create the RFOutputTable object shared by all users of fileName
+    so that their record()s don't overwrite each other in the file
+    '''
+    key = os.path.abspath(fileName if fileName else RFOutputTable.RFOUTPUTTABLE_FILE)
+    with rfOutputTable.lock:
+        try:
+            return rfOutputTable.tables[key]
+        except KeyError:
+            rfOutputTable.tables[key] = RFOutputTable(fileName)
+            return rfOutputTable.tables[key]
+
+rfOutputTable.tables = {}
+rfOutputTable.lock = threading.Lock()
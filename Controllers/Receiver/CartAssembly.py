@@ -19,6 +19,7 @@ from DBBand6Cart.PreampParams import PreampParams, PreampParam
 from ..PBAController import PBAController
 from INSTR.SignalGenerator.Interface import SignalGenInterface
 from .Interface import Receiver_Interface, AutoLOStatus, SelectSIS
+from .LOPowerMap import LOPowerMap
 from Controllers.schemas.LO import LOSettings
 
 class CartAssemblySettings(BaseModel):
@@ -28,6 +29,9 @@ class CartAssemblySettings(BaseModel):
     max_iter: int = 15
     tolerance: float = 0.5   # uA
     sleep: float = 0.2
+    interleavePols: bool = True     # level pol0 and pol1 in lockstep
+    warmStart: bool = True          # seed autoLOPower from the LOPowerMap
+    warmStartSpread: float = 5      # % PA output around the warm-start value to search first
     freqLOGHz: float = 0
     loConfig: WCA = WCA()
     loSettings: LOSettings = LOSettings()
@@ -41,12 +45,7 @@ class CartAssembly(Receiver_Interface):
         self.loDevice = loDevice
         self.reset()
         self.loadSettings()
-        self.controller = PBAController(
-            tolerance = self.settings.tolerance,
-            output_limits = (self.settings.min_percent, self.settings.max_percent),
-            min_resolution = 0.0005,
-            max_iter = self.settings.max_iter
-        )
+        self.loPowerMap = LOPowerMap()
         
     def reset(self):
         self.configId = self.keysPol0 = self.keysPol1 = None
@@ -219,70 +218,105 @@ class CartAssembly(Receiver_Interface):
             return True, ""
 
         if kwargs.get('on_thread', False):
-            threading.Thread(target = self._autoLOPowerSequence, args = (pol0, pol1), daemon = True).start()
+            threading.Thread(target = self._autoLOPowerSequence, args = (pol0, pol1, reinitialize), daemon = True).start()
             return True, ""
         else:
             return self._autoLOPowerSequence(pol0, pol1, reinitialize)
 
     def _autoLOPowerSequence(self, pol0: bool, pol1: bool, reinitialize: bool) -> tuple[bool, str]:
-        success0 = success1 = True
-        msg0 = msg1 = ""
-        self.autoLOStatus.is_active = True        
+        targets = {}
         if pol0:
-            self.autoLOStatus.polarization = 0
-            success0, msg0 = self._autoLOPower(0, self.mixerParam01.IJ)
+            targets[0] = self.mixerParam01.IJ
         if pol1:
-            self.autoLOStatus.polarization = 1
-            success1, msg1 = self._autoLOPower(1, self.mixerParam11.IJ)
+            targets[1] = self.mixerParam11.IJ
+        self.autoLOStatus.is_active = True
+        if self.settings.interleavePols:
+            # level both pols in lockstep:
+            self.autoLOStatus.polarization = None if len(targets) > 1 else next(iter(targets))
+            results = self._autoLOPowerPols(targets, reinitialize)
+        else:
+            results = {}
+            for pol, targetIJ in targets.items():
+                self.autoLOStatus.polarization = pol
+                results |= self._autoLOPowerPols({pol: targetIJ}, reinitialize)
         self.autoLOStatus.is_active = None
-        return success0 & success1, msg0 + " " + msg1
+        success = all(success for success, _ in results.values())
+        return success, " ".join(msg for _, msg in results.values() if msg)
 
-    def _autoLOPower(self, pol, targetIJ = None) -> tuple[bool, str]:
+    def _autoLOPower(self, pol, targetIJ = None, reinitialize: bool = False) -> tuple[bool, str]:
         if targetIJ is None:
             try:
-                targetIJ = abs(self.mixerParam01.IJ if pol == 0 else self.mixerParam11.IJ)
+                targetIJ = self.mixerParam01.IJ if pol == 0 else self.mixerParam11.IJ
             except:
                 return False, "CartAssembly._autoLOPower bias not available"
-        
-        self.logger.info(f"CartAssembly._autoLOPower: pol{pol} target Ij={targetIJ}")
-        
-        averaging = 2
-        self.controller.reset()
-        self.controller.setpoint = targetIJ
-        paOutput = self.controller.output
-        self.loDevice.setPAOutput(pol, paOutput)
-        time.sleep(self.settings.sleep)
-        sis = self.ccaDevice.getSIS(pol, sis = 1, averaging = averaging)
-        if sis is None:
-            return False, f"Error getting SIS bias readings for pol{pol}"
+        return self._autoLOPowerPols({pol: targetIJ}, reinitialize)[pol]
 
-        sisCurrent = abs(sis['Ij'])
+    def _autoLOPowerPols(self, targets: dict[int, float], reinitialize: bool = False) -> dict[int, tuple[bool, str]]:
+        """Level the LO power for one or more pols
 
-        done = error = False
-        msg = ""
+        Each pol has its own controller.  On each iteration all the PA outputs are written,
+        then one settle delay, then all the SIS currents are read and the controllers updated.
+        :param targets: target Ij for each pol to level
+        :return dict of pol: (success, msg)
+        """
+        averaging = 2
+        freqLO = self.settings.freqLOGHz
+        controllers = {}
+        for pol, targetIJ in targets.items():
+            targetIJ = abs(targetIJ)
+            self.logger.info(f"CartAssembly._autoLOPower: pol{pol} target Ij={targetIJ}")
+            controller = self._makeController()
+            initial = None
+            if self.settings.warmStart and not reinitialize:
+                initial = self.loPowerMap.lookup(self.configId, pol, freqLO, targetIJ)
+            if initial is not None:
+                self.logger.info(f"CartAssembly._autoLOPower: pol{pol} warm start PA={initial:.1f} % at {freqLO} GHz")
+                controller.reset(initial, self.settings.warmStartSpread)
+            controller.setpoint = targetIJ
+            controllers[pol] = controller
+            self.loDevice.setPAOutput(pol, controller.output)
 
-        while not done and not error:
-            self.logger.info(f"CartAssembly.autoLOPower iter={self.controller.iter} PA={self.controller.output:.1f} % Ij={sisCurrent:.3f} uA")
-            paOutput = self.controller.process(sisCurrent)
-            if self.controller.done and not self.controller.fail:
-                msg = f"CartAssembly.autoLOPower: success Ij={sisCurrent:.3f} uA"
-                done = True
-            elif self.controller.fail:
-                msg = f"CartAssembly.autoLOPower: fail iter={self.controller.iter} max_iter={self.settings.max_iter} setValue={paOutput:.2f} %"
-                error = True
-            else:
-                self.loDevice.setPAOutput(pol, paOutput)
-                time.sleep(self.settings.sleep)
+        results = {}
+        while len(results) < len(controllers):
+            time.sleep(self.settings.sleep)
+            # read all the SIS currents before changing any PA output:
+            sisCurrents = {}
+            for pol in controllers:
+                if pol in results:
+                    continue
                 sis = self.ccaDevice.getSIS(pol, sis = 1, averaging = averaging)
-                sisCurrent = abs(sis['Ij'])
+                if sis is None:
+                    msg = f"Error getting SIS bias readings for pol{pol}"
+                    self.logger.error(msg)
+                    results[pol] = (False, msg)
+                else:
+                    sisCurrents[pol] = abs(sis['Ij'])
+            for pol, sisCurrent in sisCurrents.items():
+                controller = controllers[pol]
+                # the PA output which gave sisCurrent:
+                applied = controller.output
+                self.logger.info(f"CartAssembly.autoLOPower pol{pol} iter={controller.iter} PA={applied:.1f} % Ij={sisCurrent:.3f} uA")
+                paOutput = controller.process(sisCurrent)
+                if controller.done and not controller.fail:
+                    self.logger.info(f"CartAssembly.autoLOPower: pol{pol} success Ij={sisCurrent:.3f} uA iter={controller.iter}")
+                    self.loPowerMap.record(self.configId, pol, freqLO, controller.setpoint, applied, controller.iter)
+                    results[pol] = (True, "")
+                elif controller.fail:
+                    msg = f"CartAssembly.autoLOPower: pol{pol} fail iter={controller.iter} max_iter={self.settings.max_iter} setValue={paOutput:.2f} %"
+                    self.logger.error(msg)
+                    results[pol] = (False, msg)
+                else:
+                    self.loDevice.setPAOutput(pol, paOutput)
+        return {pol: results[pol] for pol in targets}
+
+    def _makeController(self) -> PBAController:
+        return PBAController(
+            tolerance = self.settings.tolerance,
+            output_limits = (self.settings.min_percent, self.settings.max_percent),
+            min_resolution = 0.0005,
+            max_iter = self.settings.max_iter
+        )
 
-        if error:
-            self.logger.error(msg)
-            return error, msg
-        elif msg:
-            self.logger.info(msg)
-            return True, ""
-    
     def getAutoLOStatus(self) -> AutoLOStatus:
         return self.autoLOStatus
 
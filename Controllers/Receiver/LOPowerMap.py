@@ -0,0 +1,112 @@
+import logging
+import threading
+import yaml
+from datetime import datetime
+from pydantic import BaseModel
+from typing import Optional
+
+class PAOutputPoint(BaseModel):
+    freqLO: float               # GHz
+    targetIJ: float             # uA
+    paOutput: float             # %
+    iterations: int = 0         # controller iterations it took to converge
+    timeStamp: Optional[datetime] = None
+
+class LOPowerMapData(BaseModel):
+    # keyed by "configId/pol":
+    points: dict[str, list[PAOutputPoint]] = {}
+
+class LOPowerMap():
+    """Persisted map of converged LO PA output settings for warm-starting autoLOPower
+
+    Records the PA output which gave the target SIS current, keyed by cartridge configuration,
+    pol, LO frequency and target Ij.  lookup() interpolates in LO frequency between recorded
+    points having a target Ij close to the requested one.
+    """
+    LOPOWERMAP_FILE = "Settings/LOPowerMap_CartAssembly.yaml"
+    FREQ_RESOLUTION = 0.01      # GHz.  Points closer than this are the same frequency
+    IJ_WINDOW = 2.0             # uA.  Only use points with target Ij within this of the requested
+    MAX_EXTRAPOLATE = 2.0       # GHz.  Use the nearest point if outside the recorded range by up to this much
+
+    def __init__(self, fileName: str = None):
+        self.logger = logging.getLogger("ALMAFE-CTS-Control")
+        self.fileName = fileName if fileName else self.LOPOWERMAP_FILE
+        self.lock = threading.Lock()
+        self.loadMap()
+
+    def loadMap(self) -> None:
+        try:
+            with open(self.fileName, "r") as f:
+                d = yaml.safe_load(f)
+                self.data = LOPowerMapData.model_validate(d)
+        except Exception as e:
+            self.data = LOPowerMapData()
+
+    def saveMap(self) -> None:
+        try:
+            with open(self.fileName, "w") as f:
+                yaml.dump(self.data.model_dump(), f)
+        except Exception as e:
+            self.logger.error(f"LOPowerMap.saveMap: {e}")
+
+    def record(self, configId: int, pol: int, freqLO: float, targetIJ: float, paOutput: float, iterations: int = 0) -> None:
+        """Record a converged PA output, replacing any point at the same frequency and target Ij"""
+        point = PAOutputPoint(
+            freqLO = freqLO,
+            targetIJ = abs(targetIJ),
+            paOutput = paOutput,
+            iterations = iterations,
+            timeStamp = datetime.now()
+        )
+        with self.lock:
+            points = self.data.points.setdefault(self._key(configId, pol), [])
+            points[:] = [p for p in points if not self._samePoint(p, point)]
+            points.append(point)
+            points.sort(key = lambda p: p.freqLO)
+            self.saveMap()
+
+    def lookup(self, configId: int, pol: int, freqLO: float, targetIJ: float) -> float | None:
+        """Starting PA output for the given LO frequency and target Ij
+
+        :return PA output % or None if there are no recorded points near enough
+        """
+        targetIJ = abs(targetIJ)
+        with self.lock:
+            points = self.data.points.get(self._key(configId, pol), [])
+            # for each recorded frequency, the point with target Ij closest to the requested:
+            nearest = {}
+            for p in points:
+                if abs(p.targetIJ - targetIJ) <= self.IJ_WINDOW:
+                    freq = round(p.freqLO / self.FREQ_RESOLUTION)
+                    if freq not in nearest or abs(p.targetIJ - targetIJ) < abs(nearest[freq].targetIJ - targetIJ):
+                        nearest[freq] = p
+        if not nearest:
+            return None
+        candidates = sorted(nearest.values(), key = lambda p: p.freqLO)
+        below = [p for p in candidates if p.freqLO <= freqLO + self.FREQ_RESOLUTION / 2]
+        above = [p for p in candidates if p.freqLO >= freqLO - self.FREQ_RESOLUTION / 2]
+        if below and above:
+            lo, hi = below[-1], above[0]
+            if hi.freqLO - lo.freqLO < self.FREQ_RESOLUTION:
+                return lo.paOutput
+            return lo.paOutput + (hi.paOutput - lo.paOutput) * (freqLO - lo.freqLO) / (hi.freqLO - lo.freqLO)
+        nearestPoint = below[-1] if below else above[0]
+        if abs(nearestPoint.freqLO - freqLO) <= self.MAX_EXTRAPOLATE:
+            return nearestPoint.paOutput
+        return None
+
+    def clear(self, configId: int = None) -> None:
+        """Forget the recorded points for a configuration, or all of them"""
+        with self.lock:
+            if configId is None:
+                self.data.points = {}
+            else:
+                prefix = f"{configId}/"
+                self.data.points = {k: v for k, v in self.data.points.items() if not k.startswith(prefix)}
+            self.saveMap()
+
+    def _key(self, configId: int, pol: int) -> str:
+        return f"{configId}/{pol}"
+
+    def _samePoint(self, a: PAOutputPoint, b: PAOutputPoint) -> bool:
+        return abs(a.freqLO - b.freqLO) < self.FREQ_RESOLUTION and abs(a.targetIJ - b.targetIJ) < 0.05
@@ -0,0 +1,125 @@
+import functools
+import logging
+import threading
+import time
+from datetime import datetime
+from pydantic import BaseModel
+from typing import Any, Optional
+from Measure.Shared.RingBuffer import RingBuffer
+
+class TemperatureReading(BaseModel):
+    timeStamp: datetime
+    temps: list[Optional[float]]
+    errors: list
+
+class TemperatureHistory(BaseModel):
+    items: list[TemperatureReading] = []
+    lastSeq: int = 0
+
+class TemperaturePoller():
+    """Reads all channels of the temperature monitor on a fixed cadence and serves reads from the cache
+
+    Drop-in for the TemperatureMonitor: readSingle() and readAll() return the cached values if
+    they are younger than maxAge and only read the instrument if the poller has fallen behind or
+    is not running.  getCached() never reads the instrument and also returns the data age.
+    Everything else is passed through to the monitor, with method calls serialized with the polls.
+    """
+    INTERVAL = 2.0              # seconds between polls
+    MAX_AGE = 10.0              # seconds.  Read the instrument if the cache is older than this
+    HISTORY_CAPACITY = 7200     # readings kept for the UI.  4 hours at the default interval
+
+    def __init__(self,
+            monitor,
+            interval: float = None,
+            maxAge: float = None,
+            historyCapacity: int = None
+        ):
+        """
+        :param monitor: TemperatureMonitor or TemperatureMonitorSimulator
+        """
+        self.logger = logging.getLogger("ALMAFE-CTS-Control")
+        self.monitor = monitor
+        self.interval = interval if interval else self.INTERVAL
+        self.maxAge = maxAge if maxAge else self.MAX_AGE
+        self.history = RingBuffer(historyCapacity if historyCapacity else self.HISTORY_CAPACITY)
+        self.ioLock = threading.Lock()
+        self.latest = None
+        self.stopEvent = threading.Event()
+        self.thread = None
+
+    def __getattr__(self, name: str) -> Any:
+        # only called for attributes not found on the poller:
+        attr = getattr(self.__dict__['monitor'], name)
+        if not callable(attr):
+            return attr
+        # methods may do I/O, so serialize them with the polling thread:
+        @functools.wraps(attr)
+        def locked(*args, **kwargs):
+            with self.ioLock:
+                return attr(*args, **kwargs)
+        return locked
+
+    def start(self) -> None:
+        if self.thread is None or not self.thread.is_alive():
+            self.stopEvent.clear()
+            self.thread = threading.Thread(target = self._run, name = "TemperaturePoller", daemon = True)
+            self.thread.start()
+
+    def stop(self) -> None:
+        self.stopEvent.set()
+        if self.thread is not None:
+            self.thread.join()
+        self.thread = None
+
+    def poll(self) -> TemperatureReading:
+        """Read all channels from the instrument and update the cache and history"""
+        with self.ioLock:
+            temps, errors = self.monitor.readAll()
+        reading = TemperatureReading(timeStamp = datetime.now(), temps = temps, errors = errors)
+        self.latest = reading
+        self.history.append(reading)
+        return reading
+
+    def age(self) -> Optional[float]:
+        """Seconds since the latest reading, or None if there hasn't been one"""
+        latest = self.latest
+        return (datetime.now() - latest.timeStamp).total_seconds() if latest else None
+
+    def getCached(self, sensor: int) -> tuple[Optional[float], Optional[int], Optional[float]]:
+        """The latest reading for a sensor without reading the instrument
+
+        :param sensor: 1-based sensor number
+        :return (temp, err, age seconds) or (None, None, None) if there is no reading
+        """
+        latest = self.latest
+        if latest is None or not 0 < sensor <= len(latest.temps):
+            return None, None, None
+        return latest.temps[sensor - 1], latest.errors[sensor - 1], self.age()
+
+    def readSingle(self, sensor: int) -> tuple[float, int]:
+        temp, err, age = self.getCached(sensor)
+        if temp is not None and age <= self.maxAge:
+            return temp, err
+        with self.ioLock:
+            return self.monitor.readSingle(sensor)
+
+    def readAll(self) -> tuple[list[float], list[int]]:
+        latest = self.latest
+        if latest is None or self.age() > self.maxAge:
+            latest = self.poll()
+        return latest.temps, latest.errors
+
+    def _run(self) -> None:
+        nextTime = time.monotonic()
+        while not self.stopEvent.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                self.logger.error(f"TemperaturePoller: {e}")
+            # don't try to catch up if a read took longer than the interval:
+            nextTime = max(nextTime + self.interval, time.monotonic())
+            self.stopEvent.wait(max(0, nextTime - time.monotonic()))
+
+    def getHistory(self, since: int = 0) -> TemperatureHistory:
+        items, lastSeq = self.history.since(since)
+        return TemperatureHistory(items = items, lastSeq = lastSeq)
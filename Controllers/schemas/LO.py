@@ -54,6 +54,7 @@ class LOSettings(BaseModel):
     floogOffset: float = 0.01       # GHz
     loopBWSelect: int = LODevice.LOOPBW_ALT     # 15 MHz/V
     lockSBSelect: int = LODevice.LOCK_BELOW_REF
+    useLockHints: bool = True       # start from the parameters which last locked at the frequency
 
 class AdjustPLL(BaseModel):
     '''
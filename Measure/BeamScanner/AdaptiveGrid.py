@@ -0,0 +1,186 @@
+import numpy as np
+from pydantic import BaseModel
+
+class AdaptiveReport(BaseModel):
+    """Interpolation quality of an adaptive-resolution subscan"""
+    key: int = 0                    # keyBeamPattern
+    rows: int = 0                   # rows in the output grid
+    coarseRows: int = 0             # measured in the coarse pass
+    denseRows: int = 0              # measured in the refine pass
+    interpolatedRows: int = 0       # not measured.  Interpolated from the measured rows either side
+    interpolated: list[int] = []    # indexes of the interpolated rows
+    validationRows: int = 0         # dense rows compared against interpolation from the coarse rows
+    ampErrorRms: float = 0          # dB.  Coarse interpolation vs measured, over the validation rows above the floor
+    ampErrorMax: float = 0          # dB
+    phaseErrorRms: float = 0        # deg
+    phaseErrorMax: float = 0        # deg
+    ampErrorBound: float = 0        # dB.  Estimated worst error of the interpolated rows, from coarse second differences
+
+    def getText(self) -> str:
+        return f"rows:{self.rows} coarse:{self.coarseRows} dense:{self.denseRows} interpolated:{self.interpolatedRows} " \
+            f"validation amp rms/max:{self.ampErrorRms:.2f}/{self.ampErrorMax:.2f} dB " \
+            f"phase rms/max:{self.phaseErrorRms:.1f}/{self.phaseErrorMax:.1f} deg " \
+            f"bound:{self.ampErrorBound:.2f} dB"
+
+class AdaptiveGrid():
+    """Coarse-to-fine row selection and merging for one subscan
+
+    Rows are indexes into the subscan's y axis list.  The coarse pass measures every
+    coarseFactor'th row plus the last.  Between two coarse rows, the rows are refined
+    if anywhere above the amplitude floor the amplitude or phase changes by more than the
+    thresholds.  Rows which are not measured are interpolated linearly in y on the
+    complex field between the nearest measured rows.
+    """
+    def __init__(self,
+            numRows: int,
+            numCols: int,
+            coarseFactor: int = 4,
+            ampThreshold: float = 3.0,
+            phaseThreshold: float = 30.0,
+            ampFloor: float = -50.0
+        ):
+        """
+        :param numRows: length of the y axis list
+        :param numCols: points per row
+        :param coarseFactor: coarse pass row spacing, in rows
+        :param ampThreshold: dB.  Refine between coarse rows differing by more than this
+        :param phaseThreshold: deg.  Refine between coarse rows differing by more than this
+        :param ampFloor: dB relative to the peak.  Points below this never cause refinement
+        """
+        self.numRows = numRows
+        self.numCols = numCols
+        self.coarseFactor = max(1, int(coarseFactor))
+        self.ampThreshold = ampThreshold
+        self.phaseThreshold = phaseThreshold
+        self.ampFloor = ampFloor
+        self.amplitude = np.full((numRows, numCols), np.nan, dtype = np.float32)
+        self.phase = np.full((numRows, numCols), np.nan, dtype = np.float32)
+        self.measured = np.zeros(numRows, dtype = bool)
+        self.coarse = self.coarseRows()
+        self.dense = []
+
+    def coarseRows(self) -> list[int]:
+        rows = list(range(0, self.numRows, self.coarseFactor))
+        if rows and rows[-1] != self.numRows - 1:
+            rows.append(self.numRows - 1)
+        return rows
+
+    def addRow(self, rowIndex: int, amplitude: list[float], phase: list[float], reverseX: bool = False) -> None:
+        """Store a measured row.  Traces from reversed rows are stored in forward x order"""
+        amp = np.asarray(amplitude, dtype = np.float32)[:self.numCols]
+        pha = np.asarray(phase, dtype = np.float32)[:self.numCols]
+        if reverseX:
+            amp, pha = amp[::-1], pha[::-1]
+        self.amplitude[rowIndex, :len(amp)] = amp
+        self.phase[rowIndex, :len(pha)] = pha
+        self.measured[rowIndex] = True
+
+    def refineRows(self) -> list[int]:
+        """The rows to measure in the refine pass, from the coarse rows measured so far"""
+        coarse = [row for row in self.coarse if self.measured[row]]
+        if not coarse:
+            return []
+        floor = np.nanmax(self.amplitude[coarse]) + self.ampFloor
+        rows = []
+        for a, b in zip(coarse, coarse[1:]):
+            if b - a < 2:
+                continue
+            ampA, ampB = self.amplitude[a], self.amplitude[b]
+            mask = (ampA > floor) | (ampB > floor)
+            if not mask.any():
+                continue
+            dAmp = np.nanmax(np.abs(ampA[mask] - ampB[mask]))
+            dPhase = np.nanmax(np.abs(self._wrap(self.phase[a][mask] - self.phase[b][mask])))
+            if dAmp > self.ampThreshold or dPhase > self.phaseThreshold:
+                rows.extend(range(a + 1, b))
+        self.dense = rows
+        return rows
+
+    def merge(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Fill the unmeasured rows by interpolation between the nearest measured rows
+
+        :return (amplitude dB, phase deg, measured) where measured is the per-row mask
+        """
+        amplitude = self.amplitude.copy()
+        phase = self.phase.copy()
+        rows = np.flatnonzero(self.measured)
+        for row in np.flatnonzero(~self.measured):
+            amplitude[row], phase[row] = self._interpolate(row, rows)
+        return amplitude, phase, self.measured.copy()
+
+    def interpolatedRows(self) -> list[int]:
+        return [int(row) for row in np.flatnonzero(~self.measured)]
+
+    def interpolatedRanges(self) -> list[tuple[int, int]]:
+        """The interpolated rows as (first, last) runs of consecutive indexes"""
+        ranges = []
+        for row in self.interpolatedRows():
+            if ranges and ranges[-1][1] == row - 1:
+                ranges[-1] = (ranges[-1][0], row)
+            else:
+                ranges.append((row, row))
+        return ranges
+
+    def report(self) -> AdaptiveReport:
+        coarse = np.array([row for row in self.coarse if self.measured[row]], dtype = int)
+        denseMeasured = [row for row in self.dense if self.measured[row]]
+        report = AdaptiveReport(
+            rows = self.numRows,
+            coarseRows = len(coarse),
+            denseRows = len(denseMeasured),
+            interpolatedRows = int(np.count_nonzero(~self.measured)),
+            interpolated = self.interpolatedRows()
+        )
+        if not len(coarse):
+            return report
+        floor = np.nanmax(self.amplitude[coarse]) + self.ampFloor
+
+        # validation: how well the coarse rows alone predict the dense rows actually measured:
+        ampErrors = []
+        phaseErrors = []
+        for row in denseMeasured:
+            amp, pha = self._interpolate(row, coarse)
+            mask = self.amplitude[row] > floor
+            ampErrors.append(np.abs(amp[mask] - self.amplitude[row][mask]))
+            phaseErrors.append(np.abs(self._wrap(pha[mask] - self.phase[row][mask])))
+        if ampErrors:
+            ampErrors = np.concatenate(ampErrors)
+            phaseErrors = np.concatenate(phaseErrors)
+        if len(ampErrors):
+            report.validationRows = len(denseMeasured)
+            report.ampErrorRms = float(np.sqrt(np.nanmean(ampErrors ** 2)))
+            report.ampErrorMax = float(np.nanmax(ampErrors))
+            report.phaseErrorRms = float(np.sqrt(np.nanmean(phaseErrors ** 2)))
+            report.phaseErrorMax = float(np.nanmax(phaseErrors))
+
+        # linear interpolation error is about 1/8 of the second difference over the interval:
+        bound = 0.0
+        for a, b, c in zip(coarse, coarse[1:], coarse[2:]):
+            if self.measured[a + 1:c].all():
+                continue
+            amps = self.amplitude[[a, b, c]]
+            mask = (amps > floor).any(axis = 0)
+            if mask.any():
+                bound = max(bound, float(np.nanmax(np.abs(amps[0] - 2 * amps[1] + amps[2])[mask])) / 8)
+        report.ampErrorBound = bound
+        return report
+
+    def _interpolate(self, row: int, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        below = rows[rows < row]
+        above = rows[rows > row]
+        if not len(below) or not len(above):
+            nearest = below[-1] if len(below) else above[0]
+            return self.amplitude[nearest].copy(), self.phase[nearest].copy()
+        a, b = below[-1], above[0]
+        w = (row - a) / (b - a)
+        field = (1 - w) * self._field(a) + w * self._field(b)
+        with np.errstate(divide = 'ignore'):
+            amplitude = 20 * np.log10(np.abs(field))
+        return amplitude.astype(np.float32), np.degrees(np.angle(field)).astype(np.float32)
+
+    def _field(self, row: int) -> np.ndarray:
+        return 10 ** (self.amplitude[row].astype(float) / 20) * np.exp(1j * np.radians(self.phase[row].astype(float)))
+
+    @staticmethod
+    def _wrap(degrees: np.ndarray) -> np.ndarray:
+        return (degrees + 180) % 360 - 180
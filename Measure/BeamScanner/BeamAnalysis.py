@@ -0,0 +1,217 @@
+import logging
+import queue
+import threading
+import time
+import numpy as np
+from datetime import datetime
+from pydantic import BaseModel
+from typing import Optional
+
+SPEED_OF_LIGHT = 299792458  # m/s
+
+class BeamAnalysisResult(BaseModel):
+    """Provisional figures for the subscan in progress, updated as each row is measured
+
+    The efficiencies treat the measured near-field map as the aperture.  They are for spotting
+    a bad scan early and are not a substitute for the beam efficiency calculation on the database.
+    """
+    key: int = 0                            # keyBeamPattern
+    freqRF: float = 0                       # GHz
+    rows: int = 0                           # rows in the subscan
+    rowsMeasured: int = 0
+    peakAmp: Optional[float] = None         # dB
+    centerX: Optional[float] = None         # mm.  Power-weighted centroid
+    centerY: Optional[float] = None         # mm
+    beamRadiusX: Optional[float] = None     # mm.  Twice the power-weighted standard deviation: w of a gaussian beam
+    beamRadiusY: Optional[float] = None     # mm
+    edgeLevel: Optional[float] = None       # dB relative to the peak.  Highest level on the edges of the map measured so far
+    amplitudeEff: Optional[float] = None    # (sum |E|)^2 / (N sum |E|^2) over the map: the amplitude taper
+    phaseEff: Optional[float] = None        # |sum E|^2 / (sum |E|)^2
+    farFieldOffsetX: Optional[float] = None # deg.  Far-field peak direction from the preview
+    farFieldOffsetY: Optional[float] = None # deg
+    timeStamp: Optional[datetime] = None
+
+    def getText(self) -> str:
+        return f"rows:{self.rowsMeasured}/{self.rows} peak:{self.peakAmp:.1f} dB " \
+            f"center:({self.centerX:.1f}, {self.centerY:.1f}) mm radius:({self.beamRadiusX:.1f}, {self.beamRadiusY:.1f}) mm " \
+            f"edge:{self.edgeLevel:.1f} dB amplitudeEff:{self.amplitudeEff:.3f} phaseEff:{self.phaseEff:.3f}"
+
+class FarFieldPreview(BaseModel):
+    key: int = 0                            # keyBeamPattern
+    size: int = 0                           # points per side
+    step: float = 0                         # direction cosine per point
+    amplitude: list[list[float]] = []       # dB relative to the peak.  [v][u] with the boresight at [size // 2][size // 2]
+    timeStamp: Optional[datetime] = None
+
+class BeamAnalysis():
+    """Pipeline stage which analyzes a subscan's rasters while it is measured
+
+    The analysis thread reads the rows from the subscan's RasterGrid as the motion thread
+    put()s their indexes, so no trace data is copied.  Moments and sums are kept per row,
+    so a re-measured row replaces its earlier contribution and an update costs one row plus
+    a sum over the rows.
+    The far-field preview is the FFT of the near-field map measured so far.  Being global
+    it is recomputed at most every fftInterval seconds, and at finish().
+    """
+    def __init__(self, fftInterval: float = 10, fftSize: int = 256, previewSize: int = 64):
+        """
+        :param fftInterval: seconds between far-field preview updates
+        :param fftSize: minimum FFT length.  Larger maps use the next power of two
+        :param previewSize: points per side of the far-field preview, centered on boresight
+        """
+        self.logger = logging.getLogger("ALMAFE-CTS-Control")
+        self.fftInterval = fftInterval
+        self.fftSize = fftSize
+        self.previewSize = previewSize
+        self.jobs = queue.Queue()
+        self.lock = threading.Lock()
+        self.grid = None
+        self.lastFFT = 0
+        self.result = BeamAnalysisResult()
+        self.farField = FarFieldPreview()
+        self.thread = threading.Thread(target = self._run, name = "BeamAnalysis", daemon = True)
+        self.thread.start()
+
+    def start(self, grid, xAxisList: list[float], yAxisList: list[float], freqRF: float) -> None:
+        """Begin a new subscan
+
+        :param grid: RasterGrid of the subscan
+        :param xAxisList: mm.  x position of each grid column
+        :param yAxisList: mm.  y position of each grid row
+        :param freqRF: GHz
+        """
+        self.jobs.put(("start", grid, xAxisList, yAxisList, freqRF))
+
+    def put(self, row: int) -> None:
+        """Analyze a row of the grid which has been measured"""
+        self.jobs.put(("row", row))
+
+    def finish(self) -> None:
+        """Update the far-field preview with the complete map"""
+        self.jobs.put(("finish", ))
+
+    def wait(self) -> None:
+        """Wait until all jobs put so far are done"""
+        self.jobs.join()
+
+    def getResult(self) -> BeamAnalysisResult:
+        with self.lock:
+            return self.result.model_copy()
+
+    def getFarField(self) -> FarFieldPreview:
+        with self.lock:
+            return self.farField
+
+    def _run(self) -> None:
+        while True:
+            job = self.jobs.get()
+            try:
+                if job[0] == "start":
+                    self._start(*job[1:])
+                elif job[0] == "row":
+                    self._addRow(job[1])
+                    if time.time() - self.lastFFT > self.fftInterval:
+                        self._farField()
+                elif job[0] == "finish":
+                    self._farField()
+                    if self.result.rowsMeasured:
+                        self.logger.info(f"BeamAnalysis {self.result.key}: {self.result.getText()}")
+            except Exception as e:
+                self.logger.exception(e)
+            finally:
+                self.jobs.task_done()
+
+    def _start(self, grid, xAxisList: list[float], yAxisList: list[float], freqRF: float) -> None:
+        self.grid = grid
+        self.x = np.asarray(xAxisList, dtype = float)[:grid.numCols]
+        self.y = np.asarray(yAxisList, dtype = float)[:grid.numRows]
+        self.freqRF = freqRF
+        # per row: sum P, sum P x, sum P x^2, sum E, sum |E|.  Complex for sum E:
+        self.rowSums = np.zeros((grid.numRows, 5), dtype = complex)
+        self.rowPoints = np.zeros(grid.numRows, dtype = int)
+        self.rowPeak = np.full(grid.numRows, -np.inf)
+        self.rowEdge = np.full(grid.numRows, -np.inf)   # dB.  Highest of the first and last points, or of the whole row for the first and last rows
+        self.measured = np.zeros(grid.numRows, dtype = bool)
+        self.lastFFT = time.time()
+        with self.lock:
+            self.result = BeamAnalysisResult(key = grid.key, freqRF = freqRF, rows = grid.numRows)
+            self.farField = FarFieldPreview(key = grid.key)
+
+    def _addRow(self, row: int) -> None:
+        if self.grid is None:
+            return
+        amp = self.grid.amplitude[row].astype(float)
+        valid = ~np.isnan(amp)
+        if not valid.any():
+            return
+        amp = amp[valid]
+        E = self._field(amp, self.grid.phase[row].astype(float)[valid])
+        x = self.x[valid]
+        P = np.abs(E) ** 2
+        self.rowSums[row] = (P.sum(), (P * x).sum(), (P * x * x).sum(), E.sum(), np.abs(E).sum())
+        self.rowPoints[row] = len(amp)
+        self.rowPeak[row] = amp.max()
+        self.rowEdge[row] = amp.max() if row in (0, self.grid.numRows - 1) else max(amp[0], amp[-1])
+        self.measured[row] = True
+        self._update()
+
+    def _update(self) -> None:
+        sums = self.rowSums[self.measured]
+        y = self.y[self.measured]
+        P = sums[:, 0].real
+        sumP = P.sum()
+        if sumP <= 0:
+            return
+        peak = self.rowPeak[self.measured].max()
+        centerX = sums[:, 1].real.sum() / sumP
+        centerY = (P * y).sum() / sumP
+        varX = max(sums[:, 2].real.sum() / sumP - centerX ** 2, 0)
+        varY = max((P * y * y).sum() / sumP - centerY ** 2, 0)
+        sumE = abs(sums[:, 3].sum())
+        sumAbsE = sums[:, 4].real.sum()
+        points = self.rowPoints[self.measured].sum()
+        with self.lock:
+            self.result.rowsMeasured = int(self.measured.sum())
+            self.result.peakAmp = float(peak)
+            self.result.centerX = float(centerX)
+            self.result.centerY = float(centerY)
+            self.result.beamRadiusX = float(2 * np.sqrt(varX))
+            self.result.beamRadiusY = float(2 * np.sqrt(varY))
+            self.result.edgeLevel = float(self.rowEdge[self.measured].max() - peak)
+            self.result.amplitudeEff = float(sumAbsE ** 2 / (points * sumP))
+            self.result.phaseEff = float(sumE ** 2 / sumAbsE ** 2) if sumAbsE else None
+            self.result.timeStamp = datetime.now()
+
+    def _farField(self) -> None:
+        self.lastFFT = time.time()
+        if self.grid is None or not self.measured.any() or len(self.x) < 2:
+            return
+        E = self._field(self.grid.amplitude.astype(float), self.grid.phase.astype(float))
+        E[np.isnan(E)] = 0
+        size = max(self.fftSize, 1 << int(np.ceil(np.log2(max(E.shape)))))
+        F = np.fft.fftshift(np.fft.fft2(E, s = (size, size)))
+        power = np.abs(F) ** 2
+        v, u = np.unravel_index(np.argmax(power), power.shape)
+        with np.errstate(divide = 'ignore'):
+            amplitude = 10 * np.log10(power / power[v, u])
+        # direction cosine per FFT bin is the wavelength over the FFT length in space:
+        dx = abs(self.x[1] - self.x[0])
+        step = SPEED_OF_LIGHT / (self.freqRF * 1e9) * 1e3 / (size * dx) if self.freqRF else 0
+        center = size // 2
+        half = self.previewSize // 2
+        preview = amplitude[center - half:center + half, center - half:center + half]
+        preview = np.maximum(preview, -100)
+        with self.lock:
+            self.result.farFieldOffsetX = float(np.degrees(np.arcsin(np.clip((u - center) * step, -1, 1))))
+            self.result.farFieldOffsetY = float(np.degrees(np.arcsin(np.clip((v - center) * step, -1, 1))))
+            self.farField = FarFieldPreview(
+                key = self.grid.key,
+                size = preview.shape[0],
+                step = step,
+                amplitude = np.round(preview, 2).tolist(),
+                timeStamp = datetime.now()
+            )
+
+    @staticmethod
+    def _field(amplitude: np.ndarray, phase: np.ndarray) -> np.ndarray:
+        return 10 ** (amplitude / 20) * np.exp(1j * np.radians(phase))
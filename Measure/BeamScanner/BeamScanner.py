@@ -11,21 +11,30 @@ from Controllers.RFAutoLevel import RFAutoLevel
 from Controllers.IFSystem.Interface import IFSystem_Interface
 from Controllers.PowerDetect.PDPNA import PDPNA
 from .schemas import MeasurementSpec, ScanList, ScanListItem, ScanStatus, SubScan, Raster, Rasters
+from .RasterWriter import RasterWriter, RasterJob
+from .ScanPlanner import ScanPlanner, ScanPlan
+from .AdaptiveGrid import AdaptiveGrid
+from .RasterGrid import RasterGrid, RasterView
+from .ScanWatchdog import ScanWatchdog, WatchdogAction, WatchdogEvent
+from .BeamAnalysis import BeamAnalysis
 from ..Shared.MeasurementStatus import MeasurementStatus
 from DBBand6Cart.CartTests import CartTest
 from app_Common.CTSDB import CartTestsDB
 from DBBand6Cart.BPCenterPowers import BPCenterPower, BPCenterPowers
 from DBBand6Cart.BeamPatterns import BeamPattern, BeamPatterns
-from DBBand6Cart.BPRawData import BPRawDatum, BPRawData
+from DBBand6Cart.BPRawData import BPRawData
 from DBBand6Cart.BPErrors import BPErrorLevel, BPError, BPErrors
 from app_Common.CTSDB import CTSDB
+from app_Common.DBWriter import dbWriter
 from DebugOptions import *
 
 import os
+import shutil
+import threading
 import time
 from datetime import datetime
 import concurrent.futures
-from typing import Tuple
+from typing import Callable, Tuple
 import copy
 import logging
 import yaml
@@ -36,6 +45,11 @@ class BeamScanner():
     XY_SPEED_POSITIONING = 40       # mm/sec
     XY_SPEED_SCANNING = 20          # mm/sec
     POL_SPEED = 10                  # deg/sec
+    RASTER_GRID_DIR = "Settings/RasterGrids"    # memory-mapped raster grids, one directory per subscan named <keyBeamPattern>_<timestamp>
+    MAX_RASTER_GRIDS = 20           # keep the files for this many subscans
+    WATCHDOG_INTERVAL = 0.5         # sec.  Motor power and lock status polling
+    MAX_ROW_RETRIES = 2             # re-measure a row spoiled by a transient fault this many times
+    INTERPOLATED_PER_NOTE = 10      # ranges of interpolated rows listed per BPErrors note
     
     def __init__(self, 
             motorController: MCInterface,
@@ -62,13 +76,47 @@ class BeamScanner():
         self.scanList = ScanList()
         self.futures = None
         self.keyCartTest = 0
+        self.rasterGrid = None      # RasterGrid for the current subscan
+        self.rastersOffset = 0      # rasters stored before the current scan, for getRastersSince()
+        self.rastersLock = threading.Lock()
         self.centerPowersTable = BPCenterPowers(driver = CTSDB())
         self.beamPatternsTable = BeamPatterns(driver = CTSDB())
         self.bpRawDataTable = BPRawData(driver = CTSDB())
         self.bpErrorsTable = BPErrors(driver = CTSDB())
+        self.rasterWriter = RasterWriter(self.bpRawDataTable)
+        self.beamAnalysis = BeamAnalysis()
+        self.planner = ScanPlanner()
+        self.lockedLO = None        # frequencies at which the LO and RF source were left locked by the previous subscan
+        self.lockedRF = None
+        self.adaptiveReport = None  # for the latest adaptive-resolution subscan
+        self.retryRow = False       # set by the scan loop to re-measure the current row
+        self.rowRetries = 0
+        # serialize I/O to each device between the scan thread and the watchdog:
+        self.mcLock = threading.RLock()
+        self.loLock = threading.RLock()
+        self.rfLock = threading.RLock()
+        self.watchdog = ScanWatchdog(self.WATCHDOG_INTERVAL)
+        self.watchdog.addCheck("motorPower", WatchdogAction.ABORT, 
+            lambda: self.__pollIfIdle(self.mcLock, lambda: not self.mc.getMotorStatus().powerFail()), "Motor power failure")
+        self.watchdog.addCheck("loLock", WatchdogAction.RETRY, 
+            lambda: SIMULATE or self.__pollIfIdle(self.loLock, lambda: self.cartAssembly.loDevice.getLockInfo()['isLocked']), "LOST LO LOCK")
+        self.watchdog.addCheck("rfLock", WatchdogAction.RETRY, 
+            lambda: SIMULATE or self.__pollIfIdle(self.rfLock, lambda: self.rfSrcDevice.getLockInfo()['isLocked']), "LOST RF SOURCE LOCK")
         self.loadSettings()
         self.__reset()
         
+    def __pollIfIdle(self, lock: threading.RLock, poll: Callable[[], bool]) -> bool | None:
+        """For the watchdog checks: poll a device unless the scan thread is using it
+
+        :return the result of poll or None to skip the check, if the device is busy
+        """
+        if not lock.acquire(blocking = False):
+            return None
+        try:
+            return poll()
+        finally:
+            lock.release()
+
     def __reset(self):
         self.scanStatus = ScanStatus(key = self.keyCartTest)
         self.__resetRasters()
@@ -96,11 +144,37 @@ class BeamScanner():
             yaml.dump(self.measurementSpec.dict(), f)
 
     def getLatestRasterInfo(self) -> tuple[int, int]:
-        if len(self.rasters):
-            return self.rasters[-1].key, self.rasters[-1].index
+        rasterGrid = self.rasterGrid
+        latest = rasterGrid.viewsSince(rasterGrid.sequence - 1) if rasterGrid else None
+        if latest:
+            return rasterGrid.key, latest[0].index
         else:
             return 0, 0
 
+    def getRastersSince(self, cursor: int) -> tuple[list[RasterView], int]:
+        """Return the rasters collected since cursor, for incremental delivery
+
+        Cursors count rasters stored from startup and keep counting when a new scan resets the rasters,
+        so a client can resume with the cursor it was last given.  A re-measured row is stored again,
+        so its replacement raster is returned even if the row was returned before.
+        :param int cursor: from the previous call.  0 to get all rasters of the current scan.
+        :return (list of RasterView, cursor for the next call).  Each view's cursor attribute is the cursor just past it.
+        """
+        with self.rastersLock:
+            rasterGrid = self.rasterGrid
+            offset = self.rastersOffset
+            sequence = rasterGrid.sequence if rasterGrid else 0
+        end = offset + sequence
+        if cursor > end:
+            # cursor from before a restart:
+            cursor = 0
+        if not rasterGrid:
+            return [], end
+        views = [view for view in rasterGrid.viewsSince(max(cursor - offset, 0)) if view.sequence <= sequence]
+        for view in views:
+            view.cursor = offset + view.sequence
+        return views, end
+
     def getRasters(self, 
                    first: int = 0, 
                    last: int = -1,
@@ -112,11 +186,13 @@ class BeamScanner():
         :param bool latestOnly: If True, ignore first and last.  Instead return the most recent raster.
         :return Rasters
         """
-        available = len(self.rasters)
+        rasterGrid = self.rasterGrid
+        available = rasterGrid.count if rasterGrid else 0
         if latestOnly:
             # return the last raster if available
-            if available:
-                return Rasters(items = [self.rasters[-1]])
+            latest = rasterGrid.viewsSince(rasterGrid.sequence - 1) if available else None
+            if latest:
+                return Rasters(items = [self.__toRaster(latest[0])])
             else:
                 # nothing to return:
                 return Rasters()
@@ -126,10 +202,49 @@ class BeamScanner():
 
         # return what's requested, if available:
         if 0 <= first < available:
-            return Rasters(items = self.rasters[first:last])
+            return Rasters(items = [self.__toRaster(view) for view in rasterGrid.views(first, last)])
         else:
             return Rasters()
+
+    def loadRasterGrid(self, keyBeamPattern: int) -> Rasters:
+        """Load the rasters of a subscan from its memory-mapped grid, for example after a crash
+
+        If the subscan was measured more than once, loads the latest.
+        """
+        try:
+            names = sorted(name for name in os.listdir(self.RASTER_GRID_DIR) if name.startswith(f"{keyBeamPattern}_"))
+        except FileNotFoundError:
+            names = []
+        if not names:
+            self.logger.error(f"BeamScanner.loadRasterGrid: no raster grid for keyBeamPattern={keyBeamPattern}")
+            return Rasters()
+        try:
+            rasterGrid = RasterGrid.open(os.path.join(self.RASTER_GRID_DIR, names[-1]))
+        except Exception as e:
+            self.logger.error(f"BeamScanner.loadRasterGrid: {e}")
+            return Rasters()
+        return Rasters(items = [self.__toRaster(view) for view in rasterGrid.views()])
+
+    def __toRaster(self, view: RasterView) -> Raster:
+        return Raster(
+            key = view.key,
+            index = view.index,
+            startPos = Position(x = view.startPos.x, y = view.startPos.y, pol = view.startPos.pol),
+            xStep = view.xStep,
+            amplitude = view.amplitude.tolist(),
+            phase = view.phase.tolist(),
+            complete = view.complete
+        )
         
+    def getPlan(self) -> ScanPlan:
+        """The order and estimated durations of the subscans of the current scan list"""
+        return self.planner.plan(
+            self.scanList.model_copy(deep = True),
+            self.measurementSpec,
+            optimize = self.measurementSpec.optimizeOrder,
+            reuseLocks = self.measurementSpec.reuseLocks
+        )
+
     def start(self, cartTest: CartTest) -> int:
         cartTestsDb = CartTestsDB()
         if not SIMULATE:
@@ -146,11 +261,11 @@ class BeamScanner():
         self.scanStatus.activeScan = 0
         self.futures = []
         self.futures.append(self.executor.submit(self.__runAllScans))
-        # self.futures.append(self.executor.submit(self.__databaseWriterThread))
         return self.keyCartTest
 
     def stop(self):
         self.stopNow = True
+        # not under mcLock, which the scan thread holds while waiting for a move:
         self.mc.stopMove()
         if self.futures:
             concurrent.futures.wait(self.futures)
@@ -171,99 +286,126 @@ class BeamScanner():
             )
             return
 
-        self.mc.setTriggerInterval(self.measurementSpec.resolution)
-
-        self.scanList.updateIndex()
-        for scan in self.scanList.items:
-            if scan.enable:
+        with self.mcLock:
+            self.mc.setTriggerInterval(self.measurementSpec.resolution)
+
+        plan = self.planner.plan(
+            self.scanList,
+            self.measurementSpec,
+            optimize = self.measurementSpec.optimizeOrder,
+            reuseLocks = self.measurementSpec.reuseLocks
+        )
+        self.logger.info(f"BeamScanner: {len(plan.items)} subscans, estimated {plan.totalTime / 3600:.2f} hours")
+        self.lockedLO = self.lockedRF = None
+        timeStart = time.time()
+        scan = None
+        for planned in plan.items:
+            if scan is None or scan.index != planned.scanIndex:
+                if scan is not None:
+                    self.scanStatus.activeScan = None
+                scan = self.scanList.items[planned.scanIndex]
                 self.__reset()
                 self.scanStatus.activeScan = scan.index
                 self.logger.info(scan.getText())
-                scan.makeSubScans()
-                for subScan in scan.subScans:
-                    if self.stopNow:
-                        self.__abortScan("User Stop")
-                        return
-                    self.logger.info(subScan.getText())
-                    self.scanStatus.message = "Started: " + subScan.getText()
-                    self.scanStatus.activeSubScanIndex = subScan.index
-                    self.scanStatus.activeSubScan = subScan.getText()
-
-                    # compute angles for this scan:
-                    self.scanAngle = self.measurementSpec.scanAngles[subScan.getScanAngleIndex()]
-                    self.levelAngle = self.measurementSpec.scanAngles[subScan.pol]
-                    if subScan.is180:
-                        self.scanAngle += 180
-                        self.levelAngle += 180
-
-                    # create the BeamPatterns record for this scan:
-                    if SIMULATE:
-                        keyId = 1
-                    else:
-                        keyId = self.beamPatternsTable.create(BeamPattern(
-                            fkCartTest = self.keyCartTest,
-                            FreqLO = scan.LO,
-                            FreqCarrier = scan.RF,
-                            Beam_Center_X = self.measurementSpec.beamCenter.x,
-                            Beam_Center_Y = self.measurementSpec.beamCenter.y,                        
-                            Scan_Angle = self.scanAngle,
-                            Scan_Port = subScan.getScanPort(scan.isUSB()).value,
-                            Lvl_Angle = self.levelAngle,
-                            AutoLevel = self.measurementSpec.targetLevel,
-                            Resolution = self.measurementSpec.resolution,
-                            SourcePosition = subScan.getSourcePosition().value
-                        ))
-                    if not keyId:
-                        msg = "__runAllScans: beamPatternsTable.create returned None"
-                        success = False
-                    else:
-                        # run the scan:
-                        self.scanStatus.fkBeamPatterns = keyId
-                        self.xAxisList = self.measurementSpec.makeXAxisList()
-                        self.yAxisList = self.measurementSpec.makeYAxisList()
-                        success, msg = self.__runOneScan(scan, subScan)
-
-                    self.scanStatus.activeSubScanIndex = None
-                    self.scanStatus.activeSubScan = None
-                    
-                    if success:
-                        self.logger.info(f"{success}:{msg}")
-                        self.scanStatus.message = "Scan complete"
-                    else:
-                        self.scanStatus.message = "Error: " + msg
-                        self.__logBPError(
-                            source = self.__runAllScans.__name__, 
-                            msg = msg,
-                            freqSrc = scan.RF,
-                            freqRcvr = scan.LO
-                        )
+            subScan = scan.subScans[planned.subScanIndex]
+            if self.stopNow:
+                self.__abortScan("User Stop")
+                return
+            self.logger.info(subScan.getText())
+            self.scanStatus.message = "Started: " + subScan.getText()
+            self.scanStatus.activeSubScanIndex = subScan.index
+            self.scanStatus.activeSubScan = subScan.getText()
+            self.scanStatus.timeRemaining = plan.totalTime - planned.startTime
+            timeSubScan = time.time()
+
+            # compute angles for this scan:
+            self.scanAngle = self.measurementSpec.scanAngles[subScan.getScanAngleIndex()]
+            self.levelAngle = self.measurementSpec.scanAngles[subScan.pol]
+            if subScan.is180:
+                self.scanAngle += 180
+                self.levelAngle += 180
+
+            # create the BeamPatterns record for this scan:
+            if SIMULATE:
+                keyId = 1
+            else:
+                keyId = self.beamPatternsTable.create(BeamPattern(
+                    fkCartTest = self.keyCartTest,
+                    FreqLO = scan.LO,
+                    FreqCarrier = scan.RF,
+                    Beam_Center_X = self.measurementSpec.beamCenter.x,
+                    Beam_Center_Y = self.measurementSpec.beamCenter.y,                        
+                    Scan_Angle = self.scanAngle,
+                    Scan_Port = subScan.getScanPort(scan.isUSB()).value,
+                    Lvl_Angle = self.levelAngle,
+                    AutoLevel = self.measurementSpec.targetLevel,
+                    Resolution = self.measurementSpec.resolution,
+                    SourcePosition = subScan.getSourcePosition().value
+                ))
+            if not keyId:
+                msg = "__runAllScans: beamPatternsTable.create returned None"
+                success = False
+            else:
+                # run the scan:
+                self.scanStatus.fkBeamPatterns = keyId
+                self.xAxisList = self.measurementSpec.makeXAxisList()
+                self.yAxisList = self.measurementSpec.makeYAxisList()
+                success, msg = self.__runOneScan(scan, subScan)
+
+            self.scanStatus.activeSubScanIndex = None
+            self.scanStatus.activeSubScan = None
+            self.logger.info(f"BeamScanner: {subScan.getText()} took {time.time() - timeSubScan:.0f} s, estimated {planned.duration:.0f} s")
+            
+            if success:
+                self.logger.info(f"{success}:{msg}")
+                self.scanStatus.message = "Scan complete"
+            else:
+                self.lockedLO = self.lockedRF = None
+                self.scanStatus.message = "Error: " + msg
+                self.__logBPError(
+                    source = self.__runAllScans.__name__, 
+                    msg = msg,
+                    freqSrc = scan.RF,
+                    freqRcvr = scan.LO
+                )
 
-                self.scanStatus.activeScan = None
+        self.scanStatus.activeScan = None
+        self.scanStatus.timeRemaining = None
+        self.logger.info(f"BeamScanner: scan list took {(time.time() - timeStart) / 3600:.2f} hours, estimated {plan.totalTime / 3600:.2f} hours")
+        # wait for all rasters to be written:
+        dbWriter().flush()
         self.scanStatus.scanComplete = True
         self.scanStatus.measurementComplete = True
         self.measurementStatus.setMeasuring(None)
 
     def __runOneScan(self, scan:ScanListItem, subScan:SubScan) -> Tuple[bool, str]:
         try:
+            self.rasterWriter.startSubScan()
             success, msg = self.__resetRasters()
             if success:
                 success, msg = self.__configureIfProcessor(scan, subScan)
-            if success:
+            # keep the LO and RF locks from the previous subscan if at the same frequencies and still locked:
+            keepLO = self.__isStillLocked(self.cartAssembly.loDevice, self.loLock, self.lockedLO, scan.LO)
+            keepRF = keepLO and self.__isStillLocked(self.rfSrcDevice, self.rfLock, self.lockedRF, scan.RF)
+            self.lockedLO = self.lockedRF = None
+            if success and not keepLO:
                 success, msg = self.__rfSourceOff()
-            if success:
-                success, msg = self.__lockLO(scan, subScan)
-            if not success:
-                # retry lock
-                time.sleep(1)
-                success, msg = self.__lockLO(scan, subScan)
-            if success:
-                success, msg = self.__setReceiverBias(scan, subScan)
-            if success:
-                success, msg = self.__lockRF(scan, subScan)
-            if not success:
-                time.sleep(1)
-                # retry lock
+                if success:
+                    success, msg = self.__lockLO(scan, subScan)
+                if not success:
+                    # retry lock
+                    time.sleep(1)
+                    success, msg = self.__lockLO(scan, subScan)
+                if success:
+                    success, msg = self.__setReceiverBias(scan, subScan)
+            if success and not keepRF:
                 success, msg = self.__lockRF(scan, subScan)
+                if not success:
+                    time.sleep(1)
+                    # retry lock
+                    success, msg = self.__lockRF(scan, subScan)
+            if success:
+                self.lockedLO, self.lockedRF = scan.LO, scan.RF
             if success:
                 success, msg = self.__moveToBeamCenter(scan, subScan)
             if success:
@@ -284,8 +426,13 @@ class BeamScanner():
             self.__selectIFInput(isUSB = scan.RF > scan.LO, pol = subScan.pol)
 
             rasterIndex = 0
+            adaptiveGrid = self.__makeAdaptiveGrid()
+            self.__newRasterGrid()
+            self.beamAnalysis.start(self.rasterGrid, self.xAxisList, self.yAxisList, scan.RF)
+            self.watchdog.start()
             # loop on y axis:
-            for self.yPos in self.yAxisList:
+            for self.rowIndex in self.__rowOrder(adaptiveGrid):
+                self.yPos = self.yAxisList[self.rowIndex]
                 # are we scanning right-to-left at this yPos?
                 self.reverseX = self.measurementSpec.scanBidirectional and (rasterIndex % 2 != 0)
 
@@ -294,45 +441,23 @@ class BeamScanner():
                     self.__abortScan("User Stop")
                     return (False, "User Stop")
                 
-                # check for motor power failure:
-                motorStatus = self.mc.getMotorStatus()
-                msg = "__runOneScan: motor power failure. Aborting all scans!"
-                if motorStatus.powerFail():
-                    self.__logBPError(
-                        source = self.__runOneScan.__name__, 
-                        msg = msg,
-                        freqSrc = scan.RF,
-                        freqRcvr = scan.LO
-                    )
-                    self.stopNow = True
-                    self.__abortScan("Motor power failure")
-                    return (False, "Motor power failure")
-                
-                # check for lost LO lock:
-                lockInfo = self.cartAssembly.loDevice.getLockInfo()
-                if not lockInfo['isLocked'] and not SIMULATE:
-                    msg = "__runOneScan: lost LO lock. Aborting this scan."
-                    self.__logBPError(
-                        source = self.__runOneScan.__name__, 
-                        msg = msg,
-                        freqSrc = scan.RF,
-                        freqRcvr = scan.LO
-                    )
-                    self.__abortScan("LOST LO LOCK")
-                    return (False, "LOST LO LOCK")
-
-                # check for lost RF source lock:
-                lockInfo = self.rfSrcDevice.getLockInfo()
-                if not lockInfo['isLocked'] and not SIMULATE:
-                    msg = "__runOneScan: lost RF source lock. Aborting this scan."
-                    self.__logBPError(
-                        source = self.__runOneScan.__name__, 
-                        msg = msg,
-                        freqSrc = scan.RF,
-                        freqRcvr = scan.LO
-                    )
-                    self.__abortScan("LOST RF SOURCE LOCK")
-                    return (False, "LOST RF SOURCE LOCK")
+                # motor power and the LO and RF locks are polled by the watchdog:
+                fault = self.watchdog.fault()
+                if fault and fault.action == WatchdogAction.RETRY:
+                    # relock and re-level before measuring the row again:
+                    success, msg = self.__relock(scan, subScan, fault)
+                    if success:
+                        lastCenterPwrTime = time.time()
+                        fault = None
+                    else:
+                        self.__logBPError(
+                            source = self.__runOneScan.__name__, 
+                            msg = msg,
+                            freqSrc = scan.RF,
+                            freqRcvr = scan.LO
+                        )
+                if fault:
+                    return self.__watchdogAbort(scan, fault)
 
                 # time to record the beam center power?
                 # always coming from +X direction to avoid mechanical backlash
@@ -390,9 +515,13 @@ class BeamScanner():
                     self.__abortScan(msg)
                     return (success, msg)
 
+                # faults from here until the trace is read spoil this row:
+                rowStartTime = datetime.now()
+
                 # configure external triggering:
-                self.mc.setXYSpeed(self.XY_SPEED_SCANNING)
-                moveTimeout = self.mc.estimateMoveTime(self.mc.getPosition(), endPos)
+                with self.mcLock:
+                    self.mc.setXYSpeed(self.XY_SPEED_SCANNING)
+                    moveTimeout = self.mc.estimateMoveTime(self.mc.getPosition(), endPos)
                 success, msg = self.__configurePNARaster(scan, subScan, moveTimeout)
                 if not success:
                     self.__logBPError(
@@ -428,10 +557,39 @@ class BeamScanner():
                     self.__abortScan(msg)
                     return (success, msg)
 
-                # Write to database:
-                success, msg = self.__writeRasterToDatabase(scan, subScan)      # removed worker thread
-                rasterIndex += 1                                          # removed worker thread
+                # re-measure the row if the watchdog saw a fault while it was measured:
+                events = self.watchdog.eventsSince(rowStartTime)
+                if events:
+                    fault = next((event for event in events if event.action == WatchdogAction.ABORT), events[-1])
+                    if fault.action == WatchdogAction.ABORT or self.rowRetries >= self.MAX_ROW_RETRIES:
+                        return self.__watchdogAbort(scan, fault)
+                    self.logger.warning(f"BeamScanner: re-measuring row {self.rowIndex} after {fault.msg} at {fault.timeStamp}")
+                    self.retryRow = True
+                    continue
+
+                self.beamAnalysis.put(self.rowIndex)
+                if adaptiveGrid:
+                    adaptiveGrid.addRow(self.rowIndex, self.raster.amplitude, self.raster.phase, self.reverseX)
+
+                # queue the raster to be written to the database:
+                success, msg = self.__writeRasterToDatabase(scan, subScan)
+                rasterIndex += 1
+
+            self.beamAnalysis.finish()
+            if adaptiveGrid:
+                self.__writeInterpolatedRows(scan, subScan, adaptiveGrid, rasterIndex)
                 
+            # wait for the rasters of this subscan to be written:
+            if not SIMULATE:
+                success, msg = self.rasterWriter.waitSubScan()
+                if not success:
+                    self.__logBPError(
+                        source = self.__runOneScan.__name__, 
+                        msg = msg,
+                        freqSrc = scan.RF,
+                        freqRcvr = scan.LO
+                    )
+
             # record the beam center power a final time:
             success, msg = self.__measureCenterPower(scan, subScan, scanComplete = True)
             if not success:
@@ -448,16 +606,135 @@ class BeamScanner():
         except Exception as e:
             self.logger.exception(e)
             return (False, "__runOneScan Exception: " + str(e))
+        finally:
+            self.watchdog.stop()
+
+    def __watchdogAbort(self, scan:ScanListItem, fault: WatchdogEvent) -> Tuple[bool, str]:
+        abortAll = fault.action == WatchdogAction.ABORT
+        self.__logBPError(
+            source = self.__runOneScan.__name__, 
+            msg = f"__runOneScan: {fault.msg}. " + ("Aborting all scans!" if abortAll else "Aborting this scan."),
+            freqSrc = scan.RF,
+            freqRcvr = scan.LO
+        )
+        if abortAll:
+            self.stopNow = True
+        return self.__abortScan(fault.msg)
+
+    def __relock(self, scan:ScanListItem, subScan:SubScan, fault: WatchdogEvent) -> Tuple[bool, str]:
+        self.logger.warning(f"BeamScanner: {fault.msg}. Relocking before row {self.rowIndex}")
+        self.lockedLO = self.lockedRF = None
+        with self.loLock:
+            lostLO = not (SIMULATE or self.cartAssembly.loDevice.getLockInfo()['isLocked'])
+        with self.rfLock:
+            lostRF = not (SIMULATE or self.rfSrcDevice.getLockInfo()['isLocked'])
+        success, msg = True, ""
+        if lostLO:
+            success, msg = self.__rfSourceOff()
+            if success:
+                success, msg = self.__lockLO(scan, subScan)
+            # the bias and LO power are set again after the LO is locked:
+            if success:
+                success, msg = self.__setReceiverBias(scan, subScan)
+        if success and lostRF:
+            success, msg = self.__lockRF(scan, subScan)
+        # the RF source output must be leveled again after either lock is lost:
+        if success:
+            success, msg = self.__moveToBeamCenter(scan, subScan)
+        if success:
+            success, msg = self.__rfSourceAutoLevel(scan, subScan)
+        if success:
+            success, msg = self.__measureCenterPower(scan, subScan, scanComplete = False)
+        if not success:
+            return (False, f"__relock: {fault.msg}: {msg}")
+        self.watchdog.pollOnce()
+        current = self.watchdog.fault()
+        if current:
+            return (False, f"__relock: {current.msg} after relocking")
+        self.lockedLO, self.lockedRF = scan.LO, scan.RF
+        return (True, "")
+
+    def __isStillLocked(self, loDevice: LODevice, lock: threading.RLock, lockedFreq: float | None, freq: float) -> bool:
+        if not self.measurementSpec.reuseLocks or lockedFreq is None or abs(lockedFreq - freq) >= ScanPlanner.FREQ_RESOLUTION:
+            return False
+        with lock:
+            return SIMULATE or loDevice.getLockInfo()['isLocked']
+
+    def __makeAdaptiveGrid(self) -> AdaptiveGrid | None:
+        spec = self.measurementSpec
+        if not spec.adaptive:
+            return None
+        return AdaptiveGrid(
+            numRows = len(self.yAxisList),
+            numCols = spec.numScanPoints(),
+            coarseFactor = spec.coarseFactor,
+            ampThreshold = spec.refineAmpThreshold,
+            phaseThreshold = spec.refinePhaseThreshold,
+            ampFloor = spec.refineAmpFloor
+        )
+
+    def __rowOrder(self, adaptiveGrid: AdaptiveGrid | None):
+        # a generator so that the refine rows are chosen after the coarse rows are measured:
+        def rows():
+            if adaptiveGrid is None:
+                yield from range(len(self.yAxisList))
+            else:
+                yield from adaptiveGrid.coarse
+                yield from adaptiveGrid.refineRows()
+
+        self.retryRow = False
+        for row in rows():
+            self.rowRetries = 0
+            yield row
+            # the scan loop sets retryRow to re-measure a row spoiled by a fault:
+            while self.retryRow:
+                self.retryRow = False
+                self.rowRetries += 1
+                yield row
+
+    def __writeInterpolatedRows(self, scan:ScanListItem, subScan:SubScan, adaptiveGrid: AdaptiveGrid, rasterIndex: int) -> None:
+        # fill the rows which were not measured so the database holds the full uniform grid:
+        amplitude, phase, measured = adaptiveGrid.merge()
+        self.adaptiveReport = adaptiveGrid.report()
+        self.adaptiveReport.key = self.scanStatus.fkBeamPatterns
+        self.logger.info(f"BeamScanner adaptive {subScan.getText()}: {self.adaptiveReport.getText()}")
+        # BPRawData has no column to mark them, so record which rows are interpolated against the beam pattern:
+        ranges = [f"{self.yAxisList[first]}" if first == last else f"{self.yAxisList[first]}..{self.yAxisList[last]}" 
+            for first, last in adaptiveGrid.interpolatedRanges()]
+        for start in range(0, len(ranges), self.INTERPOLATED_PER_NOTE):
+            self.__logBPError(
+                source = self.__writeInterpolatedRows.__name__,
+                msg = f"Interpolated rows, not measured, at Y= {', '.join(ranges[start:start + self.INTERPOLATED_PER_NOTE])} mm",
+                freqSrc = scan.RF,
+                freqRcvr = scan.LO,
+                level = BPErrorLevel.INFO
+            )
+        self.reverseX = False
+        for row in adaptiveGrid.interpolatedRows():
+            self.yPos = self.yAxisList[row]
+            self.raster = Raster(
+                key = self.scanStatus.fkBeamPatterns,
+                index = rasterIndex,
+                startPos = Position(x = self.measurementSpec.scanStart.x, y = self.yPos, pol = self.scanAngle),
+                xStep = self.measurementSpec.resolution,
+                amplitude = amplitude[row].tolist(),
+                phase = phase[row].tolist(),
+                complete = True
+            )
+            self.__writeRasterToDatabase(scan, subScan)
+            rasterIndex += 1
 
     def __moveScanner(self, nextPos:Position, withTrigger:bool) -> Tuple[bool, str]:
-        self.mc.setXYSpeed(self.XY_SPEED_SCANNING if withTrigger else self.XY_SPEED_POSITIONING)
-        self.mc.setPolSpeed(self.POL_SPEED)
-        moveTimeout = self.mc.estimateMoveTime(self.mc.getPosition(), nextPos)
-        self.mc.setNextPos(nextPos)
-        self.mc.startMove(withTrigger, moveTimeout)
-        moveStatus = self.mc.waitForMove(timeout = moveTimeout + 0.5)
-        actualPos = self.mc.getPosition(cached = False)
-        self.mc.stopMove()
+        # the watchdog's motor power check is skipped during the move.  A power failure makes the move fail:
+        with self.mcLock:
+            self.mc.setXYSpeed(self.XY_SPEED_SCANNING if withTrigger else self.XY_SPEED_POSITIONING)
+            self.mc.setPolSpeed(self.POL_SPEED)
+            moveTimeout = self.mc.estimateMoveTime(self.mc.getPosition(), nextPos)
+            self.mc.setNextPos(nextPos)
+            self.mc.startMove(withTrigger, moveTimeout)
+            moveStatus = self.mc.waitForMove(timeout = moveTimeout + 0.5)
+            actualPos = self.mc.getPosition(cached = False)
+            self.mc.stopMove()
         if self.stopNow:
             return (False, "__moveScanner: User Stop")
         else:
@@ -483,16 +760,21 @@ class BeamScanner():
                 Phase = self.scanStatus.phase,
                 ScanComplete = self.scanStatus.scanComplete
             ))
-        self.logger.info(f"__measureCenterPower: position {self.mc.getPosition().getText()}")
+        with self.mcLock:
+            position = self.mc.getPosition()
+        self.logger.info(f"__measureCenterPower: position {position.getText()}")
         msg = f"__measureCenterPower: {self.scanStatus.getCenterPowerText()}"        
         self.logger.info(msg)
         return (True, msg)
 
-    def __logBPError(self, source: str, msg: str, freqSrc = 0, freqRcvr = 0, level = BPErrorLevel.ERROR) -> None:
-        self.logger.error(msg)
+    def __logBPError(self, source: str, msg: str, freqSrc = 0, freqRcvr = 0, level = BPErrorLevel.ERROR, fkBeamPattern = None) -> None:
+        if level == BPErrorLevel.ERROR:
+            self.logger.error(msg)
+        else:
+            self.logger.info(msg)
         if not SIMULATE:
             self.bpErrorsTable.create(BPError(
-                fkBeamPattern = self.scanStatus.fkBeamPatterns,
+                fkBeamPattern = fkBeamPattern if fkBeamPattern is not None else self.scanStatus.fkBeamPatterns,
                 Level = level,
                 Message = msg,
                 Model = os.path.split(__file__)[1],
@@ -524,9 +806,41 @@ class BeamScanner():
         return (code == 0, "__resetPNA: " + msg)
 
     def __resetRasters(self) -> Tuple[bool, str]:
-        self.rasters = []
+        with self.rastersLock:
+            if self.rasterGrid:
+                self.rastersOffset += self.rasterGrid.sequence
+                # release the files so that they can be pruned.  Clients may still hold views:
+                self.rasterGrid.close()
+            self.rasterGrid = None
         return (True, "")
 
+    def __newRasterGrid(self) -> None:
+        directory = None
+        if self.measurementSpec.rasterGridOnDisk:
+            # unique per subscan, since the key is not unique when simulating or re-measuring:
+            directory = os.path.join(self.RASTER_GRID_DIR, f"{self.scanStatus.fkBeamPatterns}_{datetime.now():%Y%m%d%H%M%S%f}")
+            self.__pruneRasterGrids()
+        rasterGrid = RasterGrid(
+            key = self.scanStatus.fkBeamPatterns,
+            numRows = len(self.yAxisList),
+            numCols = self.measurementSpec.numScanPoints(),
+            directory = directory
+        )
+        with self.rastersLock:
+            self.rasterGrid = rasterGrid
+
+    def __pruneRasterGrids(self) -> None:
+        try:
+            directories = [os.path.join(self.RASTER_GRID_DIR, name) for name in os.listdir(self.RASTER_GRID_DIR)]
+        except FileNotFoundError:
+            return
+        directories.sort(key = os.path.getmtime)
+        for directory in directories[:max(len(directories) - self.MAX_RASTER_GRIDS + 1, 0)]:
+            try:
+                shutil.rmtree(directory)
+            except OSError as e:
+                self.logger.warning(f"BeamScanner: could not remove raster grid {directory}: {e}")
+
     def __configureIfProcessor(self, scan:ScanListItem, subScan:SubScan) -> Tuple[bool, str]:
         self.__selectIFInput(isUSB = scan.RF > scan.LO, pol = subScan.pol)
         self.ifSystem.output_select = OutputSelect.PNA_INTERFACE
@@ -548,26 +862,28 @@ class BeamScanner():
         self.ifSystem.input_select = position
 
     def __rfSourceOff(self) -> Tuple[bool, str]:
-        self.rfSrcDevice.setPAOutput(pol = self.rfSrcDevice.paPol, percent = 0)
+        with self.rfLock:
+            self.rfSrcDevice.setPAOutput(pol = self.rfSrcDevice.paPol, percent = 0)
         return (True, "")
 
     def __lockLO(self, scan:ScanListItem, subScan:SubScan) -> Tuple[bool, str]:
-        self.cartAssembly.loDevice.selectLockSideband(self.cartAssembly.loDevice.LOCK_ABOVE_REF)
-        wcaFreq, ytoFreq, ytoCourse = self.cartAssembly.loDevice.setFrequency(scan.LO)
-        pllConfig = self.cartAssembly.loDevice.getPLLConfig()
-        self.loReference.setFrequency((scan.LO / pllConfig['coldMult'] - 0.020) / pllConfig['warmMult'])
-        # self.loReference.setAmplitude(12.0)
-        self.loReference.setRFOutput(True)
-        if not SIMULATE:
-            wcaFreq, ytoFreq, ytoCourse = self.cartAssembly.loDevice.lockPLL()
+        with self.loLock:
+            self.cartAssembly.loDevice.selectLockSideband(self.cartAssembly.loDevice.LOCK_ABOVE_REF)
+            wcaFreq, ytoFreq, ytoCourse = self.cartAssembly.loDevice.setFrequency(scan.LO)
+            pllConfig = self.cartAssembly.loDevice.getPLLConfig()
+            self.loReference.setFrequency((scan.LO / pllConfig['coldMult'] - 0.020) / pllConfig['warmMult'])
+            # self.loReference.setAmplitude(12.0)
+            self.loReference.setRFOutput(True)
+            if not SIMULATE:
+                wcaFreq, ytoFreq, ytoCourse = self.cartAssembly.loDevice.lockPLL()
         return (True, f"__lockLO: wca={wcaFreq}, yto={ytoFreq}, courseTune={ytoCourse}")
 
     def __setReceiverBias(self, scan:ScanListItem, subScan:SubScan) -> Tuple[bool, str]:
-        if self.cartAssembly.setBias(scan.LO):
-            if not SIMULATE:
-                ret = self.cartAssembly.autoLOPower()
-            else:
-                ret = False
+        # autoLOPower adjusts the LO PA:
+        with self.loLock:
+            biasSet = self.cartAssembly.setBias(scan.LO)
+            ret = biasSet and not SIMULATE and self.cartAssembly.autoLOPower()
+        if biasSet:
             if ret or SIMULATE:
                 return (True, "")
             else:
@@ -576,16 +892,17 @@ class BeamScanner():
             return (False, "cartAssembly.setBias failed.  Provide config ID?")
 
     def __lockRF(self, scan:ScanListItem, subScan:SubScan) -> Tuple[bool, str]:
-        self.rfSrcDevice.selectLockSideband(self.rfSrcDevice.LOCK_ABOVE_REF)
-        wcaFreq, ytoFreq, ytoCourse = self.rfSrcDevice.setFrequency(scan.RF)
-        if self.rfReference:
-            # for debug only.  Normally the RF ref synth is not used for beam patterns:
-            pllConfig = self.rfSrcDevice.getPLLConfig()
-            self.rfReference.setFrequency((scan.RF / pllConfig['coldMult'] - 0.020) / pllConfig['warmMult'])
-            self.rfReference.setAmplitude(16.0)
-            self.rfReference.setRFOutput(True)
-        if not SIMULATE:
-            wcaFreq, ytoFreq, ytoCourse = self.rfSrcDevice.lockPLL()
+        with self.rfLock:
+            self.rfSrcDevice.selectLockSideband(self.rfSrcDevice.LOCK_ABOVE_REF)
+            wcaFreq, ytoFreq, ytoCourse = self.rfSrcDevice.setFrequency(scan.RF)
+            if self.rfReference:
+                # for debug only.  Normally the RF ref synth is not used for beam patterns:
+                pllConfig = self.rfSrcDevice.getPLLConfig()
+                self.rfReference.setFrequency((scan.RF / pllConfig['coldMult'] - 0.020) / pllConfig['warmMult'])
+                self.rfReference.setAmplitude(16.0)
+                self.rfReference.setRFOutput(True)
+            if not SIMULATE:
+                wcaFreq, ytoFreq, ytoCourse = self.rfSrcDevice.lockPLL()
         return (wcaFreq != 0, f"__lockRF: wca={wcaFreq}, yto={ytoFreq}, courseTune={ytoCourse}")
 
     def __moveToBeamCenter(self, scan:ScanListItem, subScan:SubScan) -> Tuple[bool, str]:
@@ -595,10 +912,11 @@ class BeamScanner():
 
     def __rfSourceAutoLevel(self, scan:ScanListItem, subScan:SubScan) -> Tuple[bool, str]:
         self.pdPNA.configure(power_config = DEFAULT_POWER_CONFIG, config = FAST_CONFIG)
-        success = self.rfAutoLevel.autoLevel(abs(scan.RF - scan.LO), self.measurementSpec.targetLevel)
+        with self.rfLock:
+            success, msg = self.rfAutoLevel.autoLevel(abs(scan.RF - scan.LO), self.measurementSpec.targetLevel, freqRF = scan.RF)
         if SIMULATE:
             success = True
-        return (success, "__rfSourceAutoLevel")
+        return (success, "__rfSourceAutoLevel: " + msg)
 
     def __configurePNARaster(self, scan:ScanListItem, subScan:SubScan, moveTimeout:float) -> Tuple[bool, str]:
         # add 10sec to timeout to account for accel/decel
@@ -610,51 +928,43 @@ class BeamScanner():
     def __getPNARaster(self, scan:ScanListItem, subScan:SubScan) -> Tuple[bool, str]:
         amp, phase = self.pna.getTrace(y = self.yPos, reverseX = self.reverseX)
         if amp and phase:
-            self.raster.amplitude = amp
-            self.raster.phase = phase
-            self.raster.complete = True
-            self.rasters.append(self.raster)
+            # the grid's view of the stored raster replaces the placeholder:
+            self.raster = self.rasterGrid.put(
+                row = self.rowIndex,
+                amplitude = amp,
+                phase = phase,
+                y = self.yPos,
+                pol = self.raster.startPos.pol,
+                startX = self.raster.startPos.x,
+                xStep = self.raster.xStep
+            )
             return (True, "")
         else:
             return (False, "pna.getTrace returned no data")
 
-    # def __databaseWriterThread(self):
-    #     while not self.stopNow and not self.scanStatus.measurementComplete:
-    #         if self.raster.complete:
-    #             scan = self.scanList.items[self.scanStatus.activeScan]
-    #             subScan = scan.subScans[self.scanStatus.activeSubScanIndex]
-    #             self.__writeRasterToDatabase(scan, subScan)
-    #             self.raster.complete = False
-    #             self.raster.index += 1
-    #         time.sleep(2)
-
     def __writeRasterToDatabase(self, scan: ScanListItem, subScan: SubScan) -> Tuple[bool, str]:
         if SIMULATE:
             return (True, "Simulate write to database")
-        xAxisList = reversed(self.xAxisList) if self.reverseX else self.xAxisList
-        now = datetime.now()
-        records = [BPRawDatum(
-            fkBeamPattern = self.scanStatus.fkBeamPatterns,
-            Pol = subScan.pol,
-            Position_X = x,
-            Position_Y = self.yPos,
-            SourceAngle = self.scanAngle,
-            Power = amp,
-            Phase = phase,
-            timeStamp = now
-        ) for x, amp, phase in zip(xAxisList, self.raster.amplitude, self.raster.phase)]
-
-        count = self.bpRawDataTable.create(records)
-        
-        if count == len(self.xAxisList):
-            return (True, "")
-        else:
-            msg = f"__writeRasterToDatabase: Only {count} records out of {len(self.xAxisList)} were written."
+
+        def onError(msg: str, fkBeamPattern: int) -> None:
+            # called on the RasterWriter or DBWriter thread:
             self.__logBPError(
                 source = self.__writeRasterToDatabase.__name__, 
-                msg = msg,
+                msg = "__writeRasterToDatabase: " + msg,
                 freqSrc = scan.RF,
-                freqRcvr = scan.LO
+                freqRcvr = scan.LO,
+                fkBeamPattern = fkBeamPattern
             )
-            return (False, msg)
+
+        self.rasterWriter.put(RasterJob(
+            raster = self.raster,
+            fkBeamPattern = self.scanStatus.fkBeamPatterns,
+            pol = subScan.pol,
+            yPos = self.yPos,
+            scanAngle = self.scanAngle,
+            xAxisList = self.xAxisList,
+            reverseX = self.reverseX,
+            onError = onError
+        ))
+        return (True, "")
         
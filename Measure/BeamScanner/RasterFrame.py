@@ -0,0 +1,65 @@
+import struct
+import numpy as np
+
+# Binary websocket framing for beam scanner rasters.
+#
+# Little-endian.  A fixed header followed by the amplitude then phase traces as float32[numPoints]:
+#   magic       4s      b'BSR1'
+#   flags       uint32  FLAG_REVERSE | FLAG_COMPLETE
+#   key         int32   keyBeamPattern
+#   index       int32   raster index within the subscan
+#   cursor      int64   raster cursor after this one, for resuming with ?cursor=
+#   x, y, pol   float32 startPos
+#   xStep       float32 mm.  Negative when reversed
+#   numPoints   uint32
+
+MAGIC = b'BSR1'
+HEADER = struct.Struct('<4sIiiqffffI')
+FLAG_REVERSE = 0x01
+FLAG_COMPLETE = 0x02
+
+def packRaster(raster, cursor: int = 0) -> bytes:
+    """Pack a Raster into a binary frame
+
+    :param raster: Raster
+    :param cursor: value to return to the client for resuming
+    :return bytes
+    """
+    amplitude = np.asarray(raster.amplitude, dtype = '<f4')
+    phase = np.asarray(raster.phase, dtype = '<f4')
+    flags = (FLAG_REVERSE if raster.xStep < 0 else 0) | (FLAG_COMPLETE if raster.complete else 0)
+    header = HEADER.pack(
+        MAGIC,
+        flags,
+        raster.key,
+        raster.index,
+        cursor,
+        raster.startPos.x,
+        raster.startPos.y,
+        raster.startPos.pol,
+        raster.xStep,
+        len(amplitude)
+    )
+    return header + amplitude.tobytes() + phase.tobytes()
+
+def unpackRaster(data: bytes) -> dict:
+    """Unpack a binary frame made by packRaster
+
+    :return dict of the header fields plus 'amplitude' and 'phase' as float32 arrays
+    """
+    magic, flags, key, index, cursor, x, y, pol, xStep, numPoints = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"unpackRaster: bad magic {magic}")
+    amplitude = np.frombuffer(data, dtype = '<f4', count = numPoints, offset = HEADER.size)
+    phase = np.frombuffer(data, dtype = '<f4', count = numPoints, offset = HEADER.size + 4 * numPoints)
+    return {
+        'key': key,
+        'index': index,
+        'cursor': cursor,
+        'startPos': {'x': x, 'y': y, 'pol': pol},
+        'xStep': xStep,
+        'reverse': bool(flags & FLAG_REVERSE),
+        'complete': bool(flags & FLAG_COMPLETE),
+        'amplitude': amplitude,
+        'phase': phase
+    }
@@ -0,0 +1,203 @@
+import os
+import shutil
+import threading
+import numpy as np
+import yaml
+from types import SimpleNamespace
+
+# one entry per row in the order first measured:
+RASTER_DTYPE = np.dtype([
+    ('row', '<i4'),         # row index in the grid
+    ('y', '<f4'),
+    ('pol', '<f4'),
+    ('startX', '<f4'),      # x of the first point measured
+    ('xStep', '<f4'),       # negative when measured right-to-left
+    ('points', '<i4'),      # length of the trace measured
+    ('complete', 'u1'),
+    ('seq', '<i4')          # sequence number of the put() which stored it, from 1
+])
+
+class RasterView():
+    """One measured raster of a RasterGrid, duck-type compatible with schemas.Raster
+
+    amplitude and phase are views into the grid in the order measured, so no data is copied.
+    """
+    def __init__(self, grid: 'RasterGrid', index: int):
+        entry = grid.entries[index]
+        row = int(entry['row'])
+        reverse = entry['xStep'] < 0
+        self.key = grid.key
+        self.index = index
+        self.row = row
+        self.startPos = SimpleNamespace(x = float(entry['startX']), y = float(entry['y']), pol = float(entry['pol']))
+        self.xStep = float(entry['xStep'])
+        self.sequence = int(entry['seq'])
+        points = int(entry['points'])
+        self.amplitude = (grid.amplitude[row, ::-1] if reverse else grid.amplitude[row])[:points]
+        self.phase = (grid.phase[row, ::-1] if reverse else grid.phase[row])[:points]
+        self.complete = bool(entry['complete'])
+
+    def dict(self) -> dict:
+        """Same shape as Raster.dict()"""
+        return {
+            'key': self.key,
+            'index': self.index,
+            'startPos': vars(self.startPos).copy(),
+            'xStep': self.xStep,
+            'amplitude': self.amplitude.tolist(),
+            'phase': self.phase.tolist(),
+            'complete': self.complete
+        }
+
+class RasterGrid():
+    """Preallocated float32 amplitude and phase arrays for the rasters of one subscan
+
+    Indexed by (row, column) with columns in forward x order regardless of the scan direction.
+    If a directory is given the arrays are memory-mapped files in it, so memory use does not
+    depend on the length of the scan list and a crashed scan can be reloaded with open().
+    A re-measured row replaces the raster of its earlier measurement, keeping its index,
+    so there is at most one raster per row.  Every put() gets the next sequence number, so
+    viewsSince() also returns the rasters which were replaced since the sequence given.
+    One writer thread calls put(); readers may call view() and count concurrently.
+    """
+    def __init__(self,
+            key: int,
+            numRows: int,
+            numCols: int,
+            directory: str = None
+        ):
+        """
+        :param key: keyBeamPattern
+        :param numRows: rows in the subscan
+        :param numCols: points per row
+        :param directory: if given, back the arrays with files in this directory
+        """
+        self.key = key
+        self.numRows = numRows
+        self.numCols = numCols
+        self.directory = directory
+        self.lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok = True)
+            with open(os.path.join(directory, "grid.yaml"), "w") as f:
+                yaml.dump({'key': key, 'numRows': numRows, 'numCols': numCols}, f)
+            self.amplitude = self._openArray("amplitude.npy", 'w+', np.float32, (numRows, numCols))
+            self.phase = self._openArray("phase.npy", 'w+', np.float32, (numRows, numCols))
+            self.entries = self._openArray("rasters.npy", 'w+', RASTER_DTYPE, (numRows, ))
+            self.amplitude[:] = np.nan
+            self.phase[:] = np.nan
+        else:
+            self.amplitude = np.full((numRows, numCols), np.nan, dtype = np.float32)
+            self.phase = np.full((numRows, numCols), np.nan, dtype = np.float32)
+            self.entries = np.zeros(numRows, dtype = RASTER_DTYPE)
+        self.rowComplete = np.zeros(numRows, dtype = bool)
+        self.rowIndex = np.full(numRows, -1, dtype = int)     # index of each row's raster, -1 if not measured
+        self.count = 0
+        self.sequence = 0
+
+    @classmethod
+    def open(cls, directory: str) -> 'RasterGrid':
+        """Reload a grid from its directory, for example after a crash"""
+        with open(os.path.join(directory, "grid.yaml"), "r") as f:
+            meta = yaml.safe_load(f)
+        grid = cls.__new__(cls)
+        grid.key = meta['key']
+        grid.numRows = meta['numRows']
+        grid.numCols = meta['numCols']
+        grid.directory = directory
+        grid.lock = threading.Lock()
+        grid.amplitude = grid._openArray("amplitude.npy", 'r+')
+        grid.phase = grid._openArray("phase.npy", 'r+')
+        grid.entries = grid._openArray("rasters.npy", 'r+')
+        # the rasters measured are the leading entries marked complete:
+        complete = grid.entries['complete'].astype(bool)
+        grid.count = int(np.argmin(complete)) if not complete.all() else len(complete)
+        grid.rowComplete = np.zeros(grid.numRows, dtype = bool)
+        grid.rowComplete[grid.entries['row'][:grid.count]] = True
+        grid.rowIndex = np.full(grid.numRows, -1, dtype = int)
+        grid.rowIndex[grid.entries['row'][:grid.count]] = np.arange(grid.count)
+        grid.sequence = int(grid.entries['seq'][:grid.count].max()) if grid.count else 0
+        return grid
+
+    def put(self,
+            row: int,
+            amplitude: list[float],
+            phase: list[float],
+            y: float,
+            pol: float,
+            startX: float,
+            xStep: float
+        ) -> RasterView:
+        """Store a measured raster given in the order measured
+
+        A row measured again replaces its earlier raster.
+        :return a view of the stored raster
+        """
+        amp = np.asarray(amplitude, dtype = np.float32)[:self.numCols]
+        pha = np.asarray(phase, dtype = np.float32)[:self.numCols]
+        if xStep < 0:
+            amp, pha = amp[::-1], pha[::-1]
+            # reversed traces end at column numCols - 1:
+            cols = slice(self.numCols - len(amp), self.numCols)
+        else:
+            cols = slice(0, len(amp))
+        with self.lock:
+            index = int(self.rowIndex[row])
+            if index < 0:
+                index = self.count
+            else:
+                # clear the earlier measurement, which may have been longer:
+                self.amplitude[row] = np.nan
+                self.phase[row] = np.nan
+            self.amplitude[row, cols] = amp
+            self.phase[row, cols] = pha
+            self.entries[index] = (row, y, pol, startX, xStep, len(amp), 1, self.sequence + 1)
+            self.rowComplete[row] = True
+            self.rowIndex[row] = index
+            # publish only after the data is in place:
+            self.count = max(self.count, index + 1)
+            self.sequence += 1
+        return RasterView(self, index)
+
+    def view(self, index: int) -> RasterView:
+        return RasterView(self, index)
+
+    def views(self, first: int = 0, last: int = None) -> list[RasterView]:
+        """Views of the rasters first <= index < last in the order first measured"""
+        count = self.count
+        last = count if last is None else min(last, count)
+        return [RasterView(self, index) for index in range(max(first, 0), last)]
+
+    def viewsSince(self, sequence: int) -> list[RasterView]:
+        """Views of the rasters stored or replaced after sequence, in the order stored"""
+        with self.lock:
+            count = self.count
+            seq = np.array(self.entries['seq'][:count])
+        indexes = np.flatnonzero(seq > sequence)
+        return [RasterView(self, int(index)) for index in indexes[np.argsort(seq[indexes])]]
+
+    def flush(self) -> None:
+        if self.directory:
+            for array in (self.amplitude, self.phase, self.entries):
+                array.flush()
+
+    def close(self) -> None:
+        """Flush and detach from the backing files, keeping the data in memory
+
+        The files are released once views made before are dropped.
+        """
+        if self.directory:
+            with self.lock:
+                self.flush()
+                self.amplitude = np.array(self.amplitude)
+                self.phase = np.array(self.phase)
+                self.entries = np.array(self.entries)
+                self.directory = None
+
+    def remove(self) -> None:
+        """Delete the backing files"""
+        if self.directory:
+            shutil.rmtree(self.directory, ignore_errors = True)
+
+    def _openArray(self, name: str, mode: str, dtype = None, shape: tuple = None) -> np.memmap:
+        return np.lib.format.open_memmap(os.path.join(self.directory, name), mode = mode, dtype = dtype, shape = shape)
@@ -0,0 +1,155 @@
+import logging
+import queue
+import threading
+import numpy as np
+from datetime import datetime
+from typing import Callable, Optional, Tuple
+from DBBand6Cart.BPRawData import BPRawDatum
+from app_Common.DBWriter import DBWriter, dbWriter
+from .schemas import Raster
+
+class RasterJob():
+    """A completed raster plus what is needed to turn it into BPRawData rows"""
+    def __init__(self,
+            raster: Raster,
+            fkBeamPattern: int,
+            pol: int,
+            yPos: float,
+            scanAngle: float,
+            xAxisList: list[float],
+            reverseX: bool,
+            onError: Optional[Callable[[str, int], None]] = None):
+        self.raster = raster
+        self.fkBeamPattern = fkBeamPattern
+        self.pol = pol
+        self.yPos = yPos
+        self.scanAngle = scanAngle
+        self.xAxisList = xAxisList
+        self.reverseX = reverseX
+        self.onError = onError
+        self.timeStamp = datetime.now()
+        self.index = raster.index
+        self.subScan = None         # set by RasterWriter.put()
+        self.amplitude = None       # copies of the raster's traces, made by RasterWriter.put()
+        self.phase = None
+
+class RasterWriter():
+    """Pipeline stage between the beam scanner's motion thread and the database
+
+    The motion thread put()s each completed raster and moves on to the next row.
+    The writer thread converts rasters to BPRawDatum rows and submits them to the DBWriter,
+    so the database latency is hidden behind the scanner motion.
+    waitSubScan() is the end-of-subscan barrier: it returns once every raster put since
+    startSubScan() has been written or given up on, with the count of failures.
+    It waits only for this subscan's rasters, not for other jobs on the DBWriter.  Rasters still
+    in flight from an earlier subscan are written but don't count towards the current one.
+    """
+    WAIT_TIMEOUT = 30               # sec.  waitSubScan() default timeout, plus WAIT_PER_RASTER for each raster pending
+    WAIT_PER_RASTER = 2
+
+    def __init__(self, table, writer: DBWriter = None):
+        """
+        :param table: the BPRawData table object
+        :param writer: the DBWriter to submit to.  Default is the shared dbWriter()
+        """
+        self.logger = logging.getLogger("ALMAFE-CTS-Control")
+        self.table = table
+        self.writer = writer if writer else dbWriter()
+        self.jobs = queue.Queue()
+        self.cv = threading.Condition()
+        self.subScan = 0
+        self.pending = 0            # rasters of the current subscan not yet written or given up on
+        self.failures = 0
+        self.lastError = ""
+        self.thread = threading.Thread(target = self._run, name = "RasterWriter", daemon = True)
+        self.thread.start()
+
+    def startSubScan(self) -> None:
+        with self.cv:
+            self.subScan += 1
+            self.pending = 0
+            self.failures = 0
+            self.lastError = ""
+
+    def put(self, job: RasterJob) -> None:
+        # copy the traces, since the raster may be a view of a grid row which can be measured again:
+        job.amplitude = np.array(job.raster.amplitude, dtype = float)
+        job.phase = np.array(job.raster.phase, dtype = float)
+        # and drop the view so that queued jobs don't hold the grid's files open:
+        job.raster = None
+        with self.cv:
+            job.subScan = self.subScan
+            self.pending += 1
+        self.jobs.put(job)
+
+    def waitSubScan(self, timeout: float = None) -> Tuple[bool, str]:
+        """Wait until all rasters put since startSubScan() have been written
+
+        :param timeout: seconds to wait.  Default is WAIT_TIMEOUT plus WAIT_PER_RASTER for each raster pending
+        :return (success, msg)
+        """
+        with self.cv:
+            if timeout is None:
+                timeout = self.WAIT_TIMEOUT + self.WAIT_PER_RASTER * self.pending
+            if not self.cv.wait_for(lambda: not self.pending, timeout):
+                return (False, f"RasterWriter.waitSubScan: timed out with {self.pending} rasters not written")
+            if self.failures:
+                return (False, f"RasterWriter.waitSubScan: {self.failures} rasters not written: {self.lastError}")
+        return (True, "")
+
+    def _run(self) -> None:
+        while True:
+            job = self.jobs.get()
+            try:
+                self._submit(job)
+            except Exception as e:
+                self.logger.exception(e)
+                self._onDone(job, False, f"RasterWriter: {e}")
+            finally:
+                self.jobs.task_done()
+
+    def _submit(self, job: RasterJob) -> None:
+        records = self._makeRecords(job)
+
+        def onComplete(success: bool, msg: str) -> None:
+            # called on the DBWriter thread:
+            self._onDone(job, success, msg)
+
+        description = f"raster {job.index} Y={job.yPos}"
+        if not records:
+            self._onDone(job, True, "")
+        elif not self.writer.submit(self.table, records, onComplete, description):
+            self._onDone(job, False, f"database writer queue full, dropped {description}")
+
+    def _makeRecords(self, job: RasterJob) -> list[BPRawDatum]:
+        """Convert a raster to rows as whole columns
+
+        The columns are validated once as float arrays, so the per-row records are built without validation.
+        """
+        xAxis = np.asarray(job.xAxisList, dtype = float)
+        if job.reverseX:
+            xAxis = xAxis[::-1]
+        amplitude = job.amplitude
+        phase = job.phase
+        count = min(len(xAxis), len(amplitude), len(phase))
+        common = dict(
+            fkBeamPattern = int(job.fkBeamPattern),
+            Pol = int(job.pol),
+            Position_Y = float(job.yPos),
+            SourceAngle = float(job.scanAngle),
+            timeStamp = job.timeStamp
+        )
+        return [BPRawDatum.model_construct(Position_X = x, Power = amp, Phase = ph, **common) 
+            for x, amp, ph in zip(xAxis[:count].tolist(), amplitude[:count].tolist(), phase[:count].tolist())]
+
+    def _onDone(self, job: RasterJob, success: bool, msg: str) -> None:
+        with self.cv:
+            # a late result from an earlier subscan doesn't count towards the current one:
+            if job.subScan == self.subScan:
+                self.pending -= 1
+                if not success:
+                    self.failures += 1
+                    self.lastError = msg
+                self.cv.notify_all()
+        if not success and job.onError:
+            job.onError(msg, job.fkBeamPattern)
@@ -0,0 +1,217 @@
+import logging
+import yaml
+from math import sqrt
+from pydantic import BaseModel
+from .AdaptiveGrid import AdaptiveGrid
+
+class ScanTiming(BaseModel):
+    """Motion and overhead parameters for estimating beam scan durations
+
+    Speeds default to the BeamScanner's.  The overheads are typical values for the CTS
+    and can be calibrated against the actual subscan times which the BeamScanner logs.
+    """
+    xySpeedPositioning: float = 40      # mm/sec
+    xySpeedScanning: float = 20         # mm/sec
+    polSpeed: float = 10                # deg/sec
+    xyAccel: float = 50                 # mm/sec^2
+    polAccel: float = 10                # deg/sec^2
+    triggerPeriod: float = 0.005        # sec.  PNA time per triggered point.  Limits the scanning speed
+    loLockTime: float = 15              # sec.  Lock the LO, set the receiver bias and LO power
+    rfLockTime: float = 5               # sec.  Lock the RF source
+    levelTime: float = 15               # sec.  RF source auto-level
+    centerPowerTime: float = 2          # sec.  Measure the beam center power, not including the moves
+    rowOverhead: float = 1.5            # sec.  Per raster: PNA configuration and trace transfer
+    subScanOverhead: float = 2          # sec.  Per subscan: database records and IF configuration
+    adaptiveDenseFraction: float = 0.3  # adaptive scans: fraction of the non-coarse rows measured in the refine pass
+
+class PlannedSubScan(BaseModel):
+    scanIndex: int                      # ScanListItem.index
+    subScanIndex: int                   # SubScan.index
+    RF: float
+    LO: float
+    subScanText: str = ""
+    scanAngle: float = 0
+    levelAngle: float = 0
+    relockLO: bool = True
+    relockRF: bool = True
+    rows: int = 0
+    centers: int = 0                    # beam center power measurements, including the first and last
+    startTime: float = 0                # sec from the start of the scan list
+    duration: float = 0                 # sec
+
+class ScanPlan(BaseModel):
+    items: list[PlannedSubScan] = []
+    totalTime: float = 0                # sec
+    listOrderTime: float = 0            # sec if run in the order of the scan list
+    optimized: bool = False
+
+class ScanPlanner():
+    """Orders the subscans of a ScanList and estimates how long they will take
+
+    Items with the same LO and RF are made adjacent so that the locks can be kept between them,
+    and the subscans of each item are ordered by level angle, alternating direction from one
+    item to the next, so that the pol axis does not rotate back at every item boundary.
+    The time estimate replays the BeamScanner's scan loop: trapezoidal moves on each axis,
+    rasters at the scanning speed and beam center measurements every centersInterval.
+    """
+    SETTINGS_FILE = "Settings/Settings_BeamScanTiming.yaml"
+    FREQ_RESOLUTION = 0.001     # GHz.  Frequencies closer than this are the same
+
+    def __init__(self, fileName: str = None):
+        self.logger = logging.getLogger("ALMAFE-CTS-Control")
+        self.fileName = fileName if fileName else self.SETTINGS_FILE
+        self.loadSettings()
+
+    def loadSettings(self) -> None:
+        try:
+            with open(self.fileName, "r") as f:
+                d = yaml.safe_load(f)
+                self.timing = ScanTiming.model_validate(d)
+        except Exception as e:
+            self.timing = ScanTiming()
+
+    def saveSettings(self) -> None:
+        try:
+            with open(self.fileName, "w") as f:
+                yaml.dump(self.timing.model_dump(), f)
+        except Exception as e:
+            self.logger.error(f"ScanPlanner.saveSettings: {e}")
+
+    def plan(self, scanList, measurementSpec, optimize: bool = True, reuseLocks: bool = True) -> ScanPlan:
+        """Make the plan for the enabled items of a scan list
+
+        :param scanList: ScanList.  makeSubScans() is called on each enabled item.
+        :param measurementSpec: MeasurementSpec
+        :param optimize: if False keep the scan list order
+        :param reuseLocks: if True the BeamScanner keeps the LO and RF locks between subscans at the same frequencies
+        """
+        scanList.updateIndex()
+        items = [item for item in scanList.items if item.enable]
+        for item in items:
+            item.makeSubScans()
+        listOrder = [(item, list(item.subScans)) for item in items]
+        listOrderPlan = self._estimate(listOrder, measurementSpec, reuseLocks)
+        if not optimize:
+            return listOrderPlan
+
+        ordered = []
+        ascending = True
+        for item in sorted(items, key = lambda item: (round(item.LO / self.FREQ_RESOLUTION), round(item.RF / self.FREQ_RESOLUTION))):
+            subScans = sorted(item.subScans, key = lambda subScan: self._angles(subScan, measurementSpec)[1], reverse = not ascending)
+            # only change direction when the item actually had a pol rotation to reverse:
+            if len(set(self._angles(subScan, measurementSpec)[1] for subScan in subScans)) > 1:
+                ascending = not ascending
+            ordered.append((item, subScans))
+        plan = self._estimate(ordered, measurementSpec, reuseLocks)
+        plan.listOrderTime = listOrderPlan.totalTime
+        plan.optimized = True
+        return plan
+
+    def moveTime(self, distance: float, speed: float, accel: float) -> float:
+        """Time for a trapezoidal or triangular move profile which starts and ends at rest"""
+        distance = abs(distance)
+        if distance == 0 or speed <= 0:
+            return 0
+        if accel <= 0:
+            return distance / speed
+        if distance >= speed * speed / accel:
+            return distance / speed + speed / accel
+        return 2 * sqrt(distance / accel)
+
+    def _move(self, fromPos: tuple[float, float, float], toPos: tuple[float, float, float], xySpeed: float) -> float:
+        # the axes move together so the slowest one sets the time:
+        t = self.timing
+        return max(
+            self.moveTime(toPos[0] - fromPos[0], xySpeed, t.xyAccel),
+            self.moveTime(toPos[1] - fromPos[1], xySpeed, t.xyAccel),
+            self.moveTime(toPos[2] - fromPos[2], t.polSpeed, t.polAccel)
+        )
+
+    def _angles(self, subScan, measurementSpec) -> tuple[float, float]:
+        """(scanAngle, levelAngle) as computed in BeamScanner.__runAllScans"""
+        scanAngle = measurementSpec.scanAngles[subScan.getScanAngleIndex()]
+        levelAngle = measurementSpec.scanAngles[subScan.pol]
+        if subScan.is180:
+            scanAngle += 180
+            levelAngle += 180
+        return scanAngle, levelAngle
+
+    def _rows(self, measurementSpec) -> list[float]:
+        """The y positions in the order they will be scanned"""
+        yAxisList = measurementSpec.makeYAxisList()
+        if not getattr(measurementSpec, 'adaptive', False):
+            return yAxisList
+        # coarse rows then the expected refine rows, which are normally those nearest the beam center:
+        coarse = AdaptiveGrid(len(yAxisList), 1, measurementSpec.coarseFactor).coarseRows()
+        others = sorted(set(range(len(yAxisList))) - set(coarse), key = lambda row: abs(yAxisList[row] - measurementSpec.beamCenter.y))
+        dense = sorted(others[:round(len(others) * self.timing.adaptiveDenseFraction)])
+        return [yAxisList[row] for row in coarse + dense]
+
+    def _estimate(self, ordered: list, measurementSpec, reuseLocks: bool) -> ScanPlan:
+        t = self.timing
+        spec = measurementSpec
+        yAxisList = self._rows(spec)
+        width = abs(spec.scanEnd.x - spec.scanStart.x)
+        scanSpeed = t.xySpeedScanning
+        if t.triggerPeriod > 0:
+            scanSpeed = min(scanSpeed, spec.resolution / t.triggerPeriod)
+        rasterTime = self.moveTime(width, scanSpeed, t.xyAccel)
+
+        plan = ScanPlan()
+        clock = 0
+        pos = None
+        lockedLO = lockedRF = None
+        for item, subScans in ordered:
+            for subScan in subScans:
+                scanAngle, levelAngle = self._angles(subScan, spec)
+                center = (spec.beamCenter.x, spec.beamCenter.y, levelAngle)
+                planned = PlannedSubScan(
+                    scanIndex = item.index,
+                    subScanIndex = subScan.index,
+                    RF = item.RF,
+                    LO = item.LO,
+                    subScanText = subScan.getText(),
+                    scanAngle = scanAngle,
+                    levelAngle = levelAngle,
+                    relockLO = not (reuseLocks and lockedLO is not None and abs(lockedLO - item.LO) < self.FREQ_RESOLUTION),
+                    rows = len(yAxisList),
+                    startTime = clock
+                )
+                planned.relockRF = planned.relockLO or not (reuseLocks and lockedRF is not None and abs(lockedRF - item.RF) < self.FREQ_RESOLUTION)
+                lockedLO, lockedRF = item.LO, item.RF
+
+                elapsed = t.subScanOverhead
+                if planned.relockLO:
+                    elapsed += t.loLockTime
+                if planned.relockRF:
+                    elapsed += t.rfLockTime
+                elapsed += self._move(pos, center, t.xySpeedPositioning) if pos else 0
+                elapsed += t.levelTime + t.centerPowerTime
+                pos = center
+                planned.centers = 1
+                lastCenter = clock + elapsed
+
+                for rasterIndex, y in enumerate(yAxisList):
+                    reverseX = spec.scanBidirectional and (rasterIndex % 2 != 0)
+                    if reverseX and clock + elapsed - lastCenter > spec.centersInterval:
+                        elapsed += self._move(pos, center, t.xySpeedPositioning) + t.centerPowerTime
+                        pos = center
+                        lastCenter = clock + elapsed
+                        planned.centers += 1
+                    startX, endX = (spec.scanEnd.x, spec.scanStart.x) if reverseX else (spec.scanStart.x, spec.scanEnd.x)
+                    startPos = (startX, y, scanAngle)
+                    elapsed += self._move(pos, startPos, t.xySpeedPositioning)
+                    elapsed += rasterTime + t.rowOverhead
+                    pos = (endX, y, scanAngle)
+
+                # final beam center power:
+                elapsed += self._move(pos, center, t.xySpeedPositioning) + t.centerPowerTime
+                pos = center
+                planned.centers += 1
+
+                planned.duration = elapsed
+                clock += elapsed
+                plan.items.append(planned)
+        plan.totalTime = clock
+        plan.listOrderTime = clock
+        return plan
@@ -0,0 +1,119 @@
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from enum import Enum
+from pydantic import BaseModel
+from typing import Callable, Optional
+
+class WatchdogAction(Enum):
+    ABORT = "ABORT"         # stop all scans
+    RETRY = "RETRY"         # re-measure the affected row.  Abort the subscan if the fault persists
+
+class WatchdogEvent(BaseModel):
+    check: str
+    action: WatchdogAction
+    msg: str
+    timeStamp: datetime
+    recovered: Optional[datetime] = None
+
+class ScanWatchdog():
+    """Polls health checks on its own thread while a beam scan runs
+
+    Each check is a function returning True when healthy.  When one fails a timestamped event
+    is recorded and the faulted flag is set, so the scan loop only has to look at the flag and
+    at the events since a row started.  The flag clears when all checks are healthy again.
+    Exceptions raised by a check are logged and the check is skipped for that poll.
+    A check may also return None to be skipped, for example when its device is busy.
+    """
+    MAX_EVENTS = 100
+
+    def __init__(self, pollInterval: float = 0.5):
+        """
+        :param pollInterval: seconds between polls of all checks
+        """
+        self.logger = logging.getLogger("ALMAFE-CTS-Control")
+        self.pollInterval = pollInterval
+        self.checks = {}
+        self.events = deque(maxlen = self.MAX_EVENTS)
+        self.faults = {}
+        self.faulted = threading.Event()
+        self.startTime = datetime.now()
+        self.lock = threading.Lock()
+        self.stopEvent = threading.Event()
+        self.thread = None
+
+    def addCheck(self, name: str, action: WatchdogAction, poll: Callable[[], bool], msg: str = "") -> None:
+        """
+        :param name: identifies the check in events
+        :param action: what the scan loop should do when it fails
+        :param poll: returns True when healthy, None if it can't tell now
+        :param msg: describes the fault
+        """
+        self.checks[name] = (action, poll, msg if msg else name)
+
+    def start(self) -> None:
+        """Clear the current faults, poll once so the state is valid immediately, then start polling"""
+        self.stop()
+        with self.lock:
+            self.faults = {}
+            self.faulted.clear()
+            self.startTime = datetime.now()
+        self.pollOnce()
+        self.stopEvent.clear()
+        self.thread = threading.Thread(target = self._run, name = "ScanWatchdog", daemon = True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        if self.thread:
+            self.stopEvent.set()
+            self.thread.join()
+            self.thread = None
+
+    def pollOnce(self) -> None:
+        for name, (action, poll, msg) in list(self.checks.items()):
+            try:
+                healthy = poll()
+            except Exception as e:
+                self.logger.error(f"ScanWatchdog {name}: {e}")
+                continue
+            if healthy is None:
+                continue
+            with self.lock:
+                if not healthy and name not in self.faults:
+                    event = WatchdogEvent(check = name, action = action, msg = msg, timeStamp = datetime.now())
+                    self.faults[name] = event
+                    self.events.append(event)
+                    self.faulted.set()
+                    self.logger.warning(f"ScanWatchdog: {msg}")
+                elif healthy and name in self.faults:
+                    self.faults.pop(name).recovered = datetime.now()
+                    if not self.faults:
+                        self.faulted.clear()
+                    self.logger.info(f"ScanWatchdog: recovered from {msg}")
+
+    def fault(self) -> Optional[WatchdogEvent]:
+        """The current fault, ABORT faults first, or None if all checks are healthy"""
+        if not self.faulted.is_set():
+            return None
+        with self.lock:
+            faults = sorted(self.faults.values(), key = lambda event: event.action != WatchdogAction.ABORT)
+            return faults[0] if faults else None
+
+    def eventsSince(self, since: datetime) -> list[WatchdogEvent]:
+        """Faults since the last start() which were present at any time from since until now
+
+        Recovery is detected up to pollInterval after it happens, so that much is added before since.
+        """
+        since -= timedelta(seconds = self.pollInterval)
+        with self.lock:
+            return [event for event in self.events 
+                if event.timeStamp >= self.startTime and (event.recovered is None or event.recovered >= since)]
+
+    def getEvents(self) -> list[WatchdogEvent]:
+        with self.lock:
+            return list(self.events)
+
+    def _run(self) -> None:
+        while not self.stopEvent.wait(self.pollInterval):
+            self.pollOnce()
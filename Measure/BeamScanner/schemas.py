@@ -122,6 +122,14 @@ class MeasurementSpec(BaseModel):
     ifAttenuator: int = 22
     centersInterval: float = 300 # 5 minutes
     scanBidirectional: bool = True
+    optimizeOrder: bool = True  # run the scan list in the ScanPlanner's order
+    reuseLocks: bool = True     # keep the LO and RF locks between subscans at the same frequencies
+    adaptive: bool = False      # coarse-to-fine rows.  See AdaptiveGrid
+    coarseFactor: int = 4       # coarse pass row spacing, in multiples of resolution
+    refineAmpThreshold: float = 3.0     # dB change between coarse rows which causes the rows between to be measured
+    refinePhaseThreshold: float = 30.0  # deg
+    refineAmpFloor: float = -50.0       # dB relative to the peak.  Points below this don't cause refinement
+    rasterGridOnDisk: bool = True       # back each subscan's raster grid with memory-mapped files
 
     def makeYAxisList(self) -> List[float]:
         y = float(self.scanStart.y)
@@ -164,6 +172,7 @@ class ScanStatus(BaseModel):
     activeScan: int = None
     activeSubScanIndex: int = None
     activeSubScan: str = None
+    timeRemaining: Optional[float] = None   # sec.  Estimated from the scan plan
     message: str = None
     error: bool = False
 
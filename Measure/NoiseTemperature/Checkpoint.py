@@ -0,0 +1,249 @@
+import json
+import logging
+import os
+import threading
+import yaml
+from datetime import datetime
+from enum import Enum
+from pydantic import BaseModel
+from typing import Callable, Iterable, Optional
+
+class StepType(Enum):
+    WARM_IF = "WARM_IF"
+    NOISE_TEMP = "NOISE_TEMP"
+    IMAGE_REJECT = "IMAGE_REJECT"
+
+class CheckpointPoint(BaseModel):
+    freqLO: float       # GHz
+    freqIF: float       # GHz.  0 for a swept LO, which is resumed as a unit
+    pol: int
+    stepType: StepType
+
+class TestCheckpoint(BaseModel):
+    points: list[CheckpointPoint] = []
+    timeStamp: Optional[datetime] = None
+
+class CheckpointData(BaseModel):
+    # keyed by CartTest or MixerTest key:
+    tests: dict[int, TestCheckpoint] = {}
+
+class NoiseTempCheckpoint():
+    """Persisted record of the (LO, IF, pol, step type) points of a noise temperature test whose data has been written
+
+    The scripts mark points done from the DBWriter onComplete callback, so a point is only
+    skipped on resume if its records are in the database.
+    Points marked done are appended to a journal next to the YAML file, which is rewritten
+    only when the journal reaches COMPACT_ENTRIES, on flush() and on clear().
+    Only the most recent MAX_TESTS tests are kept.
+    """
+    CHECKPOINT_FILE = "Settings/NoiseTempCheckpoint.yaml"
+    FREQ_RESOLUTION = 0.001     # GHz.  Frequencies closer than this are the same
+    MAX_TESTS = 10
+    COMPACT_ENTRIES = 500       # rewrite the YAML file when the journal has this many points
+
+    def __init__(self, fileName: str = None):
+        self.logger = logging.getLogger("ALMAFE-CTS-Control")
+        self.fileName = fileName if fileName else self.CHECKPOINT_FILE
+        self.journalName = os.path.splitext(self.fileName)[0] + ".journal"
+        self.journalEntries = 0
+        self.lock = threading.Lock()
+        self.loadCheckpoint()
+
+    def loadCheckpoint(self) -> None:
+        try:
+            with open(self.fileName, "r") as f:
+                d = yaml.safe_load(f)
+                self.data = CheckpointData.model_validate(d)
+        except Exception as e:
+            self.data = CheckpointData()
+        self.done = {key: set(self._index(p.freqLO, p.freqIF, p.pol, p.stepType) for p in test.points)
+            for key, test in self.data.tests.items()}
+        # replay the points marked since the YAML file was written:
+        self.journalEntries = 0
+        try:
+            with open(self.journalName, "r") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        point = CheckpointPoint.model_validate(entry['point'])
+                    except Exception:
+                        # a line cut short by a crash:
+                        continue
+                    self._add(entry['testKey'], point, datetime.fromisoformat(entry['timeStamp']))
+                    self.journalEntries += 1
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.error(f"NoiseTempCheckpoint.loadCheckpoint: {e}")
+
+    def saveCheckpoint(self) -> None:
+        # call with self.lock held.  Writes the YAML file and empties the journal:
+        try:
+            temp = self.fileName + ".tmp"
+            with open(temp, "w") as f:
+                yaml.dump(self.data.model_dump(mode = 'json'), f, sort_keys = False)
+            os.replace(temp, self.fileName)
+            with open(self.journalName, "w"):
+                pass
+            self.journalEntries = 0
+        except Exception as e:
+            self.logger.error(f"NoiseTempCheckpoint.saveCheckpoint: {e}")
+
+    def flush(self) -> None:
+        """Fold the journal into the YAML file"""
+        with self.lock:
+            if self.journalEntries:
+                self.saveCheckpoint()
+
+    def hasCheckpoint(self, testKey: int) -> bool:
+        with self.lock:
+            return bool(self.done.get(testKey))
+
+    def getPoints(self, testKey: int) -> list[CheckpointPoint]:
+        with self.lock:
+            test = self.data.tests.get(testKey)
+            return list(test.points) if test else []
+
+    def markDone(self,
+            testKey: int,
+            freqLO: float,
+            freqIFs: Iterable[float],
+            pols: Iterable[int],
+            stepTypes: Iterable[StepType]
+        ) -> None:
+        """Mark every combination of the given IFs, pols and step types done at freqLO"""
+        timeStamp = datetime.now()
+        with self.lock:
+            lines = []
+            for freqIF in freqIFs:
+                for pol in pols:
+                    for stepType in stepTypes:
+                        point = CheckpointPoint(freqLO = freqLO, freqIF = freqIF, pol = pol, stepType = stepType)
+                        if self._add(testKey, point, timeStamp):
+                            lines.append(json.dumps({'testKey': testKey, 'point': point.model_dump(mode = 'json'), 'timeStamp': timeStamp.isoformat()}))
+            if not lines:
+                return
+            self.journalEntries += len(lines)
+            if self.journalEntries >= self.COMPACT_ENTRIES:
+                self.saveCheckpoint()
+                return
+            try:
+                with open(self.journalName, "a") as f:
+                    f.write("\n".join(lines) + "\n")
+            except Exception as e:
+                self.logger.error(f"NoiseTempCheckpoint.markDone: {e}")
+
+    def remaining(self,
+            testKey: int,
+            freqLO: float,
+            freqIF: float,
+            pols: Iterable[int],
+            stepTypes: Iterable[StepType]
+        ) -> list[StepType]:
+        """The step types which are not yet done for all of pols at (freqLO, freqIF)"""
+        with self.lock:
+            done = self.done.get(testKey, set())
+            return [stepType for stepType in stepTypes
+                if any(self._index(freqLO, freqIF, pol, stepType) not in done for pol in pols)]
+
+    def isStarted(self,
+            testKey: int,
+            freqLO: float,
+            freqIF: float,
+            pols: Iterable[int],
+            stepTypes: Iterable[StepType]
+        ) -> bool:
+        """True if any of stepTypes is done for any of pols at (freqLO, freqIF)"""
+        with self.lock:
+            done = self.done.get(testKey, set())
+            return any(self._index(freqLO, freqIF, pol, stepType) in done for pol in pols for stepType in stepTypes)
+
+    def hasRecord(self,
+            testKey: int,
+            freqLO: float,
+            freqIF: float,
+            pols: Iterable[int],
+            stepTypes: Iterable[StepType]
+        ) -> bool:
+        """True if the record for (freqLO, freqIF) has been written and so must not be measured again
+
+        The scripts write all of stepTypes for a point as one record.  If the test steps changed between
+        runs the record may have only some of them.  That is logged, and the point is still skipped
+        because measuring it again would insert a second record.
+        """
+        stepTypes = list(stepTypes)
+        if not self.isStarted(testKey, freqLO, freqIF, pols, stepTypes):
+            return False
+        remaining = self.remaining(testKey, freqLO, freqIF, pols, stepTypes)
+        if remaining:
+            self.logger.warning(f"NoiseTempCheckpoint: LO={freqLO:.2f} IF={freqIF:.2f} GHz was written without {[s.value for s in remaining]}. Not measuring it again.")
+        return True
+
+    def isDone(self,
+            testKey: int,
+            freqLO: float,
+            freqIF: float,
+            pols: Iterable[int],
+            stepTypes: Iterable[StepType]
+        ) -> bool:
+        return not self.remaining(testKey, freqLO, freqIF, pols, stepTypes)
+
+    def onWritten(self,
+            testKey: int,
+            freqLO: float,
+            freqIFs: Iterable[float],
+            pols: Iterable[int],
+            stepTypes: Iterable[StepType]
+        ) -> Callable[[bool, str], None]:
+        """Make a DBWriter onComplete callback which marks the points done if the write succeeded"""
+        freqIFs, pols, stepTypes = list(freqIFs), list(pols), list(stepTypes)
+        def callback(success: bool, msg: str) -> None:
+            if success:
+                self.markDone(testKey, freqLO, freqIFs, pols, stepTypes)
+        return callback
+
+    def clear(self, testKey: int = None) -> None:
+        """Forget the checkpoint for one test, or all of them"""
+        with self.lock:
+            if testKey is None:
+                self.data.tests = {}
+                self.done = {}
+            else:
+                self.data.tests.pop(testKey, None)
+                self.done.pop(testKey, None)
+            self.saveCheckpoint()
+
+    def _add(self, testKey: int, point: CheckpointPoint, timeStamp: datetime) -> bool:
+        # call with self.lock held.  Returns False if the point was already done:
+        test = self.data.tests.get(testKey)
+        if test is None:
+            test = self.data.tests[testKey] = TestCheckpoint()
+            self.done[testKey] = set()
+            self._prune()
+        test.timeStamp = timeStamp
+        index = self._index(point.freqLO, point.freqIF, point.pol, point.stepType)
+        if index in self.done[testKey]:
+            return False
+        self.done[testKey].add(index)
+        test.points.append(point)
+        return True
+
+    def _prune(self) -> None:
+        # tests are kept in the order they were first marked:
+        while len(self.data.tests) > self.MAX_TESTS:
+            oldest = next(iter(self.data.tests))
+            self.data.tests.pop(oldest)
+            self.done.pop(oldest, None)
+
+    def _index(self, freqLO: float, freqIF: float, pol: int, stepType: StepType) -> tuple:
+        return (round(freqLO / self.FREQ_RESOLUTION), round(freqIF / self.FREQ_RESOLUTION), pol, stepType)
+
+def noiseTempCheckpoint() -> NoiseTempCheckpoint:
+    '''
+    test and if necessary create the singleton NoiseTempCheckpoint object
+    '''
+    try:
+        return noiseTempCheckpoint.checkpoint
+    except:
+        noiseTempCheckpoint.checkpoint = NoiseTempCheckpoint()
+        return noiseTempCheckpoint.checkpoint
@@ -0,0 +1,97 @@
+from math import sqrt
+from pydantic import BaseModel
+from Measure.Shared.Welford import Welford
+
+class NoiseTempErrorBars(BaseModel):
+    pol: int
+    sideband: str
+    freqIF: float
+    samplesHot: int
+    samplesCold: int
+    pHotErr: float      # W standard error
+    pColdErr: float
+    Y: float            # linear
+    TRx: float          # K
+    TRxErr: float       # K standard error
+
+class ChopperEstimator():
+    """Sequential estimate of Y-factor and TRx from chopper hot and cold power samples
+
+    Keeps a running mean and variance for each load.  done() is True once both loads have
+    maxSamples, or both have minSamples and the TRx standard error is within targetTRxErr.
+    If targetTRxErr is 0, the criterion is instead both power standard errors within stdErr.
+    """
+    def __init__(self,
+            tHot: float,
+            tCold: float,
+            minSamples: int,
+            maxSamples: int,
+            targetTRxErr: float = 0,
+            stdErr: float = 0):
+        """
+        :param tHot: K hot load temperature
+        :param tCold: K effective cold load temperature
+        :param minSamples: per load
+        :param maxSamples: per load
+        :param targetTRxErr: K
+        :param stdErr: W for each load, if targetTRxErr is 0
+        """
+        self.tHot = tHot
+        self.tCold = tCold
+        self.minSamples = minSamples
+        self.maxSamples = maxSamples
+        self.targetTRxErr = targetTRxErr
+        self.stdErr = stdErr
+        self.hot = Welford()
+        self.cold = Welford()
+
+    def add(self, power: float, isHot: bool) -> None:
+        """Add a linear power sample"""
+        if isHot:
+            self.hot.add(power)
+        else:
+            self.cold.add(power)
+
+    @property
+    def Y(self) -> float:
+        return self.hot.mean / self.cold.mean if self.cold.mean else float('nan')
+
+    @property
+    def TRx(self) -> float:
+        Y = self.Y
+        return (self.tHot - self.tCold * Y) / (Y - 1) if Y != 1 else float('inf')
+
+    @property
+    def TRxErr(self) -> float:
+        """Standard error of TRx propagated from the hot and cold standard errors"""
+        if not self.hot.mean or not self.cold.mean or self.hot.count < 2 or self.cold.count < 2:
+            return float('inf')
+        Y = self.Y
+        if Y == 1:
+            return float('inf')
+        YErr = Y * sqrt((self.hot.stdErr / self.hot.mean) ** 2 + (self.cold.stdErr / self.cold.mean) ** 2)
+        # dTRx/dY = (tCold - tHot) / (Y - 1)^2:
+        return abs(self.tHot - self.tCold) / (Y - 1) ** 2 * YErr
+
+    def done(self) -> bool:
+        if self.hot.count >= self.maxSamples and self.cold.count >= self.maxSamples:
+            return True
+        if self.hot.count < self.minSamples or self.cold.count < self.minSamples:
+            return False
+        if self.targetTRxErr:
+            return self.TRxErr <= self.targetTRxErr
+        return self.hot.stdErr <= self.stdErr and self.cold.stdErr <= self.stdErr
+
+    def errorBars(self, pol: int, sideband: str, freqIF: float) -> NoiseTempErrorBars:
+        return NoiseTempErrorBars(
+            pol = pol,
+            sideband = sideband,
+            freqIF = freqIF,
+            samplesHot = self.hot.count,
+            samplesCold = self.cold.count,
+            pHotErr = self.hot.stdErr,
+            pColdErr = self.cold.stdErr,
+            Y = self.Y,
+            TRx = self.TRx,
+            TRxErr = self.TRxErr
+        )
@@ -2,8 +2,7 @@ import time
 from datetime import datetime
 import logging
 from typing import Optional
-from statistics import mean, stdev
-from math import sqrt, log10
+from math import log10
 from INSTR.SignalGenerator.Keysight_PSG_MXG import SignalGenerator
 from INSTR.TemperatureMonitor.Lakeshore218 import TemperatureMonitor
 from INSTR.PowerSupply.AgilentE363xA import PowerSupply
@@ -21,10 +20,15 @@ from Measure.Shared.DataDisplay import DataDisplay
 from Measure.Shared.makeSteps import makeSteps
 from Measure.Shared.SelectPolarization import SelectPolarization
 from Measure.Shared.Sampler import Sampler
-from Measure.Shared.SelectSIS import SelectSIS
+from Measure.Shared.Telemetry import TelemetryService, TelemetrySnapshot
 from Measure.NoiseTemperature.SettingsContainer import SettingsContainer
+from Measure.NoiseTemperature.NoiseTempReduction import ReducedNoiseTemp, reduceNoiseTemp, recordsToArrays
+from Measure.NoiseTemperature.NoiseTempSweep import NoiseTempSweep, NoiseTempSweepPoint
+from Measure.NoiseTemperature.SweepScheduler import SweepLoad, SweepStepTimer, planSweep
+from Measure.NoiseTemperature.ChopperEstimator import ChopperEstimator
+from Measure.NoiseTemperature.YFactorEstimator import YFactorEstimator
 from .schemas import CommonSettings, WarmIFSettings, NoiseTempSettings, YFactorSettings, ChopperPowers, \
-    SpecAnPowers, YFactorSample, BiasOptSettings, YFactorPowers
+    YFactorSample, BiasOptSettings, YFactorPowers
 from DBBand6Cart.schemas.WarmIFNoise import WarmIFNoise
 from DBBand6Cart.schemas.NoiseTempRawDatum import NoiseTempRawDatum
 from DBBand6Cart.schemas.DUT_Type import DUT_Type
@@ -63,6 +67,9 @@ class NoiseTempActions():
         self.dutType = dutType
         self.settings = settings
         self.ifAutoLevel = IFAutoLevel(self.ifSystem, self.powerDetect, self.chopper)
+        self.telemetry = TelemetryService(self.receiver, self.tempMonitor)
+        self.sweepTimings = []
+        self.freqLO = None
         self._reset()
 
     def _reset(self) -> None:
@@ -109,6 +116,8 @@ class NoiseTempActions():
             setBias: bool = True,
         ) -> tuple[bool, str]:
 
+        self.freqLO = freqLO
+        self.telemetry.invalidate()
         self.receiver.settings.loSettings.lockLO = lockLO
         msg = "Locking" if lockLO else "Tuning"
         msg += f" LO at {freqLO:.2f} GHz..."
@@ -137,7 +146,7 @@ class NoiseTempActions():
             return True, f"LO LOCK FAILED {'and set bias ' if setBias else ''}at {freqLO:.2f} GHz."
 
     def getLO(self) -> float:
-        return self.receiver.freqLOGHz
+        return self.freqLO
 
     def setIF(self, freqIF: float = 0, ifAutoLevel: bool = True) -> tuple[bool, str]:
 
@@ -145,7 +154,7 @@ class NoiseTempActions():
 
         success, msg = True, ""
         if ifAutoLevel:
-            success, msg = self.ifAutoLevel.autoLevel(self.settings.commonSettings.targetPHot)
+            success, msg = self.ifAutoLevel.autoLevel(self.settings.commonSettings.targetPHot, freqLO = self.freqLO)
         
         if not success:
             self.logger.error(msg)
@@ -270,14 +279,14 @@ class NoiseTempActions():
                 )                
 
         self.measurementStatus.setStatusMessage("Warm IF Noise: Done.")
-        self.dataDisplay.warmIfData = records
+        self.dataDisplay.setWarmIfData(records)
         return records
     
 #### Y-FACTOR #####################################################
 
     def measureYFactor(self, settings: YFactorSettings) -> None:
 
-        self.dataDisplay.yFactorHistory = []
+        self.dataDisplay.yFactorHistory.clear()
         self.dataDisplay.yFactorPowers = []
 
         if self.powerDetect.detect_mode == DetectMode.METER or settings.detectMode == DetectMode.METER:
@@ -296,18 +305,15 @@ class NoiseTempActions():
         self.ifSystem.output_select = OutputSelect.POWER_DETECT
         self.ifSystem.input_select = settings.inputSelect
 
-        chopperPowers = []
+        estimator = YFactorEstimator(settings.windows)
+        openIsHot = self.chopper.openIsHot
 
         def read():
             state = self.chopper.getState()
             power = self.powerDetect.read()
-            chopperPowers.append(
-                ChopperPowers(
-                    inputName = self.ifSystem.input_select.name, 
-                    chopperState = state, 
-                    power = power
-                )
-            )
+            if state in (ChopperState.OPEN, ChopperState.CLOSED):
+                # same orientation as the Y-factor has always used: OPEN is hot, swapped when openIsHot is set:
+                self._addYFactorPower(estimator, power, isHot = (state == ChopperState.OPEN) != openIsHot)
 
         sampling_interval = 1 / self.settings.commonSettings.sampleRate
         calculate_countdown = self.settings.commonSettings.powerMeterConfig.minS
@@ -322,10 +328,8 @@ class NoiseTempActions():
             else:
                 calculate_countdown -= 1
                 if calculate_countdown == 0:
-                    self._calculateYFactor(chopperPowers, retain_samples)
+                    self._calculateYFactor(estimator, retain_samples)
                     calculate_countdown = self.settings.commonSettings.powerMeterConfig.minS
-                if len(chopperPowers) > retain_samples:
-                    chopperPowers = chopperPowers[-retain_samples:]
                 time.sleep(sampling_interval)
         
         sampler.stop()
@@ -355,34 +359,23 @@ class NoiseTempActions():
         self.ifSystem.bandwidth = settings.ifStop - settings.ifStart
 
         retain_samples = 20
-        chopperPowers = []
+        estimator = YFactorEstimator(settings.windows)
 
         def read():
             self.chopper.gotoHot()
             time.sleep(0.5)
-            chopperPowers.append(
-                ChopperPowers(
-                    inputName = self.ifSystem.input_select.name, 
-                    chopperState = ChopperState.OPEN, 
-                    power = self.powerDetect.read()
-                )
-            )
+            self._addYFactorPower(estimator, self.powerDetect.read(), isHot = True)
             self.chopper.gotoCold()
             time.sleep(0.5)
-            chopperPowers.append(
-                ChopperPowers(
-                    inputName = self.ifSystem.input_select.name, 
-                    chopperState = ChopperState.CLOSED, 
-                    power = self.powerDetect.read()
-                )
-            )
+            self._addYFactorPower(estimator, self.powerDetect.read(), isHot = False)
 
         # measure how long hot, cold sweeps take
         timeStart = time.time()
         read()
         sampling_interval = (time.time() - timeStart) * 1.2
         # discard the sample used for measuring:
-        chopperPowers = []
+        estimator.clear()
+        self.dataDisplay.yFactorPowers = []
 
         sampler = Sampler(sampling_interval, read)
         sampler.start()
@@ -392,9 +385,7 @@ class NoiseTempActions():
             if self.measurementStatus.stopNow():
                 done = True
             else:
-                self._calculateYFactor(chopperPowers, retain_samples)                
-                if len(chopperPowers) > retain_samples:
-                    chopperPowers = chopperPowers[-retain_samples:]
+                self._calculateYFactor(estimator, retain_samples)                
                 time.sleep(2 * sampling_interval)
         
         sampler.stop()
@@ -404,35 +395,25 @@ class NoiseTempActions():
         self.measurementStatus.setComplete(True)
         self.finished = True
 
-    def _calculateYFactor(self, chopperPowers: list[ChopperPowers], retainSamples: int):
-        N = self.settings.commonSettings.powerMeterConfig.minS * 3
-        if N > len(chopperPowers):
-            N = len(chopperPowers)
-
-        pHot = [x.power for x in chopperPowers[-N:] if x.chopperState == ChopperState.OPEN]
-        pCold = [x.power for x in chopperPowers[-N:] if x.chopperState == ChopperState.CLOSED]
-        if self.chopper.openIsHot:
-            pHot, pCold = pCold, pHot
-
-        if len(pHot) < 2 or len(pCold) < 2:
-            return
-
-        Y = mean(pHot) - mean(pCold)
-        Ylinear = 10 ** (Y / 10)
+    def _addYFactorPower(self, estimator: YFactorEstimator, power: float, isHot: bool) -> None:
+        """Called on the Sampler thread with each hot or cold power reading"""
+        pair = estimator.add(power, isHot)
+        if pair:
+            yFactorPowers = self.dataDisplay.yFactorPowers
+            yFactorPowers.append(YFactorPowers(inputName = self.ifSystem.input_select.name, pHot = pair[0], pCold = pair[1]))
+            # trim in blocks so appending stays O(1) amortized:
+            if len(yFactorPowers) > 2 * self.dataDisplay.Y_FACTOR_CAPACITY:
+                del yFactorPowers[:-self.dataDisplay.Y_FACTOR_CAPACITY]
+
+    def _calculateYFactor(self, estimator: YFactorEstimator, retainSamples: int):
         tAmb, tErr = self.tempMonitor.readSingle(self.settings.commonSettings.sensorAmbient)
         if tErr or tAmb < 1:
             return
-        TRx = (tAmb - self.settings.commonSettings.tColdEff * Ylinear) / (Ylinear - 1)
-        self.dataDisplay.yFactorHistory.append(YFactorSample(Y = Y, TRx = TRx))
-        if len(self.dataDisplay.yFactorHistory) > retainSamples:
-            self.dataDisplay.yFactorHistory = self.dataDisplay.yFactorHistory[-retainSamples:]
-        self.dataDisplay.yFactorPowers += [
-            YFactorPowers(
-                inputName = self.ifSystem.input_select.name,
-                pHot = h,
-                pCold = c
-            ) for h, c in zip(pHot, pCold)
-        ]
+        windows = estimator.estimate(tAmb, self.settings.commonSettings.tColdEff)
+        primary = next((w for w in windows if w.samples == estimator.primary), None)
+        if primary is None:
+            return
+        self.dataDisplay.addYFactorSample(YFactorSample(Y = primary.Y, TRx = primary.TRx, windows = windows), retainSamples)
 
 #### NOISE TEMPERATURE #####################################
     
@@ -440,9 +421,9 @@ class NoiseTempActions():
             fkTestRecord: int,
             freqLO: float,
             freqIF: float = 0,
-            recordsIn: dict[tuple[int, float], NoiseTempRawDatum] | None = None,
+            recordsIn: NoiseTempSweep | dict[tuple[int, float], NoiseTempRawDatum] | None = None,
             statusMessage: str = None
-        ) -> dict[tuple[int, float], NoiseTempRawDatum] | None:
+        ) -> NoiseTempSweep | dict[tuple[int, float], NoiseTempRawDatum] | None:
         self.rfSrcDevice.setOutputPower(0)
         self.ifSystem.output_select = OutputSelect.POWER_DETECT
         self.ifSystem.input_select = InputSelect.POL0_USB
@@ -496,64 +477,61 @@ class NoiseTempActions():
                 for sideband in sidebands:
                     self.ifSystem.set_pol_sideband(pol, sideband)
                     time.sleep(0.5)
-                    self.dataDisplay.chopperPowerHistory = []
-                    samplesHot = []
-                    samplesCold = []                    
+                    self.dataDisplay.chopperPowerHistory.clear()
                     record = records.get((pol, freqIF), None)
                     if not record:
                         record = self._initRawDatum(fkTestRecord, freqLO, freqIF, pol)
                         records[(pol, freqIF)] = record
                     #select the IF record to be displayed to the user:
-                    self.dataDisplay.currentNoiseTemp[pol] = record
+                    self.dataDisplay.setCurrentNoiseTemp(pol, record)
                     
-                    done = False
-                    while not done:
+                    powerMeterConfig = self.settings.commonSettings.powerMeterConfig
+                    estimator = ChopperEstimator(
+                        tHot = record.TRF_Hot,
+                        tCold = self.settings.commonSettings.tColdEff,
+                        minSamples = powerMeterConfig.minS,
+                        maxSamples = powerMeterConfig.maxS,
+                        # without a hot load temperature fall back on the power standard error:
+                        targetTRxErr = self.settings.commonSettings.targetTRxErr if record.TRF_Hot > 1 else 0,
+                        stdErr = powerMeterConfig.stdErr
+                    )
+                    while not estimator.done():
                         cycleEnd = time.time() + sampleInterval
                         chopperPower = ChopperPowers(
                             inputName = self.ifSystem.input_select.name,
                             chopperState = self.chopper.getState(),
                             power = self.powerDetect.read()
                         )
-                        self.dataDisplay.chopperPowerHistory.append(chopperPower)
+                        self.dataDisplay.addChopperPower(chopperPower)
                         if chopperPower.chopperState == ChopperState.OPEN:
-                            if openIsHot:
-                                samplesHot.append(chopperPower.power)
-                            else:
-                                samplesCold.append(chopperPower.power)    
+                            estimator.add(chopperPower.power, isHot = openIsHot)
                         elif chopperPower.chopperState == ChopperState.CLOSED:
-                            if openIsHot:
-                                samplesCold.append(chopperPower.power)
-                            else:
-                                samplesHot.append(chopperPower.power)    
-        
-                        if len(samplesHot) >= self.settings.commonSettings.powerMeterConfig.maxS and len(samplesCold) >= self.settings.commonSettings.powerMeterConfig.maxS:
-                            done = True
-                        elif len(samplesHot) >= self.settings.commonSettings.powerMeterConfig.minS and len(samplesCold) >= self.settings.commonSettings.powerMeterConfig.minS:
-                            pHotErr = stdev(samplesHot) / sqrt(len(samplesHot))
-                            pColdErr = stdev(samplesCold) / sqrt(len(samplesCold))
-                            if pHotErr <= self.settings.commonSettings.powerMeterConfig.stdErr and pColdErr <= self.settings.commonSettings.powerMeterConfig.stdErr:
-                                done = True
+                            estimator.add(chopperPower.power, isHot = not openIsHot)
     
                         now = time.time()
                         if now < cycleEnd:
                             time.sleep(cycleEnd - now)
 
+                    errorBars = estimator.errorBars(pol, sideband, freqIF)
+                    self.dataDisplay.addNoiseTempErrorBars(errorBars)
+                    self.logger.info(f"Noise temp pol{pol} {sideband} IF={freqIF:.2f} GHz: TRx={errorBars.TRx:.1f} +/- {errorBars.TRxErr:.2f} K " \
+                                     f"samples hot:{errorBars.samplesHot} cold:{errorBars.samplesCold}")
                     if sideband == 'USB':
-                        record.Phot_USB = 10 * log10(mean(samplesHot) * 1000)
-                        record.Pcold_USB = 10 * log10(mean(samplesCold) * 1000)
-                        record.Phot_USB_StdErr = pHotErr
-                        record.Pcold_USB_StdErr = pColdErr
+                        record.Phot_USB = 10 * log10(estimator.hot.mean * 1000)
+                        record.Pcold_USB = 10 * log10(estimator.cold.mean * 1000)
+                        record.Phot_USB_StdErr = errorBars.pHotErr
+                        record.Pcold_USB_StdErr = errorBars.pColdErr
                     else:
-                        record.Phot_LSB = 10 * log10(mean(samplesHot) * 1000)
-                        record.Pcold_LSB = 10 * log10(mean(samplesCold) * 1000)
-                        record.Phot_LSB_StdErr = pHotErr
-                        record.Pcold_LSB_StdErr = pColdErr
+                        record.Phot_LSB = 10 * log10(estimator.hot.mean * 1000)
+                        record.Pcold_LSB = 10 * log10(estimator.cold.mean * 1000)
+                        record.Phot_LSB_StdErr = errorBars.pHotErr
+                        record.Pcold_LSB_StdErr = errorBars.pColdErr
 
     def _measureNoiseTemp_SWEEP(self,
                 freqLO: float,
                 ifSteps: list[float],
                 selectPol: SelectPolarization,
-                records: dict[tuple[int, float], NoiseTempRawDatum],
+                records: NoiseTempSweep,
                 statusMessage: str = None
             ) -> None:
         if statusMessage is None:
@@ -561,71 +539,102 @@ class NoiseTempActions():
         self.measurementStatus.setStatusMessage(statusMessage)
         self.chopper.stop()
         self.rfSrcDevice.setOutputPower(0)
-        self.settings.ntSpecAnSettings.sweepPoints = int((self.noiseTempSettings.ifStop - self.noiseTempSettings.ifStart) / self.noiseTempSettings.ifStep) + 1
-        self.powerDetect.configure(config = self.settings.ntSpecAnSettings, startGHz = self.noiseTempSettings.ifStart, stopGHz = self.noiseTempSettings.ifStop)
-                
-        for pol in 0, 1:
-            if selectPol.testPol(pol):
-                #select the IF record to be displayed to the user:
-                self.dataDisplay.currentNoiseTemp[pol] = records[(pol, ifSteps[0])]
-                
-                #prepare the traces to be displayed to the user:
-                self.dataDisplay.specAnPowerHistory = SpecAnPowers(pol = pol, ifFreqs = ifSteps)
-
-                self.chopper.gotoHot()
-
-                self.ifSystem.set_pol_sideband(pol, 'USB')                        
-                _, amps = self.powerDetect.read()
-
-                self.dataDisplay.specAnPowerHistory.pHotUSB = amps
-
-                for freqIF, amp in zip(ifSteps, amps):
-                    records[(pol, freqIF)].Phot_USB = amp
-
-                if self.receiver.is2SB():
-                    self.ifSystem.set_pol_sideband(pol, 'LSB')
-                    _, amps = self.powerDetect.read()
-
-                    self.dataDisplay.specAnPowerHistory.pHotLSB = amps
-
-                    for freqIF, amp in zip(ifSteps, amps):
-                        records[(pol, freqIF)].Phot_LSB = amp
-
-                self.chopper.gotoCold()
-                
-                self.ifSystem.set_pol_sideband(pol, 'USB')                        
-                _, amps = self.powerDetect.read()
-
-                self.dataDisplay.specAnPowerHistory.pColdUSB = amps
-
-                for freqIF, amp in zip(ifSteps, amps):
-                    records[(pol, freqIF)].Pcold_USB = amp
-
-                if self.receiver.is2SB():
-                    self.ifSystem.set_pol_sideband(pol, 'LSB')
-                    _, amps = self.powerDetect.read()
-
-                    self.dataDisplay.specAnPowerHistory.pColdLSB = amps
+        # one trace point per IF step, so the trace lines up with records.ifFreqs:
+        self.settings.ntSpecAnSettings.sweepPoints = len(ifSteps)
+        self.powerDetect.configure(config = self.settings.ntSpecAnSettings, startGHz = ifSteps[0], stopGHz = ifSteps[-1])
+
+        pols = [pol for pol in (0, 1) if selectPol.testPol(pol)]
+        sidebands = ('USB', 'LSB') if self.receiver.is2SB() else ('USB', )
+        plan = planSweep(pols, sidebands)
+        commonSettings = self.settings.commonSettings
+        # wait for a whole sweep after the chopper and IF switch have settled.  Detectors without a sweep time use their own default:
+        sweepTime = self.powerDetect.sweep_time
+        readArgs = {'delay': sweepTime * commonSettings.sweepDelayFactor} if sweepTime else {}
+        timer = SweepStepTimer()
+        measured = set()    # (pol, sideband) with one load measured
+
+        for step in plan:
+            if self.measurementStatus.stopNow():
+                break
+            timer.begin(step)
+            settle = 0
+            if step.switchIF:
+                self.ifSystem.set_pol_sideband(step.pol, step.sideband)
+                timer.lap('tSwitch')
+                settle = commonSettings.ifSwitchSettleTime
+            if step.moveChopper:
+                if step.load == SweepLoad.HOT:
+                    self.chopper.gotoHot()
+                else:
+                    self.chopper.gotoCold()
+                timer.lap('tChopper')
+                settle = max(settle, commonSettings.chopperSettleTime)
+            time.sleep(settle)
+            timer.lap('tSettle')
+            _, amps = self.powerDetect.read(**readArgs)
+            timer.lap('tAcquire')
+            timer.end()
+
+            records.setTrace(step.pol, step.field, amps)
+            #update the IF record and traces displayed to the user once both loads of a pol and sideband are measured:
+            if (step.pol, step.sideband) in measured:
+                self.dataDisplay.setSpecAnPowers(records.specAnPowers(step.pol))
+                self.dataDisplay.setCurrentNoiseTemp(step.pol, records.makeRecord(step.pol, 0))
+            else:
+                measured.add((step.pol, step.sideband))
 
-                    for freqIF, amp in zip(ifSteps, amps):
-                        records[(pol, freqIF)].Pcold_LSB = amp
+        self.sweepTimings = timer.timings
+        self.logger.info(f"_measureNoiseTemp_SWEEP LO={freqLO:.2f} GHz: {timer.summary()}")
 
     def calcMeanNoiseTemp(self, 
-            records: NoiseTempRawDatum, 
+            records: NoiseTempSweep | dict[tuple[int, float], NoiseTempRawDatum] | list[NoiseTempRawDatum], 
             ifStart: float, 
             ifStop: float
         ) -> float:
+        if isinstance(records, NoiseTempSweep):
+            result = self.reduceNoiseTemp(records)
+            mask = result.bandMask(ifStart, ifStop)
+            # USB of the pols present, as for the records case below:
+            TRx = result.TRx[records.pols, 0][:, mask]
+            return float(TRx.mean()) if TRx.size else float('nan')
+
         if isinstance(records, dict):
             _records = list(records.values())
         else:
             _records = records
 
-        sum = 0
         _records = [rec for rec in _records if ifStart <= rec.CenterIF <= ifStop]
-        for rec in _records:
-            Y = (10 ** (rec.Phot_USB / 10)) / (10 ** (rec.Pcold_USB / 10))
-            sum += (rec.TRF_Hot - self.settings.commonSettings.tColdEff * Y) / (Y - 1)
-        return sum / len(_records)
+        if not _records:
+            return float('nan')
+        result = reduceNoiseTemp(
+            [rec.CenterIF for rec in _records],
+            [rec.Phot_USB for rec in _records],
+            [rec.Pcold_USB for rec in _records],
+            [rec.TRF_Hot for rec in _records],
+            self.settings.commonSettings.tColdEff
+        )
+        return float(result.TRx.mean())
+
+    def reduceNoiseTemp(self,
+            records: NoiseTempSweep | dict[tuple[int, float], NoiseTempRawDatum] | list[NoiseTempRawDatum],
+            withImageReject: bool = False
+        ) -> ReducedNoiseTemp:
+        """Batched Y-factor, TRx and Tssb for all pols, sidebands and IFs in records
+
+        :param withImageReject: if True, correct Tssb using the image rejection stored in the records
+        :return ReducedNoiseTemp with arrays shaped (pol, sideband, IF)
+        """
+        if isinstance(records, NoiseTempSweep):
+            ifFreqs, pHot, pCold, tHot, imageReject = records.toArrays()
+        else:
+            if isinstance(records, dict):
+                records = list(records.values())
+            ifFreqs, pHot, pCold, tHot, imageReject = recordsToArrays(records)
+        return reduceNoiseTemp(
+            ifFreqs, pHot, pCold, tHot,
+            self.settings.commonSettings.tColdEff,
+            imageReject if withImageReject else None
+        )
 
 #### IMAGE REJECTION #####################################
     
@@ -633,8 +642,8 @@ class NoiseTempActions():
             fkTestRecord: int,
             freqLO: float,
             freqIF: float,
-            recordsIn: dict[tuple[int, float], NoiseTempRawDatum] | None = None
-        ) -> dict[tuple[int, float], NoiseTempRawDatum] | None:
+            recordsIn: NoiseTempSweep | dict[tuple[int, float], NoiseTempRawDatum] | None = None
+        ) -> NoiseTempSweep | dict[tuple[int, float], NoiseTempRawDatum] | None:
         
         if not self.receiver.is2SB():
             return None
@@ -664,7 +673,7 @@ class NoiseTempActions():
             freqLO: float,
             freqIF: float,
             selectPol: SelectPolarization,
-            records: dict[tuple[int, float], NoiseTempRawDatum]) -> None:
+            records: NoiseTempSweep | dict[tuple[int, float], NoiseTempRawDatum]) -> None:
 
         self.measurementStatus.setStatusMessage(f"Measure image rejection LO={freqLO:.2f} GHz, IF={freqIF:.2f} GHz...")
         self.powerDetect.configure(units = 'dBm', fast_mode = False)
@@ -675,7 +684,7 @@ class NoiseTempActions():
                 if not record:
                     record = self._initRawDatum(fkTestRecord, freqLO, freqIF, pol)
                     records[(pol, freqIF)] = record
-                self.dataDisplay.currentNoiseTemp[pol] = record
+                self._displayRecord(pol, record)
 
                 if record.Is_LO_Unlocked:
                     # can't take data if the LO is unlocked.
@@ -725,6 +734,8 @@ class NoiseTempActions():
                         time.sleep(0.25)                
                         record.PwrUSB_SrcLSB = self.powerDetect.read()
 
+                self._displayRecord(pol, record)
+
         self.rfSrcDevice.setOutputPower(0)
         
     def _measureImageReject_SWEEP(self,
@@ -732,7 +743,7 @@ class NoiseTempActions():
             freqLO: float,
             freqIF: float,
             selectPol: SelectPolarization,
-            records: dict[tuple[int, float], NoiseTempRawDatum]) -> tuple[bool, str]:         
+            records: NoiseTempSweep | dict[tuple[int, float], NoiseTempRawDatum]) -> tuple[bool, str]:         
         
         self.powerDetect.configure(config = self.settings.irSpecAnSettings)            
         for pol in (0, 1):
@@ -747,7 +758,7 @@ class NoiseTempActions():
                 if not record:
                     record = self._initRawDatum(fkTestRecord, freqLO, freqIF, pol)
                     records[(pol, freqIF)] = record
-                self.dataDisplay.currentNoiseTemp[pol] = record
+                self._displayRecord(pol, record)
 
                 if record.Is_LO_Unlocked:
                     # can't take data if the LO is unlocked.
@@ -816,6 +827,8 @@ class NoiseTempActions():
                             record.PwrUSB_SrcLSB = self.powerDetect.read(averaging = 100, delay = 1)
                         
                     self.rfSrcDevice.setOutputPower(0)
+
+                self._displayRecord(pol, record)
                 
                 if self.measurementStatus.stopNow():
                     self.rfSrcDevice.setOutputPower(0)
@@ -828,93 +841,58 @@ class NoiseTempActions():
 
 #### PRIVATE HELPER METHODS #######################################
 
+    def _displayRecord(self, pol: int, record: NoiseTempRawDatum | NoiseTempSweepPoint) -> None:
+        """select the IF record to be displayed to the user"""
+        if isinstance(record, NoiseTempSweepPoint):
+            record = record.toRecord()
+        self.dataDisplay.setCurrentNoiseTemp(pol, record)
+
+    def _telemetry(self, pols: tuple[int, ...]) -> TelemetrySnapshot:
+        return self.telemetry.snapshot(
+            pols,
+            self.settings.commonSettings.sensorAmbient,
+            self.settings.commonSettings.sensorMixer,
+            self.settings.commonSettings.telemetryMaxAge
+        )
+
     def _initRawData(self,
             fkTestRecord: int,
             freqLO: float,
             selectPol: SelectPolarization,
-            ifSteps: list[float]) -> dict[tuple[int, float], NoiseTempRawDatum]:
-
-
-        loIsLocked = self.receiver.isLocked()        
-
-        try:
-            tAmb, tErr = self.tempMonitor.readSingle(self.settings.commonSettings.sensorAmbient)
-        except:
-            tAmb = 0
-
-        try:
-            tMixer, tErr = self.tempMonitor.readSingle(self.settings.commonSettings.sensorMixer)
-        except:
-            tMixer = 0
-
-        try:
-            cartridgeTemps = self.receiver.ccaDevice.getCartridgeTemps()
-        except:
-            cartridgeTemps = None
-
-        pll = self.receiver.getPLL()
-        pa = self.receiver.getPA()
-        if selectPol.testPol(0):
-            sis01 = self.receiver.readSISBias(SelectSIS.SIS1, pol = 0, averaging = 8)
-            sis02 = self.receiver.readSISBias(SelectSIS.SIS2, pol = 0, averaging = 8)
-        if selectPol.testPol(1):
-            sis11 = self.receiver.readSISBias(SelectSIS.SIS1, pol = 1, averaging = 8)
-            sis12 = self.receiver.readSISBias(SelectSIS.SIS2, pol = 1, averaging = 8)
+            ifSteps: list[float]) -> NoiseTempSweep:
+
+        pols = tuple(pol for pol in (0, 1) if selectPol.testPol(pol))
+        telemetry = self._telemetry(pols)
         now = datetime.now()
-        records = {}
-
-        for freqIF in ifSteps:            
-            if selectPol.testPol(0):
-                records[(0, freqIF)] = NoiseTempRawDatum(
-                    fkCartTest = fkTestRecord,
-                    fkDUT_Type = self.dutType.value,
-                    timeStamp = now,
-                    FreqLO = freqLO,
-                    CenterIF = freqIF,
-                    BWIF = 100,
-                    Pol = 0,
-                    TRF_Hot = tAmb,
-                    IF_Attn = self.ifSystem.attenuation,
-                    TColdLoad = self.settings.commonSettings.tColdEff,
-                    Vj1 = sis01['Vj'],
-                    Ij1 = sis01['Ij'],
-                    Imag = sis01['Imag'],
-                    Vj2 = sis02['Vj'],
-                    Ij2 = sis02['Ij'],
-                    Tmixer = cartridgeTemps['temp2'] if cartridgeTemps else tMixer,
-                    PLL_Lock_V = pll['lockVoltage'],
-                    PLL_Corr_V = pll['corrV'],
-                    PLL_Assm_T = pll['temperature'],
-                    PA_A_Drain_V = pa['VDp0'],
-                    PA_B_Drain_V = pa['VDp1'],
-                    Is_LO_Unlocked = not loIsLocked
-                )
-            
-            if selectPol.testPol(1):
-                records[(1, freqIF)] = NoiseTempRawDatum(
-                    fkCartTest = fkTestRecord,
-                    timeStamp = now,
-                    FreqLO = freqLO,
-                    CenterIF = freqIF,
-                    BWIF = 100,
-                    Pol = 1,
-                    TRF_Hot = tAmb,
-                    IF_Attn = self.ifSystem.attenuation,
-                    TColdLoad = self.settings.commonSettings.tColdEff,
-                    Vj1 = sis11['Vj'],
-                    Ij1 = sis11['Ij'],
-                    Imag = sis11['Imag'],
-                    Vj2 = sis12['Vj'],
-                    Ij2 = sis12['Ij'],
-                    Tmixer = cartridgeTemps['temp5'] if cartridgeTemps else tMixer,
-                    PLL_Lock_V = pll['lockVoltage'],
-                    PLL_Corr_V = pll['corrV'],
-                    PLL_Assm_T = pll['temperature'],
-                    PA_A_Drain_V = pa['VDp0'],
-                    PA_B_Drain_V = pa['VDp1'],
-                    Is_LO_Unlocked = not loIsLocked
-                )
-        return records
+        headers = {}
+
+        # values common to all IF points of the pol:
+        for pol in pols:
+            sis = telemetry.sis[pol]
+            headers[pol] = dict(
+                fkCartTest = fkTestRecord,
+                fkDUT_Type = self.dutType.value,
+                timeStamp = now,
+                FreqLO = freqLO,
+                BWIF = 100,
+                Pol = pol,
+                TRF_Hot = telemetry.tAmb,
+                IF_Attn = self.ifSystem.attenuation,
+                TColdLoad = self.settings.commonSettings.tColdEff,
+                Vj1 = sis.Vj1,
+                Ij1 = sis.Ij1,
+                Imag = sis.Imag,
+                Vj2 = sis.Vj2,
+                Ij2 = sis.Ij2,
+                Tmixer = telemetry.mixerTemp(pol),
+                PLL_Lock_V = telemetry.pllLockV,
+                PLL_Corr_V = telemetry.pllCorrV,
+                PLL_Assm_T = telemetry.pllTemp,
+                PA_A_Drain_V = telemetry.paDrainVA,
+                PA_B_Drain_V = telemetry.paDrainVB,
+                Is_LO_Unlocked = not telemetry.loIsLocked
+            )
+        return NoiseTempSweep(ifSteps, headers)
     
     def _initRawDatum(self,
             fkTestRecord: int,
@@ -922,22 +900,8 @@ class NoiseTempActions():
             freqIF: float,
             pol: int) -> NoiseTempRawDatum:
 
-        loIsLocked = self.receiver.isLocked()  
-            
-        try:
-            tAmb, tErr = self.tempMonitor.readSingle(self.settings.commonSettings.sensorAmbient)
-        except:
-            tAmb = 0
-
-        try:
-            cartridgeTemps = self.receiver.ccaDevice.getCartridgeTemps()
-        except:
-            cartridgeTemps = None
-
-        pll = self.receiver.getPLL()
-        pa = self.receiver.getPA()
-        sis1 = self.receiver.readSISBias(SelectSIS.SIS1, pol = pol, averaging = 8)
-        sis2 = self.receiver.readSISBias(SelectSIS.SIS2, pol = pol, averaging = 8)
+        telemetry = self._telemetry((pol, ))
+        sis = telemetry.sis[pol]
         now = datetime.now()
 
         return NoiseTempRawDatum(
@@ -947,19 +911,19 @@ class NoiseTempActions():
             CenterIF = freqIF,
             BWIF = 100,
             Pol = pol,
-            TRF_Hot = tAmb,
+            TRF_Hot = telemetry.tAmb,
             IF_Attn = self.ifSystem.attenuation,
             TColdLoad = self.settings.commonSettings.tColdEff,
-            Vj1 = sis1['Vj'],
-            Ij1 = sis1['Ij'],
-            Imag = sis1['Imag'],
-            Vj2 = sis2['Vj'],
-            Ij2 = sis2['Ij'],
-            Tmixer = cartridgeTemps['temp2'] if cartridgeTemps else -1,
-            PLL_Lock_V = pll['lockVoltage'],
-            PLL_Corr_V = pll['corrV'],
-            PLL_Assm_T = pll['temperature'],
-            PA_A_Drain_V = pa['VDp0'],
-            PA_B_Drain_V = pa['VDp1'],
-            Is_LO_Unlocked = not loIsLocked
+            Vj1 = sis.Vj1,
+            Ij1 = sis.Ij1,
+            Imag = sis.Imag,
+            Vj2 = sis.Vj2,
+            Ij2 = sis.Ij2,
+            Tmixer = telemetry.mixerTemp(pol),
+            PLL_Lock_V = telemetry.pllLockV,
+            PLL_Corr_V = telemetry.pllCorrV,
+            PLL_Assm_T = telemetry.pllTemp,
+            PA_A_Drain_V = telemetry.paDrainVA,
+            PA_B_Drain_V = telemetry.paDrainVB,
+            Is_LO_Unlocked = not telemetry.loIsLocked
         )
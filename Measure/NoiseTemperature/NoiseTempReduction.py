@@ -0,0 +1,105 @@
+import numpy as np
+from typing import Iterable
+
+# sideband axis order used by all arrays in this module:
+SIDEBANDS = ('USB', 'LSB')
+
+class ReducedNoiseTemp():
+    """Results of a batched noise temperature reduction.
+
+    All arrays are shaped (pol, sideband, IF) with sideband index 0=USB, 1=LSB.
+    Points which could not be computed are NaN.
+    """
+    def __init__(self,
+            ifFreqs: np.ndarray,
+            Y: np.ndarray,
+            TRx: np.ndarray,
+            Tssb: np.ndarray
+        ):
+        self.ifFreqs = ifFreqs
+        self.Y = Y
+        self.TRx = TRx
+        self.Tssb = Tssb
+
+    def bandMask(self, ifStart: float, ifStop: float) -> np.ndarray:
+        return (self.ifFreqs >= ifStart) & (self.ifFreqs <= ifStop)
+
+    def bandMean(self, ifStart: float, ifStop: float, ssb: bool = False) -> np.ndarray:
+        """Mean noise temperature over IF in [ifStart, ifStop]
+
+        :param ssb: if True average Tssb, otherwise TRx
+        :return np.ndarray shaped (pol, sideband)
+        """
+        mask = self.bandMask(ifStart, ifStop)
+        temps = self.Tssb if ssb else self.TRx
+        if not mask.any():
+            return np.full(temps.shape[:2], np.nan)
+        return temps[:, :, mask].mean(axis = 2)
+
+def dBmToLinear(p_dBm: np.ndarray | float) -> np.ndarray:
+    return np.power(10.0, np.asarray(p_dBm, dtype = float) / 10)
+
+def reduceNoiseTemp(
+        ifFreqs: Iterable[float],
+        pHot: np.ndarray,
+        pCold: np.ndarray,
+        tHot: np.ndarray | float,
+        tColdEff: float,
+        imageReject: np.ndarray | None = None
+    ) -> ReducedNoiseTemp:
+    """Compute Y-factor, receiver noise temperature and image-rejection corrected Tssb for whole sweeps.
+
+    :param ifFreqs: IF frequencies [GHz], length N
+    :param pHot: hot load powers [dBm] shaped (pol, sideband, N) or broadcastable to it
+    :param pCold: cold load powers [dBm] same shape as pHot
+    :param tHot: hot load temperature [K]: scalar or broadcastable to pHot, e.g. TRF_Hot per record
+    :param tColdEff: effective cold load temperature [K]
+    :param imageReject: optional image rejection [dB] same shape as pHot. If None, Tssb = TRx
+    :return ReducedNoiseTemp
+    """
+    ifFreqs = np.asarray(ifFreqs, dtype = float)
+    pHot = np.asarray(pHot, dtype = float)
+    pCold = np.asarray(pCold, dtype = float)
+    # Y = Phot / Pcold in linear units is the same as the dB difference:
+    Y = dBmToLinear(pHot - pCold)
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        TRx = (np.asarray(tHot, dtype = float) - tColdEff * Y) / (Y - 1)
+        if imageReject is None:
+            Tssb = TRx.copy()
+        else:
+            # the image sideband contributes 1/IRR of the hot-cold signal:
+            Tssb = TRx * (1 + dBmToLinear(-np.asarray(imageReject, dtype = float)))
+    return ReducedNoiseTemp(ifFreqs, Y, TRx, Tssb)
+
+def recordsToArrays(records: list, pols: Iterable[int] = (0, 1)) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Gather NoiseTempRawDatum-like records into arrays for reduceNoiseTemp
+
+    Missing values (None) become NaN.
+    :return ifFreqs, pHot, pCold, tHot, imageReject with the power arrays shaped (pol, sideband, IF)
+    """
+    pols = list(pols)
+    ifFreqs = sorted({rec.CenterIF for rec in records})
+    ifIndex = {freq: i for i, freq in enumerate(ifFreqs)}
+    polIndex = {pol: i for i, pol in enumerate(pols)}
+    shape = (len(pols), len(SIDEBANDS), len(ifFreqs))
+    pHot = np.full(shape, np.nan)
+    pCold = np.full(shape, np.nan)
+    tHot = np.full(shape, np.nan)
+    imageReject = np.full(shape, np.nan)
+
+    def value(x):
+        return np.nan if x is None else x
+
+    for rec in records:
+        p = polIndex.get(rec.Pol)
+        if p is None:
+            continue
+        i = ifIndex[rec.CenterIF]
+        pHot[p, 0, i] = value(rec.Phot_USB)
+        pCold[p, 0, i] = value(rec.Pcold_USB)
+        pHot[p, 1, i] = value(rec.Phot_LSB)
+        pCold[p, 1, i] = value(rec.Pcold_LSB)
+        tHot[p, :, i] = value(rec.TRF_Hot)
+        imageReject[p, 0, i] = value(rec.PwrUSB_SrcUSB) - value(rec.PwrLSB_SrcUSB)
+        imageReject[p, 1, i] = value(rec.PwrLSB_SrcLSB) - value(rec.PwrUSB_SrcLSB)
+    return np.asarray(ifFreqs), pHot, pCold, tHot, imageReject
@@ -0,0 +1,208 @@
+import logging
+import numpy as np
+from typing import Any, Iterable
+from DBBand6Cart.schemas.NoiseTempRawDatum import NoiseTempRawDatum
+from .schemas import SpecAnPowers
+
+# fields which vary with IF, stored as one float array per field shaped (pol, IF).  NaN means not measured.
+SWEEP_COLUMNS = (
+    'Phot_USB', 'Pcold_USB', 'Phot_LSB', 'Pcold_LSB',
+    'Phot_USB_StdErr', 'Pcold_USB_StdErr', 'Phot_LSB_StdErr', 'Pcold_LSB_StdErr',
+    'PwrUSB_SrcUSB', 'PwrLSB_SrcUSB', 'PwrLSB_SrcLSB', 'PwrUSB_SrcLSB',
+    'Source_Power_USB', 'Source_Power_LSB'
+)
+# per-IF flags, stored as float 0/1 with NaN meaning not set:
+SWEEP_FLAGS = ('Is_RF_Unlocked', )
+
+class NoiseTempSweepPoint():
+    """Read/write view of one (pol, IF) point of a NoiseTempSweep
+
+    Behaves like a NoiseTempRawDatum for attribute access.  Writes go straight into the sweep arrays.
+    """
+    def __init__(self, sweep: 'NoiseTempSweep', pol: int, index: int):
+        object.__setattr__(self, '_sweep', sweep)
+        object.__setattr__(self, '_pol', pol)
+        object.__setattr__(self, '_index', index)
+
+    def __getattr__(self, name: str) -> Any:
+        return self._sweep.getValue(self._pol, self._index, name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self._sweep.setValue(self._pol, self._index, name, value)
+
+    def toRecord(self) -> NoiseTempRawDatum:
+        return self._sweep.makeRecord(self._pol, self._index)
+
+class NoiseTempSweep():
+    """Columnar store for noise temperature and image rejection raw data at one LO frequency
+
+    Replaces dict[(pol, freqIF)] -> NoiseTempRawDatum for swept measurements:
+    - values which vary with IF are held in one contiguous array per field, indexed by [pol, IF bin]
+    - values common to all IF points of a pol (bias, temperatures, PLL, etc.) are held once per pol
+    NoiseTempRawDatum records are only created by values() / toRecords(), normally at database write time.
+    The dict-like methods get(), __getitem__(), __setitem__(), __contains__() and values() are provided
+    so that code written for the dict of records continues to work.
+    """
+    NUM_POLS = 2
+
+    def __init__(self, ifSteps: Iterable[float], headers: dict[int, dict] | None = None):
+        """
+        :param ifSteps: the IF frequencies [GHz] of the sweep
+        :param headers: dict of pol -> NoiseTempRawDatum fields common to all IF points for that pol
+        """
+        self.ifFreqs = np.array(ifSteps, dtype = float)
+        self.headers = {pol: dict(header) for pol, header in headers.items()} if headers else {}
+        shape = (self.NUM_POLS, len(self.ifFreqs))
+        self.columns = {name: np.full(shape, np.nan) for name in SWEEP_COLUMNS + SWEEP_FLAGS}
+
+    def __len__(self) -> int:
+        return len(self.headers) * len(self.ifFreqs)
+
+    @property
+    def pols(self) -> list[int]:
+        return sorted(self.headers.keys())
+
+    def ifIndex(self, freqIF: float) -> int | None:
+        found = np.flatnonzero(np.isclose(self.ifFreqs, freqIF, rtol = 0, atol = 1e-6))
+        return int(found[0]) if len(found) else None
+
+    #### WHOLE-TRACE ACCESS #################################
+
+    def setTrace(self, pol: int, field: str, values: Iterable[float]) -> None:
+        """Write a whole trace into one field for one pol
+
+        A trace with more points than the sweep's IF steps is truncated.  One with fewer leaves the
+        remaining IF points not measured.
+        """
+        values = np.asarray(values, dtype = float).ravel()
+        numIF = len(self.ifFreqs)
+        if len(values) != numIF:
+            logging.getLogger("ALMAFE-CTS-Control").warning(
+                f"NoiseTempSweep.setTrace: {field} pol{pol} has {len(values)} points for {numIF} IF steps")
+            trace = np.full(numIF, np.nan)
+            trace[:min(len(values), numIF)] = values[:numIF]
+            values = trace
+        self.columns[field][pol, :] = values
+
+    def getTrace(self, pol: int, field: str) -> np.ndarray:
+        return self.columns[field][pol]
+
+    def setHeader(self, pol: int, **fields) -> None:
+        self.headers.setdefault(pol, {}).update(fields)
+
+    def toArrays(self, pols: Iterable[int] = (0, 1)) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Arrays for NoiseTempReduction.reduceNoiseTemp, same layout as NoiseTempReduction.recordsToArrays
+
+        :return ifFreqs, pHot, pCold, tHot, imageReject with the power arrays shaped (pol, sideband, IF)
+        """
+        pols = list(pols)
+        c = self.columns
+        pHot = np.stack([np.stack([c['Phot_USB'][pol], c['Phot_LSB'][pol]]) for pol in pols])
+        pCold = np.stack([np.stack([c['Pcold_USB'][pol], c['Pcold_LSB'][pol]]) for pol in pols])
+        imageReject = np.stack([np.stack([
+            c['PwrUSB_SrcUSB'][pol] - c['PwrLSB_SrcUSB'][pol],
+            c['PwrLSB_SrcLSB'][pol] - c['PwrUSB_SrcLSB'][pol]
+        ]) for pol in pols])
+        tHot = np.full(pHot.shape, np.nan)
+        for i, pol in enumerate(pols):
+            value = self.headers.get(pol, {}).get('TRF_Hot')
+            if value is not None:
+                tHot[i] = value
+        return self.ifFreqs.copy(), pHot, pCold, tHot, imageReject
+
+    def specAnPowers(self, pol: int) -> SpecAnPowers:
+        """Traces for display to the user.  Traces not yet measured are empty lists."""
+        def trace(field):
+            values = self.columns[field][pol]
+            return [] if np.isnan(values).all() else values.tolist()
+
+        return SpecAnPowers(
+            pol = pol,
+            ifFreqs = self.ifFreqs.tolist(),
+            pHotUSB = trace('Phot_USB'),
+            pColdUSB = trace('Pcold_USB'),
+            pHotLSB = trace('Phot_LSB'),
+            pColdLSB = trace('Pcold_LSB')
+        )
+
+    #### SINGLE-POINT ACCESS ################################
+
+    def getValue(self, pol: int, index: int, name: str) -> Any:
+        if name == 'CenterIF':
+            return float(self.ifFreqs[index])
+        column = self.columns.get(name)
+        if column is not None:
+            value = column[pol, index]
+            if np.isnan(value):
+                return None
+            return bool(value) if name in SWEEP_FLAGS else float(value)
+        try:
+            return self.headers[pol][name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def setValue(self, pol: int, index: int, name: str, value: Any) -> None:
+        column = self.columns.get(name)
+        if column is not None:
+            column[pol, index] = np.nan if value is None else float(value)
+        elif name == 'CenterIF':
+            raise AttributeError("NoiseTempSweep: CenterIF is read-only")
+        else:
+            # a value which is common to all IF points of the pol:
+            self.headers.setdefault(pol, {})[name] = value
+
+    def makeRecord(self, pol: int, index: int) -> NoiseTempRawDatum:
+        fields = dict(self.headers[pol])
+        fields['CenterIF'] = float(self.ifFreqs[index])
+        for name, column in self.columns.items():
+            value = column[pol, index]
+            if not np.isnan(value):
+                fields[name] = bool(value) if name in SWEEP_FLAGS else float(value)
+        return NoiseTempRawDatum(**fields)
+
+    #### DICT COMPATIBILITY #################################
+
+    def __contains__(self, key: tuple[int, float]) -> bool:
+        pol, freqIF = key
+        return pol in self.headers and self.ifIndex(freqIF) is not None
+
+    def get(self, key: tuple[int, float], default: Any = None) -> NoiseTempSweepPoint | Any:
+        pol, freqIF = key
+        index = self.ifIndex(freqIF)
+        if pol not in self.headers or index is None:
+            return default
+        return NoiseTempSweepPoint(self, pol, index)
+
+    def __getitem__(self, key: tuple[int, float]) -> NoiseTempSweepPoint:
+        point = self.get(key)
+        if point is None:
+            raise KeyError(key)
+        return point
+
+    def __setitem__(self, key: tuple[int, float], record: NoiseTempRawDatum) -> None:
+        """Store a complete record, adding an IF bin if needed
+
+        Values common to the pol which are already present are kept.
+        """
+        pol, freqIF = key
+        index = self.ifIndex(freqIF)
+        if index is None:
+            index = int(np.searchsorted(self.ifFreqs, freqIF))
+            self.ifFreqs = np.insert(self.ifFreqs, index, freqIF)
+            for name in self.columns:
+                self.columns[name] = np.insert(self.columns[name], index, np.nan, axis = 1)
+        values = record.model_dump()
+        values.pop('CenterIF', None)
+        header = self.headers.setdefault(pol, {})
+        for name, value in values.items():
+            if name in self.columns:
+                self.columns[name][pol, index] = np.nan if value is None else float(value)
+            else:
+                header.setdefault(name, value)
+
+    def values(self) -> list[NoiseTempRawDatum]:
+        return self.toRecords()
+
+    def toRecords(self) -> list[NoiseTempRawDatum]:
+        """Materialize the NoiseTempRawDatum records, ordered by IF then pol"""
+        return [self.makeRecord(pol, index) for index in range(len(self.ifFreqs)) for pol in self.pols]
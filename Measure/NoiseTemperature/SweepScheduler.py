@@ -0,0 +1,98 @@
+import time
+from enum import Enum
+from pydantic import BaseModel
+
+class SweepLoad(Enum):
+    HOT = "HOT"
+    COLD = "COLD"
+
+class SweepStep(BaseModel):
+    """One spectrum analyzer trace in a noise temperature sweep"""
+    pol: int
+    sideband: str
+    load: SweepLoad
+    moveChopper: bool = False   # the chopper must move before this trace
+    switchIF: bool = False      # the IF switch must change before this trace
+
+    @property
+    def field(self) -> str:
+        """The NoiseTempRawDatum / NoiseTempSweep field this trace is stored in"""
+        return ('Phot_' if self.load == SweepLoad.HOT else 'Pcold_') + self.sideband
+
+class SweepStepTiming(BaseModel):
+    pol: int
+    sideband: str
+    load: SweepLoad
+    tChopper: float = 0     # seconds spent moving the chopper
+    tSwitch: float = 0      # seconds spent switching the IF
+    tSettle: float = 0      # seconds waiting for the hardware to settle
+    tAcquire: float = 0     # seconds spent in the spectrum analyzer read
+
+    @property
+    def total(self) -> float:
+        return self.tChopper + self.tSwitch + self.tSettle + self.tAcquire
+
+def planSweep(pols: list[int], sidebands: tuple[str, ...], startLoad: SweepLoad = SweepLoad.HOT) -> list[SweepStep]:
+    """Order the traces to minimize chopper transitions and IF switching
+
+    For each pol all traces on one load are taken before moving to the other load.
+    The sideband order reverses on each load change and the load order reverses on each pol change,
+    so consecutive traces share either the load or the IF setting:
+        pol0: hot USB, hot LSB, cold LSB, cold USB
+        pol1: cold USB, cold LSB, hot LSB, hot USB
+    :param pols: the pols to measure, in order
+    :param sidebands: ('USB', 'LSB') for 2SB receivers, ('USB', ) for DSB
+    :param startLoad: the load the chopper is assumed to be on before the first trace
+    :return list[SweepStep]
+    """
+    steps = []
+    loads = [SweepLoad.HOT, SweepLoad.COLD] if startLoad == SweepLoad.HOT else [SweepLoad.COLD, SweepLoad.HOT]
+    order = list(sidebands)
+    chopperAt = None
+    ifAt = None
+    for pol in pols:
+        for load in loads:
+            for sideband in order:
+                steps.append(SweepStep(
+                    pol = pol,
+                    sideband = sideband,
+                    load = load,
+                    moveChopper = load != chopperAt,
+                    switchIF = (pol, sideband) != ifAt
+                ))
+                chopperAt = load
+                ifAt = (pol, sideband)
+            order.reverse()
+        loads.reverse()
+    return steps
+
+class SweepStepTimer():
+    """Accumulate per-step timing while executing a sweep plan"""
+
+    def __init__(self):
+        self.timings = []
+        self.current = None
+        self._start = None
+
+    def begin(self, step: SweepStep) -> None:
+        self.current = SweepStepTiming(pol = step.pol, sideband = step.sideband, load = step.load)
+        self._start = time.time()
+
+    def lap(self, phase: str) -> None:
+        """Add the time since the last lap to the named phase: 'tChopper', 'tSwitch', 'tSettle' or 'tAcquire'"""
+        now = time.time()
+        setattr(self.current, phase, getattr(self.current, phase) + now - self._start)
+        self._start = now
+
+    def end(self) -> SweepStepTiming:
+        self.timings.append(self.current)
+        return self.current
+
+    @property
+    def total(self) -> float:
+        return sum(t.total for t in self.timings)
+
+    def summary(self) -> str:
+        return f"{len(self.timings)} traces in {self.total:.2f} s: " + ", ".join(
+            f"pol{t.pol} {t.load.value} {t.sideband} {t.total:.2f}" for t in self.timings
+        )
@@ -0,0 +1,119 @@
+import threading
+from math import fsum
+from typing import Optional
+from pydantic import BaseModel
+
+class YFactorWindow(BaseModel):
+    samples: int        # window length per load
+    Y: float            # dB
+    TRx: Optional[float] = None     # K. None if the hot load temperature is not known
+
+class WindowedSums():
+    """Running sums over the last N samples for several N, sharing one circular buffer
+
+    Each add() is O(number of windows) and memory is fixed at the longest window.
+    """
+    RESUM_INTERVAL = 100000     # recompute the sums from the buffer this often to bound rounding drift
+
+    def __init__(self, windows: list[int]):
+        assert windows and min(windows) > 0
+        self.windows = sorted(set(windows))
+        self.capacity = self.windows[-1]
+        self.buffer = [0.0] * self.capacity
+        self.sums = {w: 0.0 for w in self.windows}
+        self.total = 0      # samples added
+        self.sinceResum = 0
+
+    def add(self, x: float) -> None:
+        index = self.total % self.capacity
+        for w in self.windows:
+            self.sums[w] += x
+            if self.total >= w:
+                # the sample falling out of this window:
+                self.sums[w] -= self.buffer[(self.total - w) % self.capacity]
+        self.buffer[index] = x
+        self.total += 1
+        self.sinceResum += 1
+        if self.sinceResum >= self.RESUM_INTERVAL:
+            self._resum()
+
+    def count(self, window: int) -> int:
+        return min(self.total, window)
+
+    def mean(self, window: int) -> Optional[float]:
+        n = self.count(window)
+        return self.sums[window] / n if n else None
+
+    def clear(self) -> None:
+        self.sums = {w: 0.0 for w in self.windows}
+        self.total = 0
+        self.sinceResum = 0
+
+    def _resum(self) -> None:
+        self.sinceResum = 0
+        for w in self.windows:
+            n = self.count(w)
+            self.sums[w] = fsum(self.buffer[(self.total - i - 1) % self.capacity] for i in range(n))
+
+class YFactorEstimator():
+    """Incremental Y-factor over fixed windows of the most recent hot and cold samples
+
+    Powers are in dBm and Y is the difference of the hot and cold means, as the display has always shown.
+    Windows are lengths in samples per load.  The first window is the primary one.
+    Thread safe: samples are added from the Sampler thread while the display reads.
+    """
+    def __init__(self, windows: list[int]):
+        self.primary = windows[0]
+        self.hot = WindowedSums(windows)
+        self.cold = WindowedSums(windows)
+        self.lock = threading.Lock()
+        self.pendingHot = None
+        self.pendingCold = None
+
+    @property
+    def windows(self) -> list[int]:
+        return self.hot.windows
+
+    def add(self, power: float, isHot: bool) -> Optional[tuple[float, float]]:
+        """Add a sample
+
+        :return (pHot, pCold) when this sample completes a new hot/cold pair, otherwise None
+        """
+        with self.lock:
+            if isHot:
+                self.hot.add(power)
+                self.pendingHot = power
+            else:
+                self.cold.add(power)
+                self.pendingCold = power
+            if self.pendingHot is not None and self.pendingCold is not None:
+                pair = (self.pendingHot, self.pendingCold)
+                self.pendingHot = self.pendingCold = None
+                return pair
+            return None
+
+    def clear(self) -> None:
+        with self.lock:
+            self.hot.clear()
+            self.cold.clear()
+            self.pendingHot = self.pendingCold = None
+
+    def estimate(self, tHot: float = None, tCold: float = None) -> list[YFactorWindow]:
+        """Y and TRx for each window having at least two samples of each load
+
+        :param tHot: K.  If given with tCold, also compute TRx
+        :param tCold: K
+        """
+        results = []
+        with self.lock:
+            for w in self.windows:
+                if self.hot.count(w) < 2 or self.cold.count(w) < 2:
+                    continue
+                Y = self.hot.mean(w) - self.cold.mean(w)
+                TRx = None
+                if tHot is not None and tCold is not None:
+                    Ylinear = 10 ** (Y / 10)
+                    if Ylinear != 1:
+                        TRx = (tHot - tCold * Ylinear) / (Ylinear - 1)
+                results.append(YFactorWindow(samples = w, Y = Y, TRx = TRx))
+        return results
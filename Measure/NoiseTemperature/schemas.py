@@ -5,6 +5,7 @@ from INSTR.Chopper.Interface import ChopperState
 from Controllers.IFSystem.Interface import InputSelect
 from Controllers.PowerDetect.Interface import DetectMode
 from Measure.Shared.SelectPolarization import SelectPolarization
+from .YFactorEstimator import YFactorWindow
 
 class ChopperMode(Enum):
     SPIN = "SPIN"
@@ -37,6 +38,11 @@ class CommonSettings(BaseModel):
     loRefAmplitude: float = 5
     rfRefAmplitude: float = 15
     pauseForColdLoad: bool = True
+    chopperSettleTime: float = 0.2          # sec to wait after moving the chopper before a spectrum analyzer sweep
+    ifSwitchSettleTime: float = 0.05        # sec to wait after switching the IF before a spectrum analyzer sweep
+    sweepDelayFactor: float = 2.0           # spectrum analyzer read delay as a multiple of its sweep time
+    targetTRxErr: float = 0.5               # K. Power meter sampling stops when the TRx standard error is below this. 0 to use powerMeterConfig.stdErr
+    telemetryMaxAge: float = 10             # sec to reuse temperature readings when stamping records
     powerMeterConfig: StdErrConfig = StdErrConfig(
         minS = 50,
         maxS = 600,
@@ -89,6 +95,7 @@ class YFactorSettings(BaseModel):
     ifStart: float = 5
     ifStop: float = 10
     attenuation: float = 20
+    windows: list[int] = [75, 600, 3600]    # Y-factor averaging windows, samples per load.  The first is the primary
 
 class ChopperPowers(BaseModel):
     inputName: str
@@ -111,3 +118,4 @@ class SpecAnPowers(BaseModel):
 class YFactorSample(BaseModel):
     Y: float
     TRx: float
+    windows: list[YFactorWindow] = []       # Y and TRx over each of YFactorSettings.windows
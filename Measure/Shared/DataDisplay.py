@@ -1,27 +1,73 @@
+from typing import Any
 from AMB.schemas.MixerTests import IVCurveResults, MagnetOptResults, DefluxResults
 from Measure.MixerTests.ResultsQueue import ResultsQueue
+from Measure.Shared.DisplayHub import DisplayHub, DisplayTopic
+from Measure.Shared.RingBuffer import RingBuffer
 
 class DataDisplay():
+    CHOPPER_POWER_CAPACITY = 10000
+    Y_FACTOR_CAPACITY = 2000
+    STABILITY_CAPACITY = 20000
 
     def __init__(self) -> None:
+        self.hub = DisplayHub()
+        self.chopperPowerHistory = RingBuffer(self.CHOPPER_POWER_CAPACITY)
+        self.yFactorHistory = RingBuffer(self.Y_FACTOR_CAPACITY)
+        self.stabilityHistory = RingBuffer(self.STABILITY_CAPACITY)
         self.ivCurveQueue = ResultsQueue()
         self.magnetOptQueue = ResultsQueue()
         self.defluxQueue = ResultsQueue()
         self.ivCurveResults = IVCurveResults()
         self.magnetOptResults = MagnetOptResults()
-        self.defluxResults = DefluxResults()        
+        self.defluxResults = DefluxResults()
         self.reset()
 
     def reset(self) -> None:
         self.warmIfData = None
-        self.chopperPowerHistory = []
+        self.chopperPowerHistory.clear()
         self.specAnPowerHistory = None
         self.currentNoiseTemp = [None, None]
-        self.yFactorHistory = []
+        self.noiseTempErrorBars = []
+        self.yFactorHistory.clear()
         self.yFactorPowers = []
         self.timeSeriesList = []
-        self.stabilityHistory = []
+        self.stabilityHistory.clear()
         self.biasOptResults = []
         self.ivCurveResults.reset()
         self.magnetOptResults.reset()
         self.defluxResults.reset()
+
+    # Producers call these to update the display data and notify the websocket subscribers:
+
+    def setWarmIfData(self, records: list) -> None:
+        self.warmIfData = records
+        self.hub.publish(DisplayTopic.WARM_IF, records)
+
+    def addChopperPower(self, item: Any) -> None:
+        self.chopperPowerHistory.append(item)
+        self.hub.publish(DisplayTopic.CHOPPER_POWER, item)
+
+    def setSpecAnPowers(self, item: Any) -> None:
+        self.specAnPowerHistory = item
+        self.hub.publish(DisplayTopic.SPEC_AN, item)
+
+    def setCurrentNoiseTemp(self, pol: int, record: Any) -> None:
+        self.currentNoiseTemp[pol] = record
+        self.hub.publish(DisplayTopic.NOISE_TEMP, record)
+
+    def addNoiseTempErrorBars(self, item: Any) -> None:
+        self.noiseTempErrorBars.append(item)
+
+    def addYFactorSample(self, item: Any, retainSamples: int = None) -> None:
+        self.yFactorHistory.append(item)
+        if retainSamples:
+            self.yFactorHistory.retain(retainSamples)
+        self.hub.publish(DisplayTopic.Y_FACTOR, item)
+
+    def addStabilitySample(self, item: Any) -> None:
+        self.stabilityHistory.append(item)
+        self.hub.publish(DisplayTopic.STABILITY, item)
+
+    def addBiasOptResult(self, item: Any) -> None:
+        self.biasOptResults.append(item)
+        self.hub.publish(DisplayTopic.BIAS_OPT, item)
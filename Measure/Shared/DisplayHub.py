@@ -0,0 +1,90 @@
+import asyncio
+import logging
+import threading
+from enum import Enum
+from typing import Any
+
+class DisplayTopic(Enum):
+    WARM_IF = "WARM_IF"
+    CHOPPER_POWER = "CHOPPER_POWER"
+    SPEC_AN = "SPEC_AN"
+    NOISE_TEMP = "NOISE_TEMP"
+    Y_FACTOR = "Y_FACTOR"
+    STABILITY = "STABILITY"
+    BIAS_OPT = "BIAS_OPT"
+
+class Subscription():
+    """One subscriber's bounded queue of events, consumed on the asyncio event loop
+
+    When the queue is full the oldest event is dropped, so a slow client only ever
+    falls behind by maxsize events and always ends up with the latest ones.
+    """
+    def __init__(self, hub: 'DisplayHub', topic: DisplayTopic, maxsize: int, loop: asyncio.AbstractEventLoop):
+        self.hub = hub
+        self.topic = topic
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize = maxsize)
+        self.dropped = 0
+
+    def _deliver(self, payload: Any) -> None:
+        # runs on the event loop:
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(payload)
+
+    async def get(self) -> Any:
+        """Wait for the next event"""
+        return await self.queue.get()
+
+    async def getAll(self) -> list[Any]:
+        """Wait for the next event, then return it along with any others already queued"""
+        items = [await self.queue.get()]
+        while not self.queue.empty():
+            items.append(self.queue.get_nowait())
+        return items
+
+    def close(self) -> None:
+        self.hub.unsubscribe(self)
+
+class DisplayHub():
+    """Publish/subscribe hub between measurement threads and websocket handlers
+
+    Producers call publish() from any thread.  Each event is handed to every subscriber's
+    event loop with call_soon_threadsafe, so websocket handlers await new data instead of polling.
+    """
+    def __init__(self):
+        self.logger = logging.getLogger("ALMAFE-CTS-Control")
+        self.lock = threading.Lock()
+        self.subscriptions: dict[DisplayTopic, list[Subscription]] = {}
+
+    def subscribe(self, topic: DisplayTopic, maxsize: int = 100) -> Subscription:
+        """Subscribe to a topic.  Must be called from a coroutine running on the event loop which will consume the events.
+
+        :param maxsize: max events to queue for this subscriber.  Use 1 for topics where only the latest value matters.
+        """
+        subscription = Subscription(self, topic, maxsize, asyncio.get_running_loop())
+        with self.lock:
+            self.subscriptions.setdefault(topic, []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self.lock:
+            subscriptions = self.subscriptions.get(subscription.topic, [])
+            if subscription in subscriptions:
+                subscriptions.remove(subscription)
+
+    def publish(self, topic: DisplayTopic, payload: Any) -> None:
+        """Send an event to all subscribers of topic.  Safe to call from any thread."""
+        with self.lock:
+            subscriptions = list(self.subscriptions.get(topic, []))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._deliver, payload)
+            except RuntimeError:
+                # the subscriber's event loop is closed:
+                self.unsubscribe(subscription)
+
+    def numSubscribers(self, topic: DisplayTopic) -> int:
+        with self.lock:
+            return len(self.subscriptions.get(topic, []))
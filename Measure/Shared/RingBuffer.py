@@ -0,0 +1,84 @@
+import threading
+from typing import Any, Iterator
+
+class RingBuffer():
+    """Fixed-capacity history of display items with sequence numbers
+
+    Items are stored in a preallocated array of slots, so memory is bounded by capacity.
+    Each appended item gets the next sequence number, starting at 1.  Sequence numbers keep
+    counting across clear(), so a reader which remembers the last one it saw can always ask
+    for just the new items with since().
+    """
+    def __init__(self, capacity: int):
+        assert capacity > 0
+        self.capacity = capacity
+        self.lock = threading.Lock()
+        self.slots = [None] * capacity
+        self.nextSeq = 1        # sequence number the next appended item will get
+        self.count = 0          # items currently held
+
+    @property
+    def firstSeq(self) -> int:
+        """Sequence number of the oldest item held"""
+        return self.nextSeq - self.count
+
+    @property
+    def lastSeq(self) -> int:
+        """Sequence number of the newest item appended, or 0 if nothing has been"""
+        return self.nextSeq - 1
+
+    def append(self, item: Any) -> int:
+        """Add an item, overwriting the oldest if full
+
+        :return the item's sequence number
+        """
+        with self.lock:
+            seq = self.nextSeq
+            self.slots[seq % self.capacity] = item
+            self.nextSeq += 1
+            self.count = min(self.count + 1, self.capacity)
+            return seq
+
+    def extend(self, items: list) -> int:
+        for item in items:
+            self.append(item)
+        return self.lastSeq
+
+    def clear(self) -> None:
+        """Discard all items.  Sequence numbers are not reset."""
+        with self.lock:
+            self.slots = [None] * self.capacity
+            self.count = 0
+
+    def retain(self, count: int) -> None:
+        """Discard all but the newest count items"""
+        with self.lock:
+            while self.count > count:
+                self.slots[(self.nextSeq - self.count) % self.capacity] = None
+                self.count -= 1
+
+    def since(self, seq: int) -> tuple[list, int]:
+        """Items appended after sequence number seq
+
+        If items after seq have already been overwritten, returns all the items held.
+        If seq is ahead of lastSeq, as after a restart, also returns all the items held.
+        :param seq: the last sequence number the reader has seen.  0 to get everything held.
+        :return (items, the sequence number of the last item returned) for the next call.
+        """
+        with self.lock:
+            if seq >= self.nextSeq:
+                seq = 0
+            first = max(seq + 1, self.nextSeq - self.count)
+            items = [self.slots[i % self.capacity] for i in range(first, self.nextSeq)]
+            return items, self.nextSeq - 1
+
+    def latest(self) -> Any:
+        """The newest item or None"""
+        with self.lock:
+            return self.slots[(self.nextSeq - 1) % self.capacity] if self.count else None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator:
+        return iter(self.since(0)[0])
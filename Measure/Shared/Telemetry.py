@@ -0,0 +1,139 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
+from Measure.Shared.SelectSIS import SelectSIS
+
+class SISReading(BaseModel):
+    model_config = ConfigDict(frozen = True)
+    Vj1: Optional[float] = None
+    Ij1: Optional[float] = None
+    Imag: Optional[float] = None
+    Vj2: Optional[float] = None
+    Ij2: Optional[float] = None
+
+class TelemetrySnapshot(BaseModel):
+    """Receiver and temperature monitor points read together for stamping raw data records"""
+    model_config = ConfigDict(frozen = True)
+    timeStamp: datetime
+    tAmb: float = 0
+    tMixer: float = 0                               # from the temperature monitor
+    cartridgeTemps: Optional[dict[str, float]] = None
+    loIsLocked: bool = False
+    pllLockV: Optional[float] = None
+    pllCorrV: Optional[float] = None
+    pllTemp: Optional[float] = None
+    paDrainVA: Optional[float] = None
+    paDrainVB: Optional[float] = None
+    sis: dict[int, SISReading] = {}
+
+    def mixerTemp(self, pol: int) -> float:
+        """The mixer temperature for pol from the cartridge sensors if available, else from the temperature monitor"""
+        if self.cartridgeTemps:
+            return self.cartridgeTemps['temp2' if pol == 0 else 'temp5']
+        return self.tMixer
+
+class TelemetryService():
+    """Reads the monitor points needed for raw data records concurrently
+
+    The reads are split into groups which don't share a bus: the temperature monitor,
+    and the receiver, whose LO and mixer bias monitor points all go through the FEMC.
+    The two groups run on their own worker threads.
+    Only the temperatures are cached: snapshot() reuses them if they are younger than maxAge.
+    The receiver is read every time, since the SIS bias and LO power can be changed by
+    anything holding the receiver and the records must reflect the bias they were measured at.
+    """
+    SIS_AVERAGING = 8
+
+    def __init__(self, receiver, tempMonitor):
+        """
+        :param receiver: CartAssembly | MixerAssembly
+        :param tempMonitor: TemperatureMonitor
+        """
+        self.logger = logging.getLogger("ALMAFE-CTS-Control")
+        self.receiver = receiver
+        self.tempMonitor = tempMonitor
+        self.executor = ThreadPoolExecutor(max_workers = 2, thread_name_prefix = "Telemetry")
+        self.lock = threading.Lock()
+        self.cachedTemps = None
+        self.cachedKey = None
+        self.cachedTime = 0
+
+    def invalidate(self) -> None:
+        with self.lock:
+            self.cachedTemps = None
+
+    def snapshot(self,
+            pols: tuple[int, ...],
+            sensorAmbient: int,
+            sensorMixer: int,
+            maxAge: float = 0
+        ) -> TelemetrySnapshot:
+        """Read a snapshot, reusing the cached temperatures if they are younger than maxAge
+
+        :param pols: read the SIS bias for these pols
+        :param sensorAmbient: temperature monitor sensor for the ambient/hot load temperature
+        :param sensorMixer: temperature monitor sensor for the mixer, if the cartridge has none
+        :param maxAge: seconds.  0 means always read the temperatures
+        """
+        with self.lock:
+            timeStart = time.monotonic()
+            receiver = self.executor.submit(self._readReceiver, pols)
+            fresh = self.cachedTemps is not None \
+                and self.cachedKey == (sensorAmbient, sensorMixer) \
+                and timeStart - self.cachedTime <= maxAge
+            if not fresh:
+                self.cachedTemps = self.executor.submit(self._readTemps, sensorAmbient, sensorMixer).result()
+                self.cachedKey = (sensorAmbient, sensorMixer)
+                self.cachedTime = timeStart
+            snapshot = TelemetrySnapshot(
+                timeStamp = datetime.now(),
+                **self.cachedTemps,
+                **receiver.result()
+            )
+            self.logger.debug(f"TelemetryService.snapshot: read in {time.monotonic() - timeStart:.2f} s")
+            return snapshot
+
+    def _readTemps(self, sensorAmbient: int, sensorMixer: int) -> dict:
+        try:
+            tAmb, tErr = self.tempMonitor.readSingle(sensorAmbient)
+        except:
+            tAmb = 0
+        try:
+            tMixer, tErr = self.tempMonitor.readSingle(sensorMixer)
+        except:
+            tMixer = 0
+        return dict(tAmb = tAmb, tMixer = tMixer)
+
+    def _readReceiver(self, pols: tuple[int, ...]) -> dict:
+        loIsLocked = self.receiver.isLocked()
+        pll = self.receiver.getPLL()
+        pa = self.receiver.getPA()
+        try:
+            cartridgeTemps = self.receiver.ccaDevice.getCartridgeTemps()
+        except:
+            cartridgeTemps = None
+        sis = {}
+        for pol in pols:
+            sis1 = self.receiver.readSISBias(SelectSIS.SIS1, pol = pol, averaging = self.SIS_AVERAGING)
+            sis2 = self.receiver.readSISBias(SelectSIS.SIS2, pol = pol, averaging = self.SIS_AVERAGING)
+            sis[pol] = SISReading(
+                Vj1 = sis1['Vj'],
+                Ij1 = sis1['Ij'],
+                Imag = sis1['Imag'],
+                Vj2 = sis2['Vj'],
+                Ij2 = sis2['Ij']
+            )
+        return dict(
+            loIsLocked = loIsLocked,
+            pllLockV = pll['lockVoltage'],
+            pllCorrV = pll['corrV'],
+            pllTemp = pll['temperature'],
+            paDrainVA = pa['VDp0'],
+            paDrainVB = pa['VDp1'],
+            cartridgeTemps = cartridgeTemps,
+            sis = sis
+        )
@@ -0,0 +1,34 @@
+from math import sqrt
+
+class Welford():
+    """Running count, mean and variance in one pass, numerically stable
+
+    Welford's algorithm: each add() is O(1) and no samples are kept.
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0       # sum of squared differences from the mean
+
+    def add(self, x: float) -> None:
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance.  0 if fewer than two samples"""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return sqrt(self.variance)
+
+    @property
+    def stdErr(self) -> float:
+        """Standard error of the mean.  inf if fewer than two samples"""
+        return sqrt(self.variance / self.count) if self.count > 1 else float('inf')
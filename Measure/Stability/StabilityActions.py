@@ -44,6 +44,7 @@ class StabilityActions():
         self.loReference = loReference
         self.receiver = receiver
         self.rfSrcDevice = rfSrcDevice        
+        self.freqRF = None
         self.ifSystem = ifSystem
         self.powerDetect = None
         self.tempMonitor = tempMonitor
@@ -134,6 +135,7 @@ class StabilityActions():
         self.measurementStatus.setStatusMessage(f"Locking RF at {freqRF} GHz...")
         self.rfSrcDevice.selectLockSideband(self.rfSrcDevice.LOCK_ABOVE_REF)
         wcaFreq, ytoFreq, ytoCourse = self.rfSrcDevice.setFrequency(freqRF)
+        self.freqRF = freqRF
         if not SIMULATE:
             wcaFreq, ytoFreq, ytoCourse = self.rfSrcDevice.lockPLL()
         return (wcaFreq != 0, f"lockRF: wca={wcaFreq}, yto={ytoFreq}, courseTune={ytoCourse}")      
@@ -145,10 +147,10 @@ class StabilityActions():
         self.ifSystem.output_select = OutputSelect.PNA_INTERFACE    
         self.ifSystem.attenuation = self.settings.attenuateIF
         self.powerDetect.configure(power_config = DEFAULT_POWER_CONFIG, config = FAST_CONFIG)
-        success = self.rfAutoLevel.autoLevel(freqIF, self.settings.targetLevel)
+        success, msg = self.rfAutoLevel.autoLevel(freqIF, self.settings.targetLevel, freqRF = self.freqRF)
         if SIMULATE:
             success = True
-        return (success, "rfSourceAutoLevel")
+        return (success, "rfSourceAutoLevel: " + msg)
     
     #### MEASUREMENT HELPERS ##################################
 
@@ -199,7 +201,7 @@ class StabilityActions():
         phaseSeries.tsId = temp.tsId
         self.measurementStatus.setStatusMessage("Measuring...")
         self.measurementStatus.setChildKey(phaseSeries.tsId)
-        self.dataDisplay.stabilityHistory = []     
+        self.dataDisplay.stabilityHistory.clear()     
         
         success = True
         msg = ""
@@ -253,7 +255,7 @@ class StabilityActions():
             elif time.time() >= timeEnd:
                 done = True
             elif phase is not None:
-                self.dataDisplay.stabilityHistory.append(StabilitySample(
+                self.dataDisplay.addStabilitySample(StabilitySample(
                     key = phaseSeries.tsId,
                     timeStamp = datetime.now(),
                     amp_or_phase = phase,
@@ -291,7 +293,7 @@ class StabilityActions():
         ampSeries.tsId = temp.tsId
         self.measurementStatus.setStatusMessage("Measuring...")
         self.measurementStatus.setChildKey(ampSeries.tsId)
-        self.dataDisplay.stabilityHistory = []     
+        self.dataDisplay.stabilityHistory.clear()     
         
         success = True
         msg = ""
@@ -332,7 +334,7 @@ class StabilityActions():
             elif time.time() >= timeEnd:
                 done = True
             elif amplitude is not None:
-                self.dataDisplay.stabilityHistory.append(StabilitySample(
+                self.dataDisplay.addStabilitySample(StabilitySample(
                     key = ampSeries.tsId,
                     timeStamp = datetime.now(),
                     amp_or_phase = amplitude,
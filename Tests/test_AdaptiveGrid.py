@@ -0,0 +1,66 @@
+import unittest
+import numpy as np
+from Measure.BeamScanner.AdaptiveGrid import AdaptiveGrid
+
+class test_AdaptiveGrid(unittest.TestCase):
+
+    def setUp(self):
+        # gaussian beam with a phase curvature on a 0.5 mm grid:
+        y = np.arange(77, 217.01, 0.5)
+        x = np.arange(73, 223.01, 0.5)
+        X, Y = np.meshgrid(x, y)
+        r2 = (X - 146.5) ** 2 + (Y - 144) ** 2
+        field = np.exp(-r2 / (2 * 8 ** 2)) * np.exp(1j * np.radians(0.05 * r2))
+        self.amp = 20 * np.log10(np.abs(field) + 1e-6)
+        self.phase = np.degrees(np.angle(field))
+        self.grid = AdaptiveGrid(len(y), len(x), coarseFactor = 4)
+
+    def scan(self):
+        for i, row in enumerate(self.grid.coarse):
+            reverse = i % 2 == 1
+            amp, phase = self.amp[row], self.phase[row]
+            self.grid.addRow(row, amp[::-1] if reverse else amp, phase[::-1] if reverse else phase, reverseX = reverse)
+        dense = self.grid.refineRows()
+        for row in dense:
+            self.grid.addRow(row, self.amp[row], self.phase[row])
+        return dense
+
+    def test_coarseRows(self):
+        self.assertEqual(AdaptiveGrid(9, 1, 4).coarseRows(), [0, 4, 8])
+        self.assertEqual(AdaptiveGrid(10, 1, 4).coarseRows(), [0, 4, 8, 9])
+
+    def test_refine_near_beam(self):
+        dense = self.scan()
+        self.assertTrue(dense)
+        # fewer rows measured than the full grid, and only near the beam:
+        measured = len(self.grid.coarse) + len(dense)
+        self.assertLess(measured, self.grid.numRows / 2)
+        rows = np.array(dense)
+        self.assertTrue(np.all(np.abs(rows * 0.5 + 77 - 144) < 50))
+
+    def test_merge_and_report(self):
+        self.scan()
+        amp, phase, measured = self.grid.merge()
+        self.assertFalse(np.isnan(amp).any())
+        mask = self.amp > -50
+        self.assertLess(np.max(np.abs(amp - self.amp)[mask]), 0.5)
+        # reversed rows were stored in forward order:
+        row = self.grid.coarse[1]
+        self.assertTrue(np.allclose(amp[row], self.amp[row], atol = 1e-3))
+        report = self.grid.report()
+        self.assertEqual(report.rows, self.grid.numRows)
+        self.assertEqual(report.coarseRows + report.denseRows + report.interpolatedRows, report.rows)
+        self.assertGreater(report.validationRows, 0)
+        self.assertLess(report.ampErrorRms, 1)
+        self.assertEqual(report.interpolated, self.grid.interpolatedRows())
+        self.assertEqual(len(report.interpolated), report.interpolatedRows)
+
+    def test_interpolatedRanges(self):
+        grid = AdaptiveGrid(9, 1, 4)
+        for row in (0, 2, 4, 8):
+            grid.addRow(row, np.zeros(1), np.zeros(1))
+        self.assertEqual(grid.interpolatedRows(), [1, 3, 5, 6, 7])
+        self.assertEqual(grid.interpolatedRanges(), [(1, 1), (3, 3), (5, 7)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import numpy as np
+from Measure.BeamScanner.RasterGrid import RasterGrid
+from Measure.BeamScanner.BeamAnalysis import BeamAnalysis
+
+class test_BeamAnalysis(unittest.TestCase):
+
+    def setUp(self):
+        # gaussian beam, w = 10 mm, centered at (2, -3) mm on a 1 mm grid:
+        self.x = np.arange(-40, 40.01, 1.0)
+        self.y = np.arange(-40, 40.01, 1.0)
+        X, Y = np.meshgrid(self.x, self.y)
+        self.w = 10
+        self.field = np.exp(-((X - 2) ** 2 + (Y + 3) ** 2) / self.w ** 2)
+        self.amp = 20 * np.log10(self.field + 1e-9)
+        self.grid = RasterGrid(1, len(self.y), len(self.x))
+        self.analysis = BeamAnalysis(fftInterval = 1000)
+        self.analysis.start(self.grid, self.x.tolist(), self.y.tolist(), freqRF = 240)
+
+    def scan(self, phase = None, rows = None):
+        phase = np.zeros_like(self.amp) if phase is None else phase
+        for row in (range(len(self.y)) if rows is None else rows):
+            self.grid.put(row, self.amp[row], phase[row], y = self.y[row], pol = 0, startX = self.x[0], xStep = 1)
+            self.analysis.put(row)
+        self.analysis.finish()
+        self.analysis.wait()
+        return self.analysis.getResult()
+
+    def test_gaussian(self):
+        result = self.scan()
+        self.assertEqual(result.rowsMeasured, len(self.y))
+        self.assertAlmostEqual(result.centerX, 2, places = 3)
+        self.assertAlmostEqual(result.centerY, -3, places = 3)
+        self.assertAlmostEqual(result.beamRadiusX, self.w, places = 2)
+        self.assertAlmostEqual(result.beamRadiusY, self.w, places = 2)
+        self.assertAlmostEqual(result.peakAmp, 0, places = 3)
+        self.assertLess(result.edgeLevel, -100)
+        self.assertAlmostEqual(result.phaseEff, 1, places = 6)
+        self.assertLess(result.amplitudeEff, 1)
+        # boresight far field:
+        self.assertAlmostEqual(result.farFieldOffsetX, 0, places = 6)
+        self.assertAlmostEqual(result.farFieldOffsetY, 0, places = 6)
+        farField = self.analysis.getFarField()
+        self.assertEqual(farField.size, 64)
+        self.assertEqual(farField.amplitude[32][32], 0)
+
+    def test_partial(self):
+        result = self.scan(rows = range(0, len(self.y), 4))
+        self.assertEqual(result.rowsMeasured, len(range(0, len(self.y), 4)))
+        self.assertAlmostEqual(result.centerX, 2, places = 3)
+
+    def test_tilt(self):
+        # a linear phase tilt steers the far-field peak and the phase efficiency drops:
+        X = np.meshgrid(self.x, self.y)[0]
+        wavelength = 299792458 / 240e9 * 1e3
+        angle = 5
+        phase = np.degrees(2 * np.pi / wavelength * np.sin(np.radians(angle)) * X)
+        result = self.scan(phase = phase)
+        self.assertAlmostEqual(abs(result.farFieldOffsetX), angle, delta = 0.5)
+        self.assertAlmostEqual(result.farFieldOffsetY, 0, places = 6)
+        self.assertLess(result.phaseEff, 0.5)
+
+    def test_remeasure(self):
+        self.scan()
+        # a re-measured row replaces its earlier contribution:
+        before = self.analysis.getResult()
+        self.grid.put(40, self.amp[40], np.zeros(len(self.x)), y = self.y[40], pol = 0, startX = self.x[0], xStep = 1)
+        self.analysis.put(40)
+        self.analysis.wait()
+        after = self.analysis.getResult()
+        self.assertEqual(after.rowsMeasured, before.rowsMeasured)
+        self.assertAlmostEqual(after.centerY, before.centerY, places = 9)
@@ -1,5 +1,8 @@
+import os
+import tempfile
 import unittest
 import configparser
+from types import SimpleNamespace
 from AMB.AMBConnectionDLL import AMBConnectionDLL
 from AMB.LODevice import LODevice
 from AMB.CCADevice import CCADevice
@@ -10,7 +13,8 @@ from DBBand6Cart.schemas.PreampParam import PreampParam
 from DBBand6Cart.MixerParams import MixerParams
 from DBBand6Cart.PreampParams import PreampParams
 
-from Controllers.Receiver.CartAssembly import CartAssembly
+from Controllers.Receiver.CartAssembly import CartAssembly, CartAssemblySettings
+from Controllers.Receiver.LOPowerMap import LOPowerMap
 
 CARTRIDGE_BAND = 6
 YTO_LOW = 12.22
@@ -101,3 +105,85 @@ class test_CartAssembly(unittest.TestCase):
         targets = self.cartAssembly.getSISCurrentTargets()
         print(targets)
 
+class FakeLODevice():
+    def __init__(self, events: list):
+        self.events = events
+        self.paOutput = {0: 0, 1: 0}
+
+    def setPAOutput(self, pol: int, percent: float) -> None:
+        self.events.append(('set', pol))
+        self.paOutput[pol] = percent
+
+class FakeCCADevice():
+    """SIS current proportional to the PA output.  A pol with no gain never reaches the target"""
+    def __init__(self, events: list, loDevice: FakeLODevice, gain: dict[int, float], broken: tuple[int] = ()):
+        self.events = events
+        self.loDevice = loDevice
+        self.gain = gain
+        self.broken = broken
+
+    def getSIS(self, pol: int, sis: int, averaging: int = 1) -> dict | None:
+        self.events.append(('read', pol))
+        if pol in self.broken:
+            return None
+        return {'Vj': 2.0, 'Ij': -self.gain[pol] * self.loDevice.paOutput[pol]}
+
+class CartAssemblyUnderTest(CartAssembly):
+    def loadSettings(self):
+        self.settings = CartAssemblySettings(sleep = 0, max_iter = 10, freqLOGHz = 241)
+
+class test_CartAssemblyAutoLOPower(unittest.TestCase):
+
+    def setUp(self) -> None:
+        fd, self.fileName = tempfile.mkstemp(suffix = ".yaml")
+        os.close(fd)
+        self.events = []
+
+    def tearDown(self) -> None:
+        os.remove(self.fileName)
+
+    def makeCart(self, gain: dict[int, float], broken: tuple[int] = ()) -> CartAssembly:
+        loDevice = FakeLODevice(self.events)
+        cart = CartAssemblyUnderTest(FakeCCADevice(self.events, loDevice, gain, broken), loDevice)
+        cart.loPowerMap = LOPowerMap(self.fileName)
+        cart.configId = 1
+        cart.mixerParam01 = SimpleNamespace(IJ = 25)
+        cart.mixerParam11 = SimpleNamespace(IJ = 30)
+        return cart
+
+    def sisCurrent(self, cart: CartAssembly, pol: int) -> float:
+        return abs(cart.ccaDevice.getSIS(pol, 1)['Ij'])
+
+    def test_bothConverge(self) -> None:
+        cart = self.makeCart({0: 0.5, 1: 0.4})
+        results = cart._autoLOPowerPols({0: 25, 1: -30})
+        self.assertEqual(results, {0: (True, ""), 1: (True, "")})
+        # both PA outputs are written before both SIS currents are read:
+        self.assertEqual(self.events[:4], [('set', 0), ('set', 1), ('read', 0), ('read', 1)])
+        self.assertAlmostEqual(self.sisCurrent(cart, 0), 25, delta = cart.settings.tolerance)
+        self.assertAlmostEqual(self.sisCurrent(cart, 1), 30, delta = cart.settings.tolerance)
+        self.assertAlmostEqual(cart.loPowerMap.lookup(1, 0, 241, 25), 50, delta = 1)
+        self.assertAlmostEqual(cart.loPowerMap.lookup(1, 1, 241, 30), 75, delta = 1.25)
+
+    def test_onePolFails(self) -> None:
+        cart = self.makeCart({0: 0.5, 1: 0.4}, broken = (1, ))
+        success, msg = cart._autoLOPowerSequence(True, True, False)
+        # a SIS read error fails the sequence and doesn't stop the other pol:
+        self.assertFalse(success)
+        self.assertIn("pol1", msg)
+        self.assertIsNone(cart.autoLOStatus.is_active)
+        self.assertAlmostEqual(self.sisCurrent(cart, 0), 25, delta = cart.settings.tolerance)
+        self.assertEqual(self.events.count(('read', 1)), 1)
+        self.assertIsNotNone(cart.loPowerMap.lookup(1, 0, 241, 25))
+        self.assertIsNone(cart.loPowerMap.lookup(1, 1, 241, 30))
+
+    def test_maxIter(self) -> None:
+        cart = self.makeCart({0: 0, 1: 0.4})
+        results = cart._autoLOPowerPols({0: 25, 1: 30})
+        success, msg = results[0]
+        self.assertFalse(success)
+        self.assertIn("fail", msg)
+        # stops after max_iter:
+        self.assertLessEqual(self.events.count(('read', 0)), cart.settings.max_iter + 2)
+        self.assertEqual(results[1], (True, ""))
+        self.assertIsNone(cart.loPowerMap.lookup(1, 0, 241, 25))
@@ -0,0 +1,48 @@
+import random
+import unittest
+from statistics import mean, stdev
+from Measure.Shared.Welford import Welford
+from Measure.NoiseTemperature.ChopperEstimator import ChopperEstimator
+
+class test_ChopperEstimator(unittest.TestCase):
+
+    def test_welford(self):
+        rng = random.Random(1)
+        samples = [rng.gauss(5, 2) for _ in range(1000)]
+        acc = Welford()
+        for x in samples:
+            acc.add(x)
+        self.assertEqual(acc.count, 1000)
+        self.assertAlmostEqual(acc.mean, mean(samples))
+        self.assertAlmostEqual(acc.stdev, stdev(samples))
+        self.assertAlmostEqual(acc.stdErr, stdev(samples) / 1000 ** 0.5)
+
+    def run_estimator(self, noise: float, targetTRxErr: float) -> ChopperEstimator:
+        rng = random.Random(2)
+        # TRx = 50 K with tHot = 300, tCold = 80: Y = 350 / 130
+        estimator = ChopperEstimator(tHot = 300, tCold = 80, minSamples = 20, maxSamples = 2000, targetTRxErr = targetTRxErr)
+        isHot = True
+        while not estimator.done():
+            pHot = 350e-6 * (1 + rng.gauss(0, noise))
+            pCold = 130e-6 * (1 + rng.gauss(0, noise))
+            estimator.add(pHot if isHot else pCold, isHot)
+            isHot = not isHot
+        return estimator
+
+    def test_quiet_finishes_early(self):
+        quiet = self.run_estimator(0.001, 0.5)
+        noisy = self.run_estimator(0.02, 0.5)
+        self.assertEqual(quiet.hot.count, 20)
+        self.assertGreater(noisy.hot.count, quiet.hot.count)
+        self.assertLessEqual(noisy.TRxErr, 0.5)
+        self.assertAlmostEqual(noisy.TRx, 50, delta = 2)
+
+    def test_max_samples(self):
+        estimator = self.run_estimator(0.5, 0.01)
+        self.assertEqual(estimator.hot.count, 2000)
+        bars = estimator.errorBars(0, 'USB', 6.0)
+        self.assertGreater(bars.TRxErr, 0.01)
+        self.assertEqual(bars.samplesCold, 2000)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import asyncio
+import json
+import unittest
+from app_Common.ConnectionManager import ConnectionManager, encode
+
+class FakeWebSocket():
+    def __init__(self, stalled = False):
+        self.client = None
+        self.sent = []
+        self.stalled = asyncio.Event()
+        if not stalled:
+            self.stalled.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        await self.stalled.wait()
+        self.sent.append(json.loads(text))
+
+class test_ConnectionManager(unittest.TestCase):
+
+    def test_encode(self):
+        self.assertEqual(json.loads(encode({'a': 1, 'b': [1.5, None]})), {'a': 1, 'b': [1.5, None]})
+
+    def test_stalled_client(self):
+        async def run():
+            manager = ConnectionManager(maxQueue = 4)
+            fast = FakeWebSocket()
+            slow = FakeWebSocket(stalled = True)
+            await manager.connect(fast)
+            await manager.connect(slow)
+            for i in range(10):
+                await manager.broadcast({'i': i})
+                await asyncio.sleep(0)
+            await asyncio.sleep(0.01)
+            self.assertEqual([m['i'] for m in fast.sent], list(range(10)))
+            self.assertEqual(slow.sent, [])
+            slow.stalled.set()
+            await asyncio.sleep(0.01)
+            status = manager.status
+            manager.disconnect(fast)
+            manager.disconnect(slow)
+            return slow.sent, status
+        sent, status = asyncio.run(run())
+        # the slow client got the frame it was stuck on plus the latest ones:
+        self.assertEqual(sent[-1], {'i': 9})
+        self.assertLess(len(sent), 10)
+        self.assertEqual(status[0].sent, 10)
+        self.assertGreater(status[1].dropped, 0)
+
+    def test_coalesce_and_late_join(self):
+        async def run():
+            manager = ConnectionManager()
+            slow = FakeWebSocket(stalled = True)
+            await manager.connect(slow)
+            await manager.broadcast({'x': 0}, key = 'pos')
+            await asyncio.sleep(0)
+            for x in range(1, 5):
+                await manager.broadcast({'x': x}, key = 'pos')
+            late = FakeWebSocket()
+            await manager.connect(late)
+            slow.stalled.set()
+            await asyncio.sleep(0.01)
+            manager.disconnect(slow)
+            manager.disconnect(late)
+            return slow.sent, late.sent
+        slowSent, lateSent = asyncio.run(run())
+        self.assertEqual(slowSent, [{'x': 0}, {'x': 4}])
+        self.assertEqual(lateSent, [{'x': 4}])
+
+    def test_no_sender_without_frames(self):
+        async def run():
+            manager = ConnectionManager()
+            websocket = FakeWebSocket()
+            await manager.connect(websocket)
+            # a client served only with send() has no sender task:
+            await manager.send({'a': 1}, websocket)
+            idle = manager.clients[websocket].task
+            await manager.broadcast({'b': 2})
+            await asyncio.sleep(0.01)
+            manager.disconnect(websocket)
+            return idle, websocket.sent
+        idle, sent = asyncio.run(run())
+        self.assertIsNone(idle)
+        self.assertEqual(sent, [{'a': 1}, {'b': 2}])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from app_Common.DBPool import CTSDBPool, PooledDriver
+
+class FakeCursor():
+    def __init__(self, rows: list[tuple], lastrowid: int = None):
+        self.rows = list(rows)
+        self.lastrowid = lastrowid
+
+    def fetchone(self):
+        return self.rows.pop(0) if self.rows else None
+
+    def fetchall(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+    def fetchmany(self, max_rows):
+        rows, self.rows = self.rows[:max_rows], self.rows[max_rows:]
+        return rows
+
+class FakeDriver():
+    count = 0
+
+    def __init__(self):
+        FakeDriver.count += 1
+        self.id = FakeDriver.count
+        self.healthy = True
+        self.connected = True
+        self.cursor = None
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.connection = SimpleNamespace(ping = self.ping)
+
+    def ping(self, reconnect = False):
+        if not self.healthy:
+            raise RuntimeError("gone away")
+
+    def execute(self, query, params = None, commit = False, **kwargs):
+        self.statements.append(query)
+        self.cursor = FakeCursor([(self.id, query)], lastrowid = self.id * 100)
+        if commit:
+            self.commits += 1
+        return True
+
+    def commit(self):
+        self.commits += 1
+        return True
+
+    def rollback(self):
+        self.rollbacks += 1
+        return True
+
+    def is_connected(self):
+        return self.connected
+
+    def disconnect(self):
+        self.connected = False
+        return True
+
+class FakePool(CTSDBPool):
+    def _connect(self):
+        return FakeDriver()
+
+class test_DBPool(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = FakePool({}, size = 2, checkoutTimeout = 0.05)
+        self.db = PooledDriver(self.pool)
+
+    def test_checkoutCheckin(self):
+        with self.pool.connection() as driver:
+            self.assertEqual(self.pool.status.checkedOut, 1)
+        self.assertEqual(self.pool.status.checkedOut, 0)
+        self.assertEqual(self.pool.status.idle, 1)
+        # the idle connection is reused:
+        with self.pool.connection() as again:
+            self.assertIs(again, driver)
+        self.assertEqual(self.pool.status.connections, 1)
+
+    def test_statementReleases(self):
+        self.assertTrue(self.db.execute("SELECT 1"))
+        # nothing held after the statement, but its rows can still be fetched:
+        self.assertEqual(self.pool.status.checkedOut, 0)
+        self.assertEqual(self.db.fetchone()[1], "SELECT 1")
+        self.assertIsNone(self.db.fetchone())
+
+    def test_manyThreads(self):
+        # more threads than connections don't each hold one:
+        def work():
+            for _ in range(5):
+                self.db.execute("SELECT 1")
+                self.db.fetchall()
+        threads = [threading.Thread(target = work) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        status = self.pool.status
+        self.assertEqual(status.checkedOut, 0)
+        self.assertLessEqual(status.connections, 2)
+        self.assertEqual(status.statements, 40)
+
+    def test_transaction(self):
+        self.db.execute("INSERT INTO t VALUES (1)")
+        # an uncommitted write keeps its connection:
+        self.assertEqual(self.pool.status.checkedOut, 1)
+        self.db.execute("UPDATE t SET a = 2")
+        self.assertTrue(self.db.commit())
+        self.assertEqual(self.pool.status.checkedOut, 0)
+        driver = self.pool.idle[0][0]
+        self.assertEqual(driver.statements, ["INSERT INTO t VALUES (1)", "UPDATE t SET a = 2"])
+        self.assertEqual(driver.commits, 1)
+
+    def test_release(self):
+        self.db.execute("DELETE FROM t")
+        self.db.release()
+        self.assertEqual(self.pool.status.checkedOut, 0)
+        self.assertEqual(self.pool.idle[0][0].rollbacks, 1)
+
+    def test_session(self):
+        with self.db.session():
+            self.db.execute("SELECT 1")
+            self.db.execute("SELECT 2")
+            self.assertEqual(self.pool.status.checkedOut, 1)
+        self.assertEqual(self.pool.status.checkedOut, 0)
+        self.assertEqual(len(self.pool.idle[0][0].statements), 2)
+
+    def test_lastInsertId(self):
+        self.db.execute("INSERT INTO t VALUES (1)", commit = True)
+        self.assertEqual(self.pool.status.checkedOut, 0)
+        # another thread takes the connection in between:
+        with self.pool.connection() as driver:
+            self.db.execute("SELECT LAST_INSERT_ID()")
+            self.assertEqual(self.db.fetchone(), (driver.id * 100, ))
+            self.assertEqual(driver.statements, ["INSERT INTO t VALUES (1)"])
+
+    def test_overflow(self):
+        with self.pool.connection(), self.pool.connection():
+            timeStart = time.time()
+            with self.pool.connection():
+                self.assertGreaterEqual(time.time() - timeStart, 0.04)
+                self.assertEqual(self.pool.status.connections, 3)
+                self.assertEqual(self.pool.status.overflow, 1)
+        # the overflow connection is closed on return:
+        self.assertEqual(self.pool.status.connections, 2)
+        self.assertEqual(self.pool.status.idle, 2)
+
+    def test_waitForCheckin(self):
+        pool = FakePool({}, size = 1, checkoutTimeout = 5)
+        held = pool._checkout()
+        threading.Timer(0.05, pool._checkin, args = (held, )).start()
+        with pool.connection() as driver:
+            self.assertIs(driver, held)
+        self.assertEqual(pool.status.overflow, 0)
+
+    def test_staleReplaced(self):
+        with self.pool.connection() as driver:
+            pass
+        driver.healthy = False
+        # make it look idle for longer than the health check interval:
+        self.pool.idle = [(driver, time.time() - CTSDBPool.HEALTH_CHECK_INTERVAL - 1)]
+        with self.pool.connection() as replacement:
+            self.assertIsNot(replacement, driver)
+        self.assertFalse(driver.connected)
+        self.assertEqual(self.pool.status.reconnects, 1)
+        self.assertEqual(self.pool.status.connections, 1)
+
+    def test_recentNotPinged(self):
+        with self.pool.connection() as driver:
+            pass
+        driver.healthy = False
+        with self.pool.connection() as again:
+            self.assertIs(again, driver)
@@ -0,0 +1,84 @@
+import unittest
+from types import SimpleNamespace
+from app_Common.DBPool import CTSDBPool, PooledDriver
+from app_Common.DBWriter import DBWriter
+
+class FakeTable():
+    def __init__(self, failures = 0):
+        self.rows = []
+        self.calls = 0
+        self.failures = failures
+
+    def create(self, records):
+        self.calls += 1
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("connection lost")
+        self.rows += records
+        return len(records)
+
+class FakePool(CTSDBPool):
+    def _connect(self):
+        driver = SimpleNamespace(cursor = None, is_connected = lambda: True)
+        driver.execute = lambda query, params = None, commit = False: True
+        return driver
+
+class CommittingTable():
+    '''
+    Commits the insert then fails, as when the connection is lost reading back the new key
+    '''
+    def __init__(self):
+        self.db = PooledDriver(FakePool({}))
+        self.calls = 0
+
+    def create(self, records):
+        self.calls += 1
+        self.db.execute("INSERT INTO t VALUES (1)", commit = True)
+        raise RuntimeError("connection lost")
+
+class test_DBWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.writer = DBWriter()
+        self.writer.BACKOFF_INITIAL = 0.01
+
+    def tearDown(self):
+        self.writer.stop()
+
+    def test_batches_and_flush(self):
+        table = FakeTable()
+        for i in range(10):
+            self.writer.submit(table, [i, i + 100])
+        self.assertTrue(self.writer.flush(5))
+        self.assertEqual(sorted(table.rows), sorted(list(range(10)) + list(range(100, 110))))
+        status = self.writer.status
+        self.assertEqual(status.written, 20)
+        self.assertEqual(status.queued, 0)
+
+    def test_retry(self):
+        table = FakeTable(failures = 2)
+        self.writer.submit(table, [1, 2, 3])
+        self.writer.flush(5)
+        self.assertEqual(table.rows, [1, 2, 3])
+        self.assertEqual(self.writer.status.retries, 2)
+
+    def test_give_up(self):
+        self.writer.MAX_RETRIES = 1
+        table = FakeTable(failures = 5)
+        results = []
+        self.writer.submit(table, [1], onComplete = lambda success, msg: results.append(success))
+        self.writer.flush(5)
+        self.assertEqual(results, [False])
+        self.assertEqual(self.writer.status.failed, 1)
+
+    def test_no_retry_after_commit(self):
+        table = CommittingTable()
+        results = []
+        self.writer.submit(table, [1], onComplete = lambda success, msg: results.append(success))
+        self.writer.flush(5)
+        self.assertEqual(table.calls, 1)
+        self.assertEqual(results, [False])
+        self.assertEqual(self.writer.status.retries, 0)
+
+if __name__ == '__main__':
+    unittest.main()
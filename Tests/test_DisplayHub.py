@@ -0,0 +1,48 @@
+import asyncio
+import threading
+import unittest
+from Measure.Shared.DisplayHub import DisplayHub, DisplayTopic
+
+class test_DisplayHub(unittest.TestCase):
+
+    def setUp(self):
+        self.hub = DisplayHub()
+
+    def test_publish_from_thread(self):
+        async def consume():
+            subscription = self.hub.subscribe(DisplayTopic.CHOPPER_POWER, maxsize = 100)
+            thread = threading.Thread(target = lambda: [self.hub.publish(DisplayTopic.CHOPPER_POWER, i) for i in range(5)])
+            thread.start()
+            received = []
+            while len(received) < 5:
+                received += await asyncio.wait_for(subscription.getAll(), 1)
+            thread.join()
+            subscription.close()
+            return received
+        self.assertEqual(asyncio.run(consume()), [0, 1, 2, 3, 4])
+        self.assertEqual(self.hub.numSubscribers(DisplayTopic.CHOPPER_POWER), 0)
+
+    def test_latest_only(self):
+        async def consume():
+            subscription = self.hub.subscribe(DisplayTopic.SPEC_AN, maxsize = 1)
+            for i in range(3):
+                self.hub.publish(DisplayTopic.SPEC_AN, i)
+            # let the call_soon_threadsafe callbacks run:
+            await asyncio.sleep(0)
+            item = await subscription.get()
+            subscription.close()
+            return item, subscription.dropped
+        self.assertEqual(asyncio.run(consume()), (2, 2))
+
+    def test_other_topics_not_delivered(self):
+        async def consume():
+            subscription = self.hub.subscribe(DisplayTopic.Y_FACTOR)
+            self.hub.publish(DisplayTopic.STABILITY, 1)
+            await asyncio.sleep(0)
+            empty = subscription.queue.empty()
+            subscription.close()
+            return empty
+        self.assertTrue(asyncio.run(consume()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import os
+import tempfile
+import unittest
+from Controllers.IFAttenTable import IFAttenTable
+
+class test_IFAttenTable(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.fileName = tempfile.mkstemp(suffix = ".yaml")
+        os.close(fd)
+        self.table = IFAttenTable(self.fileName)
+
+    def tearDown(self):
+        os.remove(self.fileName)
+
+    def test_lookup(self):
+        self.assertIsNone(self.table.lookup(230, 6, 'POL0_USB', -30))
+        self.table.record(230, 6, 'POL0_USB', -30, 20)
+        self.table.record(230, 8, 'POL0_USB', -30, 25)
+        self.table.record(230, 6, 'POL1_USB', -30, 40)
+        self.assertEqual(self.table.lookup(230, 6, 'POL0_USB', -30), 20)
+        self.assertEqual(self.table.lookup(230.5, 7.9, 'POL0_USB', -30), 25)
+        # lower target level needs more attenuation:
+        self.assertEqual(self.table.lookup(230, 6, 'POL0_USB', -33), 23)
+        self.assertEqual(self.table.lookup(230, 6, 'POL1_USB', -30), 40)
+        self.assertIsNone(self.table.lookup(240, 6, 'POL0_USB', -30))
+        self.assertIsNone(self.table.lookup(230, 10, 'POL0_USB', -30))
+
+    def test_replace_and_persist(self):
+        self.table.record(230, 6, 'POL0_USB', -30, 20)
+        self.table.record(230, 6, 'POL0_USB', -30, 22)
+        self.assertEqual(len(self.table.data.points), 1)
+        self.table.flush()
+        self.assertEqual(IFAttenTable(self.fileName).lookup(230, 6, 'POL0_USB', -30), 22)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+from Controllers.Receiver.LOPowerMap import LOPowerMap
+from Controllers.PBAController import PBAController
+
+class test_LOPowerMap(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.fileName = tempfile.mkstemp(suffix = ".yaml")
+        os.close(fd)
+        self.map = LOPowerMap(self.fileName)
+
+    def tearDown(self):
+        os.remove(self.fileName)
+
+    def test_lookup(self):
+        self.assertIsNone(self.map.lookup(433, 0, 230, 30))
+        self.map.record(433, 0, 220, 30, 40)
+        self.map.record(433, 0, 240, 30, 60)
+        self.map.record(433, 1, 230, 30, 90)
+        self.assertAlmostEqual(self.map.lookup(433, 0, 230, 30), 50)
+        self.assertAlmostEqual(self.map.lookup(433, 0, 220, -30), 40)
+        # nearest point just outside the recorded range:
+        self.assertAlmostEqual(self.map.lookup(433, 0, 241, 30), 60)
+        self.assertIsNone(self.map.lookup(433, 0, 260, 30))
+        # target Ij too different:
+        self.assertIsNone(self.map.lookup(433, 0, 230, 40))
+        self.assertIsNone(self.map.lookup(434, 0, 230, 30))
+
+    def test_replace_and_persist(self):
+        self.map.record(433, 0, 220, 30, 40)
+        self.map.record(433, 0, 220, 30, 45)
+        self.assertEqual(len(self.map.data.points["433/0"]), 1)
+        reloaded = LOPowerMap(self.fileName)
+        self.assertAlmostEqual(reloaded.lookup(433, 0, 220, 30), 45)
+        reloaded.clear(433)
+        self.assertIsNone(LOPowerMap(self.fileName).lookup(433, 0, 220, 30))
+
+    def test_warm_start_converges_faster(self):
+        def iterations(initial = None, spread = None, answer = 60):
+            controller = PBAController(tolerance = 0.5, output_limits = (15, 100), max_iter = 15)
+            controller.reset(initial, spread)
+            controller.setpoint = 0.5 * answer
+            while not controller.done:
+                # SIS current rises with PA output:
+                controller.process(0.5 * controller.output)
+            self.assertFalse(controller.fail)
+            return controller.iter
+        self.assertEqual(iterations(60.2, 5), 1)
+        # starting within 3 % of the answer, a typical warm start takes about half the iterations:
+        cold = [iterations(answer = pa) for pa in range(20, 96, 3)]
+        warm = [iterations(pa + offset, 5, pa) for pa in range(20, 96, 3) for offset in (-3, 3)]
+        self.assertLess(sum(warm) / len(warm), 0.7 * sum(cold) / len(cold))
+
+if __name__ == '__main__':
+    unittest.main()
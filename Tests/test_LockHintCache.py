@@ -0,0 +1,45 @@
+import os
+import tempfile
+import unittest
+from Controllers.LO.LockHintCache import LockHintCache
+
+class test_LockHintCache(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.fileName = tempfile.mkstemp(suffix = ".yaml")
+        os.close(fd)
+        self.cache = LockHintCache(self.fileName)
+
+    def tearDown(self):
+        os.remove(self.fileName)
+
+    def test_lookup(self):
+        self.assertIsNone(self.cache.lookup("LO1", 230))
+        self.cache.recordLock("LO1", 230, -18, 1, 1234, 3)
+        hint = self.cache.lookup("LO1", 230)
+        self.assertEqual((hint.refAmplitude, hint.lockSB, hint.courseTune), (-18, 1, 1234))
+        self.assertIsNone(self.cache.lookup("LO1", 231))
+        self.assertIsNone(self.cache.lookup("LO2", 230))
+
+    def test_failure_keeps_hint(self):
+        self.cache.recordFailure("LO1", 230, 5)
+        self.assertIsNone(self.cache.lookup("LO1", 230))
+        self.cache.recordLock("LO1", 230, -18, 0, 1000, 2)
+        self.cache.recordFailure("LO1", 230, 4)
+        self.assertEqual(self.cache.lookup("LO1", 230).courseTune, 1000)
+
+    def test_stats_and_persist(self):
+        self.cache.recordLock("LO1", 230, -20, 0, 1000, 3)
+        self.cache.recordLock("LO1", 230, -20, 0, 1001, 1)
+        self.cache.recordFailure("LO1", 232, 2)
+        stats = LockHintCache(self.fileName).getStats("LO1")
+        self.assertEqual([s.freqLO for s in stats], [230, 232])
+        self.assertEqual(stats[0].locks, 2)
+        self.assertAlmostEqual(stats[0].meanAttempts, 2)
+        self.assertEqual(stats[0].lastAttempts, 1)
+        self.assertEqual(stats[1].failures, 1)
+        self.cache.clear("LO1")
+        self.assertEqual(self.cache.getStats(), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+from Measure.NoiseTemperature.Checkpoint import NoiseTempCheckpoint, StepType
+
+NT = StepType.NOISE_TEMP
+IR = StepType.IMAGE_REJECT
+
+class test_NoiseTempCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.fileName = tempfile.mkstemp(suffix = ".yaml")
+        os.close(fd)
+        self.checkpoint = NoiseTempCheckpoint(self.fileName)
+
+    def tearDown(self):
+        for fileName in (self.fileName, self.checkpoint.journalName):
+            if os.path.exists(fileName):
+                os.remove(fileName)
+
+    def test_remaining(self):
+        self.assertFalse(self.checkpoint.hasCheckpoint(5))
+        self.assertEqual(self.checkpoint.remaining(5, 221, 6, [0, 1], [NT, IR]), [NT, IR])
+        self.checkpoint.markDone(5, 221, [6], [0, 1], [NT])
+        self.checkpoint.markDone(5, 221, [6], [0], [IR])
+        self.assertTrue(self.checkpoint.hasCheckpoint(5))
+        self.assertEqual(self.checkpoint.remaining(5, 221, 6, [0, 1], [NT, IR]), [IR])
+        self.assertTrue(self.checkpoint.isDone(5, 221.0001, 6, [0], [NT, IR]))
+        self.assertFalse(self.checkpoint.isDone(5, 221, 7, [0], [NT]))
+        self.assertFalse(self.checkpoint.isDone(6, 221, 6, [0], [NT]))
+
+    def test_onWritten(self):
+        self.checkpoint.onWritten(5, 221, [4, 5], [0], [NT])(False, "failed")
+        self.assertFalse(self.checkpoint.hasCheckpoint(5))
+        self.checkpoint.onWritten(5, 221, [4, 5], [0], [NT])(True, "")
+        self.assertTrue(self.checkpoint.isDone(5, 221, 5, [0], [NT]))
+
+    def test_persist_and_clear(self):
+        self.checkpoint.markDone(5, 221, [0], [0, 1], [NT, IR])
+        self.checkpoint.markDone(5, 221, [0], [0], [NT])
+        self.checkpoint.markDone(7, 0, [0], [0], [StepType.WARM_IF])
+        loaded = NoiseTempCheckpoint(self.fileName)
+        self.assertEqual(len(loaded.getPoints(5)), 4)
+        self.assertTrue(loaded.isDone(7, 0, 0, [0], [StepType.WARM_IF]))
+        loaded.clear(5)
+        self.assertFalse(NoiseTempCheckpoint(self.fileName).hasCheckpoint(5))
+        self.assertTrue(NoiseTempCheckpoint(self.fileName).hasCheckpoint(7))
+
+    def test_journal(self):
+        self.checkpoint.markDone(5, 221, [4, 5], [0], [NT])
+        # marking points appends to the journal, it doesn't rewrite the YAML file:
+        self.assertEqual(os.path.getsize(self.fileName), 0)
+        with open(self.checkpoint.journalName) as f:
+            self.assertEqual(len(f.readlines()), 2)
+        self.assertTrue(NoiseTempCheckpoint(self.fileName).isDone(5, 221, 5, [0], [NT]))
+        self.checkpoint.flush()
+        self.assertEqual(os.path.getsize(self.checkpoint.journalName), 0)
+        self.assertTrue(NoiseTempCheckpoint(self.fileName).isDone(5, 221, 4, [0], [NT]))
+
+    def test_journalCutShort(self):
+        self.checkpoint.markDone(5, 221, [4], [0], [NT])
+        with open(self.checkpoint.journalName, "a") as f:
+            f.write('{"testKey": 5, "point": {"freqLO"')
+        loaded = NoiseTempCheckpoint(self.fileName)
+        self.assertEqual(len(loaded.getPoints(5)), 1)
+
+    def test_compact(self):
+        self.checkpoint.COMPACT_ENTRIES = 4
+        self.checkpoint.markDone(5, 221, [4, 5, 6, 7], [0], [NT])
+        self.assertEqual(self.checkpoint.journalEntries, 0)
+        self.assertGreater(os.path.getsize(self.fileName), 0)
+        self.assertEqual(len(NoiseTempCheckpoint(self.fileName).getPoints(5)), 4)
+
+    def test_hasRecord(self):
+        self.assertFalse(self.checkpoint.hasRecord(5, 221, 6, [0, 1], [NT, IR]))
+        self.checkpoint.markDone(5, 221, [6], [0, 1], [NT, IR])
+        self.assertTrue(self.checkpoint.hasRecord(5, 221, 6, [0, 1], [NT, IR]))
+        # written without IR by an earlier run: still not measured again:
+        self.checkpoint.markDone(5, 221, [7], [0, 1], [NT])
+        with self.assertLogs("ALMAFE-CTS-Control", level = "WARNING"):
+            self.assertTrue(self.checkpoint.hasRecord(5, 221, 7, [0, 1], [NT, IR]))
+
+    def test_prune(self):
+        for key in range(1, NoiseTempCheckpoint.MAX_TESTS + 2):
+            self.checkpoint.markDone(key, 221, [0], [0], [NT])
+        self.assertFalse(self.checkpoint.hasCheckpoint(1))
+        self.assertTrue(self.checkpoint.hasCheckpoint(NoiseTempCheckpoint.MAX_TESTS + 1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import numpy as np
+from math import log10
+from Measure.NoiseTemperature.NoiseTempReduction import reduceNoiseTemp, recordsToArrays
+
+T_COLD_EFF = 80
+T_HOT = 295
+
+class FakeRecord():
+    def __init__(self, pol, freqIF, pHot, pCold):
+        self.Pol = pol
+        self.CenterIF = freqIF
+        self.TRF_Hot = T_HOT
+        self.Phot_USB = pHot
+        self.Pcold_USB = pCold
+        self.Phot_LSB = None
+        self.Pcold_LSB = None
+        self.PwrUSB_SrcUSB = -10
+        self.PwrLSB_SrcUSB = -30
+        self.PwrLSB_SrcLSB = None
+        self.PwrUSB_SrcLSB = None
+
+class test_NoiseTempReduction(unittest.TestCase):
+
+    def test_scalar_matches_formula(self):
+        pHot, pCold = -30.0, -33.0
+        Y = 10 ** ((pHot - pCold) / 10)
+        expected = (T_HOT - T_COLD_EFF * Y) / (Y - 1)
+        result = reduceNoiseTemp([6.0], [pHot], [pCold], T_HOT, T_COLD_EFF)
+        self.assertAlmostEqual(result.TRx[0], expected)
+        self.assertAlmostEqual(result.Y[0], Y)
+
+    def test_known_trx(self):
+        # choose Y so that TRx = 50 K:
+        Y = (T_HOT + 50) / (T_COLD_EFF + 50)
+        dY = 10 * log10(Y)
+        pHot = np.full((2, 2, 11), -30.0)
+        pCold = pHot - dY
+        result = reduceNoiseTemp(np.linspace(4, 12, 11), pHot, pCold, T_HOT, T_COLD_EFF)
+        self.assertEqual(result.TRx.shape, (2, 2, 11))
+        self.assertTrue(np.allclose(result.TRx, 50))
+        self.assertTrue(np.allclose(result.bandMean(5, 10), 50))
+
+    def test_image_reject_correction(self):
+        Y = (T_HOT + 50) / (T_COLD_EFF + 50)
+        dY = 10 * log10(Y)
+        result = reduceNoiseTemp([6.0], [-30.0], [-30.0 - dY], T_HOT, T_COLD_EFF, imageReject = [10.0])
+        self.assertAlmostEqual(result.Tssb[0], 50 * 1.1)
+
+    def test_empty_band(self):
+        result = reduceNoiseTemp([6.0], [[[-30.0]]], [[[-33.0]]], T_HOT, T_COLD_EFF)
+        self.assertTrue(np.isnan(result.bandMean(20, 30)).all())
+
+    def test_records_to_arrays(self):
+        records = [FakeRecord(0, f, -30, -33) for f in (4.0, 5.0, 6.0)]
+        ifFreqs, pHot, pCold, tHot, imageReject = recordsToArrays(records, pols = (0,))
+        self.assertEqual(pHot.shape, (1, 2, 3))
+        self.assertTrue(np.isnan(pHot[0, 1]).all())
+        self.assertTrue(np.allclose(imageReject[0, 0], 20))
+        result = reduceNoiseTemp(ifFreqs, pHot, pCold, tHot, T_COLD_EFF)
+        self.assertTrue(np.isfinite(result.TRx[0, 0]).all())
+
+if __name__ == '__main__':
+    unittest.main()
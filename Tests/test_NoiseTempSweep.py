@@ -0,0 +1,134 @@
+import unittest
+import numpy as np
+from datetime import datetime
+from DBBand6Cart.schemas.NoiseTempRawDatum import NoiseTempRawDatum
+from Measure.NoiseTemperature.NoiseTempSweep import NoiseTempSweep, NoiseTempSweepPoint
+
+IF_STEPS = [4.0, 5.0, 6.0, 7.0, 8.0]
+
+def makeHeader(pol: int) -> dict:
+    return dict(
+        fkCartTest = 1,
+        fkDUT_Type = 0,
+        timeStamp = datetime.now(),
+        FreqLO = 241.0,
+        BWIF = 100,
+        Pol = pol,
+        TRF_Hot = 295.0,
+        IF_Attn = 10,
+        TColdLoad = 80.0,
+        Vj1 = 10.0 + pol,
+        Ij1 = 20.0 + pol,
+        Imag = 30.0,
+        Vj2 = 0,
+        Ij2 = 0,
+        Tmixer = 4.0,
+        PLL_Lock_V = 1.5,
+        PLL_Corr_V = 0.5,
+        PLL_Assm_T = 25.0,
+        PA_A_Drain_V = 0.8,
+        PA_B_Drain_V = 0.8,
+        Is_LO_Unlocked = False
+    )
+
+class test_NoiseTempSweep(unittest.TestCase):
+
+    def setUp(self):
+        self.sweep = NoiseTempSweep(IF_STEPS, {0: makeHeader(0), 1: makeHeader(1)})
+
+    def test_trace(self):
+        self.sweep.setTrace(0, 'Phot_USB', [1, 2, 3, 4, 5])
+        np.testing.assert_array_equal(self.sweep.getTrace(0, 'Phot_USB'), [1, 2, 3, 4, 5])
+        # the other pol is not measured:
+        self.assertTrue(np.isnan(self.sweep.getTrace(1, 'Phot_USB')).all())
+        self.assertEqual(self.sweep.specAnPowers(0).pHotUSB, [1, 2, 3, 4, 5])
+        self.assertEqual(self.sweep.specAnPowers(1).pHotUSB, [])
+
+    def test_traceLong(self):
+        # extra trace points beyond the IF steps are dropped:
+        self.sweep.setTrace(0, 'Pcold_USB', [1, 2, 3, 4, 5, 6])
+        np.testing.assert_array_equal(self.sweep.getTrace(0, 'Pcold_USB'), [1, 2, 3, 4, 5])
+
+    def test_traceShort(self):
+        # IF steps beyond the end of the trace are left not measured:
+        self.sweep.setTrace(1, 'Pcold_LSB', [1, 2, 3, 4])
+        trace = self.sweep.getTrace(1, 'Pcold_LSB')
+        np.testing.assert_array_equal(trace[:4], [1, 2, 3, 4])
+        self.assertTrue(np.isnan(trace[4]))
+        self.assertIsNone(self.sweep[(1, 8.0)].Pcold_LSB)
+
+    def test_point(self):
+        self.sweep.setTrace(0, 'Phot_USB', [1, 2, 3, 4, 5])
+        point = self.sweep[(0, 6.0)]
+        self.assertIsInstance(point, NoiseTempSweepPoint)
+        self.assertEqual(point.CenterIF, 6.0)
+        self.assertEqual(point.Phot_USB, 3)
+        self.assertEqual(point.Vj1, 10.0)
+        self.assertIsNone(point.Pcold_USB)
+        # writes go into the arrays:
+        point.Pcold_USB = 0.5
+        point.Is_RF_Unlocked = True
+        self.assertEqual(self.sweep.getTrace(0, 'Pcold_USB')[2], 0.5)
+        self.assertIs(self.sweep.getValue(0, 2, 'Is_RF_Unlocked'), True)
+        with self.assertRaises(AttributeError):
+            point.CenterIF = 7.0
+        with self.assertRaises(AttributeError):
+            point.noSuchField
+
+    def test_get(self):
+        self.assertIn((1, 5.0), self.sweep)
+        self.assertNotIn((1, 5.5), self.sweep)
+        self.assertIsNone(self.sweep.get((0, 5.5)))
+        self.assertEqual(self.sweep.get((0, 5.5), 'missing'), 'missing')
+        with self.assertRaises(KeyError):
+            self.sweep[(0, 5.5)]
+        # a pol without a header is not present:
+        sweep = NoiseTempSweep(IF_STEPS, {0: makeHeader(0)})
+        self.assertNotIn((1, 5.0), sweep)
+        self.assertIsNone(sweep.get((1, 5.0)))
+        self.assertEqual(len(sweep), len(IF_STEPS))
+
+    def test_values(self):
+        self.sweep.setTrace(0, 'Phot_USB', [1, 2, 3, 4, 5])
+        records = self.sweep.values()
+        self.assertEqual(len(records), 2 * len(IF_STEPS))
+        self.assertTrue(all(isinstance(record, NoiseTempRawDatum) for record in records))
+        # ordered by IF then pol:
+        self.assertEqual([(r.CenterIF, r.Pol) for r in records[:3]], [(4.0, 0), (4.0, 1), (5.0, 0)])
+        self.assertEqual(records[2].Phot_USB, 2)
+        self.assertEqual(records[3].Vj1, 11.0)
+
+    def test_setitemExisting(self):
+        record = self.sweep[(0, 5.0)].toRecord()
+        record.Phot_USB = 7
+        record.Vj1 = 99
+        self.sweep[(0, 5.0)] = record
+        self.assertEqual(self.sweep[(0, 5.0)].Phot_USB, 7)
+        # values common to the pol which are already present are kept:
+        self.assertEqual(self.sweep[(0, 5.0)].Vj1, 10.0)
+
+    def test_setitemInserts(self):
+        self.sweep.setTrace(0, 'Phot_USB', [1, 2, 3, 4, 5])
+        record = self.sweep[(0, 5.0)].toRecord()
+        record.CenterIF = 5.5
+        record.Phot_USB = 2.5
+        self.sweep[(0, 5.5)] = record
+        # an IF bin is inserted in order, keeping the existing points:
+        np.testing.assert_array_equal(self.sweep.ifFreqs, [4.0, 5.0, 5.5, 6.0, 7.0, 8.0])
+        np.testing.assert_array_equal(self.sweep.getTrace(0, 'Phot_USB'), [1, 2, 2.5, 3, 4, 5])
+        self.assertTrue(np.isnan(self.sweep.getTrace(1, 'Phot_USB')[2]))
+        self.assertEqual(len(self.sweep), 2 * 6)
+
+    def test_toArrays(self):
+        for pol in (0, 1):
+            self.sweep.setTrace(pol, 'Phot_USB', [10] * 5)
+            self.sweep.setTrace(pol, 'Pcold_USB', [5] * 5)
+        ifFreqs, pHot, pCold, tHot, imageReject = self.sweep.toArrays()
+        np.testing.assert_array_equal(ifFreqs, IF_STEPS)
+        self.assertEqual(pHot.shape, (2, 2, 5))
+        self.assertTrue((pHot[:, 0] == 10).all())
+        self.assertTrue(np.isnan(pCold[:, 1]).all())
+        self.assertTrue((tHot == 295.0).all())
+
+if __name__ == '__main__':
+    unittest.main()
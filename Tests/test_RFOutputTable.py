@@ -0,0 +1,66 @@
+import os
+import tempfile
+import threading
+import unittest
+from Controllers.RFSource.RFOutputTable import RFOutputTable, rfOutputTable
+
+class test_RFOutputTable(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.fileName = tempfile.mkstemp(suffix = ".yaml")
+        os.close(fd)
+        self.table = RFOutputTable(self.fileName)
+
+    def tearDown(self):
+        os.remove(self.fileName)
+
+    def test_lookup(self):
+        self.assertIsNone(self.table.lookup(1, 0, 240, -5, 10))
+        self.table.record(1, 0, 240, -5, 40, 10)
+        self.table.record(1, 0, 241, -5, 60, 10)
+        self.table.record(1, 1, 240, -5, 80, 10)
+        self.assertAlmostEqual(self.table.lookup(1, 0, 240, -5, 10), 40)
+        # interpolates in RF:
+        self.assertAlmostEqual(self.table.lookup(1, 0, 240.5, -5, 10), 50)
+        # nearest within the RF window:
+        self.assertAlmostEqual(self.table.lookup(1, 0, 242, -5, 10), 60)
+        self.assertAlmostEqual(self.table.lookup(1, 1, 240, -5, 10), 80)
+        self.assertIsNone(self.table.lookup(1, 0, 250, -5, 10))
+        self.assertIsNone(self.table.lookup(1, 0, 240, -10, 10))
+        self.assertIsNone(self.table.lookup(1, 0, 240, -5, 4))
+        self.assertIsNone(self.table.lookup(2, 0, 240, -5, 10))
+
+    def test_nearest_level(self):
+        self.table.record(1, 0, 240, -5, 40)
+        self.table.record(1, 0, 240, -6, 35)
+        self.assertAlmostEqual(self.table.lookup(1, 0, 240, -5.8), 35)
+        self.assertAlmostEqual(self.table.lookup(1, 0, 240, -5.2), 40)
+
+    def test_replace_and_persist(self):
+        self.table.record(1, 0, 240, -5, 40)
+        self.table.record(1, 0, 240, -5, 42)
+        self.assertEqual(len(self.table.data.points["1/0"]), 1)
+        self.assertAlmostEqual(RFOutputTable(self.fileName).lookup(1, 0, 240, -5), 42)
+        self.table.clear(1)
+        self.assertIsNone(self.table.lookup(1, 0, 240, -5))
+
+    def test_shared(self):
+        first = rfOutputTable(self.fileName)
+        second = rfOutputTable(os.path.join(os.path.dirname(self.fileName), ".", os.path.basename(self.fileName)))
+        self.assertIs(first, second)
+        # several users recording at once don't lose each other's points:
+        def work(pol):
+            for freq in range(10):
+                rfOutputTable(self.fileName).record(1, pol, 240 + freq, -5, 40 + pol)
+        threads = [threading.Thread(target = work, args = (pol, )) for pol in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        reloaded = RFOutputTable(self.fileName)
+        for pol in range(4):
+            self.assertEqual(len(reloaded.data.points[f"1/{pol}"]), 10)
+        del rfOutputTable.tables[os.path.abspath(self.fileName)]
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+from types import SimpleNamespace
+import numpy as np
+from Measure.BeamScanner.RasterFrame import packRaster, unpackRaster, HEADER
+
+class test_RasterFrame(unittest.TestCase):
+
+    def test_round_trip(self):
+        raster = SimpleNamespace(
+            key = 123,
+            index = 7,
+            startPos = SimpleNamespace(x = 75.0, y = -20.5, pol = 180.0),
+            xStep = -0.5,
+            amplitude = [-10.25, -11.5, -12.75],
+            phase = [10.0, -170.5, 45.25],
+            complete = True
+        )
+        data = packRaster(raster, cursor = 42)
+        self.assertEqual(len(data), HEADER.size + 2 * 3 * 4)
+        frame = unpackRaster(data)
+        self.assertEqual((frame['key'], frame['index'], frame['cursor']), (123, 7, 42))
+        self.assertEqual(frame['startPos'], {'x': 75.0, 'y': -20.5, 'pol': 180.0})
+        self.assertEqual(frame['xStep'], -0.5)
+        self.assertTrue(frame['reverse'])
+        self.assertTrue(frame['complete'])
+        np.testing.assert_array_equal(frame['amplitude'], raster.amplitude)
+        np.testing.assert_array_equal(frame['phase'], raster.phase)
+
+    def test_bad_magic(self):
+        with self.assertRaises(ValueError):
+            unpackRaster(bytes(HEADER.size))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from Measure.BeamScanner.RasterGrid import RasterGrid
+from Measure.BeamScanner.RasterFrame import packRaster, unpackRaster
+
+class test_RasterGrid(unittest.TestCase):
+
+    def setUp(self):
+        self.tempDir = tempfile.mkdtemp()
+        self.directory = os.path.join(self.tempDir, "1234")
+        self.numRows = 4
+        self.numCols = 5
+        self.amp = np.arange(self.numRows * self.numCols, dtype = np.float32).reshape(self.numRows, self.numCols)
+        self.phase = -self.amp
+
+    def tearDown(self):
+        shutil.rmtree(self.tempDir, ignore_errors = True)
+
+    def fill(self, grid: RasterGrid) -> None:
+        for row in range(self.numRows):
+            reverse = row % 2 == 1
+            amp, phase = self.amp[row], self.phase[row]
+            grid.put(row,
+                amp[::-1] if reverse else amp,
+                phase[::-1] if reverse else phase,
+                y = row * 0.5,
+                pol = 90,
+                startX = 2 if reverse else 0,
+                xStep = -0.5 if reverse else 0.5
+            )
+
+    def test_inMemory(self):
+        grid = RasterGrid(1234, self.numRows, self.numCols)
+        self.fill(grid)
+        self.assertEqual(grid.count, self.numRows)
+        self.assertTrue(grid.rowComplete.all())
+        # the grid is in forward x order:
+        np.testing.assert_array_equal(grid.amplitude, self.amp)
+        np.testing.assert_array_equal(grid.phase, self.phase)
+        # views are in the order measured:
+        view = grid.view(1)
+        np.testing.assert_array_equal(view.amplitude, self.amp[1][::-1])
+        self.assertEqual(view.startPos.x, 2)
+        self.assertEqual(view.xStep, -0.5)
+        self.assertTrue(view.complete)
+
+    def test_viewsDontCopy(self):
+        grid = RasterGrid(1234, self.numRows, self.numCols)
+        self.fill(grid)
+        view = grid.view(2)
+        self.assertTrue(np.shares_memory(view.amplitude, grid.amplitude))
+        self.assertEqual([v.index for v in grid.views(1, 3)], [1, 2])
+        self.assertEqual(len(grid.views(2)), 2)
+
+    def test_dictAndFrame(self):
+        grid = RasterGrid(1234, self.numRows, self.numCols)
+        self.fill(grid)
+        view = grid.view(1)
+        d = view.dict()
+        self.assertEqual(d['key'], 1234)
+        self.assertEqual(d['startPos'], {'x': 2, 'y': 0.5, 'pol': 90})
+        self.assertEqual(d['amplitude'], self.amp[1][::-1].tolist())
+        frame = unpackRaster(packRaster(view, 7))
+        self.assertEqual(frame['index'], 1)
+        np.testing.assert_array_equal(frame['phase'], self.phase[1][::-1])
+
+    def test_shortReversedTrace(self):
+        grid = RasterGrid(1234, self.numRows, self.numCols)
+        grid.put(0, [3, 2, 1], [3, 2, 1], y = 0, pol = 0, startX = 2, xStep = -0.5)
+        # a reversed trace starts at the last column:
+        np.testing.assert_array_equal(grid.amplitude[0, 2:], [1, 2, 3])
+        self.assertTrue(np.isnan(grid.amplitude[0, :2]).all())
+        np.testing.assert_array_equal(grid.view(0).amplitude, [3, 2, 1])
+
+    def test_remeasure(self):
+        grid = RasterGrid(1234, self.numRows, self.numCols)
+        self.fill(grid)
+        view = grid.put(0, self.amp[0] + 1, self.phase[0], y = 0, pol = 90, startX = 0, xStep = 0.5)
+        # the row's raster is replaced, not added:
+        self.assertEqual(view.index, 0)
+        self.assertEqual(grid.count, self.numRows)
+        self.assertEqual([v.row for v in grid.views()], list(range(self.numRows)))
+        np.testing.assert_array_equal(grid.amplitude[0], self.amp[0] + 1)
+        np.testing.assert_array_equal(grid.view(0).amplitude, self.amp[0] + 1)
+
+    def test_viewsSinceRemeasured(self):
+        grid = RasterGrid(1234, self.numRows, self.numCols)
+        self.fill(grid)
+        self.assertEqual([v.index for v in grid.viewsSince(2)], [2, 3])
+        sequence = grid.sequence
+        grid.put(0, self.amp[0] + 1, self.phase[0], y = 0, pol = 90, startX = 0, xStep = 0.5)
+        # the replaced raster is returned again, after those stored before it:
+        views = grid.viewsSince(sequence - 1)
+        self.assertEqual([v.index for v in views], [3, 0])
+        self.assertEqual(views[-1].sequence, grid.sequence)
+        np.testing.assert_array_equal(views[-1].amplitude, self.amp[0] + 1)
+
+    def test_remeasureRepeatedly(self):
+        # any number of re-measures fit:
+        grid = RasterGrid(1234, self.numRows, self.numCols)
+        for _ in range(3 * self.numRows):
+            grid.put(1, self.amp[1], self.phase[1], y = 0.5, pol = 90, startX = 0, xStep = 0.5)
+        self.assertEqual(grid.count, 1)
+        self.assertEqual(grid.view(0).row, 1)
+
+    def test_remeasureShorter(self):
+        grid = RasterGrid(1234, self.numRows, self.numCols)
+        self.fill(grid)
+        grid.put(2, [1, 2, 3], [1, 2, 3], y = 1, pol = 90, startX = 0, xStep = 0.5)
+        # nothing is left of the earlier, longer measurement:
+        np.testing.assert_array_equal(grid.amplitude[2, :3], [1, 2, 3])
+        self.assertTrue(np.isnan(grid.amplitude[2, 3:]).all())
+        self.assertEqual(len(grid.view(2).amplitude), 3)
+
+    def test_recoverRemeasured(self):
+        grid = RasterGrid(1234, self.numRows, self.numCols, directory = self.directory)
+        self.fill(grid)
+        grid.put(3, self.amp[3] + 1, self.phase[3], y = 1.5, pol = 90, startX = 0, xStep = 0.5)
+        grid.flush()
+        grid = RasterGrid.open(self.directory)
+        self.assertEqual(grid.count, self.numRows)
+        self.assertEqual(grid.sequence, self.numRows + 1)
+        grid.put(3, self.amp[3] + 2, self.phase[3], y = 1.5, pol = 90, startX = 0, xStep = 0.5)
+        self.assertEqual(grid.count, self.numRows)
+        np.testing.assert_array_equal(grid.view(3).amplitude, self.amp[3] + 2)
+
+    def test_recover(self):
+        grid = RasterGrid(1234, self.numRows, self.numCols, directory = self.directory)
+        self.fill(grid)
+        grid.flush()
+        del grid
+        grid = RasterGrid.open(self.directory)
+        self.assertEqual(grid.key, 1234)
+        self.assertEqual(grid.count, self.numRows)
+        self.assertTrue(grid.rowComplete.all())
+        np.testing.assert_array_equal(grid.amplitude, self.amp)
+        np.testing.assert_array_equal(grid.view(3).phase, self.phase[3][::-1])
+        grid.remove()
+        self.assertFalse(os.path.exists(self.directory))
+
+    def test_close(self):
+        grid = RasterGrid(1234, self.numRows, self.numCols, directory = self.directory)
+        self.fill(grid)
+        grid.close()
+        # the data is still readable and the files can be removed:
+        self.assertIsNone(grid.directory)
+        self.assertNotIsInstance(grid.amplitude, np.memmap)
+        np.testing.assert_array_equal(grid.view(1).amplitude, self.amp[1][::-1])
+        shutil.rmtree(self.directory)
+        self.assertEqual(len(grid.viewsSince(0)), self.numRows)
+
+    def test_recoverPartial(self):
+        grid = RasterGrid(1234, self.numRows, self.numCols, directory = self.directory)
+        grid.put(2, self.amp[2], self.phase[2], y = 1, pol = 90, startX = 0, xStep = 0.5)
+        grid.flush()
+        grid = RasterGrid.open(self.directory)
+        self.assertEqual(grid.count, 1)
+        self.assertEqual(list(grid.rowComplete), [False, False, True, False])
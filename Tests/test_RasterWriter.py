@@ -0,0 +1,123 @@
+import threading
+import unittest
+import numpy as np
+from types import SimpleNamespace
+from app_Common.DBWriter import DBWriter
+from Measure.BeamScanner.RasterWriter import RasterWriter, RasterJob
+
+class FakeTable():
+    def __init__(self, fail: bool = False, release: threading.Event = None):
+        self.fail = fail
+        self.release = release
+        self.records = []
+
+    def create(self, records: list):
+        if self.release:
+            self.release.wait(5)
+        if self.fail:
+            return False
+        self.records += records
+        return len(records)
+
+class test_RasterWriter(unittest.TestCase):
+
+    def setUp(self):
+        DBWriter.MAX_RETRIES = 0
+        self.dbWriter = DBWriter()
+        self.errors = []
+
+    def tearDown(self):
+        self.dbWriter.stop(flush = False, timeout = 1)
+        DBWriter.MAX_RETRIES = 5
+
+    def makeJob(self, index: int = 0, reverseX: bool = False, fkBeamPattern: int = 1) -> RasterJob:
+        raster = SimpleNamespace(index = index, amplitude = [-10.0, -5.0, -1.0], phase = [10.0, 20.0, 30.0])
+        return RasterJob(raster, fkBeamPattern, pol = 0, yPos = 2.5, scanAngle = 90,
+            xAxisList = [-1.0, 0.0, 1.0], reverseX = reverseX,
+            onError = lambda msg, fk: self.errors.append((fk, msg)))
+
+    def test_records(self):
+        table = FakeTable()
+        writer = RasterWriter(table, self.dbWriter)
+        writer.startSubScan()
+        writer.put(self.makeJob(0))
+        writer.put(self.makeJob(1, reverseX = True))
+        self.assertEqual(writer.waitSubScan(5), (True, ""))
+        self.assertEqual(len(table.records), 6)
+        first = table.records[0]
+        self.assertEqual((first.fkBeamPattern, first.Pol, first.Position_Y, first.SourceAngle), (1, 0, 2.5, 90))
+        self.assertEqual([(r.Position_X, r.Power, r.Phase) for r in table.records[:3]],
+            [(-1.0, -10.0, 10.0), (0.0, -5.0, 20.0), (1.0, -1.0, 30.0)])
+        # a reversed raster is paired with the x positions in the order measured:
+        self.assertEqual([r.Position_X for r in table.records[3:]], [1.0, 0.0, -1.0])
+
+    def test_failures(self):
+        writer = RasterWriter(FakeTable(fail = True), self.dbWriter)
+        writer.startSubScan()
+        writer.put(self.makeJob(0, fkBeamPattern = 7))
+        success, msg = writer.waitSubScan(5)
+        self.assertFalse(success)
+        self.assertIn("1 rasters not written", msg)
+        self.assertEqual(self.errors[0][0], 7)
+
+    def test_otherJobsNotAwaited(self):
+        # a slow job submitted by someone else doesn't hold up the barrier:
+        release = threading.Event()
+        writer = RasterWriter(FakeTable(), self.dbWriter)
+        writer.startSubScan()
+        writer.put(self.makeJob(0))
+        writer.jobs.join()
+        self.dbWriter.submit(FakeTable(release = release), [1])
+        self.assertEqual(writer.waitSubScan(5), (True, ""))
+        release.set()
+
+    def test_timeout(self):
+        release = threading.Event()
+        writer = RasterWriter(FakeTable(release = release), self.dbWriter)
+        writer.startSubScan()
+        writer.put(self.makeJob(0))
+        success, msg = writer.waitSubScan(0.1)
+        self.assertFalse(success)
+        self.assertIn("timed out", msg)
+        release.set()
+
+    def test_copiesTraces(self):
+        # the writer keeps its own copy of a raster which may be a view of a grid row:
+        amplitude = np.array([-10.0, -5.0, -1.0])
+        job = self.makeJob(0)
+        job.raster.amplitude = amplitude
+        writer = RasterWriter(FakeTable(), self.dbWriter)
+        writer.startSubScan()
+        writer.put(job)
+        self.assertFalse(np.shares_memory(job.amplitude, amplitude))
+        self.assertEqual(writer.waitSubScan(5), (True, ""))
+
+    def test_defaultTimeout(self):
+        release = threading.Event()
+        writer = RasterWriter(FakeTable(release = release), self.dbWriter)
+        writer.WAIT_TIMEOUT = 0.05
+        writer.WAIT_PER_RASTER = 0.05
+        writer.startSubScan()
+        writer.put(self.makeJob(0))
+        # bounded even without a timeout given:
+        success, msg = writer.waitSubScan()
+        self.assertFalse(success)
+        self.assertIn("timed out with 1 rasters", msg)
+        release.set()
+
+    def test_lateFailureNotCounted(self):
+        release = threading.Event()
+        writer = RasterWriter(FakeTable(fail = True, release = release), self.dbWriter)
+        writer.startSubScan()
+        writer.put(self.makeJob(0, fkBeamPattern = 1))
+        writer.jobs.join()
+        # abandon the subscan and start the next one before the first write fails:
+        writer.startSubScan()
+        release.set()
+        self.assertTrue(self.dbWriter.flush(5))
+        self.assertEqual(writer.waitSubScan(1), (True, ""))
+        # the failure is still reported against its own beam pattern:
+        self.assertEqual(self.errors[0][0], 1)
+
+if __name__ == '__main__':
+    unittest.main()
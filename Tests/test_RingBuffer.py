@@ -0,0 +1,42 @@
+import unittest
+from Measure.Shared.RingBuffer import RingBuffer
+
+class test_RingBuffer(unittest.TestCase):
+
+    def setUp(self):
+        self.buffer = RingBuffer(5)
+
+    def test_since(self):
+        self.assertEqual(self.buffer.since(0), ([], 0))
+        self.buffer.extend([10, 11, 12])
+        items, seq = self.buffer.since(0)
+        self.assertEqual((items, seq), ([10, 11, 12], 3))
+        self.buffer.append(13)
+        self.assertEqual(self.buffer.since(seq), ([13], 4))
+        self.assertEqual(self.buffer.since(4), ([], 4))
+
+    def test_wraparound(self):
+        self.buffer.extend(range(12))
+        self.assertEqual(len(self.buffer), 5)
+        self.assertEqual(self.buffer.firstSeq, 8)
+        self.assertEqual(list(self.buffer), [7, 8, 9, 10, 11])
+        # reader which fell behind gets everything still held:
+        self.assertEqual(self.buffer.since(2), ([7, 8, 9, 10, 11], 12))
+        self.assertEqual(self.buffer.since(10), ([10, 11], 12))
+        self.assertEqual(self.buffer.latest(), 11)
+
+    def test_clear_and_retain(self):
+        self.buffer.extend([1, 2, 3, 4])
+        self.buffer.retain(2)
+        self.assertEqual(list(self.buffer), [3, 4])
+        self.buffer.clear()
+        self.assertFalse(self.buffer)
+        self.assertIsNone(self.buffer.latest())
+        # sequence numbers continue after clear:
+        self.assertEqual(self.buffer.append(5), 5)
+        self.assertEqual(self.buffer.since(4), ([5], 5))
+        # a sequence number from the future is treated as 0:
+        self.assertEqual(self.buffer.since(100), ([5], 5))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from Measure.BeamScanner.ScanPlanner import ScanPlanner
+
+class FakeSubScan():
+    # the parts of schemas.SubScan used by the planner:
+    def __init__(self, index, pol, isCopol, is180 = False):
+        self.index = index
+        self.pol = pol
+        self.isCopol = isCopol
+        self.is180 = is180
+
+    def getScanAngleIndex(self):
+        return self.pol if self.isCopol or self.is180 else 1 - self.pol
+
+    def getText(self):
+        return f"Pol{self.pol} {'copol' if self.isCopol else 'xpol'}{' 180' if self.is180 else ''}"
+
+class FakeItem():
+    def __init__(self, RF, LO, enable = True):
+        self.RF = RF
+        self.LO = LO
+        self.enable = enable
+        self.index = 0
+        self.subScans = []
+
+    def makeSubScans(self):
+        self.subScans = [FakeSubScan(i, *args) for i, args in enumerate([(0, True), (0, False), (1, True), (1, False), (0, True, True)])]
+
+class FakeScanList():
+    def __init__(self, items):
+        self.items = items
+
+    def updateIndex(self):
+        for index, item in enumerate(self.items):
+            item.index = index
+
+def makeSpec(**kwargs):
+    spec = SimpleNamespace(
+        beamCenter = SimpleNamespace(x = 146.5, y = 144),
+        scanStart = SimpleNamespace(x = 73, y = 77),
+        scanEnd = SimpleNamespace(x = 223, y = 217),
+        resolution = 0.5,
+        scanAngles = [-103.5, -13.5],
+        centersInterval = 300,
+        scanBidirectional = True
+    )
+    spec.__dict__.update(kwargs)
+    spec.makeYAxisList = lambda: [spec.scanStart.y + i * spec.resolution for i in range(int((spec.scanEnd.y - spec.scanStart.y) / spec.resolution) + 1)]
+    return spec
+
+class test_ScanPlanner(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.fileName = tempfile.mkstemp(suffix = ".yaml")
+        os.close(fd)
+        os.remove(self.fileName)
+        self.planner = ScanPlanner(self.fileName)
+
+    def tearDown(self):
+        if os.path.exists(self.fileName):
+            os.remove(self.fileName)
+
+    def test_moveTime(self):
+        # trapezoid: 100 mm at 20 mm/s with 50 mm/s^2 accel:
+        self.assertAlmostEqual(self.planner.moveTime(100, 20, 50), 100 / 20 + 20 / 50)
+        # triangle: too short to reach full speed:
+        self.assertAlmostEqual(self.planner.moveTime(2, 20, 50), 2 * (2 / 50) ** 0.5)
+        self.assertEqual(self.planner.moveTime(0, 20, 50), 0)
+
+    def test_order(self):
+        scanList = FakeScanList([FakeItem(243, 253), FakeItem(211, 221), FakeItem(215, 221), FakeItem(219, 229, enable = False)])
+        plan = self.planner.plan(scanList, makeSpec())
+        self.assertTrue(plan.optimized)
+        # items ordered by LO then RF, disabled item dropped:
+        order = []
+        for p in plan.items:
+            if not order or order[-1] != p.scanIndex:
+                order.append(p.scanIndex)
+        self.assertEqual(order, [1, 2, 0])
+        # level angles alternate direction between items:
+        levels = [p.levelAngle for p in plan.items]
+        self.assertEqual(levels[:5], sorted(levels[:5]))
+        self.assertEqual(levels[5:10], sorted(levels[5:10], reverse = True))
+        # LO relocked only when it changes; RF only when it or the LO changes:
+        self.assertEqual([p.relockLO for p in plan.items].count(True), 2)
+        self.assertEqual([p.relockRF for p in plan.items].count(True), 3)
+        self.assertLess(plan.totalTime, plan.listOrderTime)
+        self.assertAlmostEqual(plan.totalTime, sum(p.duration for p in plan.items))
+
+    def test_list_order(self):
+        scanList = FakeScanList([FakeItem(243, 253), FakeItem(211, 221)])
+        plan = self.planner.plan(scanList, makeSpec(), optimize = False, reuseLocks = False)
+        self.assertFalse(plan.optimized)
+        self.assertEqual([p.scanIndex for p in plan.items], [0] * 5 + [1] * 5)
+        self.assertTrue(all(p.relockLO and p.relockRF for p in plan.items))
+        self.assertEqual(plan.totalTime, plan.listOrderTime)
+
+    def test_centers(self):
+        spec = makeSpec()
+        plan = self.planner.plan(FakeScanList([FakeItem(243, 253)]), spec)
+        first = plan.items[0]
+        self.assertEqual(first.rows, len(spec.makeYAxisList()))
+        # first and last plus one every centersInterval:
+        self.assertGreaterEqual(first.centers, 2 + int(first.duration / spec.centersInterval) - 1)
+        spec.scanBidirectional = False
+        plan = self.planner.plan(FakeScanList([FakeItem(243, 253)]), spec)
+        self.assertEqual(plan.items[0].centers, 2)
+
+    def test_adaptive(self):
+        full = self.planner.plan(FakeScanList([FakeItem(243, 253)]), makeSpec())
+        adaptive = self.planner.plan(FakeScanList([FakeItem(243, 253)]), makeSpec(adaptive = True, coarseFactor = 4))
+        self.assertLess(adaptive.items[0].rows, full.items[0].rows / 2)
+        self.assertLess(adaptive.totalTime, full.totalTime)
+
+    def test_settings(self):
+        self.planner.timing.rowOverhead = 3
+        self.planner.saveSettings()
+        self.assertEqual(ScanPlanner(self.fileName).timing.rowOverhead, 3)
+
+if __name__ == '__main__':
+    unittest.main()
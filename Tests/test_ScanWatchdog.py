@@ -0,0 +1,82 @@
+import time
+import unittest
+from datetime import datetime
+from Measure.BeamScanner.ScanWatchdog import ScanWatchdog, WatchdogAction
+
+class test_ScanWatchdog(unittest.TestCase):
+
+    def setUp(self):
+        self.locked = True
+        self.power = True
+        self.watchdog = ScanWatchdog(pollInterval = 0.01)
+        self.watchdog.addCheck("motorPower", WatchdogAction.ABORT, lambda: self.power, "Motor power failure")
+        self.watchdog.addCheck("loLock", WatchdogAction.RETRY, lambda: self.locked, "LOST LO LOCK")
+
+    def tearDown(self):
+        self.watchdog.stop()
+
+    def test_healthy(self):
+        self.watchdog.start()
+        time.sleep(0.05)
+        self.assertIsNone(self.watchdog.fault())
+        self.assertEqual(self.watchdog.eventsSince(datetime.now()), [])
+
+    def test_faultAtStart(self):
+        self.locked = False
+        self.watchdog.start()
+        fault = self.watchdog.fault()
+        self.assertEqual(fault.check, "loLock")
+        self.assertEqual(fault.action, WatchdogAction.RETRY)
+
+    def test_transientFault(self):
+        self.watchdog.start()
+        rowStart = datetime.now()
+        self.locked = False
+        time.sleep(0.05)
+        self.assertTrue(self.watchdog.faulted.is_set())
+        self.locked = True
+        time.sleep(0.05)
+        # recovered, but the row was spoiled:
+        self.assertIsNone(self.watchdog.fault())
+        events = self.watchdog.eventsSince(rowStart)
+        self.assertEqual(len(events), 1)
+        self.assertIsNotNone(events[0].recovered)
+        self.assertGreaterEqual(events[0].timeStamp, rowStart)
+        # a row started well after recovery is clean:
+        time.sleep(0.05)
+        self.assertEqual(self.watchdog.eventsSince(datetime.now()), [])
+
+    def test_abortFirst(self):
+        self.locked = False
+        self.power = False
+        self.watchdog.pollOnce()
+        self.assertEqual(self.watchdog.fault().action, WatchdogAction.ABORT)
+
+    def test_restartForgetsFaults(self):
+        self.locked = False
+        self.watchdog.start()
+        self.watchdog.stop()
+        self.locked = True
+        self.watchdog.start()
+        self.assertIsNone(self.watchdog.fault())
+        self.assertEqual(self.watchdog.eventsSince(datetime.now()), [])
+        self.assertEqual(len(self.watchdog.getEvents()), 1)
+
+    def test_checkException(self):
+        def poll():
+            raise RuntimeError("bus timeout")
+        self.watchdog.addCheck("rfLock", WatchdogAction.RETRY, poll)
+        with self.assertLogs("ALMAFE-CTS-Control", level = "ERROR"):
+            self.watchdog.pollOnce()
+        self.assertIsNone(self.watchdog.fault())
+
+    def test_checkSkipped(self):
+        # None means the device is busy, which neither raises nor clears a fault:
+        self.locked = False
+        self.watchdog.pollOnce()
+        self.locked = None
+        self.watchdog.pollOnce()
+        self.assertEqual(self.watchdog.fault().check, "loLock")
+        self.watchdog.start()
+        self.watchdog.stop()
+        self.assertIsNone(self.watchdog.fault())
@@ -0,0 +1,29 @@
+import unittest
+from Measure.NoiseTemperature.SweepScheduler import SweepLoad, planSweep
+
+class test_SweepScheduler(unittest.TestCase):
+
+    def test_2SB_both_pols(self):
+        plan = planSweep([0, 1], ('USB', 'LSB'))
+        self.assertEqual(len(plan), 8)
+        self.assertEqual(
+            [(s.pol, s.load.value, s.sideband) for s in plan[:5]],
+            [(0, 'HOT', 'USB'), (0, 'HOT', 'LSB'), (0, 'COLD', 'LSB'), (0, 'COLD', 'USB'), (1, 'COLD', 'USB')]
+        )
+        # initial move plus one per pol:
+        self.assertEqual(sum(s.moveChopper for s in plan), 3)
+        # every trace changes either the load or the IF, never both:
+        self.assertTrue(all(s.moveChopper != s.switchIF for s in plan[1:]))
+
+    def test_all_traces_present(self):
+        plan = planSweep([0, 1], ('USB', 'LSB'))
+        fields = {(s.pol, s.field) for s in plan}
+        self.assertEqual(len(fields), 8)
+
+    def test_DSB_single_pol(self):
+        plan = planSweep([1], ('USB', ), startLoad = SweepLoad.COLD)
+        self.assertEqual([s.field for s in plan], ['Pcold_USB', 'Phot_USB'])
+        self.assertEqual([s.switchIF for s in plan], [True, False])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import time
+import unittest
+from Measure.Shared.Telemetry import TelemetryService
+
+DELAY = 0.1
+
+class FakeTempMonitor():
+    def __init__(self):
+        self.reads = 0
+
+    def readSingle(self, sensor):
+        self.reads += 1
+        time.sleep(DELAY)
+        return 290.0 + sensor, 0
+
+class FakeCCA():
+    def getCartridgeTemps(self):
+        return {'temp2': 4.1, 'temp5': 4.2}
+
+class FakeReceiver():
+    def __init__(self):
+        self.ccaDevice = FakeCCA()
+        self.sisReads = 0
+        self.Ij = 20.0
+
+    def isLocked(self):
+        time.sleep(DELAY)
+        return True
+
+    def getPLL(self):
+        return {'lockVoltage': 4.5, 'corrV': 0.2, 'temperature': 30}
+
+    def getPA(self):
+        return {'VDp0': 1.1, 'VDp1': 1.2}
+
+    def readSISBias(self, select, pol, averaging = 1):
+        self.sisReads += 1
+        time.sleep(DELAY / 2)
+        return {'Vj': 2.0 + pol, 'Ij': self.Ij, 'Imag': 10.0}
+
+class test_Telemetry(unittest.TestCase):
+
+    def setUp(self):
+        self.receiver = FakeReceiver()
+        self.tempMonitor = FakeTempMonitor()
+        self.service = TelemetryService(self.receiver, self.tempMonitor)
+
+    def test_snapshot(self):
+        timeStart = time.monotonic()
+        snapshot = self.service.snapshot((0, 1), 6, 2)
+        # the temperature and receiver groups are read concurrently:
+        self.assertLess(time.monotonic() - timeStart, 3.5 * DELAY)
+        self.assertEqual(snapshot.tAmb, 296)
+        self.assertTrue(snapshot.loIsLocked)
+        self.assertEqual(snapshot.sis[1].Vj1, 3.0)
+        self.assertEqual(snapshot.mixerTemp(1), 4.2)
+        with self.assertRaises(Exception):
+            snapshot.tAmb = 0
+
+    def test_cache(self):
+        # only the temperatures are cached:
+        self.service.snapshot((0, ), 6, 2, maxAge = 10)
+        self.assertEqual(self.tempMonitor.reads, 2)
+        self.receiver.Ij = 25.0
+        second = self.service.snapshot((0, 1), 6, 2, maxAge = 10)
+        self.assertEqual(self.tempMonitor.reads, 2)
+        # the receiver is read every time so a bias change shows immediately:
+        self.assertEqual(second.sis[0].Ij1, 25.0)
+        self.assertEqual(set(second.sis.keys()), {0, 1})
+        self.assertEqual(self.receiver.sisReads, 6)
+        self.service.snapshot((0, ), 6, 2, maxAge = 0)
+        self.assertEqual(self.tempMonitor.reads, 4)
+        self.service.invalidate()
+        self.service.snapshot((0, ), 6, 2, maxAge = 10)
+        self.assertEqual(self.tempMonitor.reads, 6)
+        # a different sensor isn't served from the cache:
+        self.assertEqual(self.service.snapshot((0, ), 7, 2, maxAge = 10).tAmb, 297)
+
+if __name__ == '__main__':
+    unittest.main()
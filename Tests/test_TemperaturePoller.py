@@ -0,0 +1,65 @@
+import time
+import unittest
+from Controllers.TemperatureMonitor.Poller import TemperaturePoller
+
+class FakeMonitor():
+    def __init__(self):
+        self.reads = 0
+        self.resource = "fake"
+
+    def readAll(self):
+        self.reads += 1
+        return [290.0 + i for i in range(8)], [0] * 8
+
+    def readSingle(self, sensor):
+        self.reads += 1
+        return 1.0, 0
+
+    def reset(self, locked):
+        return locked()
+
+class test_TemperaturePoller(unittest.TestCase):
+
+    def setUp(self):
+        self.monitor = FakeMonitor()
+        self.poller = TemperaturePoller(self.monitor, interval = 0.05, maxAge = 1)
+
+    def tearDown(self):
+        self.poller.stop()
+
+    def test_cached_reads(self):
+        self.assertEqual(self.poller.getCached(6), (None, None, None))
+        self.poller.poll()
+        reads = self.monitor.reads
+        self.assertEqual(self.poller.readSingle(6), (295.0, 0))
+        temps, errors = self.poller.readAll()
+        self.assertEqual(len(temps), 8)
+        self.assertEqual(self.monitor.reads, reads)
+        temp, err, age = self.poller.getCached(1)
+        self.assertEqual(temp, 290.0)
+        self.assertLess(age, 1)
+        # passed through to the monitor:
+        self.assertEqual(self.poller.resource, "fake")
+
+    def test_stale_reads_instrument(self):
+        self.poller.maxAge = 0.01
+        self.poller.poll()
+        time.sleep(0.02)
+        self.assertEqual(self.poller.readSingle(6), (1.0, 0))
+
+    def test_passthrough_locked(self):
+        # methods passed through to the monitor are serialized with the polls:
+        self.assertTrue(self.poller.reset(self.poller.ioLock.locked))
+        self.assertFalse(self.poller.ioLock.locked())
+
+    def test_poll_thread_and_history(self):
+        self.poller.start()
+        time.sleep(0.22)
+        self.poller.stop()
+        history = self.poller.getHistory()
+        self.assertGreaterEqual(len(history.items), 3)
+        self.assertEqual(history.lastSeq, len(history.items))
+        self.assertEqual(self.poller.getHistory(history.lastSeq).items, [])
+
+if __name__ == '__main__':
+    unittest.main()
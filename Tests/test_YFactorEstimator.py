@@ -0,0 +1,48 @@
+import random
+import unittest
+from statistics import mean
+from Measure.NoiseTemperature.YFactorEstimator import WindowedSums, YFactorEstimator
+
+class test_YFactorEstimator(unittest.TestCase):
+
+    def test_windowed_sums(self):
+        rng = random.Random(3)
+        sums = WindowedSums([5, 20])
+        samples = []
+        for i in range(100):
+            x = rng.uniform(-40, -30)
+            samples.append(x)
+            sums.add(x)
+            self.assertAlmostEqual(sums.mean(5), mean(samples[-5:]))
+            self.assertAlmostEqual(sums.mean(20), mean(samples[-20:]))
+        self.assertEqual(sums.count(20), 20)
+        self.assertEqual(len(sums.buffer), 20)
+
+    def test_resum(self):
+        sums = WindowedSums([3])
+        sums.RESUM_INTERVAL = 4
+        for x in range(10):
+            sums.add(float(x))
+        self.assertAlmostEqual(sums.mean(3), 8.0)
+
+    def test_estimate(self):
+        estimator = YFactorEstimator([4, 100])
+        self.assertEqual(estimator.estimate(300, 80), [])
+        pairs = []
+        for i in range(50):
+            pairs.append(estimator.add(-30.0 if i < 40 else -29.0, isHot = True))
+            pairs.append(estimator.add(-34.0, isHot = False))
+        self.assertEqual(pairs[1], (-30.0, -34.0))
+        self.assertIsNone(pairs[0])
+        short, long = estimator.estimate(300, 80)
+        self.assertEqual(short.samples, 4)
+        self.assertAlmostEqual(short.Y, 5.0)
+        self.assertAlmostEqual(long.Y, 4.2)
+        Ylinear = 10 ** 0.5
+        self.assertAlmostEqual(short.TRx, (300 - 80 * Ylinear) / (Ylinear - 1))
+        self.assertIsNone(estimator.estimate()[0].TRx)
+        estimator.clear()
+        self.assertEqual(estimator.estimate(), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,15 +2,17 @@ from INSTR.PowerSupply.AgilentE363xA import PowerSupply
 from INSTR.PowerSupply.Simulator import PowerSupplySimulator
 from INSTR.TemperatureMonitor.Lakeshore218 import TemperatureMonitor
 from INSTR.TemperatureMonitor.Simulator import TemperatureMonitorSimulator
+from Controllers.TemperatureMonitor.Poller import TemperaturePoller
 from INSTR.ColdLoad.AMI1720 import AMI1720
 from INSTR.ColdLoad.AMI1720Simulator import AMI1720Simulator
 from INSTR.Chopper.Band6Chopper import Chopper
 from DebugOptions import *
 
 if SIMULATE:
-    temperatureMonitor = TemperatureMonitorSimulator()
+    temperatureMonitor = TemperaturePoller(TemperatureMonitorSimulator())
 else:
-    temperatureMonitor = TemperatureMonitor("GPIB0::12::INSTR")
+    temperatureMonitor = TemperaturePoller(TemperatureMonitor("GPIB0::12::INSTR"))
+temperatureMonitor.start()
 
 if SIMULATE:
     powerSupply = PowerSupplySimulator()
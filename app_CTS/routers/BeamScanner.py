@@ -1,6 +1,6 @@
 import asyncio
 import logging
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, WebSocket
 from typing import List, Tuple, Optional
 from app_Common.schemas.common import SingleFloat
 from Controllers.schemas.DeviceInfo import DeviceInfo
@@ -12,71 +12,130 @@ import app_Common.measProcedure.MeasurementStatus
 measurementStatus = app_Common.measProcedure.MeasurementStatus.measurementStatus()
 from app_Common.Response import MessageResponse
 from app_Common.ConnectionManager import ConnectionManager
+from app_Common.schemas.ConnectionManager import ConnectionStatus
 from INSTR.MotorControl.schemas import MotorStatus, MoveStatus, Position
 from INSTR.PNA.schemas import MeasConfig, PowerConfig
-from Measure.BeamScanner.schemas import MeasurementSpec, ScanList, ScanStatus, Rasters
+from Measure.BeamScanner.schemas import MeasurementSpec, ScanList, ScanStatus, Raster, Rasters
+from Measure.BeamScanner.RasterFrame import packRaster
+from Measure.BeamScanner.RasterGrid import RasterView
+from Measure.BeamScanner.ScanPlanner import ScanPlan, ScanTiming
+from Measure.BeamScanner.AdaptiveGrid import AdaptiveReport
+from Measure.BeamScanner.ScanWatchdog import WatchdogEvent
+from Measure.BeamScanner.BeamAnalysis import BeamAnalysisResult, FarFieldPreview
 from DebugOptions import *
 
 logger = logging.getLogger("ALMAFE-CTS-Control")
 
 router = APIRouter(prefix="/beamscan")
-manager = ConnectionManager()
+positionManager = ConnectionManager()
+motorStatusManager = ConnectionManager()
+# rasters are delivered incrementally so these don't drop frames or replay the latest:
+rastersManager = ConnectionManager(maxQueue = 2000, replayLatest = False)
+rastersBinaryManager = ConnectionManager(maxQueue = 2000, replayLatest = False)
+rastersCursor = 0       # cursor of the last raster broadcast
+
+# Each websocket is served by one producer which polls the motor controller or beam scanner
+# and broadcasts to all the connected clients, so extra operator screens add no polling
+# and a stalled client can't hold back the others.
+
+async def producePosition():
+    lastPosition = None
+    while positionManager.active_connections:
+        position = motorController.getPosition(cached = measurementStatus.getMeasuring())
+        if position != lastPosition:
+            lastPosition = position
+            await positionManager.broadcast(position.dict(), key = "position")
+        await asyncio.sleep(0.2)
+
+async def produceMotorStatus():
+    lastMotorStatus = None
+    while motorStatusManager.active_connections:
+        motorStatus = motorController.getMotorStatus()
+        if motorStatus != lastMotorStatus:
+            lastMotorStatus = motorStatus
+            await motorStatusManager.broadcast(motorStatus.dict(), key = "motorStatus")
+        await asyncio.sleep(0.5)
+
+def rasterMessage(raster: Raster | RasterView, cursor: int, binary: bool) -> dict | bytes:
+    if binary:
+        return packRaster(raster, cursor)
+    else:
+        return {**raster.dict(), 'cursor': cursor}
+
+async def produceRasters():
+    # broadcast each new raster once to all clients, serialized once per format:
+    global rastersCursor
+    while rastersManager.active_connections or rastersBinaryManager.active_connections:
+        try:
+            rasters, end = beamScanner.getRastersSince(rastersCursor)
+            for raster in rasters:
+                if rastersManager.active_connections:
+                    await rastersManager.broadcast(rasterMessage(raster, raster.cursor, False))
+                if rastersBinaryManager.active_connections:
+                    await rastersBinaryManager.broadcast(rasterMessage(raster, raster.cursor, True))
+            rastersCursor = end
+        except Exception as e:
+            logger.exception(e)
+        await asyncio.sleep(0.5)
 
 @router.websocket("/position_ws")
-async def websocket_scandata_push(websocket: WebSocket):
-    await manager.connect(websocket)
-    lastPosition = None            
-    try:
-        while True:
-            position = motorController.getPosition(cached = measurementStatus.getMeasuring())
-            if position != lastPosition:
-                lastPosition = position
-                await manager.send(position.dict(), websocket)
-            await asyncio.sleep(0.2)
-    except WebSocketDisconnect:
-        manager.disconnect(websocket)
-        logger.info("WebSocketDisconnect: /position_ws")
+async def websocket_position_push(websocket: WebSocket):
+    await positionManager.connect(websocket)
+    positionManager.startProducer(producePosition)
+    await positionManager.listen(websocket)
+    logger.info("WebSocketDisconnect: /position_ws")
 
 @router.websocket("/motorstatus_ws")
-async def websocket_scandata_push(websocket: WebSocket):
-    await manager.connect(websocket)
-    lastMotorStatus = None            
-    try:
-        while True:        
-            motorStatus = motorController.getMotorStatus()
-            if motorStatus != lastMotorStatus:
-                lastMotorStatus = motorStatus
-                await manager.send(motorStatus.dict(), websocket)
-            await asyncio.sleep(0.5)
-    except WebSocketDisconnect:
-        manager.disconnect(websocket)
-        logger.info("WebSocketDisconnect: /motorstatus_ws")
+async def websocket_motorstatus_push(websocket: WebSocket):
+    await motorStatusManager.connect(websocket)
+    motorStatusManager.startProducer(produceMotorStatus)
+    await motorStatusManager.listen(websocket)
+    logger.info("WebSocketDisconnect: /motorstatus_ws")
 
 @router.websocket("/rasters_ws")
-async def websocket_scandata_push(websocket: WebSocket):
+async def websocket_rasters_push(websocket: WebSocket, binary: bool = False, cursor: Optional[int] = None):
+    """Push rasters as they are measured
+
+    :param binary: if True, send binary frames made by RasterFrame.packRaster instead of JSON
+    :param cursor: to resume, the cursor from the last raster received.  0 for all rasters of the current scan.
+        If not given, starts with the latest raster.
+    """
+    global rastersCursor
+    manager = rastersBinaryManager if binary else rastersManager
     await manager.connect(websocket)
-    lastKey = None
-    lastIndex = 0
-    try:
-        while True:
-            key, index = beamScanner.getLatestRasterInfo()
-            if key > 0 and (index != lastIndex or key != lastKey):
-                lastKey, lastIndex = key, index
-                rasters = beamScanner.getRasters(latestOnly = True)
-                if rasters and len(rasters.items):
-                    await manager.send(rasters.items[0].dict(), websocket)
-            await asyncio.sleep(0.5)
-
-    except WebSocketDisconnect:
-        manager.disconnect(websocket)
-        logger.info("WebSocketDisconnect: /rasters_ws")
-    except Exception as e:
-        logger.exception(e)
+    if rastersManager.producerTask is None or rastersManager.producerTask.done():
+        rastersCursor = beamScanner.getRastersSince(0)[1]
+        rastersManager.startProducer(produceRasters)
+    # catch up to where the producer has broadcast:
+    if cursor is None:
+        cursor = max(rastersCursor - 1, 0)
+    rasters, _ = beamScanner.getRastersSince(cursor)
+    for raster in rasters:
+        # the producer sends those after rastersCursor:
+        if raster.cursor <= rastersCursor:
+            manager.queue(rasterMessage(raster, raster.cursor, binary), websocket)
+    await manager.listen(websocket)
+    logger.info("WebSocketDisconnect: /rasters_ws")
+
+@router.get("/websockets", response_model = dict[str, list[ConnectionStatus]])
+async def get_WebsocketStatus():
+    return {
+        "position_ws": positionManager.status,
+        "motorstatus_ws": motorStatusManager.status,
+        "rasters_ws": rastersManager.status + rastersBinaryManager.status
+    }
 
 @router.get("/rasters", response_model = Rasters)
 async def get_Rasters(first: int, last: Optional[int] = -1):
     return beamScanner.getRasters(first, last)
 
+@router.get("/rasters/{keyBeamPattern}", response_model = Rasters)
+async def get_SavedRasters(keyBeamPattern: int):
+    """
+    Reload the rasters of a subscan from its memory-mapped grid, for example after a crash.
+    """
+    return beamScanner.loadRasterGrid(keyBeamPattern)
+
 @router.get("/mc/query", response_model = MessageResponse)
 async def get_Query(query: str):
     """
@@ -251,6 +310,39 @@ async def put_ScanList(scanList: ScanList):
     beamScanner.scanList = scanList
     return MessageResponse(message = "Updated Scan List", success = True)
 
+@router.get("/scan_plan", response_model = ScanPlan)
+async def get_ScanPlan():
+    return beamScanner.getPlan()
+
+@router.get("/scan_plan/timing", response_model = ScanTiming)
+async def get_ScanTiming():
+    return beamScanner.planner.timing
+
+@router.post("/scan_plan/timing", response_model = MessageResponse)
+async def put_ScanTiming(timing: ScanTiming):
+    beamScanner.planner.timing = timing
+    beamScanner.planner.saveSettings()
+    return MessageResponse(message = "Updated scan timing settings", success = True)
+
+@router.get("/adaptive_report", response_model = Optional[AdaptiveReport])
+async def get_AdaptiveReport():
+    return beamScanner.adaptiveReport
+
+@router.get("/watchdog_events", response_model = List[WatchdogEvent])
+async def get_WatchdogEvents():
+    return beamScanner.watchdog.getEvents()
+
+@router.get("/analysis", response_model = BeamAnalysisResult)
+async def get_BeamAnalysis():
+    """
+    Provisional beam center, size and efficiencies of the subscan in progress.
+    """
+    return beamScanner.beamAnalysis.getResult()
+
+@router.get("/analysis/far_field", response_model = FarFieldPreview)
+async def get_FarFieldPreview():
+    return beamScanner.beamAnalysis.getFarField()
+
 @router.get("/scan_status", response_model = ScanStatus)
 async def get_ScanStatus():
     return beamScanner.scanStatus
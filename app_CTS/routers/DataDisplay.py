@@ -6,6 +6,7 @@ from fastapi.encoders import jsonable_encoder
 import app_Common.measProcedure.DataDisplay
 dataDisplay = app_Common.measProcedure.DataDisplay.dataDisplay
 from AMB.schemas.MixerTests import IVCurveResult, MagnetOptResult, DefluxResult
+from Measure.Shared.DisplayHub import DisplayTopic
 from app_Common.ConnectionManager import ConnectionManager
 
 manager = ConnectionManager()
@@ -15,111 +16,114 @@ logger = logging.getLogger("ALMAFE-CTS-Control")
 @router.websocket("/ifsystem_ws")
 async def websocket_warmif(websocket: WebSocket):
     await manager.connect(websocket)
-    lastCartTest = None
+    subscription = dataDisplay.hub.subscribe(DisplayTopic.WARM_IF, maxsize = 1)
     try:
+        records = dataDisplay.warmIfData
         while True:
-            if not dataDisplay.warmIfData:
-                lastCartTest = None
-            else:
-                if dataDisplay.warmIfData[0].fkCartTest != lastCartTest:
-                    lastCartTest = dataDisplay.warmIfData[0].fkCartTest
-                    for record in dataDisplay.warmIfData:
-                        toSend = jsonable_encoder(record.asDBM())
-                        await manager.send(toSend, websocket)
-                    
-            await asyncio.sleep(1.0)
+            if records:
+                for record in records:
+                    toSend = jsonable_encoder(record.asDBM())
+                    await manager.send(toSend, websocket)
+            records = await subscription.get()
     except WebSocketDisconnect:
         manager.disconnect(websocket)
         logger.info("WebSocketDisconnect: /ifsystem_ws")
+    finally:
+        subscription.close()
 
 @router.websocket("/chopperpower_ws")
-async def websocket_chopperpower(websocket: WebSocket):
+async def websocket_chopperpower(websocket: WebSocket, since: int = 0):
     await manager.connect(websocket)
-    lastIndex = 0
+    subscription = dataDisplay.hub.subscribe(DisplayTopic.CHOPPER_POWER, maxsize = 1)
     try:
+        lastSeq = since
         while True:
-            if not dataDisplay.chopperPowerHistory:
-                lastIndex = 0
-            else:
-                nextIndex = len(dataDisplay.chopperPowerHistory)
-                if nextIndex < lastIndex:
-                    lastIndex = 0
-                records = dataDisplay.chopperPowerHistory[lastIndex:]
-                lastIndex = nextIndex
+            records, lastSeq = dataDisplay.chopperPowerHistory.since(lastSeq)
+            if records:
                 toSend = jsonable_encoder(records)
                 await manager.send(toSend, websocket)
-            await asyncio.sleep(0.2)
+            # wait for more:
+            await subscription.get()
     except WebSocketDisconnect:
         manager.disconnect(websocket)
         logger.info("WebSocketDisconnect: /chopperpower_ws")
+    finally:
+        subscription.close()
 
 @router.websocket("/rawspecan_ws")
 async def websocket_rawspecan(websocket: WebSocket):
     await manager.connect(websocket)
+    subscription = dataDisplay.hub.subscribe(DisplayTopic.SPEC_AN, maxsize = 1)
     try:
+        record = dataDisplay.specAnPowerHistory
         while True:
-            if dataDisplay.specAnPowerHistory is not None:
-                toSend = jsonable_encoder(dataDisplay.specAnPowerHistory)
+            if record is not None:
+                toSend = jsonable_encoder(record)
                 await manager.send(toSend, websocket)
-            await asyncio.sleep(0.5)
+            record = await subscription.get()
     except WebSocketDisconnect:
         manager.disconnect(websocket)
         logger.info("WebSocketDisconnect: /rawspecan_ws")
+    finally:
+        subscription.close()
 
 @router.websocket("/rawnoisetemp_ws")
 async def websocket_raw_nt(websocket: WebSocket):
     await manager.connect(websocket)
+    subscription = dataDisplay.hub.subscribe(DisplayTopic.NOISE_TEMP, maxsize = 4)
     try:
+        records = list(dataDisplay.currentNoiseTemp)
         while True:
-            records = dataDisplay.currentNoiseTemp
-            if records[0] is not None:
-                toSend = jsonable_encoder(records[0])                    
-                await manager.send(toSend, websocket)
-            if records[1] is not None:
-                toSend = jsonable_encoder(records[1])                    
-                await manager.send(toSend, websocket)                
-            await asyncio.sleep(1)
+            for record in records:
+                if record is not None:
+                    toSend = jsonable_encoder(record)
+                    await manager.send(toSend, websocket)
+            records = await subscription.getAll()
     except WebSocketDisconnect:
         manager.disconnect(websocket)
         logger.info("WebSocketDisconnect: /rawnoisetemp_ws")
+    finally:
+        subscription.close()
 
 @router.websocket("/yfactor_ws")
-async def websocket_yfactor(websocket: WebSocket):
+async def websocket_yfactor(websocket: WebSocket, since: int = None):
     await manager.connect(websocket)
-    lastMsg = None
+    subscription = dataDisplay.hub.subscribe(DisplayTopic.Y_FACTOR, maxsize = 1)
     try:
+        # by default start with the latest record:
+        lastSeq = since if since is not None else max(dataDisplay.yFactorHistory.lastSeq - 1, 0)
         while True:
-            if not dataDisplay.yFactorHistory:
-                lastMsg = None
-            else:
-                record = dataDisplay.yFactorHistory[-1]
-                if record != lastMsg:
-                    lastMsg = record
-                    toSend = jsonable_encoder(record)
-                    await manager.send(toSend, websocket)
-            await asyncio.sleep(1)
+            records, lastSeq = dataDisplay.yFactorHistory.since(lastSeq)
+            for record in records:
+                toSend = jsonable_encoder(record)
+                await manager.send(toSend, websocket)
+            # wait for more:
+            await subscription.get()
     except WebSocketDisconnect:
         manager.disconnect(websocket)
         logger.info("WebSocketDisconnect: /yfactor_ws")
+    finally:
+        subscription.close()
 
 @router.websocket("/stability/timeseries_ws")
-async def websocket_amp_timeseries_push(websocket: WebSocket):
+async def websocket_amp_timeseries_push(websocket: WebSocket, since: int = None):
     await manager.connect(websocket)
-    lastMsg = None
+    subscription = dataDisplay.hub.subscribe(DisplayTopic.STABILITY, maxsize = 1)
     try:
+        # by default start with the latest record:
+        lastSeq = since if since is not None else max(dataDisplay.stabilityHistory.lastSeq - 1, 0)
         while True:
-            if not dataDisplay.stabilityHistory:
-                lastMsg = None
-            else:
-                record = dataDisplay.stabilityHistory[-1]
-                if record != lastMsg:
-                    lastMsg = record
-                    toSend = jsonable_encoder(record)
-                    await manager.send(toSend, websocket) 
-            await asyncio.sleep(1)
+            records, lastSeq = dataDisplay.stabilityHistory.since(lastSeq)
+            for record in records:
+                toSend = jsonable_encoder(record)
+                await manager.send(toSend, websocket)
+            # wait for more:
+            await subscription.get()
     except WebSocketDisconnect:
         manager.disconnect(websocket)
         logger.info("WebSocketDisconnect: /stability/timeseries_ws")
+    finally:
+        subscription.close()
 
 @router.websocket("/mixertests/iv_curves_ws")
 async def websocket_iv_curves(websocket: WebSocket):
@@ -4,6 +4,9 @@ router = APIRouter(prefix="/database")
 
 from app_Common.CTSDB import CTSDB
 from app_Common.schemas.common import SingleBool
+from app_Common.schemas.DBWriter import DBWriterStatus
+from app_Common.schemas.CTSDB import DBPoolStatus
+from app_Common.DBWriter import dbWriter
 from DBBand6Cart.CartConfigs import CartConfig, CartConfigs
 from DBBand6Cart.schemas.CartConfig import CartKeys
 from DBBand6Cart.MixerParams import MixerParam, MixerParams
@@ -18,6 +21,14 @@ rfSrcDevice = hardware.FEMC.rfSrcDevice
 async def get_IsConnected():
     return SingleBool(value = CTSDB().is_connected())
 
+@router.get("/pool/status", response_model = DBPoolStatus)
+async def get_PoolStatus():
+    return CTSDB().pool.status
+
+@router.get("/writer/status", response_model = DBWriterStatus)
+async def get_WriterStatus():
+    return dbWriter().status
+
 @router.get("/configs", response_model = ListResponse)
 async def getConfigs(serialNum:int = None, configId:int = None, callback:str = None):
     '''
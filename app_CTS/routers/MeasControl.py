@@ -17,6 +17,14 @@ async def put_Start(testRec: MixerTest):
     else:
         return KeyResponse(key = testRec.key, message = msg, success = True)
 
+@router.put("/resume", response_model = KeyResponse)
+async def put_Resume(testRec: MixerTest):
+    success, msg = scriptRunner.resume(testRec)
+    if not success:
+        return KeyResponse(key = 0, message = msg, success = False)
+    else:
+        return KeyResponse(key = testRec.key, message = msg, success = True)
+
 @router.put("/stop", response_model = MessageResponse)
 async def put_Stop():
     success, msg = scriptRunner.stop()
@@ -118,6 +118,10 @@ async def reset_YfactorSettings():
     nt_settings.setDefaultsYFactor()
     return MessageResponse(message = "Reset Y-factor settings to defaults", success = True)
 
+@router.get("/errorbars", response_model = ListResponse)
+async def get_NoiseTempErrorBars():
+    return prepareListResponse(dataDisplay.noiseTempErrorBars)
+
 @router.get("/yfactor/history", response_model = ListResponse)
 async def get_YFactorHistory():
     return prepareListResponse(dataDisplay.yFactorPowers)
@@ -44,16 +44,16 @@ async def websocket_rf_power(websocket: WebSocket):
         logger.info("WebSocketDisconnect: /power_ws")
 
 @router.put("/auto_rf", response_model = MessageResponse)
-async def set_AutoRF(device: str, freqIF: float = 10, target: float = -5, atten: int = 22):
+async def set_AutoRF(device: str, freqIF: float = 10, target: float = -5, atten: int = 22, freqRF: float = None):
     if device == "meter":
         ifSystem.output_select = OutputSelect.POWER_DETECT
         ifSystem.attenuation = atten
-        success, msg = rfAutoLevel.autoLevel(freqIF, target)
+        success, msg = rfAutoLevel.autoLevel(freqIF, target, freqRF = freqRF)
         return MessageResponse(message = "Auto RF power with meter: " + msg, success = success)
     elif device == "pna":
         ifSystem.output_select = OutputSelect.PNA_INTERFACE
         ifSystem.attenuation = atten
         powerDetectPNA = PDPNA(pna)
         powerDetectPNA.configure(config = FAST_CONFIG, power_config = DEFAULT_POWER_CONFIG)
-        success, msg = rfAutoLevel.autoLevel(freqIF, target, powerDetect = powerDetectPNA)
+        success, msg = rfAutoLevel.autoLevel(freqIF, target, powerDetect = powerDetectPNA, freqRF = freqRF)
         return MessageResponse(message = "Auto RF power with PNA: " + msg, success = success)
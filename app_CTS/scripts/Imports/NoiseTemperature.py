@@ -8,8 +8,10 @@ import hardware.PowerDetect
 import hardware.IFSystem
 import hardware.BeamScanner
 from database.CTSDB import CTSDB
+from app_Common.DBWriter import dbWriter
 from Measure.BeamScanner.schemas import Position
 from Measure.NoiseTemperature.NoiseTempActions import NoiseTempActions
+from Measure.NoiseTemperature.Checkpoint import noiseTempCheckpoint, StepType
 from Measure.Shared.makeSteps import makeSteps
 from Measure.Shared.SelectPolarization import SelectPolarization
 from DBBand6Cart.schemas.DUT_Type import DUT_Type
@@ -26,6 +28,7 @@ powerDetect = hardware.PowerDetect.powerDetect
 pdPowerMeter = hardware.PowerDetect.pdPowerMeter
 coldLoad = hardware.NoiseTemperature.coldLoad
 beamScanMotorController = hardware.BeamScanner.motorController
+checkpoint = noiseTempCheckpoint()
 
 actor = NoiseTempActions(
     DUT_Type.Band6_Cartridge,
@@ -12,6 +12,7 @@ import hardware.NoiseTemperature
 from Controllers.PowerDetect.PDPNA import PDPNA
 from Controllers.PowerDetect.PDVoltMeter import PDVoltMeter
 from database.CTSDB import CTSDB
+from app_Common.DBWriter import dbWriter
 from Measure.Shared.makeSteps import makeSteps
 from Measure.Shared.SelectPolarization import SelectPolarization
 from Measure.Shared.SelectSideband import SelectSideband
@@ -1,7 +1,10 @@
 import logging
 from .Imports.NoiseTemperature import *
 
-def main():
+def main(resume: bool = False):
+    """
+    :param resume: if True, skip the points recorded in the checkpoint for this test
+    """
     logger = logging.getLogger("ALMAFE-CTS-Control")
     
     next_pos = beamScanMotorController.getPosition()
@@ -11,49 +14,83 @@ def main():
 
     cart_test = measurementStatus.getMeasuring()
     receiver.setCartConfig(cart_test.configId)
+    if not resume:
+        checkpoint.clear(cart_test.key)
 
     coldLoad.startFill()
     noiseTempSettings = settingsContainer.loWgIntegritySettings if settingsContainer.testSteps.loWGIntegrity else settingsContainer.noiseTempSettings
     actor.start(noiseTempSettings)
 
-    if settingsContainer.testSteps.warmIF:
+    pols = [pol for pol in (0, 1) if SelectPolarization(noiseTempSettings.polarization).testPol(pol)]
+    stepTypes = []
+    if settingsContainer.testSteps.noiseTemp or settingsContainer.testSteps.loWGIntegrity:
+        stepTypes.append(StepType.NOISE_TEMP)
+    if settingsContainer.testSteps.imageReject and receiver.is2SB():
+        stepTypes.append(StepType.IMAGE_REJECT)
+
+    if settingsContainer.testSteps.warmIF and not checkpoint.isDone(cart_test.key, 0, 0, [0], [StepType.WARM_IF]):
         records = actor.measureIFSysNoise(cart_test.key, settingsContainer.warmIFSettings)
         DB = WarmIFNoiseData(driver = CTSDB())
-        DB.create(records)
+        dbWriter().submit(DB, records,
+            onComplete = checkpoint.onWritten(cart_test.key, 0, [0], [0], [StepType.WARM_IF]),
+            description = "warm IF noise")
 
     doIFStepping = settingsContainer.testSteps.imageReject or powerDetect.detect_mode == DetectMode.METER
 
     if settingsContainer.testSteps.noiseTemp or settingsContainer.testSteps.loWGIntegrity or settingsContainer.testSteps.imageReject:
         DB = NoiseTempRawData(driver = CTSDB())
+        ifSteps = list(makeSteps(noiseTempSettings.ifStart, noiseTempSettings.ifStop, noiseTempSettings.ifStep))
         for freqLO in makeSteps(noiseTempSettings.loStart, noiseTempSettings.loStop, noiseTempSettings.loStep):
             if measurementStatus.stopNow():
                 actor.stop()
                 break
+
+            # skip LOs which are already in the checkpoint.  A swept LO is checkpointed as a unit at freqIF = 0:
+            if doIFStepping:
+                loDone = all(checkpoint.hasRecord(cart_test.key, freqLO, freqIF, pols, stepTypes) for freqIF in ifSteps)
+            else:
+                loDone = checkpoint.hasRecord(cart_test.key, freqLO, 0, pols, stepTypes)
+            if loDone:
+                logger.info(f"NoiseTemperature: LO={freqLO:.2f} GHz is already done")
+                continue
             
             coldLoad.startFill()
             actor.setLO(freqLO, setBias = True)
 
-            records = None
             if not doIFStepping:
-                if settingsContainer.testSteps.noiseTemp or settingsContainer.testSteps.loWGIntegrity:
+                records = None
+                if StepType.NOISE_TEMP in stepTypes:
                     actor.checkColdLoad()
                     records = actor.measureNoiseTemp(cart_test.key, freqLO, recordsIn = records)
+                # an LO interrupted by stop is not written, so a resume measures it again as a whole:
+                if records is not None and not measurementStatus.stopNow():
+                    dbWriter().submit(DB, list(records.values()),
+                        onComplete = checkpoint.onWritten(cart_test.key, freqLO, [0], pols, stepTypes),
+                        description = f"noise temp LO={freqLO:.2f} GHz")
             else:
-                for freqIF in makeSteps(noiseTempSettings.ifStart, noiseTempSettings.ifStop, noiseTempSettings.ifStep):
+                for freqIF in ifSteps:
                     if measurementStatus.stopNow():
                         actor.stop()
                         break
+                    if checkpoint.hasRecord(cart_test.key, freqLO, freqIF, pols, stepTypes):
+                        continue
                     actor.setIF(freqIF)
-                    if settingsContainer.testSteps.noiseTemp or settingsContainer.testSteps.loWGIntegrity:
+                    records = None
+                    if StepType.NOISE_TEMP in stepTypes:
                         records = actor.measureNoiseTemp(cart_test.key, freqLO, freqIF, recordsIn = records)
-                    if measurementStatus.stopNow():
-                        actor.stop()
-                        break
-                    if settingsContainer.testSteps.imageReject:
+                    if StepType.IMAGE_REJECT in stepTypes and not measurementStatus.stopNow():
                         records = actor.measureImageReject(cart_test.key, freqLO, freqIF, recordsIn = records)
+                    # write each IF point as it completes so that a resume can re-enter within the LO.
+                    # A point interrupted by stop is not written, so a resume measures it again as a whole:
+                    if records is not None and not measurementStatus.stopNow():
+                        dbWriter().submit(DB, list(records.values()),
+                            onComplete = checkpoint.onWritten(cart_test.key, freqLO, [freqIF], pols, stepTypes),
+                            description = f"noise temp LO={freqLO:.2f} GHz IF={freqIF:.2f} GHz")
 
-            if records is not None:
-                DB.create(list(records.values()))
-
-    coldLoad.stopFill()    
+    coldLoad.stopFill()
+    dbWriter().flush()
+    checkpoint.flush()
     actor.finish()
+
+def resume():
+    main(resume = True)
@@ -178,7 +178,7 @@ def main():
                                 pol,
                                 sb
                             )
-                            calcDataDB.create(records)
+                            dbWriter().submit(calcDataDB, records, description = f"stability LO={freqLO} Pol{pol} {sb}")
 
                         # plot the FFT:
                         plotBinary = actor.plotSpectrum(phaseSeries)
@@ -204,5 +204,6 @@ def main():
             testResult = resultsDB.createOrUpdate(testResult)
     
     # all finished:
+    dbWriter().flush()
     actor.finish()
     
\ No newline at end of file
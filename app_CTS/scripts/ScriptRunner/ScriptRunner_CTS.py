@@ -11,6 +11,7 @@ beamScanner = app_CTS.measProcedure.BeamScanner.beamScanner
 from DBBand6Cart.CartTests import CartTest
 from app_Common.CTSDB import CartTestsDB
 from DBBand6Cart.TestTypes import TestTypeIds
+from Measure.NoiseTemperature.Checkpoint import noiseTempCheckpoint
 from DebugOptions import *
 
 class ScriptRunner():
@@ -23,6 +24,7 @@ class ScriptRunner():
     AMP_STABILITY_MODULE = "app_CTS.scripts.AmplitudeStability"
     PHASE_STABILITY_MODULE = "app_CTS.scripts.PhaseStability"
     ENTRY_FUNCTION = "main"
+    RESUME_FUNCTION = "resume"
 
     def __init__(self) -> None:
         self.logger = logging.getLogger("ALMAFE-CTS-Control")
@@ -165,6 +167,41 @@ class ScriptRunner():
             self.logger.error(msg)
             return False
 
+    def resume(self, cartTest: CartTest) -> tuple[bool, str]:
+        """Resume an interrupted noise temperature test, skipping the points in its checkpoint
+
+        The existing test record is reused.  No new record is created in the database.
+        """
+        if measurementStatus.isMeasuring():
+            msg = "A measurement is already in progress."
+            self.logger.error(msg)
+            return False, msg
+
+        try:
+            testType = TestTypeIds(cartTest.fkTestType)
+        except:
+            msg = f"Test type {cartTest.fkTestType} is not supported"
+            self.logger.error(msg)
+            return False, msg
+
+        if testType not in (TestTypeIds.NOISE_TEMP, TestTypeIds.LO_WG_INTEGRITY, TestTypeIds.IF_PLATE_NOISE):
+            msg = f"Resume is not supported for test type {testType.name}."
+            self.logger.error(msg)
+            return False, msg
+
+        if not cartTest.key or not noiseTempCheckpoint().hasCheckpoint(cartTest.key):
+            msg = f"No checkpoint to resume for test {cartTest.key}."
+            self.logger.error(msg)
+            return False, msg
+
+        cartTest.testSysName = self.testSysName
+        measurementStatus.setMeasuring(cartTest)
+        success, msg = self._run_script(self.NOISE_TEMP_MODULE, self.RESUME_FUNCTION)
+        if success:
+            return True, f"{testType.name} resumed."
+        else:
+            return False, msg
+
     def stop(self) -> tuple[bool, str]:
         cartTest = measurementStatus.getMeasuring()        
         if not cartTest:
@@ -1,23 +1,27 @@
 import configparser
-from ALMAFE.database.DriverMySQL import DriverMySQL
 from DBBand6Cart.LoadConfiguration import loadConfiguration
 from DBBand6Cart.CartTests import CartTests
 from DBBand6Cart.MixerTests import MixerTests
+from app_Common.DBPool import CTSDBPool, PooledDriver
 
 CTS_INI = 'ALMAFE-CTS-Control.ini'
 
-def CTSDB():
+def CTSDB() -> PooledDriver:
     '''
-    test and if necessary create the singleton CTSDatabaseAPI object
+    test and if necessary create the singleton pooled CTSDatabaseAPI object
     '''
     try:
         return CTSDB.CTSDB
     except:
-        CTSDB.CTSDB = DriverMySQL(loadConfiguration(CTS_INI, 'dbBand6Cart'))
-        # https://stackoverflow.com/questions/11821976/cursor-fetchone-returns-none-but-row-in-the-database-exists
-        CTSDB.CTSDB.execute("SET SESSION TRANSACTION ISOLATION LEVEL READ COMMITTED")
+        config = configparser.ConfigParser()
+        config.read(CTS_INI)
+        try:
+            size = int(config['dbPool']['size'])
+        except:
+            size = None
+        CTSDB.CTSDB = PooledDriver(CTSDBPool(loadConfiguration(CTS_INI, 'dbBand6Cart'), size))
         return CTSDB.CTSDB
-    
+
 def CartTestsDB():
     '''
     test and if necessary create the singleton CartTestsDB object
@@ -33,7 +37,7 @@ def CartTestsDB():
             fkTestSystem = None
         CartTestsDB.CartTestsDB = CartTests(driver = CTSDB(), defaultFkTestSystem = fkTestSystem)
         return CartTestsDB.CartTestsDB
-    
+
 def MixerTestsDB():
     '''
     test and if necessary create the singleton MixerTestsDB object
@@ -49,4 +53,3 @@ def MixerTestsDB():
             fkTestSystem = None
         MixerTestsDB.MixerTestsDB = MixerTests(driver = CTSDB(), defaultFkTestSystem = fkTestSystem)
         return MixerTestsDB.MixerTestsDB
-   
\ No newline at end of file
@@ -1,20 +1,194 @@
-from fastapi import WebSocket
-from typing import Any
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Optional
+from fastapi import WebSocket, WebSocketDisconnect
+from fastapi.encoders import jsonable_encoder
+from app_Common.schemas.ConnectionManager import ConnectionStatus
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def encode(message: Any) -> str | bytes:
+    '''
+    Serialize a message to JSON text.  Uses orjson if it is installed, falling back on jsonable_encoder + json.
+    str and bytes are passed through.  bytes are sent as binary frames.
+    '''
+    if isinstance(message, (str, bytes)):
+        return message
+    if orjson is not None:
+        try:
+            return orjson.dumps(message,
+                default = jsonable_encoder,
+                option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            ).decode()
+        except TypeError:
+            pass
+    return json.dumps(jsonable_encoder(message), separators = (",", ":"), ensure_ascii = False)
+
+class Frame():
+    '''
+    A message serialized once for sending to any number of clients
+    '''
+    def __init__(self, data: str | bytes, key: Optional[str] = None):
+        self.data = data
+        self.key = key
+        self.timeStamp = time.time()
+
+class Client():
+    '''
+    One websocket with its queue of outgoing broadcast frames and sender task.
+
+    Frames are sent in order by the sender task so a slow client never holds up broadcast().
+    The task is started by the first frame, so clients served only with send() don't get one.
+    When the queue is full the oldest frame is dropped.  A frame with the same key as one still
+    waiting replaces it, so a slow client skips stale values rather than falling further behind.
+    '''
+    def __init__(self, websocket: WebSocket, maxQueue: int, onError: Callable[['Client'], None]):
+        self.websocket = websocket
+        self.onError = onError
+        self.frames = deque()
+        self.maxQueue = maxQueue
+        self.ready = asyncio.Event()
+        self.task = None
+        self.status = ConnectionStatus(client = f"{websocket.client.host}:{websocket.client.port}" if websocket.client else "")
+
+    def put(self, frame: Frame) -> None:
+        if frame.key is not None:
+            for i, queued in enumerate(self.frames):
+                if queued.key == frame.key:
+                    del self.frames[i]
+                    self.status.coalesced += 1
+                    break
+        if len(self.frames) >= self.maxQueue:
+            self.frames.popleft()
+            self.status.dropped += 1
+        self.frames.append(frame)
+        self.status.queued = len(self.frames)
+        self.ready.set()
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def run(self) -> None:
+        try:
+            while True:
+                await self.ready.wait()
+                self.ready.clear()
+                while self.frames:
+                    frame = self.frames.popleft()
+                    self.status.queued = len(self.frames)
+                    timeStart = time.time()
+                    if isinstance(frame.data, bytes):
+                        await self.websocket.send_bytes(frame.data)
+                    else:
+                        await self.websocket.send_text(frame.data)
+                    now = time.time()
+                    self.status.sent += 1
+                    self.status.lastSendTime = now - timeStart
+                    self.status.lag = now - frame.timeStamp
+                    self.status.maxLag = max(self.status.maxLag, self.status.lag)
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            self.onError(self)
 
 class ConnectionManager():
-    def __init__(self):
+    '''
+    Tracks the websocket connections for a router.
+
+    Handlers which serve each client from their own loop use send().
+    Handlers where every client gets the same data use broadcast(), which serializes
+    each message once and hands it to every client's sender task.  A producer coroutine
+    started with startProducer() can run the polling loop once for all clients.
+    '''
+    MAX_QUEUE = 8       # frames waiting per client before the oldest are dropped
+
+    def __init__(self, maxQueue: int = None, replayLatest: bool = True):
+        '''
+        :param maxQueue: frames waiting per client before the oldest are dropped
+        :param replayLatest: if True, a new client is sent the latest broadcast frame
+        '''
+        self.logger = logging.getLogger("ALMAFE-CTS-Control")
         self.active_connections: list[WebSocket] = []
+        self.clients: dict[WebSocket, Client] = {}
+        self.maxQueue = maxQueue if maxQueue else self.MAX_QUEUE
+        self.replayLatest = replayLatest
+        self.lastFrame = None
+        self.producerTask = None
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
         self.active_connections.append(websocket)
+        client = Client(websocket, self.maxQueue, self._onSendError)
+        self.clients[websocket] = client
+        # bring a new client up to date with the latest broadcast:
+        if self.replayLatest and self.lastFrame:
+            client.put(self.lastFrame)
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        if websocket in self.active_connections:
+            self.active_connections.remove(websocket)
+        client = self.clients.pop(websocket, None)
+        if client and client.task and client.task is not asyncio.current_task():
+            client.task.cancel()
 
     async def send(self, message: Any, websocket: WebSocket):
-        await websocket.send_json(message)
-        
-    async def broadcast(self, message: Any):
-        for connection in self.active_connections:
-            await connection.send_json(message)
+        data = encode(message)
+        if isinstance(data, bytes):
+            await websocket.send_bytes(data)
+        else:
+            await websocket.send_text(data)
+
+    def queue(self, message: Any, websocket: WebSocket):
+        '''
+        Queue a message for one client, in order with broadcast frames
+        '''
+        client = self.clients.get(websocket)
+        if client:
+            client.put(Frame(encode(message)))
+
+    async def broadcast(self, message: Any, key: Optional[str] = None):
+        '''
+        Queue a message for all clients without waiting for any of them
+
+        :param message: any JSON-serializable object or pydantic model
+        :param key: if given, replaces a frame with the same key still waiting to be sent to a slow client
+        '''
+        frame = Frame(encode(message), key)
+        self.lastFrame = frame
+        for client in list(self.clients.values()):
+            client.put(frame)
+
+    async def listen(self, websocket: WebSocket):
+        '''
+        For broadcast-only handlers: wait until the client disconnects
+        '''
+        try:
+            while True:
+                # ignore anything the client sends:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+        except WebSocketDisconnect:
+            pass
+        finally:
+            self.disconnect(websocket)
+
+    def startProducer(self, producer: Callable[[], Awaitable[None]]) -> None:
+        '''
+        Start the producer coroutine if it is not already running.
+        The producer should loop while self.active_connections is not empty, calling broadcast().
+        '''
+        if self.producerTask is None or self.producerTask.done():
+            self.producerTask = asyncio.create_task(producer())
+
+    @property
+    def status(self) -> list[ConnectionStatus]:
+        return [client.status.model_copy() for client in self.clients.values()]
+
+    def _onSendError(self, client: Client) -> None:
+        self.logger.info(f"ConnectionManager: send failed to {client.status.client}")
+        self.disconnect(client.websocket)
@@ -0,0 +1,302 @@
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from ALMAFE.database.DriverMySQL import DriverMySQL
+from app_Common.schemas.CTSDB import DBPoolStatus
+
+_commits = threading.local()
+
+def commitCount() -> int:
+    '''
+    Writes committed by PooledDrivers on the calling thread since it started.
+    A caller can compare this before and after a failed call to tell if anything was committed.
+    '''
+    return getattr(_commits, 'count', 0)
+
+def _countCommit() -> None:
+    _commits.count = commitCount() + 1
+
+class CTSDBPool():
+    '''
+    Pool of DriverMySQL connections.
+
+    Connections are checked out for a statement or a transaction, not for the life of a thread,
+    so SIZE bounds the connections in use at once rather than the number of threads using the database.
+    '''
+    SIZE = 4
+    CHECKOUT_TIMEOUT = 10           # seconds to wait for a free connection before opening an overflow connection
+    HEALTH_CHECK_INTERVAL = 60      # ping connections which have been idle longer than this many seconds
+    SLOW_STATEMENT = 1.0            # log statements taking longer than this many seconds
+
+    def __init__(self, connectionInfo: dict, size: int = None, checkoutTimeout: float = None):
+        self.logger = logging.getLogger("ALMAFE-CTS-Control")
+        self.connectionInfo = connectionInfo
+        self.size = size if size else self.SIZE
+        self.checkoutTimeout = checkoutTimeout if checkoutTimeout is not None else self.CHECKOUT_TIMEOUT
+        self.cv = threading.Condition()
+        self.idle = []              # list of (driver, time last returned)
+        self.connections = 0
+        self._status = DBPoolStatus(size = self.size)
+
+    @contextmanager
+    def connection(self):
+        '''
+        Check out a connection for the duration of a with block
+        '''
+        driver = self._checkout()
+        try:
+            yield driver
+        finally:
+            self._checkin(driver)
+
+    def recordStatement(self, duration: float, query: str) -> None:
+        with self.cv:
+            self._status.statements += 1
+            self._status.totalTime += duration
+            self._status.maxTime = max(self._status.maxTime, duration)
+            if duration > self.SLOW_STATEMENT:
+                self._status.slowStatements += 1
+        if duration > self.SLOW_STATEMENT:
+            self.logger.warning(f"CTSDBPool: slow statement {duration:.2f} s: {query[:100]}")
+
+    @property
+    def status(self) -> DBPoolStatus:
+        with self.cv:
+            status = self._status.model_copy()
+            status.connections = self.connections
+            status.idle = len(self.idle)
+            status.checkedOut = self.connections - len(self.idle)
+        return status
+
+    def _connect(self) -> DriverMySQL:
+        driver = DriverMySQL(self.connectionInfo)
+        # https://stackoverflow.com/questions/11821976/cursor-fetchone-returns-none-but-row-in-the-database-exists
+        driver.execute("SET SESSION TRANSACTION ISOLATION LEVEL READ COMMITTED")
+        return driver
+
+    def _isHealthy(self, driver: DriverMySQL) -> bool:
+        if not driver.is_connected():
+            return False
+        try:
+            driver.connection.ping(reconnect = False)
+            return True
+        except Exception:
+            return False
+
+    def _checkout(self) -> DriverMySQL:
+        with self.cv:
+            if not self.idle and self.connections >= self.size:
+                if not self.cv.wait_for(lambda: self.idle, self.checkoutTimeout):
+                    self.logger.warning(f"CTSDBPool: all {self.size} connections in use. Opening an overflow connection.")
+                    self._status.overflow += 1
+            if self.idle:
+                driver, lastUsed = self.idle.pop()
+            else:
+                driver, lastUsed = None, None
+                self.connections += 1
+
+        if driver is None:
+            try:
+                return self._connect()
+            except:
+                with self.cv:
+                    self.connections -= 1
+                raise
+
+        if time.time() - lastUsed > self.HEALTH_CHECK_INTERVAL and not self._isHealthy(driver):
+            self.logger.info("CTSDBPool: replacing a stale connection")
+            with self.cv:
+                self._status.reconnects += 1
+            try:
+                driver.disconnect()
+            except:
+                pass
+            try:
+                driver = self._connect()
+            except:
+                with self.cv:
+                    self.connections -= 1
+                    self.cv.notify()
+                raise
+        return driver
+
+    def _checkin(self, driver: DriverMySQL) -> None:
+        with self.cv:
+            if self.connections > self.size:
+                # close overflow connections rather than keeping them:
+                self.connections -= 1
+                close = True
+            else:
+                self.idle.append((driver, time.time()))
+                close = False
+            self.cv.notify()
+        if close:
+            driver.disconnect()
+
+class _ResultCursor():
+    '''
+    Buffered result rows, for answering SELECT LAST_INSERT_ID() after the connection is returned.
+    '''
+    def __init__(self, rows: list[tuple]):
+        self.rows = rows
+
+    def fetchone(self) -> tuple | None:
+        return self.rows.pop(0) if self.rows else None
+
+    def fetchmany(self, max_rows: int) -> list[tuple]:
+        result, self.rows = self.rows[:max_rows], self.rows[max_rows:]
+        return result
+
+    def fetchall(self) -> list[tuple]:
+        result, self.rows = self.rows, []
+        return result
+
+class _Session():
+    '''
+    Per-thread state of a PooledDriver.
+    Returns a connection still held for an unfinished transaction to the pool when the thread exits.
+    '''
+    def __init__(self, pool: CTSDBPool):
+        self.pool = pool
+        self.driver = None          # checked out connection, if any
+        self.cursor = None          # buffered cursor of the last statement
+        self.depth = 0              # nesting of PooledDriver.session()
+        self.transaction = False    # uncommitted writes on self.driver
+        self.lastInsertId = None
+
+    def __del__(self):
+        if self.driver is not None:
+            try:
+                self.driver.rollback()
+            finally:
+                self.pool._checkin(self.driver)
+                self.driver = None
+
+class PooledDriver():
+    '''
+    Stands in for DriverMySQL.  The DBBand6Cart table classes can be constructed with this as their driver.
+
+    Each execute() checks out a connection and returns it as soon as the statement has run.
+    Cursors are buffered so fetch*() reads the rows already transferred, with no connection held.
+    Writes with commit = False keep the connection until commit() or rollback().
+    After a committed INSERT, SELECT LAST_INSERT_ID() is answered from the cursor's lastrowid
+    since the next statement may run on another connection.
+    Use session() to run several statements on one connection.
+    '''
+    WRITE_STATEMENT = re.compile(r"^\s*(INSERT|UPDATE|DELETE|REPLACE)\b", re.IGNORECASE)
+    LAST_INSERT_ID = re.compile(r"^\s*SELECT\s+LAST_INSERT_ID\(\s*\)\s*;?\s*$", re.IGNORECASE)
+    TIMESTAMP_FORMAT = DriverMySQL.TIMESTAMP_FORMAT
+
+    def __init__(self, pool: CTSDBPool):
+        self.pool = pool
+        self.local = threading.local()
+
+    @contextmanager
+    def session(self):
+        '''
+        Hold one connection for the calling thread for the duration of a with block
+        '''
+        session = self._session()
+        if session.driver is None:
+            session.driver = self.pool._checkout()
+        session.depth += 1
+        try:
+            yield self
+        finally:
+            session.depth -= 1
+            self._releaseIfDone(session)
+
+    def execute(self, query: str, params = None, commit: bool = False, **kwargs) -> bool:
+        session = self._session()
+        if session.driver is None and session.lastInsertId is not None and self.LAST_INSERT_ID.match(query):
+            session.cursor = _ResultCursor([(session.lastInsertId, )])
+            return True
+        if session.driver is None:
+            session.driver = self.pool._checkout()
+        timeStart = time.time()
+        try:
+            success = session.driver.execute(query, params, commit, **kwargs)
+            session.cursor = session.driver.cursor
+            if self.WRITE_STATEMENT.match(query):
+                session.transaction = success and not commit
+                session.lastInsertId = getattr(session.cursor, 'lastrowid', None)
+                if success and commit:
+                    _countCommit()
+            else:
+                session.lastInsertId = None
+            return success
+        finally:
+            self.pool.recordStatement(time.time() - timeStart, query)
+            self._releaseIfDone(session)
+
+    def commit(self) -> bool:
+        session = self._session()
+        if session.driver is None:
+            return True
+        try:
+            success = session.driver.commit()
+            if success and session.transaction:
+                _countCommit()
+            return success
+        finally:
+            session.transaction = False
+            self._releaseIfDone(session)
+
+    def rollback(self) -> bool:
+        session = self._session()
+        if session.driver is None:
+            return True
+        try:
+            return session.driver.rollback()
+        finally:
+            session.transaction = False
+            self._releaseIfDone(session)
+
+    def fetchone(self) -> tuple | None:
+        return self._fetch(lambda cursor: cursor.fetchone())
+
+    def fetchmany(self, max_rows) -> list[tuple] | None:
+        return self._fetch(lambda cursor: cursor.fetchmany(max_rows))
+
+    def fetchall(self) -> list[tuple] | None:
+        return self._fetch(lambda cursor: cursor.fetchall())
+
+    def is_connected(self) -> bool:
+        try:
+            with self.pool.connection() as driver:
+                return driver.is_connected()
+        except Exception:
+            return False
+
+    def release(self) -> None:
+        '''
+        Abandon any unfinished transaction and return the calling thread's connection to the pool
+        '''
+        session = self._session()
+        if session.driver is not None and session.transaction:
+            self.rollback()
+        session.depth = 0
+        self._releaseIfDone(session)
+
+    def _fetch(self, fetch):
+        cursor = self._session().cursor
+        if cursor is None:
+            return None
+        try:
+            return fetch(cursor)
+        except Exception as e:
+            self.pool.logger.error(f"PooledDriver: {e}")
+            return None
+
+    def _session(self) -> _Session:
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            session = self.local.session = _Session(self.pool)
+        return session
+
+    def _releaseIfDone(self, session: _Session) -> None:
+        if session.driver is not None and not session.depth and not session.transaction:
+            driver, session.driver = session.driver, None
+            self.pool._checkin(driver)
@@ -0,0 +1,227 @@
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Optional
+from app_Common.schemas.DBWriter import DBWriterStatus
+from app_Common.DBPool import commitCount
+
+class DBWriteJob():
+    '''
+    Records to be written by one call to table.create()
+    '''
+    def __init__(self,
+            table: Any,
+            records: list,
+            onComplete: Optional[Callable[[bool, str], None]] = None,
+            description: str = ""):
+        '''
+        :param table: a DBBand6Cart table object having create(records: list)
+        :param records: the records to write
+        :param onComplete: optional callback(success, msg) called on the writer thread when the job is done
+        :param description: for logging
+        '''
+        self.table = table
+        self.records = records
+        self.onComplete = onComplete
+        self.description = description
+
+class DBWriter():
+    '''
+    Write-behind service for measurement records.
+
+    Measurement code submits records and continues without waiting for the database.
+    A single worker thread writes them in order, combining consecutive jobs for the same table
+    into one multi-row create() call.  Failed writes are retried with exponential backoff,
+    unless create() committed anything before failing, to avoid duplicate records.
+    Call flush() at the end of a measurement to wait until everything submitted has been written.
+    '''
+    MAX_QUEUE = 500             # jobs.  submit() blocks when the queue is full
+    MAX_BATCH = 2000            # records per create() call
+    MAX_RETRIES = 5
+    BACKOFF_INITIAL = 0.5       # seconds
+    BACKOFF_MAX = 30
+
+    def __init__(self):
+        self.logger = logging.getLogger("ALMAFE-CTS-Control")
+        self.jobs = deque()
+        self.cv = threading.Condition()
+        self.busy = False
+        self.stopNow = False
+        self._status = DBWriterStatus()
+        self.thread = None
+        self.start()
+
+    def start(self) -> None:
+        if self.thread and self.thread.is_alive():
+            return
+        self.stopNow = False
+        self.thread = threading.Thread(target = self._run, name = "DBWriter", daemon = True)
+        self.thread.start()
+
+    def stop(self, flush: bool = True, timeout: float = None) -> None:
+        if flush:
+            self.flush(timeout)
+        with self.cv:
+            self.stopNow = True
+            self.cv.notify_all()
+        if self.thread:
+            self.thread.join(timeout)
+        self.thread = None
+
+    def submit(self,
+            table: Any,
+            records: list | Any,
+            onComplete: Optional[Callable[[bool, str], None]] = None,
+            description: str = "",
+            timeout: float = None) -> bool:
+        '''
+        Queue records to be written
+
+        :param table: a DBBand6Cart table object having create(records: list)
+        :param records: list of records or a single record
+        :param onComplete: optional callback(success, msg) called on the writer thread when written or given up on
+        :param description: for logging
+        :param timeout: seconds to wait if the queue is full.  None means wait indefinitely.
+        :return True if queued, False if the queue stayed full for timeout seconds
+        '''
+        if not isinstance(records, list):
+            records = [records]
+        if not records:
+            return True
+        with self.cv:
+            if len(self.jobs) >= self.MAX_QUEUE:
+                self.logger.warning(f"DBWriter: queue full, waiting to submit {description}")
+                if not self.cv.wait_for(lambda: len(self.jobs) < self.MAX_QUEUE or self.stopNow, timeout):
+                    self.logger.error(f"DBWriter: queue full, dropped {len(records)} records {description}")
+                    return False
+            self.jobs.append(DBWriteJob(table, records, onComplete, description))
+            self.cv.notify_all()
+        return True
+
+    def flush(self, timeout: float = None) -> bool:
+        '''
+        Wait until all submitted jobs have been written or given up on
+
+        :param timeout: seconds.  None means wait indefinitely.
+        :return True if the queue is empty
+        '''
+        with self.cv:
+            return self.cv.wait_for(lambda: not self.jobs and not self.busy, timeout)
+
+    @property
+    def status(self) -> DBWriterStatus:
+        with self.cv:
+            status = self._status.model_copy()
+            status.running = self.thread is not None and self.thread.is_alive()
+            status.queued = len(self.jobs)
+            status.queuedRecords = sum(len(job.records) for job in self.jobs)
+        return status
+
+    def _nextBatch(self) -> list[DBWriteJob]:
+        '''
+        Remove from the queue the next job plus any following jobs for the same table, up to MAX_BATCH records
+        Call with self.cv held.
+        '''
+        batch = [self.jobs.popleft()]
+        count = len(batch[0].records)
+        while self.jobs and self.jobs[0].table is batch[0].table and count + len(self.jobs[0].records) <= self.MAX_BATCH:
+            job = self.jobs.popleft()
+            count += len(job.records)
+            batch.append(job)
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            with self.cv:
+                self.cv.wait_for(lambda: self.jobs or self.stopNow)
+                if self.stopNow and not self.jobs:
+                    return
+                batch = self._nextBatch()
+                self.busy = True
+                # wake up any submit() waiting for space:
+                self.cv.notify_all()
+            try:
+                self._write(batch)
+            finally:
+                with self.cv:
+                    self.busy = False
+                    self.cv.notify_all()
+
+    def _write(self, batch: list[DBWriteJob]) -> None:
+        table = batch[0].table
+        records = [record for job in batch for record in job.records]
+        description = ", ".join(job.description for job in batch if job.description)
+        what = f"DBWriter: {type(table).__name__}.create" + (f" {description}" if description else "")
+        backoff = self.BACKOFF_INITIAL
+        success, msg = False, ""
+        for attempt in range(self.MAX_RETRIES + 1):
+            if attempt:
+                with self.cv:
+                    self._status.retries += 1
+                time.sleep(backoff)
+                backoff = min(backoff * 2, self.BACKOFF_MAX)
+            timeStart = time.time()
+            committed = commitCount()
+            try:
+                result = table.create(records)
+            except Exception as e:
+                result = None
+                msg = f"{what} exception: {e}"
+            else:
+                detail = "failed"
+                if isinstance(result, tuple):
+                    # (success, msg) as returned by the CalcData classes:
+                    result, detail = result
+                if result is None or result is False:
+                    msg = f"{what} {detail}"
+                elif isinstance(result, int) and not isinstance(result, bool) and result != len(records):
+                    # partial write.  Don't retry, to avoid duplicate records:
+                    msg = f"{what} wrote only {result} of {len(records)} records"
+                    self._recordWrite(time.time() - timeStart, result, len(records) - result, msg)
+                    break
+                else:
+                    success, msg = True, ""
+                    self._recordWrite(time.time() - timeStart, len(records), 0, msg)
+                    break
+            if commitCount() != committed:
+                # failed after committing.  Don't retry, to avoid duplicate records:
+                msg += " after committing"
+                self._recordWrite(0, 0, len(records), msg)
+                break
+            self.logger.warning(f"{msg} (attempt {attempt + 1})")
+        else:
+            self._recordWrite(0, 0, len(records), msg)
+
+        if not success:
+            self.logger.error(msg)
+        for job in batch:
+            if job.onComplete:
+                try:
+                    job.onComplete(success, msg)
+                except Exception as e:
+                    self.logger.exception(e)
+
+    def _recordWrite(self, duration: float, written: int, failed: int, msg: str) -> None:
+        with self.cv:
+            now = datetime.now()
+            if written:
+                self._status.written += written
+                self._status.batches += 1
+                self._status.lastWriteTime = now
+                self._status.lastWriteDuration = duration
+            if failed:
+                self._status.failed += failed
+                self._status.lastError = msg
+                self._status.lastErrorTime = now
+
+def dbWriter() -> DBWriter:
+    '''
+    test and if necessary create the singleton DBWriter object
+    '''
+    try:
+        return dbWriter.dbWriter
+    except:
+        dbWriter.dbWriter = DBWriter()
+        return dbWriter.dbWriter
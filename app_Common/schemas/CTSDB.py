@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+
+class DBPoolStatus(BaseModel):
+    '''
+    Status of the database connection pool
+    '''
+    size: int = 0               # configured pool size
+    connections: int = 0        # connections open, including overflow
+    checkedOut: int = 0         # connections held by threads
+    idle: int = 0
+    overflow: int = 0           # connections opened beyond size because the pool was exhausted
+    reconnects: int = 0         # connections replaced by the health check
+    statements: int = 0
+    totalTime: float = 0        # seconds spent in execute()
+    maxTime: float = 0
+    slowStatements: int = 0
+
+    def getText(self):
+        return f"connections:{self.connections}/{self.size} checkedOut:{self.checkedOut} statements:{self.statements} maxTime:{self.maxTime:.3f} slow:{self.slowStatements}"
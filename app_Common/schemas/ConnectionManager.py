@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+
+class ConnectionStatus(BaseModel):
+    '''
+    Broadcast statistics for one websocket client
+    '''
+    client: str = ""            # host:port
+    queued: int = 0             # frames waiting to be sent
+    sent: int = 0
+    dropped: int = 0            # frames discarded because the queue was full
+    coalesced: int = 0          # frames replaced by a newer one with the same key
+    lag: float = 0              # seconds from broadcast to sent, for the latest frame
+    maxLag: float = 0
+    lastSendTime: float = 0     # seconds in send_text() for the latest frame
+
+    def getText(self):
+        return f"{self.client} queued:{self.queued} sent:{self.sent} dropped:{self.dropped} coalesced:{self.coalesced} lag:{self.lag:.3f} maxLag:{self.maxLag:.3f}"
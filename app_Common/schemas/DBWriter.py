@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+class DBWriterStatus(BaseModel):
+    '''
+    Status of the background database writer
+    '''
+    running: bool = False
+    queued: int = 0             # jobs waiting to be written
+    queuedRecords: int = 0      # records in the jobs waiting to be written
+    written: int = 0            # records written since startup
+    batches: int = 0            # create() calls made since startup
+    retries: int = 0
+    failed: int = 0             # records given up on after all retries
+    lastError: str = ""
+    lastErrorTime: Optional[datetime] = None
+    lastWriteTime: Optional[datetime] = None
+    lastWriteDuration: float = 0    # seconds
+
+    def getText(self):
+        return f"queued:{self.queued} ({self.queuedRecords} records) written:{self.written} batches:{self.batches} retries:{self.retries} failed:{self.failed}"
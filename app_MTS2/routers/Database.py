@@ -3,6 +3,9 @@ from fastapi import APIRouter
 from app_Common.Response import ListResponse, prepareListResponse, MessageResponse
 from app_Common.CTSDB import CTSDB
 from app_Common.schemas.common import SingleBool
+from app_Common.schemas.DBWriter import DBWriterStatus
+from app_Common.schemas.CTSDB import DBPoolStatus
+from app_Common.DBWriter import dbWriter
 from DBBand6Cart.MixerConfigs import MixerConfigs
 from DBBand6Cart.schemas.MixerConfig import MixerConfig, MixerKeys
 from DBBand6Cart.MixerParams import MixerParam, MixerParams
@@ -24,6 +27,14 @@ router = APIRouter(prefix="/database")
 async def get_IsConnected():
     return SingleBool(value = CTSDB().is_connected())
 
+@router.get("/pool/status", response_model = DBPoolStatus)
+async def get_PoolStatus():
+    return CTSDB().pool.status
+
+@router.get("/writer/status", response_model = DBWriterStatus)
+async def get_WriterStatus():
+    return dbWriter().status
+
 @router.get("/configs", response_model = ListResponse)
 async def getConfigs(
         serialNum:int = None, 
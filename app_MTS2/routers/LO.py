@@ -3,6 +3,8 @@ from app_Common.schemas.common import *
 from Controllers.schemas.LO import *
 from app_Common.Response import MessageResponse
 from Controllers.schemas.DeviceInfo import DeviceInfo
+from Controllers.LO.SetFrequency_Mixin import SetFrequency_Mixin
+from Controllers.LO.LockHintCache import LockStats
 import app_MTS2.hardware.MixerAssembly
 import app_MTS2.hardware.RFSource
 loControl = app_MTS2.hardware.MixerAssembly.loControl
@@ -51,6 +53,13 @@ async def lock_PLL(request: Request, freqGHz: float, settings: LOSettings):
     else:
         return MessageResponse(message = f"{name} PLL lock FAILED at {freqGHz} GHz: {msg}", success = False)
 
+@router.get("/pll/lock_stats", response_model = list[LockStats])
+async def get_Lock_Stats(request: Request):
+    device, name = getTarget(request)
+    if not isinstance(device, SetFrequency_Mixin):
+        return []
+    return device.getLockStats()
+
 @router.put("/pll/adjust", response_model = MessageResponse)
 async def adjust_PLL(request: Request, payload: AdjustPLL):
     device, name = getTarget(request)
@@ -4,6 +4,7 @@ import app_MTS2.hardware.NoiseTemperature
 temperatureMonitor = app_MTS2.hardware.NoiseTemperature.temperatureMonitor
 from INSTR.TemperatureMonitor.schemas import Temperatures, DESCRIPTIONS
 from Controllers.schemas.DeviceInfo import DeviceInfo
+from Controllers.TemperatureMonitor.Poller import TemperatureHistory
 from DebugOptions import *
 
 logger = logging.getLogger("ALMAFE-CTS-Control")
@@ -33,3 +34,10 @@ async def get_TempSensor(sensor: int):
 async def get_TempSensors():
     temps, errors = temperatureMonitor.readAll()
     return Temperatures(temps = temps, errors = errors, descriptions = DESCRIPTIONS)
+
+@router.get("/history", response_model = TemperatureHistory)
+async def get_TempHistory(since: int = 0):
+    '''
+    Readings made by the poller after sequence number since.  Pass the returned lastSeq to get only newer readings.
+    '''
+    return temperatureMonitor.getHistory(since)
@@ -39,7 +39,7 @@ def main():
         if testSteps.warmIF:
             records = actor.measureIFSysNoise(test_record.key, settingsContainer.warmIFSettings)
             DB = WarmIFNoiseData(driver = CTSDB())
-            DB.create(records)
+            dbWriter().submit(DB, records, description = "warm IF noise")
 
         ifSystem.input_select = InputSelect.POL0_USB
 
@@ -105,7 +105,7 @@ def main():
 
                     # measure noise temperature in sweep mode:
                     statusMessage = f"Measure bias optimization LO={freqLO:.2f} GHz, Vj={Vj}, Ij={Ij}..."
-                    records: list[NoiseTempRawDatum] = actor.measureNoiseTemp(test_record.key, freqLO, statusMessage = statusMessage)
+                    records: NoiseTempSweep = actor.measureNoiseTemp(test_record.key, freqLO, statusMessage = statusMessage)
 
                     # take the mean noise temperature across the IF range:
                     meanNT = actor.calcMeanNoiseTemp(records, biasOptSettings.ifOptimizeStart, biasOptSettings.ifOptimizeStop)
@@ -135,7 +135,7 @@ def main():
                     }
 
                     # update the user display:
-                    dataDisplay.biasOptResults.append(noiseTemps[Vj][Ij]['result'])
+                    dataDisplay.addBiasOptResult(noiseTemps[Vj][Ij]['result'])
 
                     # write the output spreadsheet:                    
                     wb.save(outPath)
@@ -162,7 +162,7 @@ def main():
 
                 # write the optimum noise temperature results:
                 DB = NoiseTempRawData(driver = CTSDB())
-                DB.create(list(noiseTemps[bestVj][bestIj]['records'].values()))
+                dbWriter().submit(DB, list(noiseTemps[bestVj][bestIj]['records'].values()), description = f"noise temp LO={freqLO:.2f} GHz")
 
             # write the Trx results matrix to the output spreadsheet
             
@@ -189,5 +189,6 @@ def main():
 
     finally:
         # these will execute even if an exception is thrown above
-        coldLoad.stopFill()    
+        coldLoad.stopFill()
+        dbWriter().flush()
         actor.finish()
@@ -58,11 +58,11 @@ def main():
         
         if settings.enable01 and settings.saveResults:
             to_insert = prepare_data(testRec, SelectSIS.SIS1, 0, 0, mp1.IMAG if mp1 else 0, results.curves[0].points)
-            DB.create(to_insert)
+            dbWriter().submit(DB, to_insert, description = "IV curve")
     
         if settings.enable02 and settings.saveResults:
             to_insert = prepare_data(testRec, SelectSIS.SIS2, 0, 0, mp1.IMAG if mp1 else 0, results.curves[1].points)
-            DB.create(to_insert)
+            dbWriter().submit(DB, to_insert, description = "IV curve")
 
     if settings.loPumped:
         for freqLO in makeSteps(settings.loStart, settings.loStop, settings.loStep):
@@ -78,10 +78,11 @@ def main():
         
             if settings.enable01 and settings.saveResults:
                 to_insert = prepare_data(testRec, SelectSIS.SIS1, freqLO, pumpPwr, mp1.IMAG, results.curves[0].points)
-                DB.create(to_insert)
+                dbWriter().submit(DB, to_insert, description = f"IV curve LO={freqLO:.2f} GHz")
         
             if settings.enable02 and settings.saveResults:
                 to_insert = prepare_data(testRec, SelectSIS.SIS2, freqLO, pumpPwr, mp1.IMAG, results.curves[1].points)
-                DB.create(to_insert)
+                dbWriter().submit(DB, to_insert, description = f"IV curve LO={freqLO:.2f} GHz")
 
+    dbWriter().flush()
     actor.finish()
@@ -2,6 +2,7 @@ import logging
 
 # imports of classes and functions, for use by the script
 from app_Common.CTSDB import CTSDB
+from app_Common.DBWriter import dbWriter
 from Measure.Shared.makeSteps import makeSteps
 from Controllers.IFSystem.Interface import InputSelect, OutputSelect
 from Measure.Shared.SelectSIS import SelectSIS
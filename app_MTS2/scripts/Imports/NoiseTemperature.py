@@ -2,6 +2,7 @@ import logging
 
 # imports of classes and functions, for use by the script
 from app_Common.CTSDB import CTSDB
+from app_Common.DBWriter import dbWriter
 from Measure.Shared.makeSteps import makeSteps
 from Measure.Shared.SelectPolarization import SelectPolarization
 from DBBand6Cart.schemas.DUT_Type import DUT_Type
@@ -14,6 +15,8 @@ from DBBand6Cart.MixerParams import MixerParams, MixerParam
 from Controllers.PowerDetect.Interface import DetectMode
 from Measure.Shared.SelectSIS import SelectSIS
 from Measure.NoiseTemperature.schemas import BiasOptResult
+from Measure.NoiseTemperature.NoiseTempSweep import NoiseTempSweep
+from Measure.NoiseTemperature.Checkpoint import noiseTempCheckpoint, StepType
 from INSTR.InputSwitch.Interface import InputSelect
 
 # imports of singleton objects:
@@ -36,6 +39,7 @@ ifSystem = app_MTS2.hardware.IFSystem.ifSystem
 powerDetect = app_MTS2.hardware.PowerDetect.powerDetect
 coldLoad = app_MTS2.hardware.NoiseTemperature.coldLoad
 chopper = app_MTS2.hardware.NoiseTemperature.chopper
+checkpoint = noiseTempCheckpoint()
 logger = logging.getLogger("ALMAFE-CTS-Control")
 
 # reload all settings from files:
@@ -1,10 +1,15 @@
 import logging
 from .Imports.NoiseTemperature import *
 
-def main():
+def main(resume: bool = False):
+    """
+    :param resume: if True, skip the points recorded in the checkpoint for this test
+    """
     try:
         # get the MixerTests record for this test:
         test_record: MixerTest = measurementStatus.getMeasuring()
+        if not resume:
+            checkpoint.clear(test_record.key)
 
         # read the mixer configuration:
         DB = MixerConfigs(driver = CTSDB())
@@ -28,11 +33,20 @@ def main():
         noiseTempSettings.polarization = SelectPolarization.POL0.value
         actor.start(noiseTempSettings)
 
+        pols = [pol for pol in (0, 1) if SelectPolarization(noiseTempSettings.polarization).testPol(pol)]
+        stepTypes = []
+        if testSteps.noiseTemp:
+            stepTypes.append(StepType.NOISE_TEMP)
+        if testSteps.imageReject and receiver.is2SB():
+            stepTypes.append(StepType.IMAGE_REJECT)
+
         # measure warm IF noise:
-        if testSteps.warmIF:
+        if testSteps.warmIF and not checkpoint.isDone(test_record.key, 0, 0, [0], [StepType.WARM_IF]):
             records = actor.measureIFSysNoise(test_record.key, settingsContainer.warmIFSettings)
             DB = WarmIFNoiseData(driver = CTSDB())
-            DB.create(records)
+            dbWriter().submit(DB, records,
+                onComplete = checkpoint.onWritten(test_record.key, 0, [0], [0], [StepType.WARM_IF]),
+                description = "warm IF noise")
 
         # measure noise temperature and/or image rejection:
         if testSteps.noiseTemp or testSteps.imageReject:
@@ -40,6 +54,7 @@ def main():
 
             # for noise temp, can we use swep mode?
             sweepNoiseTemp = powerDetect.detect_mode == DetectMode.SPEC_AN
+            ifSteps = list(makeSteps(noiseTempSettings.ifStart, noiseTempSettings.ifStop, noiseTempSettings.ifStep))
 
             # loop on LO frequencies:
             for freqLO in makeSteps(noiseTempSettings.loStart, noiseTempSettings.loStop, noiseTempSettings.loStep):
@@ -47,7 +62,14 @@ def main():
                     actor.stop()
                     break
 
-                records = None
+                # skip LOs which are already in the checkpoint.  A swept LO is checkpointed as a unit at freqIF = 0:
+                if sweepNoiseTemp:
+                    loDone = checkpoint.hasRecord(test_record.key, freqLO, 0, pols, stepTypes)
+                else:
+                    loDone = all(checkpoint.hasRecord(test_record.key, freqLO, freqIF, pols, stepTypes) for freqIF in ifSteps)
+                if loDone:
+                    logger.info(f"NoiseTemperature: LO={freqLO:.2f} GHz is already done")
+                    continue
 
                 success, msg = actor.setLO(freqLO)
                 if not success:
@@ -55,34 +77,56 @@ def main():
                 elif msg:
                     logger.info(msg)
 
-                # measure noise temperature in sweep mode:
                 if sweepNoiseTemp:
-                    if testSteps.noiseTemp:
+                    # measure noise temperature in sweep mode:
+                    records = None
+                    if StepType.NOISE_TEMP in stepTypes:
                         actor.checkColdLoad()
                         records = actor.measureNoiseTemp(test_record.key, freqLO, recordsIn = records)
-                
-                if not sweepNoiseTemp or (testSteps.imageReject and receiver.is2SB()):
+
+                    # measure image rejection in IF-stepping mode:
+                    if StepType.IMAGE_REJECT in stepTypes:
+                        for freqIF in ifSteps:
+                            if measurementStatus.stopNow():
+                                actor.stop()
+                                break
+                            actor.setIF(freqIF)
+                            records = actor.measureImageReject(test_record.key, freqLO, freqIF, recordsIn = records)
+
+                    # write all records for this LO to the database.
+                    # An LO interrupted by stop is not written, so a resume measures it again as a whole:
+                    if records is not None and not measurementStatus.stopNow():
+                        dbWriter().submit(DB, list(records.values()),
+                            onComplete = checkpoint.onWritten(test_record.key, freqLO, [0], pols, stepTypes),
+                            description = f"noise temp LO={freqLO:.2f} GHz")
+                else:
                     # measure noise temp and/or image rejection in IF-stepping mode:
-                    for freqIF in makeSteps(noiseTempSettings.ifStart, noiseTempSettings.ifStop, noiseTempSettings.ifStep):
+                    for freqIF in ifSteps:
                         if measurementStatus.stopNow():
                             actor.stop()
                             break
+                        if checkpoint.hasRecord(test_record.key, freqLO, freqIF, pols, stepTypes):
+                            continue
                         actor.setIF(freqIF)
-                        if testSteps.noiseTemp and not sweepNoiseTemp:
+                        records = None
+                        if StepType.NOISE_TEMP in stepTypes:
                             records = actor.measureNoiseTemp(test_record.key, freqLO, freqIF, recordsIn = records)
-                        if measurementStatus.stopNow():
-                            actor.stop()
-                            break
-
-                        # measure image rejection:
-                        if testSteps.imageReject:
+                        if StepType.IMAGE_REJECT in stepTypes and not measurementStatus.stopNow():
                             records = actor.measureImageReject(test_record.key, freqLO, freqIF, recordsIn = records)
 
-                # write all records for this LO to the database:
-                if records is not None:
-                    DB.create(list(records.values()))
+                        # write each IF point as it completes so that a resume can re-enter within the LO.
+                        # A point interrupted by stop is not written, so a resume measures it again as a whole:
+                        if records is not None and not measurementStatus.stopNow():
+                            dbWriter().submit(DB, list(records.values()),
+                                onComplete = checkpoint.onWritten(test_record.key, freqLO, [freqIF], pols, stepTypes),
+                                description = f"noise temp LO={freqLO:.2f} GHz IF={freqIF:.2f} GHz")
 
     finally:
         # these will execute even if an exception is thrown above
         coldLoad.stopFill()
+        dbWriter().flush()
+        checkpoint.flush()
         actor.finish()
+
+def resume():
+    main(resume = True)
@@ -10,6 +10,7 @@ import app_MTS2.measProcedure.NoiseTemperature
 testSteps = app_MTS2.measProcedure.NoiseTemperature.settingsContainer.testSteps
 from DBBand6Cart.MixerTests import MixerTest, MixerTests
 from DBBand6Cart.TestTypes import TestTypeIds
+from Measure.NoiseTemperature.Checkpoint import noiseTempCheckpoint
 from Measure.NoiseTemperature.schemas import TestSteps
 from DebugOptions import *
 
@@ -21,6 +22,7 @@ class ScriptRunner():
     NOISE_TEMP_MODULE = "app_MTS2.scripts.NoiseTemperature"
     Y_FACTOR_MODULE = "app_MTS2.scripts.YFactor"
     ENTRY_FUNCTION = "main"
+    RESUME_FUNCTION = "resume"
 
     def __init__(self) -> None:
         self.logger = logging.getLogger("ALMAFE-CTS-Control")
@@ -131,6 +133,41 @@ class ScriptRunner():
             self.logger.error(msg)
             return False
 
+    def resume(self, testRecord: MixerTest) -> tuple[bool, str]:
+        """Resume an interrupted noise temperature test, skipping the points in its checkpoint
+
+        The existing test record is reused.  No new record is created in the database.
+        """
+        if measurementStatus.isMeasuring():
+            msg = "A measurement is already in progress."
+            self.logger.error(msg)
+            return False, msg
+
+        try:
+            testType = TestTypeIds(testRecord.fkTestType)
+        except:
+            msg = f"Test type {testRecord.fkTestType} is not supported"
+            self.logger.error(msg)
+            return False, msg
+
+        if testType not in (TestTypeIds.NOISE_TEMP, TestTypeIds.IF_PLATE_NOISE):
+            msg = f"Resume is not supported for test type {testType.name}."
+            self.logger.error(msg)
+            return False, msg
+
+        if not testRecord.key or not noiseTempCheckpoint().hasCheckpoint(testRecord.key):
+            msg = f"No checkpoint to resume for test {testRecord.key}."
+            self.logger.error(msg)
+            return False, msg
+
+        testRecord.testSysName = self.testSysName
+        measurementStatus.setMeasuring(testRecord)
+        success, msg = self._run_script(self.NOISE_TEMP_MODULE, self.RESUME_FUNCTION)
+        if success:
+            return True, f"{testType.name} resumed."
+        else:
+            return False, msg
+
     def stop(self) -> tuple[bool, str]:
         testRecord = measurementStatus.getMeasuring()        
         if not testRecord: